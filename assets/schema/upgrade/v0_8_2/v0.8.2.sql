@@ -63,6 +63,42 @@ CREATE TABLE IF NOT EXISTS `document_chunk`
     KEY            `idx_document_id` (`document_id`) COMMENT 'index:document_id'
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='knowledge document chunk detail';
 
+CREATE TABLE IF NOT EXISTS `knowledge_ingestion_job`
+(
+    `id`              int          NOT NULL AUTO_INCREMENT COMMENT 'auto increment id',
+    `document_id`     int          NOT NULL COMMENT 'knowledge document id',
+    `space_id`        varchar(50)  NOT NULL COMMENT 'knowledge space id',
+    `status`          varchar(50)  NOT NULL COMMENT 'status PENDING,RUNNING,FAILED,FINISHED',
+    `stage`           varchar(50)  NOT NULL COMMENT 'last completed stage: download,parse,split,embed,persist',
+    `chunk_parameters` TEXT        NULL COMMENT 'chunk parameters json',
+    `local_path`      varchar(512) NULL COMMENT 'downloaded file path',
+    `checkpoint_path` varchar(512) NULL COMMENT 'split chunks checkpoint file path',
+    `total_chunks`    int          NOT NULL DEFAULT 0 COMMENT 'total chunks to embed',
+    `embedded_chunks` int          NOT NULL DEFAULT 0 COMMENT 'embedded chunks',
+    `embedded_batches` int         NOT NULL DEFAULT 0 COMMENT 'completed embedding batches',
+    `vector_ids`      LONGTEXT     NULL COMMENT 'json list of the vector ids of the embedded chunks',
+    `attempts`        int          NOT NULL DEFAULT 0 COMMENT 'run attempts',
+    `error`           TEXT         NULL COMMENT 'error message',
+    `gmt_created`     TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT 'created time',
+    `gmt_modified`    TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'update time',
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_document_id` (`document_id`),
+    KEY `idx_status` (`status`)
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='knowledge document ingestion job';
+
+CREATE TABLE IF NOT EXISTS `document_chunk_vector`
+(
+    `id`           int          NOT NULL AUTO_INCREMENT COMMENT 'auto increment id',
+    `document_id`  int          NOT NULL COMMENT 'knowledge document id',
+    `chunk_index`  int          NOT NULL COMMENT 'chunk index in the document',
+    `chunk_hash`   varchar(64)  NOT NULL COMMENT 'sha256 of the chunk content and metadata',
+    `vector_id`    varchar(255) NULL COMMENT 'chunk id in the vector store, null if the chunk failed to load',
+    `gmt_created`  timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT 'created time',
+    `gmt_modified` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'update time',
+    PRIMARY KEY (`id`),
+    KEY `idx_document_id` (`document_id`)
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='vector store ids of the document chunks';
+
 
 CREATE TABLE IF NOT EXISTS `connect_config`
 (
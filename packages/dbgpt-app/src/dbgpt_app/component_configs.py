@@ -46,7 +46,11 @@ def initialize_components(
 
     system_app.register_instance(multi_agents)
 
-    _initialize_embedding_model(system_app, default_embedding_name)
+    _initialize_embedding_model(
+        system_app,
+        default_embedding_name,
+        embedding_cache_store=_initialize_embedding_cache(web_config),
+    )
     _initialize_rerank_model(system_app, default_rerank_name)
     _initialize_model_cache(system_app, web_config)
     _initialize_awel(system_app, web_config.awel_dirs)
@@ -78,7 +82,40 @@ def _initialize_model_cache(system_app: SystemApp, web_config: ServiceWebParamet
     else:
         persist_dir = f"{MODEL_DISK_CACHE_DIR}_{web_config.port}"
     persist_dir = resolve_root_path(persist_dir)
-    initialize_cache(system_app, storage_type, max_memory_mb, persist_dir)
+    initialize_cache(
+        system_app,
+        storage_type,
+        max_memory_mb,
+        persist_dir,
+        cache_policy=web_config.model_cache.cache_policy,
+        default_ttl=web_config.model_cache.default_ttl,
+        admission=web_config.model_cache.admission,
+        similarity_threshold=web_config.model_cache.similarity_threshold,
+    )
+
+
+def _initialize_embedding_cache(web_config: ServiceWebParameters):
+    from dbgpt.storage.cache.embedding_cache import EmbeddingCacheStore
+
+    cache_config = web_config.model_cache
+    if not cache_config or not cache_config.enable_embedding_cache:
+        return None
+    persist_dir = cache_config.embedding_cache_persist_dir
+    if persist_dir:
+        persist_dir = resolve_root_path(persist_dir)
+    try:
+        return EmbeddingCacheStore(
+            max_memory_mb=cache_config.embedding_cache_max_memory_mb,
+            persist_dir=persist_dir,
+        )
+    except ImportError as e:
+        logger.warning(
+            f"Can't import rocksdict, cache the embeddings in memory only, import "
+            f"error message: {str(e)}"
+        )
+        return EmbeddingCacheStore(
+            max_memory_mb=cache_config.embedding_cache_max_memory_mb
+        )
 
 
 def _initialize_awel(system_app: SystemApp, awel_dirs: Optional[str] = None):
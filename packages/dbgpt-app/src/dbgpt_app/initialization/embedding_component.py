@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional, Type
+from typing import TYPE_CHECKING, Any, Optional, Type
 
 from dbgpt.component import ComponentType, SystemApp
 from dbgpt.core import Embeddings, RerankEmbeddings
@@ -10,16 +10,24 @@ from dbgpt.rag.embedding.embedding_factory import (
     RerankEmbeddingFactory,
 )
 
+if TYPE_CHECKING:
+    from dbgpt.storage.cache.embedding_cache import EmbeddingCacheStore
+
 logger = logging.getLogger(__name__)
 
 
 def _initialize_embedding_model(
     system_app: SystemApp,
     default_embedding_name: Optional[str] = None,
+    embedding_cache_store: Optional["EmbeddingCacheStore"] = None,
 ):
     if default_embedding_name:
         logger.info("Register remote RemoteEmbeddingFactory")
-        system_app.register(RemoteEmbeddingFactory, model_name=default_embedding_name)
+        system_app.register(
+            RemoteEmbeddingFactory,
+            model_name=default_embedding_name,
+            cache_store=embedding_cache_store,
+        )
 
 
 def _initialize_rerank_model(
@@ -34,9 +42,16 @@ def _initialize_rerank_model(
 
 
 class RemoteEmbeddingFactory(EmbeddingFactory):
-    def __init__(self, system_app, model_name: str = None, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        system_app,
+        model_name: str = None,
+        cache_store: Optional["EmbeddingCacheStore"] = None,
+        **kwargs: Any,
+    ) -> None:
         super().__init__(system_app=system_app)
         self._default_model_name = model_name
+        self._cache_store = cache_store
         self.kwargs = kwargs
         self.system_app = system_app
 
@@ -55,7 +70,12 @@ class RemoteEmbeddingFactory(EmbeddingFactory):
             ComponentType.WORKER_MANAGER_FACTORY, WorkerManagerFactory
         ).create()
         # Ignore model_name args
-        return RemoteEmbeddings(self._default_model_name, worker_manager)
+        embeddings = RemoteEmbeddings(self._default_model_name, worker_manager)
+        if self._cache_store:
+            from dbgpt.storage.cache.embedding_cache import CachedEmbeddings
+
+            return CachedEmbeddings(embeddings, self._cache_store)
+        return embeddings
 
 
 class RemoteRerankEmbeddingFactory(RerankEmbeddingFactory):
@@ -34,7 +34,11 @@ from dbgpt_app.knowledge.request.response import (
 from dbgpt_ext.rag.assembler.summary import SummaryAssembler
 from dbgpt_ext.rag.chunk_manager import ChunkParameters
 from dbgpt_ext.rag.knowledge.factory import KnowledgeFactory
-from dbgpt_serve.rag.models.chunk_db import DocumentChunkDao, DocumentChunkEntity
+from dbgpt_serve.rag.models.chunk_db import (
+    DocumentChunkDao,
+    DocumentChunkEntity,
+    DocumentChunkVectorDao,
+)
 from dbgpt_serve.rag.models.document_db import (
     KnowledgeDocumentDao,
     KnowledgeDocumentEntity,
@@ -47,6 +51,7 @@ from dbgpt_serve.rag.storage_manager import StorageManager
 knowledge_space_dao = KnowledgeSpaceDao()
 knowledge_document_dao = KnowledgeDocumentDao()
 document_chunk_dao = DocumentChunkDao()
+document_chunk_vector_dao = DocumentChunkVectorDao()
 
 logger = logging.getLogger(__name__)
 CFG = Config()
@@ -444,6 +449,7 @@ class KnowledgeService:
         documents = knowledge_document_dao.get_documents(document_query)
         for document in documents:
             document_chunk_dao.raw_delete(document.id)
+            document_chunk_vector_dao.delete_by_document(document.id)
         # delete documents
         knowledge_document_dao.raw_delete(document_query)
         # delete space
@@ -465,13 +471,15 @@ class KnowledgeService:
             raise Exception(f"invalid space name:{space_name}")
         space = spaces[0]
 
-        vector_ids = documents[0].vector_ids
-        if vector_ids is not None:
+        vector_ids = document_chunk_vector_dao.get_vector_ids(documents[0].id)
+        if documents[0].vector_ids:
+            vector_ids.extend(documents[0].vector_ids.split(","))
+        if vector_ids:
             storage_connector = self.storage_manager.get_storage_connector(
                 index_name=space_name, storage_type=space.vector_type
             )
             # delete vector by ids
-            storage_connector.delete_by_ids(vector_ids)
+            storage_connector.delete_by_ids(",".join(vector_ids))
 
             # we next delete the corresponding CHUNK HISTORY data in Milvus
             if (
@@ -491,6 +499,7 @@ class KnowledgeService:
 
         # delete chunks
         document_chunk_dao.raw_delete(documents[0].id)
+        document_chunk_vector_dao.delete_by_document(documents[0].id)
         # delete document
         return str(knowledge_document_dao.raw_delete(document_query))
 
@@ -5,6 +5,7 @@ import time
 from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Body, Depends
+from fastapi.responses import StreamingResponse
 
 from dbgpt._private.config import Config
 from dbgpt.core.interface.message import OnceConversation
@@ -230,7 +231,8 @@ async def editor_sql_run(
     try:
         start_time = time.time() * 1000
         # Use the parameterized query and parameters
-        colunms, sql_result = conn.query_ex(result, params=params, timeout=30)
+        colunms, sql_result = await conn.aquery_ex(result, params=params, timeout=30)
+        cached = bool(getattr(sql_result, "cached_at", None))
         # Convert result type safely
         sql_result = [
             tuple(str(x) if x is not None else None for x in row) for row in sql_result
@@ -242,6 +244,7 @@ async def editor_sql_run(
             run_cost=(end_time - start_time) / 1000,
             colunms=colunms,
             values=sql_result,
+            cached=cached,
         )
         return Result.succ(sql_run_data)
     except Exception as e:
@@ -251,6 +254,69 @@ async def editor_sql_run(
         )
 
 
+# The default row budget and page size of the streaming SQL run
+_SQL_STREAM_MAX_ROWS = 10000
+_SQL_STREAM_PAGE_SIZE = 500
+
+
+def _sql_stream_events(conn, sql: str, params: Dict, max_rows: int, page_size: int):
+    """Yield the result pages of a query as server-sent events."""
+    start_time = time.time()
+    try:
+        for chunk in conn.query_stream(
+            sql, params=params, batch_size=page_size, max_rows=max_rows
+        ):
+            page = {
+                "colunms": chunk.columns,
+                "values": [
+                    [str(x) if x is not None else None for x in row]
+                    for row in chunk.rows
+                ],
+                "offset": chunk.offset,
+                "truncated": chunk.truncated,
+                "run_cost": time.time() - start_time,
+            }
+            yield f"data: {json.dumps(page, ensure_ascii=False)}\n\n"
+    except Exception as e:
+        logger.error(f"editor_sql_run_stream exception: {str(e)}", exc_info=True)
+        yield f"data: {json.dumps({'result_info': str(e)}, ensure_ascii=False)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@router.post("/v1/editor/sql/run/stream")
+async def editor_sql_run_stream(
+    run_param: dict = Body(),
+    editor_service: EditorService = Depends(get_edit_service),
+):
+    """Run the SQL and stream the result page by page.
+
+    The first page is sent as soon as it is fetched, the stream stops at
+    ``max_rows`` rows and the last page is marked as truncated.
+    """
+    logger.info(f"editor_sql_run_stream:{run_param}")
+    db_name = resolve_editor_db_name(run_param, editor_service)
+    sql = run_param.get("sql")
+
+    if not db_name or not sql:
+        return Result.failed(msg="SQL run param error: db_name and sql are required")
+
+    conn = CFG.local_db_manager.get_connector(db_name)
+    db_type = getattr(conn, "db_type", "").lower()
+
+    is_safe, result, params = sanitize_sql(sql, db_type)
+    if not is_safe:
+        logger.warning(f"Blocked dangerous SQL: {sql}")
+        return Result.failed(msg=f"Operation not allowed: {result}")
+
+    max_rows = int(run_param.get("max_rows") or _SQL_STREAM_MAX_ROWS)
+    page_size = int(run_param.get("page_size") or _SQL_STREAM_PAGE_SIZE)
+    # The sync generator is iterated in the thread pool
+    return StreamingResponse(
+        _sql_stream_events(conn, result, params, max_rows, page_size),
+        media_type="text/event-stream",
+    )
+
+
 @router.post("/v1/sql/editor/submit")
 async def sql_editor_submit(
     sql_edit_context: ChatSqlEditContext = Body(),
@@ -317,7 +383,8 @@ async def chart_run(
     try:
         start_time = time.time() * 1000
         # Use the parameterized query and parameters
-        colunms, sql_result = db_conn.query_ex(result, params=params, timeout=30)
+        colunms, sql_result = await db_conn.aquery_ex(result, params=params, timeout=30)
+        cached = bool(getattr(sql_result, "cached_at", None))
         # Convert result type safely
         sql_result = [
             tuple(str(x) if x is not None else None for x in row) for row in sql_result
@@ -329,6 +396,7 @@ async def chart_run(
             run_cost=(end_time - start_time) / 1000,
             colunms=colunms,
             values=sql_result,
+            cached=cached,
         )
 
         chart_values = []
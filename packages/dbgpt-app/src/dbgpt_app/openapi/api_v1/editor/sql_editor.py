@@ -20,6 +20,8 @@ class SqlRunData(BaseModel):
     run_cost: float
     colunms: Optional[List[str]] = []
     values: Optional[List] = []
+    # The result is served from the query result cache of the datasource
+    cached: Optional[bool] = False
 
 
 class ChartRunData(BaseModel):
@@ -3,6 +3,7 @@ import pytest
 from dbgpt_app.openapi.api_v1.editor.api_editor_v1 import (
     chart_run,
     editor_sql_run,
+    editor_sql_run_stream,
     resolve_editor_db_name,
 )
 from dbgpt_app.openapi.api_v1.editor.service import nonempty_db_name
@@ -80,3 +81,39 @@ async def test_editor_sql_run_missing_db_name_returns_failed_result():
     )
     assert result.success is False
     assert "db_name" in (result.err_msg or "")
+
+
+@pytest.mark.asyncio
+async def test_editor_sql_run_stream_missing_db_name_returns_failed_result():
+    result = await editor_sql_run_stream(
+        {"sql": "select 1"},
+        editor_service=_NoDbService(),
+    )
+    assert result.success is False
+
+
+def test_sql_stream_events(tmp_path):
+    import json
+
+    from dbgpt_app.openapi.api_v1.editor.api_editor_v1 import _sql_stream_events
+    from dbgpt_ext.datasource.rdbms.conn_sqlite import SQLiteConnector
+
+    conn = SQLiteConnector.from_file_path(str(tmp_path / "test.db"))
+    conn.run("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);")
+    for i in range(5):
+        conn.run(f"insert into test(id, name) values ({i}, 'n{i}')")
+
+    events = list(
+        _sql_stream_events(conn, "select * from test where id < :id", {"id": 4}, 3, 2)
+    )
+    assert events[-1] == "data: [DONE]\n\n"
+    pages = [json.loads(event[len("data: ") :]) for event in events[:-1]]
+    assert [page["values"] for page in pages] == [
+        [["0", "n0"], ["1", "n1"]],
+        [["2", "n2"]],
+    ]
+    assert pages[0]["colunms"] == ["id", "name"]
+    assert pages[-1]["truncated"] is True
+
+    events = list(_sql_stream_events(conn, "select * from missing", {}, 3, 2))
+    assert "result_info" in json.loads(events[0][len("data: ") :])
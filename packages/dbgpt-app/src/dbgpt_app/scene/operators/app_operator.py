@@ -198,12 +198,14 @@ def build_cached_chat_operator(
         if is_streaming:
             llm_task = StreamingLLMOperator(llm_client, task_name=model_task_name)
             cache_task = CachedModelStreamOperator(
-                cache_manager, task_name=cache_task_name
+                cache_manager, llm_client=llm_client, task_name=cache_task_name
             )
             save_cache_task = ModelStreamSaveCacheOperator(cache_manager)
         else:
             llm_task = LLMOperator(llm_client, task_name=model_task_name)
-            cache_task = CachedModelOperator(cache_manager, task_name=cache_task_name)
+            cache_task = CachedModelOperator(
+                cache_manager, llm_client=llm_client, task_name=cache_task_name
+            )
             save_cache_task = ModelSaveCacheOperator(cache_manager)
 
         # Create a branch node to decide between fetching from cache or processing
@@ -1,12 +1,13 @@
 """GPTs memory."""
 
 import asyncio
+import dataclasses
 import json
 import logging
 from asyncio import Queue
 from collections import defaultdict
 from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt.vis.client import VisAgentMessages, VisAgentPlans, VisAppLink, vis_client
@@ -21,6 +22,36 @@ NONE_GOAL_PREFIX: str = "none_goal_count_"
 logger = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass
+class _MessageViewState:
+    """The rendered views of a conversation."""
+
+    # The key of the committed view: (message count, start round, vis enabled)
+    committed_key: Optional[Tuple[int, int, bool]] = None
+    committed_view: Union[str, List[Dict], None] = None
+    # The last view sent in incremental mode and its sequence number
+    seq: int = 0
+    last_view: Union[str, List[Dict], None] = None
+
+
+def _common_prefix_length(a: Sequence, b: Sequence) -> int:
+    """Return the length of the common prefix of two strings or lists.
+
+    The slices are compared in a binary search, a pure append is detected with one
+    comparison.
+    """
+    low, high = 0, min(len(a), len(b))
+    if a[:high] == b[:high]:
+        return high
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
 class GptsMemory:
     """GPTs memory."""
 
@@ -42,6 +73,8 @@ class GptsMemory:
         self.channels: defaultdict = defaultdict(Queue)
         self.enable_vis_map: defaultdict = defaultdict(bool)
         self.start_round_map: defaultdict = defaultdict(int)
+        self.incremental_map: defaultdict = defaultdict(bool)
+        self.view_states: Dict[str, _MessageViewState] = {}
 
     @property
     def plans_memory(self) -> GptsPlansMemory:
@@ -59,12 +92,20 @@ class GptsMemory:
         enable_vis_message: bool = True,
         history_messages: Optional[List[GptsMessage]] = None,
         start_round: int = 0,
+        incremental: bool = False,
     ):
-        """Gpt memory init."""
+        """Gpt memory init.
+
+        Args:
+            incremental (bool): Push the deltas of the message view instead of the
+                full view, see :meth:`push_message`.
+        """
         self.channels[conv_id] = asyncio.Queue()
         self.enable_vis_map[conv_id] = enable_vis_message
         self.messages_cache[conv_id] = history_messages if history_messages else []
         self.start_round_map[conv_id] = start_round
+        self.incremental_map[conv_id] = incremental
+        self.view_states[conv_id] = _MessageViewState()
 
     def enable_vis_message(self, conv_id):
         """Enable conversation message vis tag."""
@@ -92,26 +133,94 @@ class GptsMemory:
         start_round = self.start_round_map.pop(conv_id)  # noqa
         del start_round
 
+        self.incremental_map.pop(conv_id, None)
+        self.view_states.pop(conv_id, None)
+
     async def push_message(self, conv_id: str, temp_msg: Optional[str] = None):
-        """Push conversation message."""
+        """Push conversation message.
+
+        The view of the stored messages is rendered once per appended message, a
+        streamed token only renders the temporary message.
+
+        In incremental mode, the pushed item is a delta of the last pushed view:
+        ``{"seq": 2, "offset": 120, "content": "..."}``, the client keeps the first
+        ``offset`` characters (or items in the simple message mode) of its view and
+        appends ``content``. A reconnected client starts from :meth:`snapshot`.
+        """
         queue = self.queue(conv_id)
         enable_vis_tag = self.enable_vis_message(conv_id=conv_id)
         if enable_vis_tag:
             # 如果有临时消息内容需要push 拼接再最末尾，否则直接从短期记忆中发布最后消息
-            message_view = await self.app_link_chat_message(conv_id)
+            message_view = await self._committed_message_view(conv_id, True)
             if temp_msg:
                 temp_view = await self.agent_stream_message(temp_msg)
                 message_view = message_view + "\n" + temp_view
-            await queue.put(message_view)
-
         else:
             # 非VIS消息模式，直接推送简单消息列表即可，不做任何处理
-            message_views = await self.simple_message(conv_id)
+            message_view = list(await self._committed_message_view(conv_id, False))
             if temp_msg:
                 temp_view = await self.agent_stream_message(temp_msg, False)
                 if temp_view and len(temp_view) > 0:
-                    message_views.extend(temp_view)
-            await queue.put(message_views)
+                    message_view.extend(temp_view)
+
+        if self.incremental_map.get(conv_id):
+            delta = self._message_view_delta(conv_id, message_view)
+            if delta is not None:
+                await queue.put(delta)
+        else:
+            await queue.put(message_view)
+
+    async def snapshot(self, conv_id: str) -> Dict[str, Any]:
+        """Return the full message view and the sequence number of the last delta.
+
+        A reconnected client replaces its view with the content and applies the
+        deltas with a greater sequence number.
+        """
+        state = self.view_states.get(conv_id)
+        if state is not None and state.last_view is not None:
+            return {"seq": state.seq, "offset": 0, "content": state.last_view}
+        view = await self._committed_message_view(
+            conv_id, self.enable_vis_message(conv_id)
+        )
+        return {"seq": state.seq if state else 0, "offset": 0, "content": view}
+
+    async def _committed_message_view(
+        self, conv_id: str, enable_vis_message: bool
+    ) -> Union[str, List[Dict]]:
+        """Return the view of the stored messages, cached until a message is added.
+
+        The cached view is shared, don't modify it.
+        """
+        messages = self.messages_cache.get(conv_id)
+        state = self.view_states.get(conv_id)
+        if not messages or state is None:
+            # Loaded from the message memory, not cached
+            if enable_vis_message:
+                return await self.app_link_chat_message(conv_id)
+            return await self.simple_message(conv_id)
+        key = (len(messages), self.start_round_map.get(conv_id, 0), enable_vis_message)
+        if state.committed_key != key:
+            if enable_vis_message:
+                state.committed_view = await self.app_link_chat_message(conv_id)
+            else:
+                state.committed_view = await self.simple_message(conv_id)
+            state.committed_key = key
+        return state.committed_view  # type: ignore
+
+    def _message_view_delta(
+        self, conv_id: str, message_view: Union[str, List[Dict]]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the delta from the last pushed view, None if nothing changed."""
+        state = self.view_states.setdefault(conv_id, _MessageViewState())
+        last_view = state.last_view
+        offset = 0
+        if last_view is not None:
+            offset = _common_prefix_length(last_view, message_view)
+            if offset == len(last_view) == len(message_view):
+                return None
+        state.seq += 1
+        state.last_view = message_view
+        return {"seq": state.seq, "offset": offset, "content": message_view[offset:]}
 
     async def complete(self, conv_id: str):
         """Complete conversation message."""
@@ -0,0 +1,88 @@
+"""Tests for the incremental message streaming of GptsMemory."""
+
+from unittest.mock import patch
+
+import pytest
+
+from dbgpt.agent.core.memory.gpts.base import GptsMessage
+from dbgpt.agent.core.memory.gpts.gpts_memory import (
+    GptsMemory,
+    _common_prefix_length,
+)
+
+
+def _message(content: str, sender: str = "Assistant") -> GptsMessage:
+    return GptsMessage(
+        conv_id="conv1",
+        sender=sender,
+        receiver="Human",
+        role="assistant",
+        content=content,
+    )
+
+
+def _drain(memory: GptsMemory, conv_id: str):
+    queue = memory.queue(conv_id)
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def _apply(view, delta):
+    return view[: delta["offset"]] + delta["content"]
+
+
+def test_common_prefix_length():
+    assert _common_prefix_length("abc", "abcd") == 3
+    assert _common_prefix_length("abxd", "abcd") == 2
+    assert _common_prefix_length("", "abc") == 0
+    assert _common_prefix_length([1, 2, 3], [1, 2, 4]) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("enable_vis_message", [True, False])
+async def test_push_deltas(enable_vis_message):
+    memory = GptsMemory()
+    memory.init("conv1", enable_vis_message=enable_vis_message, incremental=True)
+    await memory.append_message("conv1", _message("hello"))
+    temp = {"sender": "Assistant", "receiver": "?", "model": "m", "markdown": ""}
+    for text in ["How", "How are", "How are you"]:
+        await memory.push_message("conv1", {**temp, "markdown": text})
+    # Nothing changed, nothing pushed
+    await memory.push_message("conv1", {**temp, "markdown": "How are you"})
+    await memory.append_message("conv1", _message("How are you"))
+
+    deltas = _drain(memory, "conv1")
+    assert [d["seq"] for d in deltas] == [1, 2, 3, 4, 5]
+    assert deltas[0]["offset"] == 0
+    view = deltas[0]["content"][:0]
+    for delta in deltas:
+        view = _apply(view, delta)
+    snapshot = await memory.snapshot("conv1")
+    assert snapshot["seq"] == 5
+    assert view == snapshot["content"]
+
+    memory.incremental_map["conv1"] = False
+    await memory.push_message("conv1")
+    assert _drain(memory, "conv1") == [view]
+
+
+@pytest.mark.asyncio
+async def test_committed_view_cached():
+    memory = GptsMemory()
+    memory.init("conv1", incremental=True)
+    await memory.append_message("conv1", _message("hello"))
+    temp = {"sender": "Assistant", "receiver": "?", "model": "m", "markdown": "a"}
+    with patch.object(
+        memory, "app_link_chat_message", wraps=memory.app_link_chat_message
+    ) as render:
+        # Rendered when the message was appended
+        for _ in range(5):
+            await memory.push_message("conv1", temp)
+        assert render.call_count == 0
+        await memory.append_message("conv1", _message("world"))
+        await memory.push_message("conv1", temp)
+        assert render.call_count == 1
+    memory.clear("conv1")
+    assert "conv1" not in memory.view_states
@@ -8,7 +8,7 @@ from typing import Dict, List, Optional, Tuple
 from dbgpt.core import Embeddings
 from dbgpt.util.annotations import immutable, mutable
 from dbgpt.util.executor_utils import blocking_func_to_async
-from dbgpt.util.similarity_util import cosine_similarity, sigmoid_function
+from dbgpt.util.similarity_util import EmbeddingMatrix, sigmoid_function
 
 from .base import (
     DiscardedMemoryFragments,
@@ -34,7 +34,7 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
         super().__init__(buffer_size=buffer_size)
         self._executor = executor
         self._embeddings = embeddings
-        self.short_embeddings: List[List[float]] = []
+        self.short_embeddings = EmbeddingMatrix(initial_capacity=buffer_size + 1)
         self.enhance_cnt: List[int] = [0 for _ in range(self._buffer_size)]
         self.enhance_memories: List[List[T]] = [[] for _ in range(self._buffer_size)]
         self.enhance_similarity_threshold = enhance_similarity_threshold
@@ -76,17 +76,14 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
         memory_fragment.update_embeddings(memory_fragment_embeddings)
 
         async with self._lock:
-            for idx, memory_embedding in enumerate(self.short_embeddings):
-                similarity = await blocking_func_to_async(
+            sigmoid_probs: List[float] = []
+            if len(self.short_embeddings) > 0:
+                sigmoid_probs = await blocking_func_to_async(
                     self._executor,
-                    cosine_similarity,
-                    memory_embedding,
+                    self._enhance_probabilities,
                     memory_fragment_embeddings,
                 )
-                # Sigmoid probability, transform similarity to [0, 1]
-                sigmoid_prob: float = await blocking_func_to_async(
-                    self._executor, sigmoid_function, similarity
-                )
+            for idx, sigmoid_prob in enumerate(sigmoid_probs):
                 if (
                     sigmoid_prob >= self.enhance_similarity_threshold
                     and random.random() < sigmoid_prob
@@ -100,6 +97,14 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
                 await self.handle_overflow(self._fragments)
             return discard_memories
 
+    def _enhance_probabilities(self, embeddings: List[float]) -> List[float]:
+        """Return the enhance probability of every short term memory.
+
+        The cosine similarities with all the stored embeddings are computed in one
+        batch, the sigmoid transforms them to [0, 1].
+        """
+        return sigmoid_function(self.short_embeddings.similarities(embeddings)).tolist()
+
     @mutable
     async def transfer_to_long_term(
         self, memory_fragment: T
@@ -141,7 +146,6 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
             # re-construct the indexes of short-term memories after removing summarized
             # memories
             new_memories: List[T] = []
-            new_embeddings: List[List[float]] = []
             new_enhance_memories: List[List[T]] = [[] for _ in range(self._buffer_size)]
             new_enhance_cnt: List[int] = [0 for _ in range(self._buffer_size)]
             for idx, memory in enumerate(self.short_term_memories):
@@ -150,9 +154,10 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
                     new_enhance_memories[len(new_memories)] = self.enhance_memories[idx]
                     new_enhance_cnt[len(new_memories)] = self.enhance_cnt[idx]
                     new_memories.append(memory)
-                    new_embeddings.append(self.short_embeddings[idx])
             self._fragments = new_memories
-            self.short_embeddings = new_embeddings
+            self.short_embeddings.delete(
+                [idx for idx, existing in enumerate(existing_memory) if not existing]
+            )
             self.enhance_memories = new_enhance_memories
             self.enhance_cnt = new_enhance_cnt
         return DiscardedMemoryFragments(enhance_memories, enhance_insights)
@@ -190,7 +195,7 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
             discarded_memory = self._fragments.pop(pop_id)
             discarded_memories.append(discarded_memory)
             # Remove the corresponding embedding vector
-            self.short_embeddings.pop(pop_id)
+            self.short_embeddings.delete(pop_id)
 
             # Reorganize enhance count and enhance memories
             new_enhance_memories = [[] for _ in range(self._buffer_size)]
@@ -0,0 +1,34 @@
+"""Tests for the enhanced short term memory."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from dbgpt.agent.core.memory.agent_memory import AgentMemoryFragment
+from dbgpt.agent.core.memory.short_term import EnhancedShortTermMemory
+
+
+class _FakeEmbeddings:
+    def embed_documents(self, texts):
+        return [[1.0, float(len(t) % 3)] for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+@pytest.mark.asyncio
+async def test_write_enhances_similar_memories():
+    memory = EnhancedShortTermMemory(
+        _FakeEmbeddings(),
+        ThreadPoolExecutor(max_workers=1),
+        buffer_size=3,
+        enhance_similarity_threshold=0.5,
+        enhance_threshold=100,
+    )
+    with patch("random.random", return_value=0.0):
+        for text in ["a", "bb", "ccc", "dddd", "eeeee"]:
+            await memory.write(AgentMemoryFragment(text, importance=0.5))
+    assert len(memory.short_term_memories) == len(memory.short_embeddings) == 3
+    # Every memory is enhanced by the memories written after it
+    assert memory.enhance_cnt[:3] == [2, 1, 0]
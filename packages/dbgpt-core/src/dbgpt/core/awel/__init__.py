@@ -35,6 +35,7 @@ from .runner.local_runner import DefaultWorkflowRunner
 from .task.base import (
     InputContext,
     InputSource,
+    StreamTeePolicy,
     TaskContext,
     TaskOutput,
     TaskState,
@@ -86,6 +87,7 @@ __all__ = [
     "BranchTaskType",
     "WorkflowRunner",
     "TaskState",
+    "StreamTeePolicy",
     "is_empty_data",
     "TaskOutput",
     "TaskContext",
@@ -5,6 +5,7 @@ DAG is the core component of AWEL, it is used to define the relationship between
 
 import asyncio
 import contextvars
+import copy
 import dataclasses
 import logging
 import threading
@@ -686,10 +687,26 @@ class DAGContext:
         When the task is running, the current task context
         will be set to the task context.
 
-        TODO: We should support parallel task running in the future.
+        If tasks run in parallel, every task should use its own context created by
+        :meth:`_fork`, otherwise they will overwrite the current task context of
+        each other.
         """
         self._curr_task_ctx = _curr_task_ctx
 
+    def _fork(self) -> "DAGContext":
+        """Create a new DAGContext which shares the state of current DAGContext.
+
+        The new context shares the task outputs, share data and variables with
+        current context, but has its own current task context. It is used to run
+        the nodes of the same DAG concurrently.
+
+        Returns:
+            DAGContext: The forked DAGContext
+        """
+        forked = copy.copy(self)
+        forked._curr_task_ctx = None
+        return forked
+
     def get_task_output(self, task_name: str) -> TaskOutput:
         """Get the task output by task name.
 
@@ -798,8 +815,23 @@ class DAG:
         tags: Optional[Dict[str, str]] = None,
         description: Optional[str] = None,
         default_dag_variables: Optional[DAGVariables] = None,
+        concurrent: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
     ) -> None:
-        """Initialize a DAG."""
+        """Initialize a DAG.
+
+        Args:
+            concurrent (Optional[bool], optional): Whether the runner runs the
+                independent nodes of this DAG concurrently. Defaults to None, use
+                the setting of the runner, True if `max_concurrency` is set.
+            max_concurrency (Optional[int], optional): The max number of nodes of
+                this DAG can run at the same time in one run. Defaults to None, use
+                the setting of the runner.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be greater than 0, got {max_concurrency}"
+            )
         self._dag_id = dag_id
         self._tags: Dict[str, str] = tags or {}
         self._description = description
@@ -812,6 +844,8 @@ class DAG:
         self._lock = asyncio.Lock()
         self._event_loop_task_id_to_ctx: Dict[int, DAGContext] = {}
         self._default_dag_variables = default_dag_variables
+        self._concurrent = concurrent
+        self._max_concurrency = max_concurrency
 
     def _append_node(self, node: DAGNode) -> None:
         if node.node_id in self.node_map:
@@ -848,6 +882,21 @@ class DAG:
         """Return the description of current DAG."""
         return self._description
 
+    @property
+    def concurrent(self) -> Optional[bool]:
+        """Return whether the nodes of current DAG run concurrently.
+
+        None means the setting of the runner is used.
+        """
+        if self._concurrent is None and self._max_concurrency is not None:
+            return True
+        return self._concurrent
+
+    @property
+    def max_concurrency(self) -> Optional[int]:
+        """Return the max number of nodes of current DAG run at the same time."""
+        return self._max_concurrency
+
     @property
     def dev_mode(self) -> bool:
         """Whether the current DAG is in dev mode.
@@ -39,6 +39,7 @@ class JobManager(DAGLifecycle):
         self._end_node = end_node
         self._id2node_data = id2call_data
         self._node_name_to_ids = node_name_to_ids
+        self._node_ids = {node.node_id for node in all_nodes}
 
     @staticmethod
     def build_from_end_node(
@@ -72,6 +73,18 @@ class JobManager(DAGLifecycle):
         """
         return self._id2node_data.get(node_id)
 
+    def get_downstream_in_job(self, node: BaseOperator) -> List[BaseOperator]:
+        """Get the downstream nodes of the node which will run in current job.
+
+        Args:
+            node (BaseOperator): The node.
+        """
+        return [
+            cast(BaseOperator, child)
+            for child in node.downstream
+            if cast(BaseOperator, child).node_id in self._node_ids
+        ]
+
     async def before_dag_run(self):
         """Execute the callback before DAG run."""
         tasks = []
@@ -4,28 +4,121 @@ This runner will run the workflow in the current process.
 """
 
 import asyncio
+import contextlib
 import logging
 import traceback
-from typing import Any, Dict, List, Optional, Set, cast
+from typing import Any, AsyncContextManager, Dict, List, Optional, Set, Tuple, cast
 
 from dbgpt.component import SystemApp
 from dbgpt.util.tracer import root_tracer
 
 from ..dag.base import DAGContext, DAGVar, DAGVariables
 from ..operators.base import CALL_DATA, BaseOperator, WorkflowRunner
-from ..operators.common_operator import BranchOperator
-from ..task.base import SKIP_DATA, TaskContext, TaskState
-from ..task.task_impl import DefaultInputContext, DefaultTaskContext, SimpleTaskOutput
+from ..operators.common_operator import BranchOperator, ReduceStreamOperator
+from ..operators.stream_operator import UnstreamifyAbsOperator
+from ..task.base import SKIP_DATA, StreamTeePolicy, TaskContext, TaskState
+from ..task.task_impl import (
+    DefaultInputContext,
+    DefaultTaskContext,
+    SimpleStreamTaskOutput,
+    SimpleTaskOutput,
+)
 from .job_manager import JobManager
 
 logger = logging.getLogger(__name__)
 
 
+class _NodeScheduler:
+    """Schedule the nodes of one DAG run as asyncio tasks.
+
+    Every node is scheduled at most once, the downstream nodes which share the same
+    upstream node wait for the same task.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        )
+
+    def schedule(self, node_id: str, coro_factory) -> asyncio.Task:
+        """Get the task of the node, create it if not exists."""
+        task = self._tasks.get(node_id)
+        if task is None:
+            task = asyncio.create_task(coro_factory())
+            self._tasks[node_id] = task
+        return task
+
+    @property
+    def limited(self) -> bool:
+        """Whether the number of running nodes is limited."""
+        return self._semaphore is not None
+
+    def slot(self) -> AsyncContextManager:
+        """Return a context manager to limit the running nodes."""
+        if self._semaphore is None:
+            return contextlib.nullcontext()
+        return self._semaphore
+
+    async def cancel_pending(self):
+        """Cancel the tasks which are not finished and wait for them."""
+        pending = [task for task in self._tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
 class DefaultWorkflowRunner(WorkflowRunner):
     """The default workflow runner."""
 
-    def __init__(self):
-        """Init the default workflow runner."""
+    def __init__(
+        self,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        stream_tee_policy: Optional[StreamTeePolicy] = None,
+        stream_buffer_size: int = 64,
+    ):
+        """Init the default workflow runner.
+
+        Args:
+            concurrent (bool, optional): Whether to run the independent upstream
+                nodes concurrently. Defaults to False, all nodes run one by one.
+            max_concurrency (Optional[int], optional): The max number of nodes can
+                run at the same time in one DAG run, just work when `concurrent` is
+                True. Defaults to None, no limit.
+                The `concurrent` and `max_concurrency` of a DAG override both.
+            stream_tee_policy (Optional[StreamTeePolicy], optional): If set, the
+                stream output of a node with multiple downstream nodes will be split,
+                every downstream node reads the whole stream with its own cursor.
+                The policy decides what to do with a slow downstream node. Defaults
+                to None, all downstream nodes share the same stream.
+                `StreamTeePolicy.BLOCK` needs all the downstream nodes to read at the
+                same time, so it requires `concurrent` without `max_concurrency`,
+                and a stream is only blocked when all its downstream nodes reduce it,
+                other streams, and the streams of a DAG which runs its nodes one by
+                one or limits them, are split with `StreamTeePolicy.SPILL` instead.
+            stream_buffer_size (int, optional): The max number of items buffered
+                for the slowest downstream node of a split stream. Defaults to 64.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be greater than 0, got {max_concurrency}"
+            )
+        if stream_tee_policy == StreamTeePolicy.BLOCK and (
+            not concurrent or max_concurrency is not None
+        ):
+            # The downstream nodes run one by one, the first one fills the buffer of
+            # the others and waits for them forever
+            raise ValueError(
+                "StreamTeePolicy.BLOCK requires concurrent=True and no "
+                "max_concurrency, use StreamTeePolicy.SPILL or StreamTeePolicy.DROP "
+                "with the sequential runner"
+            )
+        self._concurrent = concurrent
+        self._max_concurrency = max_concurrency
+        self._stream_tee_policy = stream_tee_policy
+        self._stream_buffer_size = stream_buffer_size
         self._running_dag_ctx: Dict[str, DAGContext] = {}
         self._task_log_index_map: Dict[str, int] = {}
         self._lock = asyncio.Lock()
@@ -95,6 +188,12 @@ class DefaultWorkflowRunner(WorkflowRunner):
         logger.debug(f"Node id {node.node_id}, call_data: {call_data}")
         skip_node_ids: Set[str] = set()
         system_app: Optional[SystemApp] = DAGVar.get_current_system_app()
+        concurrent, max_concurrency = self._concurrency_of(node)
+        scheduler: Optional[_NodeScheduler] = (
+            _NodeScheduler(max_concurrency) if concurrent else None
+        )
+        # The split stream outputs which are not taken by the downstream nodes
+        stream_outputs: Dict[str, List[TaskContext]] = {}
 
         if node.dag:
             # Save dag context
@@ -107,13 +206,25 @@ class DefaultWorkflowRunner(WorkflowRunner):
                 "exist_dag_ctx": exist_dag_ctx is not None,
                 "event_loop_task_id": event_loop_task_id,
                 "streaming_call": streaming_call,
+                "concurrent": concurrent,
                 "awel_node_id": node.node_id,
                 "awel_node_name": node.node_name,
             },
         ):
-            await self._execute_node(
-                job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
-            )
+            try:
+                await self._execute_node(
+                    job_manager,
+                    node,
+                    dag_ctx,
+                    node_outputs,
+                    skip_node_ids,
+                    system_app,
+                    scheduler,
+                    stream_outputs,
+                )
+            finally:
+                if scheduler:
+                    await scheduler.cancel_pending()
         if not streaming_call and node.dag and exist_dag_ctx is None:
             # streaming call not work for dag end
             # if exist_dag_ctx is not None, it means current dag is a sub dag
@@ -122,6 +233,20 @@ class DefaultWorkflowRunner(WorkflowRunner):
         #     del self._running_dag_ctx[node.dag.dag_id]
         return dag_ctx
 
+    def _concurrency_of(self, node: BaseOperator) -> Tuple[bool, Optional[int]]:
+        """Return whether to run the nodes concurrently and the max concurrency.
+
+        The settings of the DAG of the end node override the runner's.
+        """
+        concurrent, max_concurrency = self._concurrent, self._max_concurrency
+        dag = node.dag
+        if dag:
+            if dag.concurrent is not None:
+                concurrent = dag.concurrent
+            if dag.max_concurrency is not None:
+                max_concurrency = dag.max_concurrency
+        return concurrent, max_concurrency
+
     async def _execute_node(
         self,
         job_manager: JobManager,
@@ -130,16 +255,35 @@ class DefaultWorkflowRunner(WorkflowRunner):
         node_outputs: Dict[str, TaskContext],
         skip_node_ids: Set[str],
         system_app: Optional[SystemApp],
+        scheduler: Optional[_NodeScheduler] = None,
+        stream_outputs: Optional[Dict[str, List[TaskContext]]] = None,
     ):
         # Skip run node
         if node.node_id in node_outputs:
             return
 
         # Run all upstream nodes
-        # TODO: run in parallel, there are some code to be changed:
-        #  dag_ctx.set_current_task_context(task_ctx)
-        for upstream_node in node.upstream:
-            if isinstance(upstream_node, BaseOperator):
+        upstream_nodes = [n for n in node.upstream if isinstance(n, BaseOperator)]
+        if scheduler:
+            # Every upstream node runs in its own task with a forked DAG context,
+            # the skip state of current node is checked after all of them done.
+            await asyncio.gather(
+                *[
+                    self._schedule_node(
+                        scheduler,
+                        job_manager,
+                        upstream_node,
+                        dag_ctx,
+                        node_outputs,
+                        skip_node_ids,
+                        system_app,
+                        stream_outputs,
+                    )
+                    for upstream_node in upstream_nodes
+                ]
+            )
+        else:
+            for upstream_node in upstream_nodes:
                 await self._execute_node(
                     job_manager,
                     upstream_node,
@@ -147,10 +291,12 @@ class DefaultWorkflowRunner(WorkflowRunner):
                     node_outputs,
                     skip_node_ids,
                     system_app,
+                    stream_outputs=stream_outputs,
                 )
 
         inputs = [
-            node_outputs[upstream_node.node_id] for upstream_node in node.upstream
+            _take_upstream_output(upstream_node.node_id, node_outputs, stream_outputs)
+            for upstream_node in node.upstream
         ]
         input_ctx = DefaultInputContext(inputs)
         # Log task, get log index(plus 1 every time)
@@ -170,6 +316,10 @@ class DefaultWorkflowRunner(WorkflowRunner):
             task_ctx.set_current_state(TaskState.SKIP)
             task_ctx.set_task_output(SimpleTaskOutput(SKIP_DATA))
             node_outputs[node.node_id] = task_ctx
+            # Release the split streams, the other downstream nodes not wait for it
+            for i, upstream_node in enumerate(node.upstream):
+                if inputs[i] is not node_outputs.get(upstream_node.node_id):
+                    await _close_stream(inputs[i])
             return
         try:
             logger.debug(
@@ -189,9 +339,18 @@ class DefaultWorkflowRunner(WorkflowRunner):
             with root_tracer.start_span(
                 "dbgpt.awel.workflow.run_operator", metadata=run_metadata
             ) as span:
-                await node._run(dag_ctx, task_ctx.log_id)
+                async with scheduler.slot() if scheduler else contextlib.nullcontext():
+                    await node._run(dag_ctx, task_ctx.log_id)
                 node_outputs[node.node_id] = dag_ctx.current_task_context
                 task_ctx.set_current_state(TaskState.SUCCESS)
+                if stream_outputs is not None:
+                    self._split_stream_output(
+                        job_manager,
+                        node,
+                        dag_ctx.current_task_context,
+                        stream_outputs,
+                        scheduler,
+                    )
 
                 run_metadata["skip_node_ids"] = ",".join(skip_node_ids)
                 run_metadata["state"] = TaskState.SUCCESS.value
@@ -211,6 +370,97 @@ class DefaultWorkflowRunner(WorkflowRunner):
             task_ctx.set_current_state(TaskState.FAILED)
             raise e
 
+    def _split_stream_output(
+        self,
+        job_manager: JobManager,
+        node: BaseOperator,
+        task_ctx: TaskContext,
+        stream_outputs: Dict[str, List[TaskContext]],
+        scheduler: Optional[_NodeScheduler] = None,
+    ):
+        if not self._stream_tee_policy:
+            return
+        task_output = task_ctx.task_output
+        if not task_output.is_stream or task_output.is_empty:
+            return
+        downstream_nodes = job_manager.get_downstream_in_job(node)
+        num_downstream = len(downstream_nodes)
+        if num_downstream < 2:
+            return
+        policy = self._stream_tee_policy
+        if policy == StreamTeePolicy.BLOCK and (
+            not scheduler
+            or scheduler.limited
+            or not all(
+                isinstance(child, (ReduceStreamOperator, UnstreamifyAbsOperator))
+                for child in downstream_nodes
+            )
+        ):
+            # Only the nodes which reduce the stream read it as soon as they run,
+            # other nodes may read it after another copy of it is reduced, e.g. a
+            # node which joins the reduced value and the stream, then the buffer of
+            # its copy fills up and both wait forever. The DAG may also run its
+            # nodes one by one or limit the running nodes.
+            policy = StreamTeePolicy.SPILL
+        logger.debug(
+            f"Split stream output of node {node.node_id} to {num_downstream} "
+            f"downstream nodes, policy: {policy}"
+        )
+        split_outputs = SimpleStreamTaskOutput(task_output.output_stream).tee(
+            num_downstream,
+            buffer_size=self._stream_buffer_size,
+            policy=policy,
+        )
+        split_ctxs = []
+        for split_output in split_outputs:
+            split_ctx = task_ctx.new_ctx()
+            split_ctx.set_task_output(split_output)
+            split_ctxs.append(split_ctx)
+        stream_outputs[node.node_id] = split_ctxs
+
+    def _schedule_node(
+        self,
+        scheduler: _NodeScheduler,
+        job_manager: JobManager,
+        node: BaseOperator,
+        dag_ctx: DAGContext,
+        node_outputs: Dict[str, TaskContext],
+        skip_node_ids: Set[str],
+        system_app: Optional[SystemApp],
+        stream_outputs: Optional[Dict[str, List[TaskContext]]] = None,
+    ) -> asyncio.Task:
+        return scheduler.schedule(
+            node.node_id,
+            lambda: self._execute_node(
+                job_manager,
+                node,
+                dag_ctx._fork(),
+                node_outputs,
+                skip_node_ids,
+                system_app,
+                scheduler,
+                stream_outputs,
+            ),
+        )
+
+
+def _take_upstream_output(
+    node_id: str,
+    node_outputs: Dict[str, TaskContext],
+    stream_outputs: Optional[Dict[str, List[TaskContext]]],
+) -> TaskContext:
+    """Take the output of the upstream node, every split stream is taken once."""
+    split_ctxs = stream_outputs.get(node_id) if stream_outputs else None
+    if split_ctxs:
+        return split_ctxs.pop()
+    return node_outputs[node_id]
+
+
+async def _close_stream(task_ctx: TaskContext):
+    output_stream = task_ctx.task_output.output_stream
+    if hasattr(output_stream, "aclose"):
+        await output_stream.aclose()
+
 
 def _skip_current_downstream_by_node_name(
     branch_node: BranchOperator, skip_nodes: List[str], skip_node_ids: Set[str]
@@ -84,6 +84,18 @@ class TaskState(str, Enum):
     FAILED = "failed"  # State indicating the task failed during execution
 
 
+class StreamTeePolicy(str, Enum):
+    """The policy of a stream fan-out when a consumer is too slow.
+
+    A consumer is too slow when the buffered items it has not read reach the
+    buffer size of the fan-out.
+    """
+
+    BLOCK = "block"  # The fast consumers wait for the slow consumer
+    DROP = "drop"  # The slow consumer loses the oldest items it has not read
+    SPILL = "spill"  # The items not read by the slow consumer are written to disk
+
+
 class TaskOutput(ABC, Generic[T]):
     """Abstract base class representing the output of a task.
 
@@ -5,16 +5,22 @@ This implementation can run workflow in local machine.
 
 import asyncio
 import logging
+import pickle
+import tempfile
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import (
+    IO,
     Any,
     AsyncIterator,
     Callable,
     Coroutine,
+    Deque,
     Dict,
     Generic,
     List,
     Optional,
+    Set,
     Tuple,
     Union,
     cast,
@@ -31,6 +37,7 @@ from .base import (
     PredicateFunc,
     ReduceFunc,
     StreamFunc,
+    StreamTeePolicy,
     T,
     TaskContext,
     TaskOutput,
@@ -58,6 +65,215 @@ async def _reduce_stream(stream: AsyncIterator, reduce_function) -> Any:
     return accumulator
 
 
+class _StreamBroadcaster(Generic[T]):
+    """Broadcast one async stream to multiple consumers.
+
+    The items are pulled from the source stream on demand and kept in one shared
+    buffer, every consumer has its own cursor on the buffer. An item is released
+    once all the consumers have read it, so the items are never copied.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterator[T],
+        num_consumers: int,
+        buffer_size: int = 64,
+        policy: StreamTeePolicy = StreamTeePolicy.BLOCK,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        if num_consumers < 1:
+            raise ValueError(f"num_consumers must be positive, got {num_consumers}")
+        if buffer_size < 1:
+            raise ValueError(f"buffer_size must be positive, got {buffer_size}")
+        self._source = source
+        self._buffer_size = buffer_size
+        self._policy = StreamTeePolicy(policy)
+        self._spill_dir = spill_dir
+        self._buffer: Deque[T] = deque()
+        # The index of the first item in the buffer
+        self._start = 0
+        self._cursors: List[int] = [0] * num_consumers
+        self._active: Set[int] = set(range(num_consumers))
+        self._dropped: List[int] = [0] * num_consumers
+        self._spill_file: Optional[IO[bytes]] = None
+        # The item index to the (offset, length) in the spill file
+        self._spilled: Dict[int, Tuple[int, int]] = {}
+        self._pulling = False
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._cond = asyncio.Condition()
+
+    @property
+    def _end(self) -> int:
+        return self._start + len(self._buffer)
+
+    def consumers(self) -> List["_BroadcastStream[T]"]:
+        """Return the streams of all consumers."""
+        return [_BroadcastStream(self, i) for i in range(len(self._cursors))]
+
+    def dropped(self, consumer_id: int) -> int:
+        """Return the number of items dropped for the consumer."""
+        return self._dropped[consumer_id]
+
+    async def _next(self, consumer_id: int) -> T:
+        while True:
+            async with self._cond:
+                while True:
+                    pos = self._cursors[consumer_id]
+                    if pos < self._start:
+                        if pos in self._spilled:
+                            self._cursors[consumer_id] = pos + 1
+                            return self._read_spilled(pos)
+                        # The items have been dropped, skip to the oldest one
+                        self._dropped[consumer_id] += self._start - pos
+                        self._cursors[consumer_id] = self._start
+                        continue
+                    if pos < self._end:
+                        item = self._buffer[pos - self._start]
+                        self._cursors[consumer_id] = pos + 1
+                        self._release_read_items()
+                        self._cond.notify_all()
+                        return item
+                    if self._done:
+                        if self._error is not None:
+                            raise self._error
+                        raise StopAsyncIteration
+                    if self._pulling or self._is_full():
+                        await self._cond.wait()
+                        continue
+                    self._pulling = True
+                    break
+            # Pull the next item without holding the lock, so the other consumers
+            # can read the buffered items at the same time.
+            try:
+                item = await self._source.__anext__()
+            except StopAsyncIteration:
+                await self._finish(None)
+            except asyncio.CancelledError:
+                async with self._cond:
+                    self._pulling = False
+                    self._cond.notify_all()
+                raise
+            except Exception as e:
+                await self._finish(e)
+            else:
+                async with self._cond:
+                    self._pulling = False
+                    self._append(item)
+                    self._cond.notify_all()
+
+    async def _finish(self, error: Optional[BaseException]) -> None:
+        async with self._cond:
+            self._pulling = False
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    def _min_cursor(self) -> int:
+        if not self._active:
+            return self._end
+        return min(self._cursors[i] for i in self._active)
+
+    def _is_full(self) -> bool:
+        if self._policy != StreamTeePolicy.BLOCK:
+            return False
+        return self._end - self._min_cursor() >= self._buffer_size
+
+    def _append(self, item: T) -> None:
+        self._buffer.append(item)
+        while len(self._buffer) > self._buffer_size:
+            # Only happens with DROP and SPILL policy
+            oldest = self._buffer.popleft()
+            if self._policy == StreamTeePolicy.SPILL:
+                self._spill(self._start, oldest)
+            self._start += 1
+
+    def _release_read_items(self) -> None:
+        min_cursor = self._min_cursor()
+        while self._buffer and self._start < min_cursor:
+            self._buffer.popleft()
+            self._start += 1
+        if self._spilled:
+            for index in [i for i in self._spilled if i < min_cursor]:
+                del self._spilled[index]
+
+    def _spill(self, index: int, item: T) -> None:
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(dir=self._spill_dir)
+        data = pickle.dumps(item)
+        offset = self._spill_file.seek(0, 2)
+        self._spill_file.write(data)
+        self._spilled[index] = (offset, len(data))
+
+    def _read_spilled(self, index: int) -> T:
+        offset, length = self._spilled[index]
+        spill_file = cast(IO[bytes], self._spill_file)
+        spill_file.seek(offset)
+        item = pickle.loads(spill_file.read(length))
+        self._release_read_items()
+        return item
+
+    async def _release(self, consumer_id: int) -> None:
+        async with self._cond:
+            self._active.discard(consumer_id)
+            self._release_read_items()
+            self._cond.notify_all()
+            if self._active:
+                return
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+                self._spilled.clear()
+        if not self._done and hasattr(self._source, "aclose"):
+            # No consumer anymore, close the source stream
+            await self._source.aclose()
+
+
+class _BroadcastStream(Generic[T]):
+    """The stream of one consumer of a :class:`_StreamBroadcaster`.
+
+    The consumer should be closed if it will not be read to the end, otherwise the
+    other consumers may wait for it forever with StreamTeePolicy.BLOCK.
+    """
+
+    def __init__(self, broadcaster: _StreamBroadcaster[T], consumer_id: int):
+        self._broadcaster = broadcaster
+        self._consumer_id = consumer_id
+        self._closed = False
+
+    @property
+    def dropped(self) -> int:
+        """Return the number of items this consumer lost."""
+        return self._broadcaster.dropped(self._consumer_id)
+
+    def __aiter__(self) -> "_BroadcastStream[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            return await self._broadcaster._next(self._consumer_id)
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self) -> None:
+        """Close current consumer."""
+        if not self._closed:
+            self._closed = True
+            await self._broadcaster._release(self._consumer_id)
+
+    def __del__(self):
+        if self._closed:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(self.aclose())
+
+
 class SimpleTaskOutput(TaskOutput[T], Generic[T]):
     """The default implementation of TaskOutput.
 
@@ -223,6 +439,64 @@ class SimpleStreamTaskOutput(TaskOutput[T], Generic[T]):
 
         return SimpleStreamTaskOutput(new_iter())
 
+    def tee(
+        self,
+        n: int = 2,
+        buffer_size: int = 64,
+        policy: StreamTeePolicy = StreamTeePolicy.BLOCK,
+        spill_dir: Optional[str] = None,
+    ) -> List["SimpleStreamTaskOutput[T]"]:
+        """Split the output stream to multiple independent stream outputs.
+
+        All the new outputs read the same items from current output stream, every
+        one of them has its own cursor. Current output should not be consumed
+        after calling this method.
+
+        Args:
+            n (int, optional): The number of new outputs. Defaults to 2.
+            buffer_size (int, optional): The max number of items buffered for the
+                slowest output. Defaults to 64.
+            policy (StreamTeePolicy, optional): What to do when an output is too
+                slow. Defaults to StreamTeePolicy.BLOCK.
+            spill_dir (Optional[str], optional): The directory of the spill file,
+                just work with StreamTeePolicy.SPILL. Defaults to None, use the
+                default temporary directory.
+
+        Returns:
+            List[SimpleStreamTaskOutput[T]]: The new outputs.
+
+        Examples:
+            .. code-block:: python
+
+                import asyncio
+                from dbgpt.core.awel import SimpleStreamTaskOutput
+
+
+                async def gen():
+                    for i in range(3):
+                        yield i
+
+
+                async def collect(output):
+                    return [i async for i in output.output_stream]
+
+
+                async def main():
+                    out1, out2 = SimpleStreamTaskOutput(gen()).tee(2)
+                    return await asyncio.gather(collect(out1), collect(out2))
+
+
+                assert asyncio.run(main()) == [[0, 1, 2], [0, 1, 2]]
+        """
+        broadcaster = _StreamBroadcaster(
+            self.output_stream,
+            n,
+            buffer_size=buffer_size,
+            policy=policy,
+            spill_dir=spill_dir,
+        )
+        return [SimpleStreamTaskOutput(stream) for stream in broadcaster.consumers()]
+
     async def reduce(self, reduce_func: ReduceFunc) -> TaskOutput[OUT]:
         """Apply a reduce function to the task's output."""
         out = await _reduce_stream(self.output_stream, reduce_func)
@@ -20,6 +20,14 @@ def runner():
     return DefaultWorkflowRunner()
 
 
+@pytest.fixture
+def concurrent_runner(request):
+    param = getattr(request, "param", {})
+    return DefaultWorkflowRunner(
+        concurrent=True, max_concurrency=param.get("max_concurrency")
+    )
+
+
 def _create_stream(num_nodes) -> List[AsyncIterator[int]]:
     iters = []
     for _ in range(num_nodes):
@@ -1,3 +1,4 @@
+import asyncio
 from typing import List
 
 import pytest
@@ -6,6 +7,7 @@ from .. import (
     DAG,
     BranchOperator,
     DAGContext,
+    DefaultWorkflowRunner,
     InputOperator,
     JoinOperator,
     MapOperator,
@@ -102,6 +104,49 @@ async def test_join_node(runner: WorkflowRunner, input_nodes: List[InputOperator
         assert res.current_task_context.task_output.output == 3
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "runner_concurrent, dag_kwargs, expect_max_running",
+    [
+        (False, {"concurrent": True}, 3),
+        (False, {"max_concurrency": 2}, 2),
+        (True, {"concurrent": False}, 1),
+    ],
+)
+async def test_dag_concurrency(
+    runner_concurrent: bool, dag_kwargs, expect_max_running: int
+):
+    running = 0
+    max_running = 0
+
+    async def count_running(x: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return x
+
+    def join_func(p1, p2, p3) -> int:
+        return p1 + p2 + p3
+
+    # The settings of the DAG override the runner's
+    runner = DefaultWorkflowRunner(concurrent=runner_concurrent)
+    with DAG("test_dag_concurrency", **dag_kwargs) as _dag:
+        input_node = InputOperator(SimpleInputSource(1))
+        join_node = JoinOperator(join_func)
+        for i in range(3):
+            input_node >> MapOperator(count_running) >> join_node
+        res: DAGContext[int] = await runner.execute_workflow(join_node)
+        assert res.current_task_context.task_output.output == 3
+        assert max_running == expect_max_running
+
+
+def test_dag_invalid_max_concurrency():
+    with pytest.raises(ValueError, match="max_concurrency"):
+        DAG("test_dag_invalid_max_concurrency", max_concurrency=0)
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "input_node, is_odd",
@@ -184,3 +229,133 @@ async def test_branch_node_shared_join_default_can_skip(
         assert res.current_task_context.current_state == TaskState.SUCCESS
         expect_res = 999 if is_odd else 888
         assert res.current_task_context.task_output.output == expect_res
+
+
+@pytest.mark.asyncio
+async def test_concurrent_upstream_nodes(concurrent_runner: WorkflowRunner):
+    started = []
+    all_started = asyncio.Event()
+
+    async def wait_for_siblings(x: int) -> int:
+        started.append(x)
+        if len(started) == 3:
+            all_started.set()
+        # Deadlock if the upstream nodes are run one by one
+        await asyncio.wait_for(all_started.wait(), timeout=5)
+        return x
+
+    def join_func(p1, p2, p3) -> int:
+        return p1 + p2 + p3
+
+    with DAG("test_concurrent_upstream_nodes") as _dag:
+        input_node = InputOperator(SimpleInputSource(1))
+        join_node = JoinOperator(join_func)
+        for i in range(3):
+            input_node >> MapOperator(wait_for_siblings) >> join_node
+        res: DAGContext[int] = await concurrent_runner.execute_workflow(join_node)
+        assert res.current_task_context.current_state == TaskState.SUCCESS
+        assert res.current_task_context.task_output.output == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "concurrent_runner", [{"max_concurrency": 1}], indirect=["concurrent_runner"]
+)
+async def test_concurrent_max_concurrency(concurrent_runner: WorkflowRunner):
+    running = 0
+    max_running = 0
+    input_calls = 0
+
+    async def count_running(x: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return x
+
+    def count_input(x: int) -> int:
+        nonlocal input_calls
+        input_calls += 1
+        return x
+
+    def join_func(p1, p2, p3) -> int:
+        return p1 + p2 + p3
+
+    with DAG("test_concurrent_max_concurrency") as _dag:
+        input_node = InputOperator(SimpleInputSource(2))
+        shared_node = MapOperator(count_input)
+        join_node = JoinOperator(join_func)
+        input_node >> shared_node
+        for i in range(3):
+            shared_node >> MapOperator(count_running) >> join_node
+        res: DAGContext[int] = await concurrent_runner.execute_workflow(join_node)
+        assert res.current_task_context.task_output.output == 6
+        assert max_running == 1
+        # The shared upstream node just run once
+        assert input_calls == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "input_node, is_odd",
+    [
+        ({"outputs": [0]}, False),
+        ({"outputs": [1]}, True),
+    ],
+    indirect=["input_node"],
+)
+async def test_concurrent_branch_node(
+    concurrent_runner: WorkflowRunner, input_node: InputOperator, is_odd: bool
+):
+    def join_func(o1, o2) -> int:
+        return o1 or o2
+
+    with DAG("test_concurrent_branch_node") as _dag:
+        odd_node = MapOperator(
+            lambda x: 999, task_id="odd_node3", task_name="odd_node_name3"
+        )
+        even_node = MapOperator(
+            lambda x: 888, task_id="even_node3", task_name="even_node_name3"
+        )
+        join_node = JoinOperator(join_func)
+        branch_node = BranchOperator(
+            {lambda x: x % 2 == 1: odd_node, lambda x: x % 2 == 0: even_node}
+        )
+        branch_node >> odd_node >> join_node
+        branch_node >> even_node >> join_node
+
+        input_node >> branch_node
+
+        res: DAGContext[int] = await concurrent_runner.execute_workflow(join_node)
+        assert res.current_task_context.current_state == TaskState.SUCCESS
+        expect_res = 999 if is_odd else 888
+        assert res.current_task_context.task_output.output == expect_res
+        skipped_node = even_node if is_odd else odd_node
+        assert res._task_outputs[skipped_node.node_id].current_state == TaskState.SKIP
+
+
+@pytest.mark.asyncio
+async def test_concurrent_upstream_error(concurrent_runner: WorkflowRunner):
+    cancelled = False
+
+    async def slow(x: int) -> int:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return x
+
+    def fail(x: int) -> int:
+        raise ValueError("upstream error")
+
+    with DAG("test_concurrent_upstream_error") as _dag:
+        input_node = InputOperator(SimpleInputSource(1))
+        join_node = JoinOperator(lambda p1, p2: p1 + p2)
+        input_node >> MapOperator(slow) >> join_node
+        input_node >> MapOperator(fail) >> join_node
+        with pytest.raises(ValueError, match="upstream error"):
+            await concurrent_runner.execute_workflow(join_node)
+        assert cancelled
@@ -0,0 +1,234 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+
+from .. import (
+    DAG,
+    DAGContext,
+    DefaultWorkflowRunner,
+    InputOperator,
+    JoinOperator,
+    SimpleInputSource,
+    SimpleStreamTaskOutput,
+    StreamTeePolicy,
+    TaskState,
+)
+from ..operators.common_operator import ReduceStreamOperator
+from ..operators.stream_operator import TransformStreamAbsOperator
+
+
+async def _gen(n: int) -> AsyncIterator[int]:
+    for i in range(n):
+        yield i
+
+
+async def _collect(stream: AsyncIterator[int]) -> List[int]:
+    return [i async for i in stream]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "policy",
+    [StreamTeePolicy.BLOCK, StreamTeePolicy.SPILL],
+)
+async def test_tee_concurrent_consumers(policy: StreamTeePolicy):
+    outputs = SimpleStreamTaskOutput(_gen(100)).tee(3, buffer_size=4, policy=policy)
+    results = await asyncio.gather(*[_collect(o.output_stream) for o in outputs])
+    for res in results:
+        assert res == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_tee_block_backpressure():
+    pulled = 0
+
+    async def counting_gen():
+        nonlocal pulled
+        for i in range(100):
+            pulled += 1
+            yield i
+
+    fast, slow = SimpleStreamTaskOutput(counting_gen()).tee(2, buffer_size=5)
+    fast_stream = fast.output_stream
+    read = []
+
+    async def read_fast():
+        async for i in fast_stream:
+            read.append(i)
+
+    task = asyncio.create_task(read_fast())
+    await asyncio.sleep(0.05)
+    # The fast consumer waits for the slow consumer
+    assert len(read) == 5
+    assert pulled == 5
+    assert await _collect(slow.output_stream) == list(range(100))
+    await task
+    assert read == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_tee_drop_slow_consumer():
+    fast, slow = SimpleStreamTaskOutput(_gen(100)).tee(
+        2, buffer_size=10, policy=StreamTeePolicy.DROP
+    )
+    assert await _collect(fast.output_stream) == list(range(100))
+    slow_stream = slow.output_stream
+    assert await _collect(slow_stream) == list(range(90, 100))
+    assert slow_stream.dropped == 90
+
+
+@pytest.mark.asyncio
+async def test_tee_spill_slow_consumer(tmp_path):
+    fast, slow = SimpleStreamTaskOutput(_gen(100)).tee(
+        2, buffer_size=10, policy=StreamTeePolicy.SPILL, spill_dir=str(tmp_path)
+    )
+    assert await _collect(fast.output_stream) == list(range(100))
+    slow_stream = slow.output_stream
+    assert await _collect(slow_stream) == list(range(100))
+    assert slow_stream.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_tee_closed_consumer_not_block():
+    out1, out2 = SimpleStreamTaskOutput(_gen(100)).tee(2, buffer_size=2)
+    await out2.output_stream.aclose()
+    assert await _collect(out1.output_stream) == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_tee_source_error():
+    async def error_gen():
+        yield 1
+        raise ValueError("stream error")
+
+    out1, out2 = SimpleStreamTaskOutput(error_gen()).tee(2)
+    for out in [out1, out2]:
+        with pytest.raises(ValueError, match="stream error"):
+            await _collect(out.output_stream)
+
+
+class _PrefixOperator(TransformStreamAbsOperator[int, int]):
+    def __init__(self, prefix: int, **kwargs):
+        super().__init__(**kwargs)
+        self._prefix = prefix
+
+    async def transform_stream(self, input_value: AsyncIterator[int]):
+        async for i in input_value:
+            yield self._prefix + i
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "concurrent, policy",
+    [
+        (True, StreamTeePolicy.BLOCK),
+        (False, StreamTeePolicy.SPILL),
+        (True, StreamTeePolicy.SPILL),
+    ],
+)
+async def test_runner_split_stream_output(concurrent: bool, policy: StreamTeePolicy):
+    # The buffer is smaller than the stream
+    runner = DefaultWorkflowRunner(
+        concurrent=concurrent,
+        stream_tee_policy=policy,
+        stream_buffer_size=4,
+    )
+    with DAG("test_runner_split_stream_output") as _dag:
+        input_node = InputOperator(SimpleInputSource(_gen(10)))
+        reduce_node1 = ReduceStreamOperator(lambda x, y: x + y)
+        reduce_node2 = ReduceStreamOperator(lambda x, y: x + y)
+        join_node = JoinOperator(lambda x, y: (x, y))
+        input_node >> _PrefixOperator(0) >> reduce_node1 >> join_node
+        input_node >> _PrefixOperator(100) >> reduce_node2 >> join_node
+        res: DAGContext = await runner.execute_workflow(join_node)
+        assert res.current_task_context.current_state == TaskState.SUCCESS
+        assert res.current_task_context.task_output.output == (45, 1045)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "concurrent, policy",
+    [
+        (True, StreamTeePolicy.BLOCK),
+        (False, StreamTeePolicy.SPILL),
+        (True, StreamTeePolicy.SPILL),
+    ],
+)
+async def test_runner_split_stream_to_reduce(concurrent: bool, policy: StreamTeePolicy):
+    runner = DefaultWorkflowRunner(
+        concurrent=concurrent,
+        stream_tee_policy=policy,
+        stream_buffer_size=4,
+    )
+    with DAG("test_runner_split_stream_to_reduce") as _dag:
+        input_node = InputOperator(SimpleInputSource(_gen(10)))
+        reduce_node1 = ReduceStreamOperator(lambda x, y: x + y)
+        reduce_node2 = ReduceStreamOperator(lambda x, y: max(x, y))
+        join_node = JoinOperator(lambda x, y: (x, y))
+        input_node >> reduce_node1 >> join_node
+        input_node >> reduce_node2 >> join_node
+        res: DAGContext = await runner.execute_workflow(join_node)
+        assert res.current_task_context.task_output.output == (45, 9)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "concurrent, policy",
+    [
+        (True, StreamTeePolicy.BLOCK),
+        (False, StreamTeePolicy.SPILL),
+        (True, StreamTeePolicy.SPILL),
+    ],
+)
+async def test_runner_split_stream_asymmetric(
+    concurrent: bool, policy: StreamTeePolicy
+):
+    async def join_func(total: int, stream: AsyncIterator[int]):
+        # Read the reduced value first, then the other copy of the stream
+        return total, len(await _collect(stream))
+
+    runner = DefaultWorkflowRunner(
+        concurrent=concurrent,
+        stream_tee_policy=policy,
+        stream_buffer_size=4,
+    )
+    with DAG("test_runner_split_stream_asymmetric") as _dag:
+        input_node = InputOperator(SimpleInputSource(_gen(10)))
+        reduce_node = ReduceStreamOperator(lambda x, y: x + y)
+        join_node = JoinOperator(join_func)
+        input_node >> reduce_node >> join_node
+        input_node >> join_node
+        res: DAGContext = await asyncio.wait_for(
+            runner.execute_workflow(join_node), timeout=5
+        )
+        assert res.current_task_context.current_state == TaskState.SUCCESS
+        assert res.current_task_context.task_output.output == (45, 10)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dag_kwargs", [{"concurrent": False}, {"max_concurrency": 1}])
+async def test_runner_block_dag_not_concurrent(dag_kwargs):
+    runner = DefaultWorkflowRunner(
+        concurrent=True,
+        stream_tee_policy=StreamTeePolicy.BLOCK,
+        stream_buffer_size=4,
+    )
+    # The DAG runs its nodes one by one, the stream is spilled
+    with DAG("test_runner_block_dag_not_concurrent", **dag_kwargs) as _dag:
+        input_node = InputOperator(SimpleInputSource(_gen(10)))
+        reduce_node1 = ReduceStreamOperator(lambda x, y: x + y)
+        reduce_node2 = ReduceStreamOperator(lambda x, y: max(x, y))
+        join_node = JoinOperator(lambda x, y: (x, y))
+        input_node >> reduce_node1 >> join_node
+        input_node >> reduce_node2 >> join_node
+        res: DAGContext = await asyncio.wait_for(
+            runner.execute_workflow(join_node), timeout=5
+        )
+        assert res.current_task_context.task_output.output == (45, 9)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"concurrent": True, "max_concurrency": 2}])
+def test_runner_block_requires_concurrent(kwargs):
+    with pytest.raises(ValueError, match="StreamTeePolicy.BLOCK"):
+        DefaultWorkflowRunner(stream_tee_policy=StreamTeePolicy.BLOCK, **kwargs)
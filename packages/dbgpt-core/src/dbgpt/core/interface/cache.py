@@ -28,6 +28,7 @@ class CachePolicy(str, Enum):
 
     LRU = "lru"
     FIFO = "fifo"
+    LFU = "lfu"
 
 
 @dataclass
@@ -36,6 +37,9 @@ class CacheConfig:
 
     retrieval_policy: Optional[RetrievalPolicy] = RetrievalPolicy.EXACT_MATCH
     cache_policy: Optional[CachePolicy] = CachePolicy.LRU
+    # The time to live of the entry in seconds, None means use the default of the
+    # cache storage
+    ttl: Optional[float] = None
 
 
 class CacheKey(Serializable, ABC, Generic[K]):
@@ -120,6 +120,13 @@ class Embeddings(ABC):
     def embed_query(self, text: str) -> List[float]:
         """Embed query text."""
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed multiple query texts.
+
+        The models which can embed the queries in one call should override it.
+        """
+        return [self.embed_query(text) for text in texts]
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs."""
         return await asyncio.get_running_loop().run_in_executor(
@@ -131,3 +138,9 @@ class Embeddings(ABC):
         return await asyncio.get_running_loop().run_in_executor(
             None, self.embed_query, text
         )
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed multiple query texts."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.embed_queries, texts
+        )
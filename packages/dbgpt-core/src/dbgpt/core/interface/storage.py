@@ -118,6 +118,27 @@ class StorageItemAdapter(Generic[T, TDataRepresentation]):
             Any: The query for the resource identifier
         """
 
+    def get_query_for_identifiers(
+        self,
+        storage_format: Type[TDataRepresentation],
+        resource_ids: List[ResourceIdentifier],
+        **kwargs,
+    ) -> Optional[Any]:
+        """Get the query for a batch of resource identifiers.
+
+        Override it to let the storage load or update a batch with one query.
+
+        Args:
+            storage_format (Type[TDataRepresentation]): The storage format
+            resource_ids (List[ResourceIdentifier]): The resource identifiers
+            kwargs: The additional arguments
+
+        Returns:
+            Optional[Any]: The query for the resource identifiers, None if the
+                adapter does not support it, the items are queried one by one then
+        """
+        return None
+
 
 class DefaultStorageItemAdapter(StorageItemAdapter[T, T]):
     """Default storage item adapter.
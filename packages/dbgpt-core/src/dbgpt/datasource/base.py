@@ -1,9 +1,10 @@
 """Base class for all connectors."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
 
 from .parameter import BaseDatasourceParameters  # noqa: F401
+from .result import QueryResultChunk, iter_result_chunks
 
 C = TypeVar("C", bound="BaseDatasourceParameters")
 T = TypeVar("T", bound="BaseConnector")
@@ -153,6 +154,23 @@ class BaseConnector(ABC):
             List: result list
         """
 
+    async def arun(self, command: str, fetch: str = "all") -> List:
+        """Execute sql command asynchronously.
+
+        The default implementation runs :meth:`run` in a thread, the connectors
+        with an async driver override it.
+
+        Args:
+            command (str): sql command
+            fetch (str): fetch type
+
+        Returns:
+            List: result list
+        """
+        from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
+
+        return await blocking_func_to_async_no_executor(self.run, command, fetch)
+
     def run_to_df(self, command: str, fetch: str = "all"):
         """Execute sql command and return result as dataframe.
 
@@ -165,6 +183,51 @@ class BaseConnector(ABC):
         """
         raise NotImplementedError("Current connector does not support run_to_df")
 
+    def query_stream(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Iterator[QueryResultChunk]:
+        """Execute a query and yield the result in chunks of rows.
+
+        The default implementation fetches the whole result by :meth:`run` and
+        splits it, the connectors which support server-side cursors override it.
+
+        Args:
+            query (str): SQL query to run
+            params (Optional[Dict[str, Any]]): Parameters for the query
+            batch_size (int): The max rows of a chunk
+            max_rows (Optional[int]): Stop after these rows, the last chunk is
+                marked as truncated
+            max_bytes (Optional[int]): Stop after about these bytes of rows
+
+        Returns:
+            Iterator[QueryResultChunk]: The chunks, at least one chunk with the
+                columns is yielded for a query returning rows.
+        """
+        if params:
+            raise NotImplementedError(
+                "Current connector does not support query_stream with params"
+            )
+        result = self.run(query)
+        if not result:
+            return
+        columns = list(result[0])
+        yield from iter_result_chunks(
+            columns, iter(result[1:]), batch_size, max_rows, max_bytes
+        )
+
+    def pool_status(self) -> Dict[str, Any]:
+        """Return the connection pool usage of the connector.
+
+        Returns:
+            Dict[str, Any]: The pool usage, empty if the connector has no pool.
+        """
+        return {}
+
     def get_users(self) -> List[Tuple[str, str]]:
         """Return user information.
 
@@ -245,6 +308,26 @@ class BaseConnector(ABC):
         """
         raise NotImplementedError("Current connector does not support get_indexes")
 
+    def get_table_schemas(self, table_names: List[str]) -> Dict[str, Dict]:
+        """Return the columns, indexes and comments of many tables at once.
+
+        Implement it with a few queries against the catalog of the database, the
+        callers fall back to :meth:`get_columns`, :meth:`get_indexes` and
+        :meth:`get_table_comment` of every table if it is not supported.
+
+        Args:
+            table_names (List[str]): table names
+
+        Returns:
+            Dict[str, Dict]: Key is the table name, value contains columns:
+                List[Dict] (name, type, comment), indexes: the same as
+                :meth:`get_indexes` and comment: Optional[str]. The tables not found
+                are omitted.
+        """
+        raise NotImplementedError(
+            "Current connector does not support get_table_schemas"
+        )
+
     @classmethod
     def is_normal_type(cls) -> bool:
         """Return whether the connector is a normal type."""
@@ -1,7 +1,9 @@
 """Base class for RDBMS connectors."""
 
+import asyncio
 import logging
 import re
+import threading
 import weakref
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeoutError
@@ -9,10 +11,12 @@ from contextlib import contextmanager
 from dataclasses import dataclass, field
 from functools import wraps
 from typing import (
+    TYPE_CHECKING,
     Any,
     Dict,
     Generator,
     Iterable,
+    Iterator,
     List,
     Optional,
     Set,
@@ -27,19 +31,58 @@ import sqlalchemy
 import sqlparse
 from sqlalchemy import MetaData, Table, create_engine, inspect, select, text
 from sqlalchemy.engine import CursorResult
-from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
+from sqlalchemy.exc import NoSuchModuleError, ProgrammingError, SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
 from sqlalchemy.schema import CreateTable
 
 from dbgpt.datasource.base import BaseConnector
+from dbgpt.datasource.result import (
+    QueryResultChunk,
+    chunks_to_df,
+    iter_result_chunks,
+)
 from dbgpt.util.i18n_utils import _
 from dbgpt_ext.datasource.schema import DBType
 
 from ..parameter import BaseDatasourceParameters
+from .result_cache import (
+    CachedRows,
+    QueryResultCache,
+    extract_query_tables,
+    extract_write_tables,
+    get_shared_result_cache,
+    normalize_sql,
+)
+from .schema_cache import SchemaCache, get_shared_schema_cache
 
 logger = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+# The engine arguments shared with the async engine, the other ones (e.g.
+# connect_args) are specific to the sync driver
+_ASYNC_ENGINE_ARG_KEYS = (
+    "pool_size",
+    "max_overflow",
+    "pool_timeout",
+    "pool_recycle",
+    "pool_pre_ping",
+)
+
+
+def _pool_status(pool: Any) -> Dict[str, Any]:
+    """Return the usage of a SQLAlchemy connection pool."""
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    # Only the queue pools report the usage
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        func = getattr(pool, name, None)
+        if callable(func):
+            status[name] = func()
+    return status
+
 
 def _format_index(index: sqlalchemy.engine.interfaces.ReflectedIndex) -> str:
     return (
@@ -72,7 +115,13 @@ class RDBMSDatasourceParameters(BaseDatasourceParameters):
     )
 
     pool_size: int = field(
-        default=5, metadata={"help": _("Connection pool size, default 5")}
+        default=5,
+        metadata={
+            "help": _(
+                "Connection pool size, default 5. It sizes the pool of the sync "
+                "engine and the pool of the async engine respectively"
+            )
+        },
     )
     max_overflow: int = field(
         default=10, metadata={"help": _("Max overflow connections, default 10")}
@@ -114,6 +163,10 @@ class RDBMSDatasourceParameters(BaseDatasourceParameters):
 class RDBMSConnector(BaseConnector):
     """SQLAlchemy wrapper around a database."""
 
+    # The async driver of the async execution path, e.g. "mysql+aiomysql", the
+    # async methods run the sync methods in a thread if it is None or not installed
+    async_driver: Optional[str] = None
+
     def __init__(
         self,
         engine,
@@ -166,6 +219,17 @@ class RDBMSConnector(BaseConnector):
         self._metadata.reflect(bind=self._engine)
 
         self._all_tables: Set[str] = cast(Set[str], self._sync_tables_from_db())
+        # The schema cache is shared by the connectors of the same database
+        self._schema_cache: Optional[SchemaCache] = None
+        self._seen_schema_version: Optional[str] = None
+        self._schema_version_checked = False
+        self._schema_metadata_lock = threading.RLock()
+        # The result cache is opt-in, see enable_result_cache
+        self._result_cache: Optional[QueryResultCache] = None
+        # The async engine is created on the first async call
+        self._async_engine: Optional["AsyncEngine"] = None
+        self._async_engine_args: Dict[str, Any] = {}
+        self._async_engine_unavailable = False
 
     @classmethod
     def param_class(cls) -> Type[RDBMSDatasourceParameters]:
@@ -210,7 +274,12 @@ class RDBMSConnector(BaseConnector):
     ) -> "RDBMSConnector":
         """Construct a SQLAlchemy engine from URI."""
         _engine_args = engine_args or {}
-        return cls(create_engine(database_uri, **_engine_args), **kwargs)
+        connector = cls(create_engine(database_uri, **_engine_args), **kwargs)
+        # The async engine uses the same pool settings
+        connector._async_engine_args = {
+            k: v for k, v in _engine_args.items() if k in _ASYNC_ENGINE_ARG_KEYS
+        }
+        return connector
 
     @property
     def db_url(self) -> str:
@@ -321,6 +390,130 @@ class RDBMSConnector(BaseConnector):
         """Information about all tables in the database."""
         return self.get_table_info()
 
+    @property
+    def schema_cache(self) -> SchemaCache:
+        """Return the schema cache shared by the connectors of the database."""
+        cache = getattr(self, "_schema_cache", None)
+        if cache is None:
+            cache = get_shared_schema_cache(self._schema_cache_key())
+            self._schema_cache = cache
+        return cache
+
+    def _schema_cache_key(self) -> str:
+        url = self._engine.url
+        key = url.render_as_string(hide_password=True)
+        if not url.database or url.database == ":memory:":
+            # Every in-memory database is a different database
+            key += f"#{id(self._engine)}"
+        return f"{key}#{getattr(self, '_schema', None) or ''}"
+
+    def _get_schema_version(self) -> Optional[str]:
+        """Return a cheap version of the schema which changes after a DDL.
+
+        Return None if the dialect doesn't support it, the schema cache only
+        expires by TTL then.
+        """
+        return None
+
+    def _check_schema_version(self) -> None:
+        """Drop the schema cache and reload the metadata after a DDL change."""
+        cache = self.schema_cache
+        with self._schema_metadata_lock:
+            # A new connector validates the entries cached by the other connectors
+            first_check = not getattr(self, "_schema_version_checked", False)
+            cache.check_version(self._get_schema_version, force=first_check)
+            self._schema_version_checked = True
+            seen_version = getattr(self, "_seen_schema_version", None)
+            version = cache.version
+            if version is None:
+                return
+            if seen_version is not None and seen_version != version:
+                self._reload_schema_metadata()
+            self._seen_schema_version = version
+
+    def _reload_schema_metadata(self) -> None:
+        """Reflect the tables again, the inspector caches the reflected results."""
+        logger.info(f"Reload the schema metadata of {self.db_url}")
+        with self._schema_metadata_lock:
+            self._inspector = inspect(self._engine)
+            self._metadata.clear()
+            self._metadata.reflect(bind=self._engine)
+            self._sync_tables_from_db()
+
+    def invalidate_schema_cache(self, table_names: Optional[List[str]] = None):
+        """Drop the cached schema of the tables, all the tables if None.
+
+        Args:
+            table_names (Optional[List[str]]): table names
+        """
+        self.schema_cache.invalidate(table_names)
+
+    @property
+    def result_cache(self) -> Optional[QueryResultCache]:
+        """Return the query result cache, None if it is not enabled."""
+        return getattr(self, "_result_cache", None)
+
+    def enable_result_cache(
+        self,
+        ttl: float = 60,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> QueryResultCache:
+        """Cache the results of the read-only queries of the datasource.
+
+        The cache is shared by the connectors of the same datasource, a write
+        through :meth:`_write` drops the results reading the written table and a
+        DDL drops all the results. The writes made outside DB-GPT are only seen
+        after the TTL, so enable it for the datasources which tolerate it.
+
+        Args:
+            ttl (float): The seconds a result lives.
+            max_entries (int): The max number of the cached results.
+            max_bytes (int): The max estimated bytes of the cached rows.
+        """
+        self._result_cache = get_shared_result_cache(
+            self._schema_cache_key(), ttl, max_entries, max_bytes
+        )
+        return self._result_cache
+
+    def disable_result_cache(self) -> None:
+        """Stop caching the results of this connector."""
+        self._result_cache = None
+
+    def _get_cached_result(
+        self, query: str, params: Optional[Dict[str, Any]], fetch: str
+    ) -> Tuple[Optional[str], Set[str], Optional[Tuple[List[str], CachedRows]]]:
+        """Look up the result cache for a query.
+
+        Returns:
+            Tuple: The cache key and the tables the query reads, both are empty if
+                the query is not cacheable, and the cached columns and rows.
+        """
+        cache = self.result_cache
+        if cache is None or not query:
+            return None, set(), None
+        if self.__sql_parse(query)[2] != "SELECT":
+            return None, set(), None
+        tables = extract_query_tables(normalize_sql(query))
+        if not tables:
+            return None, set(), None
+        key = cache.make_key(query, params, fetch)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"Query result cache hit[{query}]")
+        return key, tables, cached
+
+    def _invalidate_result_cache(self, write_sql: Optional[str] = None) -> None:
+        """Drop the cached results reading the table a write statement modifies.
+
+        All the results are dropped if the table is unknown.
+        """
+        cache = self.result_cache
+        if cache is None:
+            return
+        tables = extract_write_tables(write_sql) if write_sql else set()
+        cache.invalidate_tables(tables or None)
+
     def get_table_info(self, table_names: Optional[List[str]] = None) -> str:
         """Get information about specified tables.
 
@@ -330,7 +523,10 @@ class RDBMSConnector(BaseConnector):
         If `sample_rows_in_table_info`, the specified number of sample rows will be
         appended to each table description. This can increase performance as
         demonstrated in the paper.
+
+        The rendered info of every table is cached in :attr:`schema_cache`.
         """
+        self._check_schema_version()
         all_table_names = self.get_usable_table_names()
         if table_names is not None:
             missing_tables = set(table_names).difference(all_table_names)
@@ -351,24 +547,32 @@ class RDBMSConnector(BaseConnector):
                 tables.append(self._custom_table_info[table.name])
                 continue
 
-            # add create table command
-            create_table = str(CreateTable(table).compile(self._engine))
-            table_info = f"{create_table.rstrip()}"
-            has_extra_info = (
-                self._indexes_in_table_info or self._sample_rows_in_table_info
+            tables.append(
+                self.schema_cache.get_or_load(
+                    f"table_info:{self._sample_rows_in_table_info}:"
+                    f"{bool(self._indexes_in_table_info)}",
+                    table.name,
+                    lambda: self._render_table_info(table),
+                )
             )
-            if has_extra_info:
-                table_info += "\n\n/*"
-            if self._indexes_in_table_info:
-                table_info += f"\n{self._get_table_indexes(table)}\n"
-            if self._sample_rows_in_table_info:
-                table_info += f"\n{self._get_sample_rows(table)}\n"
-            if has_extra_info:
-                table_info += "*/"
-            tables.append(table_info)
         final_str = "\n\n".join(tables)
         return final_str
 
+    def _render_table_info(self, table: Table) -> str:
+        # add create table command
+        create_table = str(CreateTable(table).compile(self._engine))
+        table_info = f"{create_table.rstrip()}"
+        has_extra_info = self._indexes_in_table_info or self._sample_rows_in_table_info
+        if has_extra_info:
+            table_info += "\n\n/*"
+        if self._indexes_in_table_info:
+            table_info += f"\n{self._get_table_indexes(table)}\n"
+        if self._sample_rows_in_table_info:
+            table_info += f"\n{self._get_sample_rows(table)}\n"
+        if has_extra_info:
+            table_info += "*/"
+        return table_info
+
     def get_columns(self, table_name: str) -> List[Dict]:
         """Get columns about specified table.
 
@@ -381,7 +585,11 @@ class RDBMSConnector(BaseConnector):
                 eg:[{'name': 'id', 'type': 'int', 'default_expression': '',
                 'is_in_primary_key': True, 'comment': 'id'}, ...]
         """
-        return self._inspector.get_columns(table_name)
+        self._check_schema_version()
+        columns = self.schema_cache.get_or_load(
+            "columns", table_name, lambda: self._inspector.get_columns(table_name)
+        )
+        return [dict(column) for column in columns]
 
     def _get_sample_rows(self, table: Table) -> str:
         # build the select command
@@ -441,6 +649,7 @@ class RDBMSConnector(BaseConnector):
             #  loss target problem
             session.execute(text(f"use `{db_cache}`"))
             logger.info(f"SQL[{write_sql}], result:{result.rowcount}")
+            self._invalidate_result_cache(write_sql)
             return result.rowcount
 
     def _query(self, query: str, fetch: str = "all"):
@@ -469,6 +678,19 @@ class RDBMSConnector(BaseConnector):
                 result.insert(0, field_names)
                 return result
 
+    def _cached_query(self, query: str, fetch: str = "all"):
+        """Run a read-only query by :meth:`_query` through the result cache."""
+        cache_key, tables, cached = self._get_cached_result(query, None, fetch)
+        if cached is not None:
+            columns, rows = cached
+            rows.insert(0, tuple(columns))
+            return rows
+        result = self._query(query, fetch)
+        # fetch="one" of an empty result returns [None]
+        if cache_key and result and None not in result[1:]:
+            self.result_cache.put(cache_key, tables, list(result[0]), result[1:])
+        return result
+
     def query_table_schema(self, table_name: str):
         """Query table schema.
 
@@ -487,7 +709,8 @@ class RDBMSConnector(BaseConnector):
     ) -> Tuple[List[str], Optional[List]]:
         """Execute a SQL command and return the results with optional timeout.
 
-        Only for query command.
+        Only for query command. A write statement drops the cached results of
+        the table it modifies.
 
         Args:
             query (str): SQL query to run
@@ -512,6 +735,27 @@ class RDBMSConnector(BaseConnector):
         if params is None:
             params = {}
 
+        cache_key, tables, cached = self._get_cached_result(query, params, fetch)
+        if cached is not None:
+            return cached
+        field_names, result = self._query_ex(query, params, fetch, timeout)
+        if cache_key and result is not None:
+            self.result_cache.put(cache_key, tables, field_names, result)
+        elif self.result_cache is not None and self.__sql_parse(query)[2] != "SELECT":
+            # The statement is committed, drop the results of the table it writes,
+            # or all the results after a DDL or an unknown statement
+            self._invalidate_result_cache(query)
+        return field_names, result
+
+    def _query_ex(
+        self,
+        query: str,
+        params: Dict[str, Any],
+        fetch: str = "all",
+        timeout: Optional[float] = None,
+    ) -> Tuple[List[str], Optional[List]]:
+        """Execute a SQL query with optional timeout, see :meth:`query_ex`."""
+
         def _execute_query(session, sql_text, query_params):
             cursor = session.execute(sql_text, query_params)
             if cursor.returns_rows:
@@ -535,27 +779,10 @@ class RDBMSConnector(BaseConnector):
 
                 # Handle timeout based on database dialect
                 if timeout is not None:
-                    if self.dialect == "mysql":
-                        # MySQL: Set MAX_EXECUTION_TIME in milliseconds
-                        mysql_timeout = int(timeout * 1000)
-                        session.execute(
-                            text(f"SET SESSION MAX_EXECUTION_TIME = {mysql_timeout}")
-                        )
-                        return _execute_query(session, sql, params)
-
-                    elif self.dialect == "postgresql":
-                        # PostgreSQL: Set statement_timeout in milliseconds
-                        session.execute(
-                            text(f"SET statement_timeout = {int(timeout * 1000)}")
-                        )
-                        return _execute_query(session, sql, params)
-
-                    elif self.dialect == "oceanbase":
-                        # OceanBase: Set ob_query_timeout in microseconds
-                        ob_timeout = int(timeout * 1000000)
-                        session.execute(
-                            text(f"SET SESSION ob_query_timeout = {ob_timeout}")
-                        )
+                    timeout_sql = self._timeout_sql(timeout)
+                    if timeout_sql:
+                        # MySQL, PostgreSQL and OceanBase: Set the session timeout
+                        session.execute(text(timeout_sql[0]))
                         return _execute_query(session, sql, params)
 
                     elif self.dialect == "mssql":
@@ -596,14 +823,9 @@ class RDBMSConnector(BaseConnector):
                 # Reset timeout settings if they were modified
                 if timeout is not None:
                     try:
-                        if self.dialect == "mysql":
-                            session.execute(text("SET SESSION MAX_EXECUTION_TIME = 0"))
-                        elif self.dialect == "postgresql":
-                            session.execute(text("SET statement_timeout = 0"))
-                        elif self.dialect == "oceanbase":
-                            session.execute(
-                                text("SET SESSION ob_query_timeout = 10000000")
-                            )  # Reset to default 10s
+                        timeout_sql = self._timeout_sql(timeout)
+                        if timeout_sql:
+                            session.execute(text(timeout_sql[1]))
                         # MSSQL and DuckDB don't need reset as timeout is handled at
                         # execution level
                     except Exception as reset_error:
@@ -611,6 +833,31 @@ class RDBMSConnector(BaseConnector):
                             f"Failed to reset timeout settings: {reset_error}"
                         )
 
+    def _timeout_sql(self, timeout: float) -> Optional[Tuple[str, str]]:
+        """Return the SQL to set and reset the session timeout of the dialect.
+
+        None if the dialect has no session timeout variable.
+        """
+        if self.dialect == "mysql":
+            # MySQL: MAX_EXECUTION_TIME in milliseconds
+            return (
+                f"SET SESSION MAX_EXECUTION_TIME = {int(timeout * 1000)}",
+                "SET SESSION MAX_EXECUTION_TIME = 0",
+            )
+        elif self.dialect == "postgresql":
+            # PostgreSQL: statement_timeout in milliseconds
+            return (
+                f"SET statement_timeout = {int(timeout * 1000)}",
+                "SET statement_timeout = 0",
+            )
+        elif self.dialect == "oceanbase":
+            # OceanBase: ob_query_timeout in microseconds, reset to default 10s
+            return (
+                f"SET SESSION ob_query_timeout = {int(timeout * 1000000)}",
+                "SET SESSION ob_query_timeout = 10000000",
+            )
+        return None
+
     def _format_sql(self, sql: str) -> str:
         """Format SQL command."""
         if not sql:
@@ -626,7 +873,7 @@ class RDBMSConnector(BaseConnector):
         command = self._format_sql(command)
         if ttype == sqlparse.tokens.DML:
             if sql_type == "SELECT":
-                return self._query(command, fetch)
+                return self._cached_query(command, fetch)
             else:
                 self._write(command)
                 select_sql = self.convert_sql_write_to_select(command)
@@ -637,6 +884,7 @@ class RDBMSConnector(BaseConnector):
             logger.info(
                 "DDL execution determines whether to enable through configuration "
             )
+            self._invalidate_result_cache()
             with self.session_scope(commit=False) as session:
                 cursor = session.execute(text(command))
                 if cursor.returns_rows:
@@ -653,16 +901,227 @@ class RDBMSConnector(BaseConnector):
                     return self.get_simple_fields(table_name)
 
     def run_to_df(self, command: str, fetch: str = "all"):
-        """Execute sql command and return result as dataframe."""
+        """Execute sql command and return result as dataframe.
+
+        The rows of a query are streamed into the DataFrame, the result list of
+        :meth:`run` is not built. Connectors which can't stream (see
+        :meth:`_can_stream_query`) build the DataFrame from :meth:`run`.
+        """
+        if fetch not in ("all", "one"):
+            raise ValueError("Fetch parameter must be either 'one' or 'all'")
+        if (
+            command
+            and self._can_stream_query()
+            and self.__sql_parse(command)[2] == "SELECT"
+        ):
+            cache_key, tables, cached = self._get_cached_result(command, None, fetch)
+            if cached is not None:
+                columns, rows = cached
+                df = chunks_to_df([QueryResultChunk(columns, rows)], columns)
+                df.attrs["cached_at"] = rows.cached_at
+                return df
+            max_rows = 1 if fetch == "one" else None
+            chunks = list(self.query_stream(command, max_rows=max_rows))
+            if cache_key and chunks:
+                rows = [row for chunk in chunks for row in chunk.rows]
+                self.result_cache.put(cache_key, tables, chunks[0].columns, rows)
+            return chunks_to_df(chunks)
+
         import pandas as pd
 
-        # Pandas has too much dependence and the import time is too long
-        # TODO: Remove the dependency on pandas
         result_lst = self.run(command, fetch)
         colunms = result_lst[0]
         values = result_lst[1:]
         return pd.DataFrame(values, columns=colunms)
 
+    def _can_stream_query(self) -> bool:
+        """Return whether the queries can be streamed from the SQLAlchemy engine.
+
+        A connector overriding :meth:`run` (e.g. with its own client) or without an
+        engine runs the queries with :meth:`run`.
+        """
+        return (
+            getattr(self, "_engine", None) is not None
+            and type(self).run is RDBMSConnector.run
+        )
+
+    @property
+    def async_engine(self) -> Optional["AsyncEngine"]:
+        """Return the async engine, None if the async driver is not available."""
+        engine = getattr(self, "_async_engine", None)
+        if engine is None and not getattr(self, "_async_engine_unavailable", False):
+            engine = self._create_async_engine()
+            self._async_engine = engine
+            self._async_engine_unavailable = engine is None
+        return engine
+
+    def _create_async_engine(self) -> Optional["AsyncEngine"]:
+        if not self.async_driver:
+            return None
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = self._engine.url.set(drivername=self.async_driver)
+        try:
+            return create_async_engine(url, **getattr(self, "_async_engine_args", {}))
+        except (ImportError, NoSuchModuleError) as e:
+            logger.info(
+                f"The async driver {self.async_driver} is not available, run the "
+                f"async calls in threads: {e}"
+            )
+            return None
+
+    async def aquery_ex(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        fetch: str = "all",
+        timeout: Optional[float] = None,
+    ) -> Tuple[List[str], Optional[List]]:
+        """Execute a SQL query asynchronously, see :meth:`query_ex`.
+
+        The read-only queries run on the async engine, no thread is occupied
+        while waiting for the database. The other statements, or all of them if
+        the async driver is not available, run :meth:`query_ex` in a thread.
+
+        The timeout is set on the database session like :meth:`query_ex` does, so
+        the server stops the query, and it is also enforced on the client side.
+        """
+        query = self._format_sql(query)
+        if not query:
+            return [], None
+        params = params or {}
+        engine = self.async_engine
+        if engine is None or self.__sql_parse(query)[2] != "SELECT":
+            from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
+
+            return await blocking_func_to_async_no_executor(
+                self.query_ex, query, params, fetch, timeout
+            )
+        logger.info(f"Async query[{query}] with timeout={timeout}s")
+        cache_key, tables, cached = self._get_cached_result(query, params, fetch)
+        if cached is not None:
+            return cached
+        try:
+            field_names, result = await asyncio.wait_for(
+                self._aexecute_query(engine, query, params, fetch, timeout), timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Query exceeded timeout of {timeout} seconds")
+        except SQLAlchemyError as e:
+            if timeout is not None and (
+                "timeout" in str(e).lower() or "timed out" in str(e).lower()
+            ):
+                raise TimeoutError(f"Query exceeded timeout of {timeout} seconds")
+            raise
+        if cache_key and result is not None:
+            self.result_cache.put(cache_key, tables, field_names, result)
+        return field_names, result
+
+    async def _aexecute_query(
+        self,
+        engine: "AsyncEngine",
+        query: str,
+        params: Dict[str, Any],
+        fetch: str,
+        timeout: Optional[float] = None,
+    ) -> Tuple[List[str], Optional[List]]:
+        timeout_sql = self._timeout_sql(timeout) if timeout is not None else None
+        async with engine.connect() as conn:
+            if timeout_sql:
+                await conn.execute(text(timeout_sql[0]))
+            try:
+                cursor = await conn.execute(text(query), params)
+                if not cursor.returns_rows:
+                    return [], None
+                if fetch == "all":
+                    result = list(cursor.fetchall())
+                elif fetch == "one":
+                    row = cursor.fetchone()
+                    result = [row] if row else []
+                else:
+                    raise ValueError("Fetch parameter must be either 'one' or 'all'")
+                return list(cursor.keys()), result
+            finally:
+                if timeout_sql:
+                    try:
+                        await conn.execute(text(timeout_sql[1]))
+                    except Exception as reset_error:
+                        logger.warning(
+                            f"Failed to reset timeout settings: {reset_error}"
+                        )
+                        # Don't return the connection with the timeout to the pool
+                        await conn.invalidate()
+
+    async def arun(self, command: str, fetch: str = "all") -> List:
+        """Execute a SQL command asynchronously, see :meth:`run`."""
+        if (
+            not command
+            or self.async_engine is None
+            or self.__sql_parse(command)[2] != "SELECT"
+        ):
+            return await super().arun(command, fetch)
+        field_names, result = await self.aquery_ex(command, fetch=fetch)
+        result = result if result is not None else []
+        result.insert(0, tuple(field_names))
+        return result
+
+    def pool_status(self) -> Dict[str, Any]:
+        """Return the usage of the sync and async connection pools."""
+        status = {"sync": _pool_status(self._engine.pool)}
+        if getattr(self, "_async_engine", None) is not None:
+            status["async"] = _pool_status(self._async_engine.sync_engine.pool)
+        return status
+
+    def query_stream(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Iterator[QueryResultChunk]:
+        """Execute a query and yield the result in chunks of rows.
+
+        The rows are fetched from a server-side cursor if the driver supports it,
+        so only about one chunk is held in memory. The cursor is closed when the
+        budget is reached or the iterator is closed.
+
+        Args:
+            query (str): SQL query to run
+            params (Optional[Dict[str, Any]]): Parameters for the query
+            batch_size (int): The max rows of a chunk
+            max_rows (Optional[int]): Stop after these rows, the last chunk is
+                marked as truncated
+            max_bytes (Optional[int]): Stop after about these bytes of rows
+
+        Returns:
+            Iterator[QueryResultChunk]: The chunks, at least one chunk with the
+                columns is yielded for a query returning rows.
+        """
+        logger.info(f"Stream query[{query}]")
+        query = self._format_sql(query)
+        if not query:
+            return
+        # Not the scoped session, the stream may be interleaved with other
+        # queries of the same thread
+        with self._engine.connect() as conn:
+            conn = conn.execution_options(
+                stream_results=True, max_row_buffer=batch_size
+            )
+            cursor = conn.execute(text(query), params or {})
+            try:
+                if not cursor.returns_rows:
+                    return
+                yield from iter_result_chunks(
+                    list(cursor.keys()),
+                    iter(cursor),
+                    batch_size=batch_size,
+                    max_rows=max_rows,
+                    max_bytes=max_bytes,
+                )
+            finally:
+                cursor.close()
+
     def run_no_throw(self, command: str, fetch: str = "all") -> List:
         """Execute a SQL command and return a string representing the results.
 
@@ -774,7 +1233,11 @@ class RDBMSConnector(BaseConnector):
         Returns:
             List[Dict]:eg:[{'name': 'idx_key', 'column_names': ['id']}]
         """
-        return self._inspector.get_indexes(table_name)
+        self._check_schema_version()
+        indexes = self.schema_cache.get_or_load(
+            "indexes", table_name, lambda: self._inspector.get_indexes(table_name)
+        )
+        return [dict(index) for index in indexes]
 
     def get_show_create_table(self, table_name):
         """Get table show create table about specified table."""
@@ -891,6 +1354,13 @@ class RDBMSConnector(BaseConnector):
                 not in ["information_schema", "performance_schema", "sys", "mysql"]
             ]
 
+    async def aclose(self):
+        """Close the async connection pool, then the other resources."""
+        if getattr(self, "_async_engine", None) is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+        self.close()
+
     def close(self):
         if self._is_closed:
             return
@@ -907,4 +1377,9 @@ class RDBMSConnector(BaseConnector):
         self._db_sessions.remove()
         # Release connection pool resources
         self._engine.dispose()
+        if getattr(self, "_async_engine", None) is not None:
+            # The async connections can't be closed without the event loop, call
+            # aclose to close them gracefully
+            self._async_engine.sync_engine.dispose(close=False)
+            self._async_engine = None
         self._is_closed = True
@@ -0,0 +1,229 @@
+"""Query result cache of the RDBMS connectors."""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import sqlparse
+
+from ..result import estimate_row_bytes
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_RESULT_CACHE_TTL = 60
+_DEFAULT_RESULT_CACHE_MAX_ENTRIES = 256
+_DEFAULT_RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_TABLE_NAME = r"(?:[`\"\[]?[\w$]+[`\"\]]?\.)*[`\"\[]?[\w$]+[`\"\]]?"
+_TABLE_PATTERN = re.compile(rf"\b(?:FROM|JOIN)\s+({_TABLE_NAME})", re.IGNORECASE)
+# The tables of a comma join, a subquery or a CTE are not all matched by
+# _TABLE_PATTERN, these queries are not cached
+_COMPLEX_FROM_PATTERN = re.compile(
+    rf"^\s*WITH\b|\(\s*SELECT\b|\b(?:FROM|JOIN)\s+{_TABLE_NAME}"
+    r"(?:\s+(?:AS\s+)?[\w$]+)?\s*,",
+    re.IGNORECASE,
+)
+_WRITE_TABLE_PATTERN = re.compile(
+    r"^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?(?:INTO\s+)?|REPLACE\s+(?:INTO\s+)?"
+    r"|UPDATE\s+(?:OR\s+\w+\s+)?|DELETE\s+FROM\s+|MERGE\s+INTO\s+"
+    r"|TRUNCATE\s+(?:TABLE\s+)?)"
+    r"((?:[`\"\[]?[\w$]+[`\"\]]?\.)*[`\"\[]?[\w$]+[`\"\]]?)",
+    re.IGNORECASE,
+)
+# The select statements which lock or write rows are not cached
+_NOT_CACHEABLE_PATTERN = re.compile(
+    r"\bFOR\s+(?:UPDATE|SHARE)\b|\bINTO\b|\bLOCK\s+IN\s+SHARE\s+MODE\b",
+    re.IGNORECASE,
+)
+
+
+class CachedRows(list):
+    """The rows returned from the result cache.
+
+    It is a plain list for the callers, ``cached_at`` marks a cached response.
+    """
+
+    cached_at: float = 0.0
+
+
+def normalize_sql(sql: str) -> str:
+    """Normalize the SQL text, the comments, case and whitespaces are ignored."""
+    sql = sqlparse.format(sql, strip_comments=True, keyword_case="upper")
+    return re.sub(r"\s+", " ", sql).strip().rstrip(";").strip()
+
+
+def extract_query_tables(sql: str) -> Set[str]:
+    """Extract the lower case table names a read-only query reads.
+
+    Return an empty set if the query is not cacheable.
+    """
+    if _NOT_CACHEABLE_PATTERN.search(sql) or _COMPLEX_FROM_PATTERN.search(sql):
+        return set()
+    return {_strip_table_name(match.group(1)) for match in _TABLE_PATTERN.finditer(sql)}
+
+
+def extract_write_tables(sql: str) -> Set[str]:
+    """Extract the lower case table name a write statement modifies.
+
+    Return an empty set if it is unknown, all the results should be dropped then.
+    """
+    match = _WRITE_TABLE_PATTERN.match(sqlparse.format(sql, strip_comments=True))
+    return {_strip_table_name(match.group(1))} if match else set()
+
+
+def _strip_table_name(name: str) -> str:
+    """Return the lower case table name without the schema and the quotes."""
+    return name.split(".")[-1].strip('`"[]').lower()
+
+
+class QueryResultCache:
+    """A TTL and size-bounded LRU cache of query results.
+
+    The key is the normalized SQL, the parameters and the fetch type. Every entry
+    records the tables it reads, a write to a table drops them.
+
+    Example:
+        .. code-block:: python
+
+            cache = QueryResultCache(ttl=60)
+            key = cache.make_key("select * from users", None, "all")
+            cache.put(key, {"users"}, ["id"], [(1,)])
+            columns, rows = cache.get(key)
+    """
+
+    def __init__(
+        self,
+        ttl: float = _DEFAULT_RESULT_CACHE_TTL,
+        max_entries: int = _DEFAULT_RESULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = _DEFAULT_RESULT_CACHE_MAX_BYTES,
+    ):
+        """Create a new QueryResultCache.
+
+        Args:
+            ttl (float): The seconds a result lives.
+            max_entries (int): The max number of the cached results.
+            max_bytes (int): The max estimated bytes of the cached rows, a result
+                larger than a quarter of it is not cached.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (created time, tables, columns, rows, estimated bytes)
+        self._entries: OrderedDict = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        sql: str, params: Optional[Dict[str, Any]] = None, fetch: str = "all"
+    ) -> str:
+        """Return the cache key of a query."""
+        params_str = json.dumps(params or {}, sort_keys=True, default=str)
+        return f"{fetch}:{normalize_sql(sql)}:{params_str}"
+
+    def get(self, key: str) -> Optional[Tuple[List[str], CachedRows]]:
+        """Return the cached columns and rows, None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, _, columns, rows, _ = entry
+            if time.time() - created_at >= self.ttl:
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+        cached_rows = CachedRows(rows)
+        cached_rows.cached_at = created_at
+        return list(columns), cached_rows
+
+    def put(
+        self,
+        key: str,
+        tables: Set[str],
+        columns: Sequence[str],
+        rows: Sequence[Any],
+    ) -> bool:
+        """Cache a result, return False if it is too large or reads no table."""
+        if not tables:
+            return False
+        size = sum(estimate_row_bytes(row) for row in rows)
+        if size > self.max_bytes // 4:
+            logger.debug(f"Skip caching a result of about {size} bytes")
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (
+                time.time(),
+                set(tables),
+                list(columns),
+                list(rows),
+                size,
+            )
+            self._total_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or self._total_bytes > self.max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+        return True
+
+    def invalidate_tables(self, tables: Optional[Set[str]] = None) -> int:
+        """Drop the results reading the tables, all the results if None.
+
+        Returns:
+            int: The number of the dropped results.
+        """
+        with self._lock:
+            if tables is None:
+                count = len(self._entries)
+                self._entries.clear()
+                self._total_bytes = 0
+                return count
+            tables = {_strip_table_name(table) for table in tables}
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if entry[1].intersection(tables)
+            ]
+            for key in keys:
+                self._pop(key)
+            return len(keys)
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry[4]
+
+    def __len__(self) -> int:
+        """Return the number of the cached results."""
+        return len(self._entries)
+
+
+_SHARED_RESULT_CACHES: Dict[str, QueryResultCache] = {}
+_SHARED_RESULT_CACHES_LOCK = threading.Lock()
+
+
+def get_shared_result_cache(
+    key: str,
+    ttl: float = _DEFAULT_RESULT_CACHE_TTL,
+    max_entries: int = _DEFAULT_RESULT_CACHE_MAX_ENTRIES,
+    max_bytes: int = _DEFAULT_RESULT_CACHE_MAX_BYTES,
+) -> QueryResultCache:
+    """Return the result cache shared by the connectors of the same datasource.
+
+    The settings of an existing cache are updated.
+    """
+    with _SHARED_RESULT_CACHES_LOCK:
+        cache = _SHARED_RESULT_CACHES.get(key)
+        if cache is None:
+            cache = QueryResultCache(ttl, max_entries, max_bytes)
+            _SHARED_RESULT_CACHES[key] = cache
+        else:
+            cache.ttl = ttl
+            cache.max_entries = max_entries
+            cache.max_bytes = max_bytes
+        return cache
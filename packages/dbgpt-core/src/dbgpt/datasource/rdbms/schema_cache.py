@@ -0,0 +1,150 @@
+"""Schema metadata cache of the RDBMS connectors."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The cached entries expire after 10 minutes even if no DDL change is detected
+_DEFAULT_SCHEMA_CACHE_TTL = 600
+# Probe the schema version at most once in this interval
+_DEFAULT_VERSION_CHECK_INTERVAL = 10
+
+_MISSING = object()
+
+
+class SchemaCache:
+    """The cache of the rendered table info, columns, indexes and sample rows.
+
+    The entries expire after ``ttl`` seconds. If the database exposes a cheap
+    schema version (a DDL counter, the last altered time or a catalog checksum),
+    all the entries are dropped once it changes.
+
+    Example:
+        .. code-block:: python
+
+            cache = SchemaCache(ttl=600)
+            cache.check_version(lambda: "42")
+            info = cache.get_or_load("table_info", "users", lambda: render("users"))
+    """
+
+    def __init__(
+        self,
+        ttl: float = _DEFAULT_SCHEMA_CACHE_TTL,
+        version_check_interval: float = _DEFAULT_VERSION_CHECK_INTERVAL,
+    ):
+        """Create a new SchemaCache.
+
+        Args:
+            ttl (float): The seconds the entries live.
+            version_check_interval (float): The min seconds between two schema
+                version probes.
+        """
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self._entries: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._lock = threading.RLock()
+        self._probe_lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._version_checked_at = 0.0
+
+    @property
+    def version(self) -> Optional[str]:
+        """Return the last seen schema version."""
+        return self._version
+
+    def get(self, kind: str, name: str) -> Any:
+        """Return the cached value, None if it is missing or expired."""
+        value = self._get(kind, name)
+        return None if value is _MISSING else value
+
+    def _get(self, kind: str, name: str) -> Any:
+        with self._lock:
+            entry = self._entries.get((kind, name))
+            if entry is None:
+                return _MISSING
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[(kind, name)]
+                return _MISSING
+            return entry[1]
+
+    def set(self, kind: str, name: str, value: Any) -> None:
+        """Cache the value."""
+        with self._lock:
+            self._entries[(kind, name)] = (time.monotonic(), value)
+
+    def get_or_load(self, kind: str, name: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value or load and cache it.
+
+        The loader runs outside the lock, two threads may load the same entry.
+        """
+        value = self._get(kind, name)
+        if value is _MISSING:
+            value = loader()
+            self.set(kind, name, value)
+        return value
+
+    def invalidate(self, names: Optional[Iterable[str]] = None) -> None:
+        """Drop the entries of the tables, all the entries if names is None."""
+        with self._lock:
+            if names is None:
+                self._entries.clear()
+                return
+            names = set(names)
+            for key in [key for key in self._entries if key[1] in names]:
+                del self._entries[key]
+
+    def check_version(
+        self, fetch_version: Callable[[], Optional[str]], force: bool = False
+    ) -> bool:
+        """Probe the schema version, drop all the entries if it changed.
+
+        The probe runs at most once in ``version_check_interval`` seconds unless
+        ``force``, it is skipped if the database has no schema version.
+
+        Returns:
+            bool: True if the schema changed since the last probe.
+        """
+        # The concurrent callers wait for the running probe instead of reading the
+        # entries it is about to drop
+        with self._probe_lock:
+            with self._lock:
+                if (
+                    not force
+                    and time.monotonic() - self._version_checked_at
+                    < self.version_check_interval
+                ):
+                    return False
+            try:
+                version = fetch_version()
+            except Exception as e:
+                logger.warning(f"Failed to probe the schema version: {e}")
+                return False
+            finally:
+                with self._lock:
+                    self._version_checked_at = time.monotonic()
+            if version is None:
+                return False
+            with self._lock:
+                old_version, self._version = self._version, version
+                if old_version is None or old_version == version:
+                    return False
+                logger.info(f"Schema version changed from {old_version} to {version}")
+                self._entries.clear()
+                return True
+
+
+_SHARED_SCHEMA_CACHES: Dict[str, SchemaCache] = {}
+_SHARED_SCHEMA_CACHES_LOCK = threading.Lock()
+
+
+def get_shared_schema_cache(key: str) -> SchemaCache:
+    """Return the schema cache shared by the connectors of the same database."""
+    with _SHARED_SCHEMA_CACHES_LOCK:
+        cache = _SHARED_SCHEMA_CACHES.get(key)
+        if cache is None:
+            cache = SchemaCache()
+            _SHARED_SCHEMA_CACHES[key] = cache
+        return cache
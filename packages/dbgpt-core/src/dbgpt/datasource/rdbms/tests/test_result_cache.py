@@ -0,0 +1,89 @@
+from ..result_cache import (
+    QueryResultCache,
+    extract_query_tables,
+    extract_write_tables,
+    get_shared_result_cache,
+    normalize_sql,
+)
+
+
+def test_normalize_sql():
+    assert normalize_sql("select *\n  from users; -- all users") == (
+        "SELECT * FROM users"
+    )
+    assert QueryResultCache.make_key("select * from users") == (
+        QueryResultCache.make_key("SELECT *   FROM users;")
+    )
+    assert QueryResultCache.make_key("select 1", {"a": 1}) != (
+        QueryResultCache.make_key("select 1", {"a": 2})
+    )
+
+
+def test_extract_tables():
+    assert extract_query_tables(
+        "SELECT * FROM main.users u JOIN `orders` o ON u.id = o.user_id"
+    ) == {"users", "orders"}
+    assert extract_query_tables("SELECT * FROM users FOR UPDATE") == set()
+    assert extract_query_tables("SELECT 1") == set()
+    # The queries whose tables are not all matched are not cacheable
+    assert extract_query_tables("SELECT * FROM a, b WHERE a.id = b.id") == set()
+    assert extract_query_tables("SELECT * FROM a x , s.b y") == set()
+    assert extract_query_tables("SELECT * FROM (SELECT id FROM a) t") == set()
+    assert extract_query_tables("SELECT * FROM a WHERE id IN (SELECT id FROM b)") == (
+        set()
+    )
+    assert extract_query_tables("WITH t AS (SELECT * FROM a) SELECT * FROM t") == (
+        set()
+    )
+    assert extract_query_tables("SELECT a, b FROM t WHERE c IN (1, 2)") == {"t"}
+    assert extract_query_tables("SELECT * FROM t GROUP BY a, b LIMIT 1, 2") == {"t"}
+    assert extract_write_tables("insert into Users(id) values (1)") == {"users"}
+    assert extract_write_tables("UPDATE users SET a = 1") == {"users"}
+    assert extract_write_tables("DELETE FROM s.users WHERE id = 1") == {"users"}
+    assert extract_write_tables("WITH t AS (SELECT 1) INSERT INTO a SELECT 1") == (
+        set()
+    )
+
+
+def test_get_put_and_ttl():
+    cache = QueryResultCache()
+    assert cache.put("k", {"users"}, ["id"], [(1,), (2,)])
+    columns, rows = cache.get("k")
+    assert columns == ["id"]
+    assert rows == [(1,), (2,)]
+    assert rows.cached_at > 0
+    assert not cache.put("k2", set(), ["id"], [(1,)])
+
+    cache.ttl = 0
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_size_bounded_eviction():
+    cache = QueryResultCache(max_entries=2, max_bytes=400)
+    cache.put("a", {"t"}, ["v"], [("x" * 50,)])
+    cache.put("b", {"t"}, ["v"], [("x" * 50,)])
+    # Touch a, b is the least recently used one
+    cache.get("a")
+    cache.put("c", {"t"}, ["v"], [("x" * 50,)])
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    # Larger than a quarter of the byte budget
+    assert not cache.put("d", {"t"}, ["v"], [("x" * 200,)])
+
+
+def test_invalidate_tables():
+    cache = QueryResultCache()
+    cache.put("a", {"users"}, ["id"], [(1,)])
+    cache.put("b", {"users", "orders"}, ["id"], [(1,)])
+    cache.put("c", {"orders"}, ["id"], [(1,)])
+    assert cache.invalidate_tables({"Users"}) == 2
+    assert cache.get("c") is not None
+    assert cache.invalidate_tables() == 1
+    assert len(cache) == 0
+
+
+def test_shared_result_cache():
+    cache = get_shared_result_cache("sqlite:///test_shared_result.db", ttl=10)
+    assert get_shared_result_cache("sqlite:///test_shared_result.db", ttl=5) is cache
+    assert cache.ttl == 5
@@ -0,0 +1,106 @@
+import threading
+from unittest.mock import Mock
+
+from ..schema_cache import SchemaCache, get_shared_schema_cache
+
+
+def test_get_or_load():
+    cache = SchemaCache()
+    loader = Mock(return_value="info")
+    assert cache.get_or_load("table_info", "a", loader) == "info"
+    assert cache.get_or_load("table_info", "a", loader) == "info"
+    loader.assert_called_once()
+    assert cache.get("table_info", "b") is None
+
+
+def test_ttl():
+    cache = SchemaCache(ttl=0)
+    cache.set("columns", "a", [])
+    assert cache.get("columns", "a") is None
+
+
+def test_invalidate():
+    cache = SchemaCache()
+    cache.set("columns", "a", [1])
+    cache.set("indexes", "a", [2])
+    cache.set("columns", "b", [3])
+    cache.invalidate(["a"])
+    assert cache.get("columns", "a") is None
+    assert cache.get("indexes", "a") is None
+    assert cache.get("columns", "b") == [3]
+    cache.invalidate()
+    assert cache.get("columns", "b") is None
+
+
+def test_check_version():
+    cache = SchemaCache(version_check_interval=0)
+    cache.set("columns", "a", [1])
+    assert not cache.check_version(lambda: "1")
+    assert cache.get("columns", "a") == [1]
+    assert not cache.check_version(lambda: "1")
+    assert cache.check_version(lambda: "2")
+    assert cache.version == "2"
+    assert cache.get("columns", "a") is None
+
+    # Not supported or failed probes keep the entries
+    cache.set("columns", "a", [1])
+    assert not cache.check_version(lambda: None)
+    assert not cache.check_version(Mock(side_effect=RuntimeError("down")))
+    assert cache.get("columns", "a") == [1]
+
+
+def test_check_version_interval():
+    cache = SchemaCache(version_check_interval=3600)
+    fetch_version = Mock(return_value="1")
+    cache.check_version(fetch_version)
+    cache.check_version(fetch_version)
+    fetch_version.assert_called_once()
+
+
+def test_shared_schema_cache():
+    assert get_shared_schema_cache("sqlite:///a.db#") is get_shared_schema_cache(
+        "sqlite:///a.db#"
+    )
+    assert get_shared_schema_cache("sqlite:///a.db#") is not get_shared_schema_cache(
+        "sqlite:///b.db#"
+    )
+
+
+def test_check_version_force():
+    cache = SchemaCache(version_check_interval=3600)
+    cache.check_version(lambda: "1")
+    assert not cache.check_version(lambda: "2")
+    assert cache.check_version(lambda: "2", force=True)
+
+
+def test_check_version_waits_running_probe():
+    cache = SchemaCache(version_check_interval=3600)
+    cache.check_version(lambda: "1")
+    cache.set("columns", "a", [1])
+    probing = threading.Event()
+    release = threading.Event()
+
+    def slow_fetch_version():
+        probing.set()
+        release.wait(5)
+        return "2"
+
+    probe = threading.Thread(
+        target=cache.check_version, args=(slow_fetch_version,), kwargs={"force": True}
+    )
+    probe.start()
+    probing.wait(5)
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(
+            (cache.check_version(lambda: "2"), cache.get("columns", "a"))
+        )
+    )
+    waiter.start()
+    waiter.join(0.1)
+    # The concurrent caller doesn't read the entries before the probe finishes
+    assert results == []
+    release.set()
+    probe.join(5)
+    waiter.join(5)
+    assert results == [(False, None)]
@@ -0,0 +1,137 @@
+"""The streaming result of a query."""
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+# The estimated size of a value which is not a string or bytes
+_FIXED_VALUE_BYTES = 8
+
+
+def estimate_row_bytes(row: Sequence[Any]) -> int:
+    """Estimate the size of a row, it is only used for the byte budget."""
+    size = 0
+    for value in row:
+        if isinstance(value, (str, bytes, bytearray)):
+            size += len(value)
+        else:
+            size += _FIXED_VALUE_BYTES
+    return size
+
+
+@dataclass
+class QueryResultChunk:
+    """A chunk of rows of a query result.
+
+    Example:
+        .. code-block:: python
+
+            for chunk in conn.query_stream("select * from users", batch_size=500):
+                render(chunk.columns, chunk.rows)
+                if chunk.truncated:
+                    break
+    """
+
+    columns: List[str]
+    rows: List[Sequence[Any]] = field(default_factory=list)
+    # The index of the first row of the chunk in the whole result
+    offset: int = 0
+    # The result is cut by the row or byte budget, it is the last chunk
+    truncated: bool = False
+
+    def to_arrow(self) -> Any:
+        """Convert the chunk to an Arrow record batch."""
+        pa = _import_pyarrow()
+        return pa.RecordBatch.from_arrays(
+            _to_arrow_arrays(pa, self.rows, len(self.columns)), names=self.columns
+        )
+
+    def to_df(self) -> Any:
+        """Convert the chunk to a pandas DataFrame."""
+        return chunks_to_df([self], self.columns)
+
+
+def iter_result_chunks(
+    columns: List[str],
+    rows: Iterator[Sequence[Any]],
+    batch_size: int = 1000,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Iterator[QueryResultChunk]:
+    """Split the rows into chunks, stop at the row or byte budget.
+
+    Args:
+        columns (List[str]): The column names
+        rows (Iterator[Sequence[Any]]): The rows, they are consumed lazily
+        batch_size (int): The max rows of a chunk
+        max_rows (Optional[int]): The row budget
+        max_bytes (Optional[int]): The byte budget, the row crossing it is kept
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    offset = 0
+    total_bytes = 0
+    chunk = QueryResultChunk(columns=columns)
+    for row in rows:
+        if max_rows is not None and offset >= max_rows:
+            chunk.truncated = True
+            break
+        if max_bytes is not None and total_bytes >= max_bytes:
+            chunk.truncated = True
+            break
+        chunk.rows.append(row)
+        offset += 1
+        if max_bytes is not None:
+            total_bytes += estimate_row_bytes(row)
+        if len(chunk.rows) >= batch_size:
+            yield chunk
+            chunk = QueryResultChunk(columns=columns, offset=offset)
+    if chunk.rows or chunk.truncated or offset == 0:
+        yield chunk
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for the Arrow result, please install it by "
+            "running `pip install pyarrow`"
+        )
+    return pa
+
+
+def _to_arrow_arrays(pa: Any, rows: List[Sequence[Any]], num_columns: int) -> List:
+    return [pa.array([row[i] for row in rows]) for i in range(num_columns)]
+
+
+def to_arrow_table(chunks: Iterable[QueryResultChunk], columns: List[str]) -> Any:
+    """Build an Arrow table from the chunks, every column is one typed array."""
+    pa = _import_pyarrow()
+    rows = [row for chunk in chunks for row in chunk.rows]
+    return pa.Table.from_arrays(_to_arrow_arrays(pa, rows, len(columns)), names=columns)
+
+
+def chunks_to_df(
+    chunks: Iterable[QueryResultChunk], columns: Optional[List[str]] = None
+) -> Any:
+    """Build a pandas DataFrame from the chunks.
+
+    The rows are converted by Arrow if pyarrow is installed, it avoids the python
+    objects of the numeric columns. Otherwise the DataFrame is built from the rows.
+    """
+    import pandas as pd
+
+    chunks = list(chunks)
+    if columns is None:
+        columns = chunks[0].columns if chunks else []
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        rows = [row for chunk in chunks for row in chunk.rows]
+        return pd.DataFrame.from_records(rows, columns=columns)
+    try:
+        return to_arrow_table(chunks, columns).to_pandas()
+    except (TypeError, ValueError, ArithmeticError):
+        # Mixed types in a column, fall back to the python objects
+        rows = [row for chunk in chunks for row in chunk.rows]
+        return pd.DataFrame.from_records(rows, columns=columns)
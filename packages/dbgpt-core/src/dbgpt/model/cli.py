@@ -10,6 +10,7 @@ from dbgpt.model.base import WorkerApplyType
 from dbgpt.model.parameter import (
     BaseParameters,
     ModelWorkerParameters,
+    WorkerHttpClientParameters,
 )
 from dbgpt.util import get_or_create_event_loop
 from dbgpt.util.command_utils import (
@@ -32,11 +33,15 @@ logger = logging.getLogger("dbgpt_cli")
 cl = CliLogger()
 
 
-def _get_worker_manager(address: str):
+def _get_worker_manager(
+    address: str, client_params: Optional[WorkerHttpClientParameters] = None
+):
     from dbgpt.model.cluster import ModelRegistryClient, RemoteWorkerManager
 
     registry = ModelRegistryClient(address)
-    worker_manager = RemoteWorkerManager(registry)
+    # The model commands have no config file, use the default client parameters
+    # if not provided
+    worker_manager = RemoteWorkerManager(registry, client_params=client_params)
     return worker_manager
 
 
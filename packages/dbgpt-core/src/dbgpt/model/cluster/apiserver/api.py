@@ -48,7 +48,11 @@ from dbgpt.core.schema.api import (
 from dbgpt.model.base import ModelInstance
 from dbgpt.model.cluster.manager_base import WorkerManager, WorkerManagerFactory
 from dbgpt.model.cluster.registry import ModelRegistry
-from dbgpt.model.parameter import ModelAPIServerParameters, WorkerType
+from dbgpt.model.parameter import (
+    ModelAPIServerParameters,
+    WorkerHttpClientParameters,
+    WorkerType,
+)
 from dbgpt.util.chat_util import transform_to_sse
 from dbgpt.util.fastapi import build_cors_config, create_app
 from dbgpt.util.tracer import initialize_tracer, root_tracer, trace
@@ -802,7 +806,11 @@ async def create_relevance(
     )
 
 
-def _initialize_all(controller_addr: str, system_app: SystemApp):
+def _initialize_all(
+    controller_addr: str,
+    system_app: SystemApp,
+    client_params: Optional[WorkerHttpClientParameters] = None,
+):
     from dbgpt.model.cluster.controller.controller import ModelRegistryClient
     from dbgpt.model.cluster.worker.manager import _DefaultWorkerManagerFactory
     from dbgpt.model.cluster.worker.remote_manager import RemoteWorkerManager
@@ -818,7 +826,7 @@ def _initialize_all(controller_addr: str, system_app: SystemApp):
     registry = system_app.get_component(
         ComponentType.MODEL_REGISTRY, ModelRegistry, default_component=None
     )
-    worker_manager = RemoteWorkerManager(registry)
+    worker_manager = RemoteWorkerManager(registry, client_params=client_params)
 
     # Register worker manager component if not exist
     system_app.get_component(
@@ -891,7 +899,11 @@ def initialize_apiserver(
         logger.warning(message)
         return create_error_response(ErrorCode.VALIDATION_TYPE_ERROR, message)
 
-    _initialize_all(apiserver_params.controller_addr, system_app)
+    _initialize_all(
+        apiserver_params.controller_addr,
+        system_app,
+        client_params=apiserver_params.http_client,
+    )
 
     if not embedded_mod:
         import uvicorn
@@ -12,7 +12,7 @@ from dbgpt.core.interface.llm import (
     ModelRequest,
 )
 from dbgpt.model.cluster.manager_base import WorkerManager
-from dbgpt.model.parameter import WorkerType
+from dbgpt.model.parameter import WorkerHttpClientParameters, WorkerType
 from dbgpt.util.i18n_utils import _
 
 
@@ -147,6 +147,8 @@ class RemoteLLMClient(DefaultLLMClient):
         controller_address (str): model controller address
         auto_convert_message (bool, optional): auto convert the message to
             ModelRequest. Defaults to False.
+        client_params (WorkerHttpClientParameters, optional): the parameters of
+            the HTTP clients to call the remote model workers. Defaults to None.
 
     If you start DB-GPT model cluster, the controller address is the address of the
     Model Controller(`dbgpt start controller`, the default port of model controller
@@ -161,10 +163,13 @@ class RemoteLLMClient(DefaultLLMClient):
         self,
         controller_address: str = "http://127.0.0.1:8000",
         auto_convert_message: bool = True,
+        client_params: Optional[WorkerHttpClientParameters] = None,
     ):
         """Initialize the RemoteLLMClient."""
         from dbgpt.model.cluster import ModelRegistryClient, RemoteWorkerManager
 
         model_registry_client = ModelRegistryClient(controller_address)
-        worker_manager = RemoteWorkerManager(model_registry_client)
+        worker_manager = RemoteWorkerManager(
+            model_registry_client, client_params=client_params
+        )
         super().__init__(worker_manager, auto_convert_message)
@@ -19,6 +19,10 @@ class RemoteEmbeddings(Embeddings):
         """Embed query text."""
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed multiple query texts in one call."""
+        return self.embed_documents(texts)
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs."""
         params = {"model": self.model_name, "input": texts}
@@ -29,6 +33,10 @@ class RemoteEmbeddings(Embeddings):
         result = await self.aembed_documents([text])
         return result[0]
 
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed multiple query texts in one call."""
+        return await self.aembed_documents(texts)
+
 
 class RemoteRerankEmbeddings(RerankEmbeddings):
     def __init__(self, model_name: str, worker_manager: WorkerManager) -> None:
@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 from concurrent.futures import Future
 from dataclasses import dataclass
 from datetime import datetime
-from typing import AsyncIterator, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from dbgpt.core import ModelMetadata, ModelOutput
@@ -165,6 +165,10 @@ class WorkerManager(ABC):
     ) -> List[ParameterDescription]:
         """Get parameter descriptions of model"""
 
+    def metrics(self) -> Dict[str, Any]:
+        """Return the metrics of the worker manager, like the load of the instances"""
+        return {}
+
 
 class WorkerManagerFactory(BaseComponent, ABC):
     name = ComponentType.WORKER_MANAGER_FACTORY.value
@@ -0,0 +1,300 @@
+"""Select one instance from the instances of a model.
+
+The selectors are shared by the worker managers (select
+:class:`~dbgpt.model.cluster.manager_base.WorkerRunData`) and the model registry
+(select :class:`~dbgpt.model.base.ModelInstance`). The load of every instance is
+recorded by a :class:`InstanceLoadTracker` when the instance is used.
+"""
+
+import bisect
+import hashlib
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from dbgpt.model.parameter import InstanceSelectStrategy
+
+T = TypeVar("T")
+
+
+def instance_key(instance: Any) -> str:
+    """Return the key of a model instance, like "vicuna@llm/127.0.0.1:8001".
+
+    Args:
+        instance (Any): The WorkerRunData or ModelInstance.
+    """
+    name = getattr(instance, "worker_key", None) or getattr(instance, "model_name", "")
+    return f"{name}/{instance.host}:{instance.port}"
+
+
+@dataclass
+class InstanceLoad:
+    """The load of one model instance."""
+
+    in_flight: int = 0
+    total_requests: int = 0
+    errors: int = 0
+    ewma_latency_ms: Optional[float] = None
+
+
+class InstanceLoadTracker:
+    """Record the in-flight requests and the latency of the model instances."""
+
+    def __init__(self, ewma_alpha: float = 0.3) -> None:
+        """Create an InstanceLoadTracker.
+
+        Args:
+            ewma_alpha (float, optional): The weight of the latest latency in the
+                exponentially weighted moving average. Defaults to 0.3.
+        """
+        self._ewma_alpha = ewma_alpha
+        self._loads: Dict[str, InstanceLoad] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> InstanceLoad:
+        """Return the load of the instance."""
+        with self._lock:
+            load = self._loads.get(key)
+            return InstanceLoad(**load.__dict__) if load else InstanceLoad()
+
+    def in_flight(self, key: str) -> int:
+        """Return the in-flight requests of the instance."""
+        load = self._loads.get(key)
+        return load.in_flight if load else 0
+
+    def ewma_latency_ms(self, key: str) -> Optional[float]:
+        """Return the moving average latency of the instance."""
+        load = self._loads.get(key)
+        return load.ewma_latency_ms if load else None
+
+    def begin(self, key: str) -> None:
+        """Record a request sent to the instance."""
+        with self._lock:
+            load = self._loads.setdefault(key, InstanceLoad())
+            load.in_flight += 1
+            load.total_requests += 1
+
+    def end(self, key: str, latency_ms: float, error: bool = False) -> None:
+        """Record a request of the instance is finished."""
+        with self._lock:
+            load = self._loads.setdefault(key, InstanceLoad())
+            load.in_flight = max(0, load.in_flight - 1)
+            if error:
+                load.errors += 1
+            if load.ewma_latency_ms is None:
+                load.ewma_latency_ms = latency_ms
+            else:
+                load.ewma_latency_ms = (
+                    self._ewma_alpha * latency_ms
+                    + (1 - self._ewma_alpha) * load.ewma_latency_ms
+                )
+
+    @contextmanager
+    def track(self, key: str) -> Iterator[None]:
+        """Track a request of the instance.
+
+        Examples:
+            .. code-block:: python
+
+                tracker = InstanceLoadTracker()
+                with tracker.track("vicuna@llm/127.0.0.1:8001"):
+                    assert tracker.in_flight("vicuna@llm/127.0.0.1:8001") == 1
+                assert tracker.in_flight("vicuna@llm/127.0.0.1:8001") == 0
+        """
+        start = time.perf_counter()
+        self.begin(key)
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.end(key, (time.perf_counter() - start) * 1000, error=error)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the load of all instances."""
+        with self._lock:
+            return {key: dict(load.__dict__) for key, load in self._loads.items()}
+
+
+class InstanceSelector(ABC):
+    """Select one instance from the instances of a model."""
+
+    def __init__(self, tracker: Optional[InstanceLoadTracker] = None) -> None:
+        """Create an InstanceSelector.
+
+        Args:
+            tracker (Optional[InstanceLoadTracker], optional): The load tracker.
+                Defaults to None, create a new one.
+        """
+        self.tracker = tracker or InstanceLoadTracker()
+
+    @abstractmethod
+    def select(self, instances: Sequence[T], hash_key: Optional[str] = None) -> T:
+        """Select one instance.
+
+        Args:
+            instances (Sequence[T]): The candidate instances, not empty.
+            hash_key (Optional[str], optional): The key of the request used to
+                select the same instance, like the conversation id. Defaults to None.
+
+        Returns:
+            T: The selected instance.
+        """
+
+    def _load_score(self, instance: Any) -> float:
+        weight = getattr(instance, "weight", None) or 1.0
+        return self.tracker.in_flight(instance_key(instance)) / weight
+
+    def _min_by_score(self, instances: Sequence[T], score_func) -> T:
+        best: List[T] = []
+        best_score = None
+        for instance in instances:
+            score = score_func(instance)
+            if best_score is None or score < best_score:
+                best, best_score = [instance], score
+            elif score == best_score:
+                best.append(instance)
+        return random.choice(best)
+
+
+class RandomSelector(InstanceSelector):
+    """Select an instance randomly."""
+
+    def select(self, instances: Sequence[T], hash_key: Optional[str] = None) -> T:
+        """Select an instance randomly."""
+        return random.choice(instances)
+
+
+class LeastRequestsSelector(InstanceSelector):
+    """Select the instance with the least in-flight requests (per weight)."""
+
+    def select(self, instances: Sequence[T], hash_key: Optional[str] = None) -> T:
+        """Select the least loaded instance, the ties are broken randomly."""
+        return self._min_by_score(instances, self._load_score)
+
+
+class PowerOfTwoSelector(InstanceSelector):
+    """Select the less loaded instance of two random instances.
+
+    It is almost as good as the least requests strategy, but it doesn't send all
+    the concurrent requests to the same instance when the load is not updated yet.
+    """
+
+    def select(self, instances: Sequence[T], hash_key: Optional[str] = None) -> T:
+        """Select the less loaded of two random instances."""
+        if len(instances) <= 2:
+            return self._min_by_score(instances, self._load_score)
+        first, second = random.sample(list(instances), 2)
+        return self._min_by_score([first, second], self._load_score)
+
+
+class EwmaLatencySelector(InstanceSelector):
+    """Select the instance with the lowest expected latency.
+
+    The expected latency is the moving average latency multiplied by the pending
+    requests, the instances never used are selected first.
+    """
+
+    def select(self, instances: Sequence[T], hash_key: Optional[str] = None) -> T:
+        """Select the instance with the lowest expected latency."""
+
+        def _score(instance: Any) -> float:
+            key = instance_key(instance)
+            latency = self.tracker.ewma_latency_ms(key)
+            if latency is None:
+                return 0.0
+            return latency * (self.tracker.in_flight(key) + 1)
+
+        return self._min_by_score(instances, _score)
+
+
+class ConsistentHashSelector(InstanceSelector):
+    """Select the instance by the consistent hashing of the request key.
+
+    The requests of the same conversation go to the same instance, so the instance
+    can reuse the KV cache of the conversation. When an instance is added or
+    removed, just the conversations on it are moved. The requests without hash key
+    fall back to the least requests strategy.
+    """
+
+    def __init__(
+        self, tracker: Optional[InstanceLoadTracker] = None, virtual_nodes: int = 100
+    ) -> None:
+        """Create a ConsistentHashSelector.
+
+        Args:
+            tracker (Optional[InstanceLoadTracker], optional): The load tracker.
+            virtual_nodes (int, optional): The virtual nodes of every instance on the
+                hash ring. Defaults to 100.
+        """
+        super().__init__(tracker)
+        self._virtual_nodes = virtual_nodes
+        self._fallback = LeastRequestsSelector(self.tracker)
+        self._ring_cache: Dict[Tuple[str, ...], Tuple[List[int], List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def select(self, instances: Sequence[T], hash_key: Optional[str] = None) -> T:
+        """Select the instance of the hash key on the hash ring."""
+        if not hash_key or len(instances) == 1:
+            return self._fallback.select(instances, hash_key)
+        key_to_instance = {instance_key(i): i for i in instances}
+        hashes, keys = self._get_ring(tuple(sorted(key_to_instance)))
+        index = bisect.bisect(hashes, _hash(hash_key)) % len(hashes)
+        return key_to_instance[keys[index]]
+
+    def _get_ring(self, keys: Tuple[str, ...]) -> Tuple[List[int], List[str]]:
+        with self._lock:
+            ring = self._ring_cache.get(keys)
+            if ring is None:
+                points = sorted(
+                    (_hash(f"{key}#{i}"), key)
+                    for key in keys
+                    for i in range(self._virtual_nodes)
+                )
+                ring = ([p[0] for p in points], [p[1] for p in points])
+                if len(self._ring_cache) > 64:
+                    # The instances changed, drop the old rings
+                    self._ring_cache.clear()
+                self._ring_cache[keys] = ring
+            return ring
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+def create_selector(
+    strategy: Optional[str] = None, tracker: Optional[InstanceLoadTracker] = None
+) -> InstanceSelector:
+    """Create the instance selector of the strategy.
+
+    Args:
+        strategy (Optional[str], optional): The select strategy, one of
+            :class:`InstanceSelectStrategy`. Defaults to None, select randomly.
+        tracker (Optional[InstanceLoadTracker], optional): The load tracker.
+
+    Returns:
+        InstanceSelector: The instance selector.
+    """
+    strategy = strategy or InstanceSelectStrategy.RANDOM.value
+    try:
+        strategy_enum = InstanceSelectStrategy(strategy)
+    except ValueError:
+        raise ValueError(
+            f"Unsupported select strategy '{strategy}', valid values are "
+            f"{InstanceSelectStrategy.values()}"
+        )
+    selector_cls = {
+        InstanceSelectStrategy.RANDOM: RandomSelector,
+        InstanceSelectStrategy.LEAST_REQUESTS: LeastRequestsSelector,
+        InstanceSelectStrategy.POWER_OF_TWO: PowerOfTwoSelector,
+        InstanceSelectStrategy.EWMA_LATENCY: EwmaLatencySelector,
+        InstanceSelectStrategy.CONSISTENT_HASH: ConsistentHashSelector,
+    }[strategy_enum]
+    return selector_cls(tracker)
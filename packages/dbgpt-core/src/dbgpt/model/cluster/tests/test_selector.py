@@ -0,0 +1,96 @@
+from collections import Counter
+
+import pytest
+
+from dbgpt.model.base import ModelInstance
+from dbgpt.model.cluster.selector import (
+    ConsistentHashSelector,
+    EwmaLatencySelector,
+    InstanceLoadTracker,
+    LeastRequestsSelector,
+    PowerOfTwoSelector,
+    create_selector,
+    instance_key,
+)
+from dbgpt.model.parameter import InstanceSelectStrategy
+
+
+def _instances(n: int):
+    return [
+        ModelInstance(model_name="test@llm", host="127.0.0.1", port=8000 + i)
+        for i in range(n)
+    ]
+
+
+def test_tracker_track():
+    tracker = InstanceLoadTracker()
+    with tracker.track("a"):
+        assert tracker.in_flight("a") == 1
+    with pytest.raises(ValueError):
+        with tracker.track("a"):
+            raise ValueError("error")
+    load = tracker.get("a")
+    assert load.in_flight == 0
+    assert load.total_requests == 2
+    assert load.errors == 1
+    assert load.ewma_latency_ms is not None
+    assert tracker.snapshot()["a"]["total_requests"] == 2
+
+
+def test_least_requests():
+    instances = _instances(3)
+    tracker = InstanceLoadTracker()
+    tracker.begin(instance_key(instances[0]))
+    tracker.begin(instance_key(instances[2]))
+    selector = LeastRequestsSelector(tracker)
+    for _ in range(10):
+        assert selector.select(instances) is instances[1]
+
+
+def test_power_of_two_avoid_busiest():
+    instances = _instances(3)
+    tracker = InstanceLoadTracker()
+    for _ in range(5):
+        tracker.begin(instance_key(instances[0]))
+    selector = PowerOfTwoSelector(tracker)
+    for _ in range(50):
+        assert selector.select(instances) is not instances[0]
+
+
+def test_ewma_latency():
+    instances = _instances(2)
+    tracker = InstanceLoadTracker()
+    tracker.end(instance_key(instances[0]), latency_ms=100)
+    tracker.end(instance_key(instances[1]), latency_ms=10)
+    selector = EwmaLatencySelector(tracker)
+    assert selector.select(instances) is instances[1]
+    # Instances never used are tried first
+    new_instances = instances + _instances(3)[2:]
+    assert selector.select(new_instances) is new_instances[2]
+
+
+def test_consistent_hash_affinity():
+    instances = _instances(4)
+    selector = ConsistentHashSelector()
+    selected = {
+        f"conv-{i}": instance_key(selector.select(instances, hash_key=f"conv-{i}"))
+        for i in range(200)
+    }
+    for conv_uid, key in selected.items():
+        # The same conversation always goes to the same instance
+        assert instance_key(selector.select(instances, hash_key=conv_uid)) == key
+    assert len(Counter(selected.values())) == 4
+
+    # Remove one instance, just the conversations on it are moved
+    removed = instance_key(instances[0])
+    for conv_uid, key in selected.items():
+        new_key = instance_key(selector.select(instances[1:], hash_key=conv_uid))
+        if key != removed:
+            assert new_key == key
+
+
+def test_create_selector():
+    for strategy in InstanceSelectStrategy.values():
+        assert create_selector(strategy).select(_instances(2)) is not None
+    with pytest.raises(ValueError):
+        create_selector("not_exist")
@@ -0,0 +1,226 @@
+"""Pooled HTTP clients for the remote model workers.
+
+Every worker address has one shared ``httpx.AsyncClient``, so the requests to the
+same worker reuse the keep-alive connections instead of creating a new connection
+(and TLS handshake) per request.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional, Tuple
+
+from dbgpt.model.parameter import WorkerHttpClientParameters
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ClientStats:
+    requests: int = 0
+    in_flight: int = 0
+    errors: int = 0
+
+
+class WorkerHttpClientPool:
+    """The pool of the shared HTTP clients, one client per worker address."""
+
+    def __init__(self, params: Optional[WorkerHttpClientParameters] = None) -> None:
+        """Create a WorkerHttpClientPool.
+
+        Args:
+            params (Optional[WorkerHttpClientParameters], optional): The client
+                parameters. Defaults to None, use the default parameters.
+        """
+        self._params = params or WorkerHttpClientParameters()
+        # Clients can't be shared across event loops, so the key is the address and
+        # the event loop which created the client.
+        self._clients: Dict[
+            Tuple[str, int], Tuple["httpx.AsyncClient", asyncio.AbstractEventLoop]
+        ] = {}
+        self._stats: Dict[str, _ClientStats] = {}
+        # The workers using the clients of every address, the clients are closed
+        # when the last one releases them
+        self._owners: Dict[str, "weakref.WeakSet[Any]"] = {}
+        self._clients_created = 0
+        self._lock = threading.Lock()
+
+    def get_client(self, address: str) -> "httpx.AsyncClient":
+        """Get the shared client of the worker address in current event loop.
+
+        Args:
+            address (str): The worker address, like "http://127.0.0.1:8001".
+
+        Returns:
+            httpx.AsyncClient: The shared client.
+        """
+        # Lazy import to avoid high time cost
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        key = (address, id(loop))
+        with self._lock:
+            item = self._clients.get(key)
+            if item and item[1] is loop and not item[0].is_closed:
+                return item[0]
+            params = self._params
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=params.max_connections,
+                    max_keepalive_connections=params.max_keepalive_connections,
+                    keepalive_expiry=params.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(None, connect=params.connect_timeout),
+            )
+            self._clients[key] = (client, loop)
+            self._clients_created += 1
+            logger.debug(f"Create HTTP client for worker {address}")
+            return client
+
+    @asynccontextmanager
+    async def request(self, address: str) -> AsyncIterator["httpx.AsyncClient"]:
+        """Borrow the shared client of the worker address and record the metrics.
+
+        Examples:
+            .. code-block:: python
+
+                async with pool.request("http://127.0.0.1:8001") as client:
+                    response = await client.post(
+                        "http://127.0.0.1:8001/api/worker/count_token",
+                        json={"prompt": "hello"},
+                    )
+        """
+        client = self.get_client(address)
+        stats = self._stats.setdefault(address, _ClientStats())
+        stats.requests += 1
+        stats.in_flight += 1
+        try:
+            yield client
+        except (GeneratorExit, asyncio.CancelledError):
+            # The stream is closed or cancelled by the caller, it is not an error
+            raise
+        except BaseException:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the metrics of the pool.
+
+        Returns:
+            Dict[str, Any]: The metrics, the "workers" item contains the requests,
+                in-flight requests, errors and open connections of every worker
+                address.
+        """
+        connections: Dict[str, int] = {}
+        with self._lock:
+            for (address, _loop_id), (client, _loop) in self._clients.items():
+                connections[address] = connections.get(address, 0) + _count_connections(
+                    client
+                )
+            clients_created = self._clients_created
+            open_clients = len(self._clients)
+        workers = {}
+        for address, stats in self._stats.items():
+            workers[address] = {
+                "requests": stats.requests,
+                "in_flight": stats.in_flight,
+                "errors": stats.errors,
+                "connections": connections.get(address, 0),
+            }
+        return {
+            "clients_created": clients_created,
+            "open_clients": open_clients,
+            "workers": workers,
+        }
+
+    def acquire(self, address: str, owner: Any) -> None:
+        """Register the owner as a user of the clients of the worker address.
+
+        The owner is weakly referenced, an owner which is garbage collected without
+        :meth:`release` doesn't keep the clients open.
+
+        Args:
+            address (str): The worker address.
+            owner (Any): The user of the clients, like a remote model worker.
+        """
+        with self._lock:
+            self._owners.setdefault(address, weakref.WeakSet()).add(owner)
+
+    def release(self, address: str, owner: Any) -> None:
+        """Release the clients of the worker address acquired by the owner.
+
+        The clients are closed when no other owner uses them. It can be called in
+        any thread, the clients are closed in the event loops which created them.
+        """
+        with self._lock:
+            owners = self._owners.get(address)
+            if owners is not None:
+                owners.discard(owner)
+                if owners:
+                    return
+                del self._owners[address]
+            keys = [key for key in self._clients if key[0] == address]
+            items = [self._clients.pop(key) for key in keys]
+        for client, loop in items:
+            _close_client_in_loop(client, loop)
+
+    async def aclose(self) -> None:
+        """Close all the clients."""
+        with self._lock:
+            items = list(self._clients.values())
+            self._clients.clear()
+        try:
+            current_loop: Optional[asyncio.AbstractEventLoop] = (
+                asyncio.get_running_loop()
+            )
+        except RuntimeError:
+            current_loop = None
+        for client, loop in items:
+            if loop is current_loop:
+                await client.aclose()
+            else:
+                _close_client_in_loop(client, loop)
+
+
+def _count_connections(client: "httpx.AsyncClient") -> int:
+    # httpx does not expose the connection pool, read it from the transport of
+    # httpcore in best effort.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    return len(connections) if connections is not None else 0
+
+
+def _close_client_in_loop(
+    client: "httpx.AsyncClient", loop: asyncio.AbstractEventLoop
+) -> None:
+    if client.is_closed or loop.is_closed():
+        return
+    try:
+        running_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        loop.create_task(client.aclose())
+    else:
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+_default_pool: Optional[WorkerHttpClientPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_client_pool() -> WorkerHttpClientPool:
+    """Get the default client pool shared by all the remote model workers."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = WorkerHttpClientPool()
+        return _default_pool
@@ -3,7 +3,6 @@ import itertools
 import json
 import logging
 import os
-import random
 import sys
 import time
 import traceback
@@ -41,6 +40,11 @@ from dbgpt.model.cluster.manager_base import (
     WorkerRunData,
 )
 from dbgpt.model.cluster.registry import ModelRegistry
+from dbgpt.model.cluster.selector import (
+    InstanceLoadTracker,
+    create_selector,
+    instance_key,
+)
 from dbgpt.model.cluster.storage import ModelStorage, ModelStorageItem
 from dbgpt.model.cluster.worker_base import ModelWorker
 from dbgpt.model.parameter import (
@@ -85,6 +89,17 @@ async def _async_heartbeat_sender(
             await asyncio.sleep(heartbeat_interval)
 
 
+def _get_hash_key(params: Dict) -> Optional[str]:
+    """Get the conversation id of the request, it is the key of the consistent
+    hashing strategy."""
+    context = params.get("context")
+    if not context:
+        return None
+    if isinstance(context, dict):
+        return context.get("conv_uid")
+    return getattr(context, "conv_uid", None)
+
+
 class LocalWorkerManager(WorkerManager):
     def __init__(
         self,
@@ -95,6 +110,7 @@ class LocalWorkerManager(WorkerManager):
         host: str = None,
         port: int = None,
         model_storage: Optional[ModelStorage] = None,
+        select_strategy: Optional[str] = None,
     ) -> None:
         """Create a LocalWorkerManager instance.
 
@@ -109,6 +125,10 @@ class LocalWorkerManager(WorkerManager):
             port (int, optional): Port. Defaults to None.
             model_storage (Optional[ModelStorage], optional): Model storage. Defaults
                 to None. It is used to store model metadata.
+            select_strategy (Optional[str], optional): The strategy to select one
+                instance of a model, see
+                :class:`~dbgpt.model.parameter.InstanceSelectStrategy`. Defaults to
+                None, select randomly.
         """
         self.workers: Dict[str, List[WorkerRunData]] = dict()
         self.executor = ThreadPoolExecutor(max_workers=os.cpu_count() * 5)
@@ -120,6 +140,10 @@ class LocalWorkerManager(WorkerManager):
         self.port = port
         self.model_storage = model_storage
         self.start_listeners = []
+        # The in-flight requests and latency of every instance, used by the load
+        # aware select strategies
+        self.load_tracker = InstanceLoadTracker()
+        self.selector = create_selector(select_strategy, self.load_tracker)
 
         self.run_data = WorkerRunData(
             host=self.host,
@@ -403,43 +427,63 @@ class LocalWorkerManager(WorkerManager):
         return self.workers.get(worker_key, [])
 
     def _simple_select(
-        self, worker_type: str, model_name: str, worker_instances: List[WorkerRunData]
+        self,
+        worker_type: str,
+        model_name: str,
+        worker_instances: List[WorkerRunData],
+        hash_key: Optional[str] = None,
     ) -> WorkerRunData:
         if not worker_instances:
             raise Exception(
                 f"Cound not found worker instances for model name {model_name} and "
                 f"worker type {worker_type}"
             )
-        worker_run_data = random.choice(worker_instances)
-        return worker_run_data
+        return self.selector.select(worker_instances, hash_key=hash_key)
 
     async def select_one_instance(
-        self, worker_type: str, model_name: str, healthy_only: bool = True
+        self,
+        worker_type: str,
+        model_name: str,
+        healthy_only: bool = True,
+        hash_key: Optional[str] = None,
     ) -> WorkerRunData:
         worker_instances = await self.get_model_instances(
             worker_type, model_name, healthy_only
         )
-        return self._simple_select(worker_type, model_name, worker_instances)
+        return self._simple_select(worker_type, model_name, worker_instances, hash_key)
 
     def sync_select_one_instance(
-        self, worker_type: str, model_name: str, healthy_only: bool = True
+        self,
+        worker_type: str,
+        model_name: str,
+        healthy_only: bool = True,
+        hash_key: Optional[str] = None,
     ) -> WorkerRunData:
         worker_instances = self.sync_get_model_instances(
             worker_type, model_name, healthy_only
         )
-        return self._simple_select(worker_type, model_name, worker_instances)
+        return self._simple_select(worker_type, model_name, worker_instances, hash_key)
 
     async def _get_model(self, params: Dict, worker_type: str = "llm") -> WorkerRunData:
         model = params.get("model")
         if not model:
             raise Exception("Model name count not be empty")
-        return await self.select_one_instance(worker_type, model, healthy_only=True)
+        return await self.select_one_instance(
+            worker_type, model, healthy_only=True, hash_key=_get_hash_key(params)
+        )
 
     def _sync_get_model(self, params: Dict, worker_type: str = "llm") -> WorkerRunData:
         model = params.get("model")
         if not model:
             raise Exception("Model name count not be empty")
-        return self.sync_select_one_instance(worker_type, model, healthy_only=True)
+        return self.sync_select_one_instance(
+            worker_type, model, healthy_only=True, hash_key=_get_hash_key(params)
+        )
+
+    def _track_load(self, worker_run_data: WorkerRunData):
+        """Record the request of the instance, include the waiting time of the
+        semaphore."""
+        return self.load_tracker.track(instance_key(worker_run_data))
 
     async def generate_stream(
         self, params: Dict, async_wrapper=None, **kwargs
@@ -457,21 +501,22 @@ class LocalWorkerManager(WorkerManager):
                     error_code=1,
                 )
                 return
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    async for outout in worker_run_data.worker.async_generate_stream(
-                        params
-                    ):
-                        yield outout
-                else:
-                    if not async_wrapper:
-                        from starlette.concurrency import iterate_in_threadpool
-
-                        async_wrapper = iterate_in_threadpool
-                    async for output in async_wrapper(
-                        worker_run_data.worker.generate_stream(params)
-                    ):
-                        yield output
+            with self._track_load(worker_run_data):
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        async for (
+                            outout
+                        ) in worker_run_data.worker.async_generate_stream(params):
+                            yield outout
+                    else:
+                        if not async_wrapper:
+                            from starlette.concurrency import iterate_in_threadpool
+
+                            async_wrapper = iterate_in_threadpool
+                        async for output in async_wrapper(
+                            worker_run_data.worker.generate_stream(params)
+                        ):
+                            yield output
 
     async def generate(self, params: Dict) -> ModelOutput:
         """Generate non stream result"""
@@ -486,13 +531,14 @@ class LocalWorkerManager(WorkerManager):
                     text=f"**LLMServer Generate Error, Please CheckErrorInfo.**: {e}",
                     error_code=1,
                 )
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    return await worker_run_data.worker.async_generate(params)
-                else:
-                    return await self.run_blocking_func(
-                        worker_run_data.worker.generate, params
-                    )
+            with self._track_load(worker_run_data):
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        return await worker_run_data.worker.async_generate(params)
+                    else:
+                        return await self.run_blocking_func(
+                            worker_run_data.worker.generate, params
+                        )
 
     async def embeddings(self, params: Dict) -> List[List[float]]:
         """Embed input"""
@@ -505,18 +551,20 @@ class LocalWorkerManager(WorkerManager):
                 worker_run_data = await self._get_model(params, worker_type=worker_type)
             except Exception as e:
                 raise e
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    return await worker_run_data.worker.async_embeddings(params)
-                else:
-                    return await self.run_blocking_func(
-                        worker_run_data.worker.embeddings, params
-                    )
+            with self._track_load(worker_run_data):
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        return await worker_run_data.worker.async_embeddings(params)
+                    else:
+                        return await self.run_blocking_func(
+                            worker_run_data.worker.embeddings, params
+                        )
 
     def sync_embeddings(self, params: Dict) -> List[List[float]]:
         worker_type = params.get("worker_type", WorkerType.TEXT2VEC.value)
         worker_run_data = self._sync_get_model(params, worker_type=worker_type)
-        return worker_run_data.worker.embeddings(params)
+        with self._track_load(worker_run_data):
+            return worker_run_data.worker.embeddings(params)
 
     async def count_token(self, params: Dict) -> int:
         """Count token of prompt"""
@@ -529,13 +577,14 @@ class LocalWorkerManager(WorkerManager):
             except Exception as e:
                 raise e
             prompt = params.get("prompt")
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    return await worker_run_data.worker.async_count_token(prompt)
-                else:
-                    return await self.run_blocking_func(
-                        worker_run_data.worker.count_token, prompt
-                    )
+            with self._track_load(worker_run_data):
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        return await worker_run_data.worker.async_count_token(prompt)
+                    else:
+                        return await self.run_blocking_func(
+                            worker_run_data.worker.count_token, prompt
+                        )
 
     async def get_model_metadata(self, params: Dict) -> ModelMetadata:
         """Get model metadata"""
@@ -547,13 +596,16 @@ class LocalWorkerManager(WorkerManager):
                 worker_run_data = await self._get_model(params)
             except Exception as e:
                 raise e
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    return await worker_run_data.worker.async_get_model_metadata(params)
-                else:
-                    return await self.run_blocking_func(
-                        worker_run_data.worker.get_model_metadata, params
-                    )
+            with self._track_load(worker_run_data):
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        return await worker_run_data.worker.async_get_model_metadata(
+                            params
+                        )
+                    else:
+                        return await self.run_blocking_func(
+                            worker_run_data.worker.get_model_metadata, params
+                        )
 
     async def worker_apply(self, apply_req: WorkerApplyRequest) -> WorkerApplyOutput:
         if apply_req.apply_type == WorkerApplyType.START:
@@ -582,6 +634,9 @@ class LocalWorkerManager(WorkerManager):
         worker_run_data = worker_instances[0]
         return worker_run_data.worker.parameter_descriptions()
 
+    def metrics(self) -> Dict[str, Any]:
+        return {"instances": self.load_tracker.snapshot()}
+
     async def _apply_worker(
         self, apply_req: WorkerApplyRequest, apply_func: ApplyFunction
     ) -> None:
@@ -851,6 +906,9 @@ class WorkerManagerAdapter(WorkerManager):
     ) -> List[ParameterDescription]:
         return await self.worker_manager.parameter_descriptions(worker_type, model_name)
 
+    def metrics(self) -> Dict[str, Any]:
+        return self.worker_manager.metrics()
+
 
 class _DefaultWorkerManagerFactory(WorkerManagerFactory):
     def __init__(
@@ -1066,7 +1124,10 @@ def _create_local_model_manager(
             f"controller_addr: {worker_params.controller_addr}"
         )
         return LocalWorkerManager(
-            host=register_host, port=port, model_storage=model_storage
+            host=register_host,
+            port=port,
+            model_storage=model_storage,
+            select_strategy=worker_params.select_strategy,
         )
     else:
         from dbgpt.model.cluster.controller.controller import ModelRegistryClient
@@ -1101,6 +1162,7 @@ def _create_local_model_manager(
             host=register_host,
             port=port,
             model_storage=model_storage,
+            select_strategy=worker_params.select_strategy,
         )
 
 
@@ -1275,7 +1337,11 @@ def initialize_worker_manager_in_client(
             raise ValueError("Controller can`t be None")
         logger.info(f"Worker params: {worker_params}")
         client = ModelRegistryClient(worker_params.controller_addr)
-        worker_manager.worker_manager = RemoteWorkerManager(client)
+        worker_manager.worker_manager = RemoteWorkerManager(
+            client,
+            client_params=worker_params.http_client,
+            select_strategy=worker_params.select_strategy,
+        )
         worker_manager.after_start(start_listener)
         initialize_controller(
             app=app,
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict, List, Optional
 
 from dbgpt.model.base import ModelInstance, WorkerApplyOutput, WorkerSupportedModel
 from dbgpt.model.cluster.base import (
@@ -9,14 +9,24 @@ from dbgpt.model.cluster.base import (
     WorkerStartupRequest,
 )
 from dbgpt.model.cluster.registry import ModelRegistry
+from dbgpt.model.cluster.worker.http_client import (
+    WorkerHttpClientParameters,
+    WorkerHttpClientPool,
+)
 from dbgpt.model.cluster.worker.manager import LocalWorkerManager, WorkerRunData, logger
 from dbgpt.model.cluster.worker.remote_worker import RemoteModelWorker
 from dbgpt.model.parameter import WorkerType
 
 
 class RemoteWorkerManager(LocalWorkerManager):
-    def __init__(self, model_registry: ModelRegistry = None) -> None:
-        super().__init__(model_registry=model_registry)
+    def __init__(
+        self,
+        model_registry: ModelRegistry = None,
+        client_params: Optional[WorkerHttpClientParameters] = None,
+        select_strategy: Optional[str] = None,
+    ) -> None:
+        super().__init__(model_registry=model_registry, select_strategy=select_strategy)
+        self.client_pool = WorkerHttpClientPool(client_params)
 
     async def start(self):
         for listener in self.start_listeners:
@@ -26,7 +36,12 @@ class RemoteWorkerManager(LocalWorkerManager):
                 listener(self)
 
     async def stop(self, ignore_exception: bool = False):
-        pass
+        await self.client_pool.aclose()
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics = super().metrics()
+        metrics["http_client"] = self.client_pool.metrics()
+        return metrics
 
     async def _fetch_from_worker(
         self,
@@ -39,14 +54,12 @@ class RemoteWorkerManager(LocalWorkerManager):
         success_handler: Callable = None,
         error_handler: Callable = None,
     ) -> Any:
-        # Lazy import to avoid high time cost
-        import httpx
-
-        url = worker_run_data.worker.worker_addr + endpoint
-        headers = {**worker_run_data.worker.headers, **(additional_headers or {})}
-        timeout = worker_run_data.worker.timeout
+        worker: RemoteModelWorker = worker_run_data.worker
+        url = worker.worker_addr + endpoint
+        headers = {**worker.headers, **(additional_headers or {})}
+        timeout = worker.timeout
 
-        async with httpx.AsyncClient() as client:
+        async with self.client_pool.request(worker.base_addr) as client:
             request = client.build_request(
                 method,
                 url,
@@ -146,7 +159,7 @@ class RemoteWorkerManager(LocalWorkerManager):
         return worker_instances
 
     def _build_single_worker_instance(self, model_name: str, instance: ModelInstance):
-        worker = RemoteModelWorker()
+        worker = RemoteModelWorker(client_pool=self.client_pool)
         worker.load_worker(model_name, host=instance.host, port=instance.port)
         wr = WorkerRunData(
             host=instance.host,
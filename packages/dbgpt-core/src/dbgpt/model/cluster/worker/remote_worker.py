@@ -1,8 +1,12 @@
 import json
 import logging
-from typing import Dict, Iterator, List
+from typing import Dict, Iterator, List, Optional
 
 from dbgpt.core import ModelMetadata, ModelOutput
+from dbgpt.model.cluster.worker.http_client import (
+    WorkerHttpClientPool,
+    get_default_client_pool,
+)
 from dbgpt.model.cluster.worker_base import ModelWorker
 from dbgpt.util.tracer import DBGPT_TRACER_SPAN_ID, root_tracer
 
@@ -10,16 +14,22 @@ logger = logging.getLogger(__name__)
 
 
 class RemoteModelWorker(ModelWorker):
-    def __init__(self) -> None:
+    def __init__(self, client_pool: Optional[WorkerHttpClientPool] = None) -> None:
         self.headers = {}
         # TODO Configured by ModelParameters
         self.timeout = 3600
         self.host = None
         self.port = None
+        # The HTTP clients are shared by all workers with the same address
+        self._client_pool = client_pool or get_default_client_pool()
+
+    @property
+    def base_addr(self) -> str:
+        return f"http://{self.host}:{self.port}"
 
     @property
     def worker_addr(self) -> str:
-        return f"http://{self.host}:{self.port}/api/worker"
+        return f"{self.base_addr}/api/worker"
 
     def support_async(self) -> bool:
         return True
@@ -28,15 +38,24 @@ class RemoteModelWorker(ModelWorker):
     #     return None
 
     def load_worker(self, model_name: str, **kwargs):
+        if self.host is not None:
+            self._client_pool.release(self.base_addr, self)
         self.host = kwargs.get("host")
         self.port = kwargs.get("port")
+        self._client_pool.acquire(self.base_addr, self)
 
     def start(self, command_args: List[str] = None) -> None:
         """Start model worker"""
         pass
 
     def stop(self) -> None:
-        raise NotImplementedError("Remote model worker not support stop methods")
+        """Release the shared HTTP clients of current worker address.
+
+        The clients are closed if no other worker of the address uses them. The
+        remote model is not stopped, a new client will be created by the next
+        request.
+        """
+        self._client_pool.release(self.base_addr, self)
 
     def generate_stream(self, params: Dict) -> Iterator[ModelOutput]:
         """Generate stream"""
@@ -44,9 +63,7 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_generate_stream(self, params: Dict) -> Iterator[ModelOutput]:
         """Asynchronous generate stream"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(self.base_addr) as client:
             delimiter = b"\0"
             buffer = b""
             url = self.worker_addr + "/generate_stream"
@@ -74,9 +91,7 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_generate(self, params: Dict) -> ModelOutput:
         """Asynchronous generate non stream"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(self.base_addr) as client:
             url = self.worker_addr + "/generate"
             logger.debug(f"Send async_generate to url {url}, params: {params}")
             response = await client.post(
@@ -93,9 +108,7 @@ class RemoteModelWorker(ModelWorker):
         raise NotImplementedError
 
     async def async_count_token(self, prompt: str) -> int:
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(self.base_addr) as client:
             url = self.worker_addr + "/count_token"
             logger.debug(f"Send async_count_token to url {url}, params: {prompt}")
             response = await client.post(
@@ -110,9 +123,7 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_get_model_metadata(self, params: Dict) -> ModelMetadata:
         """Asynchronously get model metadata"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(self.base_addr) as client:
             url = self.worker_addr + "/model_metadata"
             logger.debug(
                 f"Send async_get_model_metadata to url {url}, params: {params}"
@@ -149,9 +160,7 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_embeddings(self, params: Dict) -> List[List[float]]:
         """Asynchronous get embeddings for input"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(self.base_addr) as client:
             url = self.worker_addr + "/embeddings"
             logger.debug(f"Send async_embeddings to url {url}")
             response = await client.post(
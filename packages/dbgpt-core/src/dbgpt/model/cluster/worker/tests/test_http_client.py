@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from dbgpt.model.cluster.worker.http_client import (
+    WorkerHttpClientParameters,
+    WorkerHttpClientPool,
+)
+from dbgpt.model.cluster.worker.remote_worker import RemoteModelWorker
+
+
+@pytest_asyncio.fixture
+async def stub_worker():
+    async def count_token(request: web.Request):
+        data = await request.json()
+        return web.json_response(len(data["prompt"]))
+
+    async def embeddings(request: web.Request):
+        data = await request.json()
+        return web.json_response([[0.1, 0.2] for _ in data["input"]])
+
+    app = web.Application()
+    app.router.add_post("/api/worker/count_token", count_token)
+    app.router.add_post("/api/worker/embeddings", embeddings)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield "127.0.0.1", port
+    await runner.cleanup()
+
+
+def _new_worker(host: str, port: int, pool: WorkerHttpClientPool):
+    worker = RemoteModelWorker(client_pool=pool)
+    worker.load_worker("test-model", host=host, port=port)
+    return worker
+
+
+@pytest.mark.asyncio
+async def test_share_client_per_address():
+    pool = WorkerHttpClientPool()
+    client = pool.get_client("http://127.0.0.1:8001")
+    assert pool.get_client("http://127.0.0.1:8001") is client
+    assert pool.get_client("http://127.0.0.1:8002") is not client
+    await pool.aclose()
+    assert client.is_closed
+    assert pool.get_client("http://127.0.0.1:8001") is not client
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_worker_reuse_connection(stub_worker):
+    host, port = stub_worker
+    pool = WorkerHttpClientPool(WorkerHttpClientParameters(max_connections=10))
+    # Remote workers are created for every lookup, they share the same client
+    workers = [_new_worker(host, port, pool) for _ in range(3)]
+    for worker in workers:
+        assert await worker.async_count_token("hello") == 5
+    assert await workers[0].async_embeddings({"input": ["a", "b"]}) == [
+        [0.1, 0.2],
+        [0.1, 0.2],
+    ]
+    metrics = pool.metrics()
+    assert metrics["clients_created"] == 1
+    worker_metrics = metrics["workers"][f"http://{host}:{port}"]
+    assert worker_metrics["requests"] == 4
+    assert worker_metrics["in_flight"] == 0
+    assert worker_metrics["errors"] == 0
+    assert worker_metrics["connections"] == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_worker_stop_close_client(stub_worker):
+    host, port = stub_worker
+    pool = WorkerHttpClientPool()
+    worker = _new_worker(host, port, pool)
+    await worker.async_count_token("hello")
+    client = pool.get_client(worker.base_addr)
+    worker.stop()
+    await asyncio.sleep(0.01)
+    assert client.is_closed
+    assert pool.metrics()["open_clients"] == 0
+    # A new client is created by the next request
+    assert await worker.async_count_token("hi") == 2
+    assert pool.metrics()["clients_created"] == 2
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_worker_stop_shared_client(stub_worker):
+    host, port = stub_worker
+    pool = WorkerHttpClientPool()
+    worker1 = _new_worker(host, port, pool)
+    worker2 = _new_worker(host, port, pool)
+    await worker1.async_count_token("hello")
+    client = pool.get_client(worker1.base_addr)
+    worker1.stop()
+    await asyncio.sleep(0.01)
+    # The other worker still uses the client
+    assert not client.is_closed
+    assert await worker2.async_count_token("hi") == 2
+    worker2.stop()
+    await asyncio.sleep(0.01)
+    assert client.is_closed
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_record_errors():
+    pool = WorkerHttpClientPool()
+    worker = _new_worker("127.0.0.1", 1, pool)
+    with pytest.raises(Exception):
+        await worker.async_count_token("hello")
+    assert pool.metrics()["workers"]["http://127.0.0.1:1"]["errors"] == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_closed_stream_not_error():
+    pool = WorkerHttpClientPool()
+    address = "http://127.0.0.1:8001"
+
+    async def _stream():
+        async with pool.request(address):
+            yield 1
+            yield 2
+
+    stream = _stream()
+    assert await stream.__anext__() == 1
+    # The caller stops reading the stream
+    await stream.aclose()
+    worker_metrics = pool.metrics()["workers"][address]
+    assert worker_metrics["in_flight"] == 0
+    assert worker_metrics["errors"] == 0
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_worker_manager_metrics():
+    from dbgpt.model.cluster.worker.remote_manager import RemoteWorkerManager
+
+    manager = RemoteWorkerManager(
+        client_params=WorkerHttpClientParameters(max_connections=10)
+    )
+    assert manager.client_pool._params.max_connections == 10
+    metrics = manager.metrics()
+    assert metrics["instances"] == {}
+    assert metrics["http_client"]["workers"] == {}
+    await manager.stop()
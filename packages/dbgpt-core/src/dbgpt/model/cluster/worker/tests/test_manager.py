@@ -7,6 +7,7 @@ from dbgpt.model.adapter.hf_adapter import HFLLMDeployModelParameters
 from dbgpt.model.base import WorkerApplyType
 from dbgpt.model.cluster.base import WorkerApplyRequest, WorkerStartupRequest
 from dbgpt.model.cluster.manager_base import WorkerRunData
+from dbgpt.model.cluster.selector import create_selector
 from dbgpt.model.cluster.tests.conftest import (  # noqa
     _create_workers,
     _new_worker_params,
@@ -17,7 +18,11 @@ from dbgpt.model.cluster.tests.conftest import (  # noqa
 )
 from dbgpt.model.cluster.worker.manager import LocalWorkerManager, _build_worker  # noqa
 from dbgpt.model.cluster.worker_base import ModelWorker
-from dbgpt.model.parameter import ModelWorkerParameters, WorkerType
+from dbgpt.model.parameter import (
+    InstanceSelectStrategy,
+    ModelWorkerParameters,
+    WorkerType,
+)
 
 _TEST_MODEL_NAME = "vicuna-13b-v1.5"
 _TEST_MODEL_PATH = "/app/models/vicuna-13b-v1.5"
@@ -387,6 +392,53 @@ async def test__get_model(
         assert wr is not None
 
 
+@pytest.mark.asyncio
+async def test_select_one_instance_consistent_hash():
+    workers = _create_workers(1)
+    async with _start_worker_manager(workers=[], stop=False) as manager:
+        manager.selector = create_selector(
+            InstanceSelectStrategy.CONSISTENT_HASH.value, manager.load_tracker
+        )
+        wk, worker_params, _ = workers[0]
+        worker_key = manager._worker_key(wk.worker_type(), worker_params.name)
+        manager.workers[worker_key] = [
+            WorkerRunData(
+                host="127.0.0.1",
+                port=8001 + i,
+                worker_type=wk.worker_type(),
+                worker_key=worker_key,
+                worker=wk,
+                worker_params=None,
+                model_params=worker_params,
+                stop_event=None,
+                semaphore=None,
+                command_args=None,
+            )
+            for i in range(3)
+        ]
+        params = {"model": worker_params.name, "context": {"conv_uid": "conv-1"}}
+        selected = await manager._get_model(params, worker_type=wk.worker_type())
+        for _ in range(5):
+            wr = await manager._get_model(params, worker_type=wk.worker_type())
+            assert wr.port == selected.port
+
+
+@pytest.mark.asyncio
+async def test_record_load(
+    manager_with_2_workers: Tuple[  # noqa: F811
+        LocalWorkerManager, List[Tuple[ModelWorker, ModelWorkerParameters]]
+    ],
+):
+    manager, workers = manager_with_2_workers
+    for _, worker_params, _ in workers:
+        await manager.generate({"model": worker_params.name})
+    loads = manager.load_tracker.snapshot()
+    assert len(loads) == 2
+    for load in loads.values():
+        assert load["total_requests"] == 1
+        assert load["in_flight"] == 0
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "manager_with_2_workers, expected_messages",
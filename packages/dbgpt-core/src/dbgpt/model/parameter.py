@@ -67,6 +67,20 @@ class WorkerType(str, Enum):
             )
 
 
+class InstanceSelectStrategy(str, Enum):
+    """The strategy to select one instance from the instances of a model."""
+
+    RANDOM = "random"
+    LEAST_REQUESTS = "least_requests"
+    POWER_OF_TWO = "power_of_two"
+    EWMA_LATENCY = "ewma_latency"
+    CONSISTENT_HASH = "consistent_hash"
+
+    @staticmethod
+    def values():
+        return [item.value for item in InstanceSelectStrategy]
+
+
 @dataclass
 class BaseModelRegistryParameters(BaseParameters, RegisterParameters):
     """Base model registry parameters."""
@@ -124,6 +138,30 @@ class ModelControllerParameters(BaseServerParameters):
     )
 
 
+@dataclass
+class WorkerHttpClientParameters(BaseParameters):
+    """The parameters of the HTTP clients used to call the remote model workers."""
+
+    max_connections: Optional[int] = field(
+        default=100,
+        metadata={"help": _("The max number of connections to one worker")},
+    )
+    max_keepalive_connections: Optional[int] = field(
+        default=20,
+        metadata={
+            "help": _("The max number of idle keep-alive connections to one worker")
+        },
+    )
+    keepalive_expiry: Optional[float] = field(
+        default=60.0,
+        metadata={"help": _("The time limit on idle keep-alive connections (seconds)")},
+    )
+    connect_timeout: Optional[float] = field(
+        default=10.0,
+        metadata={"help": _("The timeout for establishing a connection (seconds)")},
+    )
+
+
 @dataclass
 class ModelAPIServerParameters(BaseServerParameters):
     port: Optional[int] = field(
@@ -154,6 +192,12 @@ class ModelAPIServerParameters(BaseServerParameters):
             )
         },
     )
+    http_client: Optional[WorkerHttpClientParameters] = field(
+        default=None,
+        metadata={
+            "help": _("The HTTP client configuration to call the remote model workers"),
+        },
+    )
 
 
 @dataclass
@@ -199,6 +243,26 @@ class ModelWorkerParameters(BaseServerParameters):
         default=20,
         metadata={"help": _("The interval for sending heartbeats (seconds)")},
     )
+    select_strategy: Optional[str] = field(
+        default=InstanceSelectStrategy.RANDOM.value,
+        metadata={
+            "valid_values": InstanceSelectStrategy.values(),
+            "help": _(
+                "The strategy to select one instance of a model: 'random', "
+                "'least_requests' (the instance with the least in-flight requests), "
+                "'power_of_two' (the less loaded of two random instances), "
+                "'ewma_latency' (the instance with the lowest moving average latency) "
+                "or 'consistent_hash' (the same conversation goes to the same "
+                "instance)"
+            ),
+        },
+    )
+    http_client: Optional[WorkerHttpClientParameters] = field(
+        default=None,
+        metadata={
+            "help": _("The HTTP client configuration to call the remote model workers"),
+        },
+    )
 
 
 @dataclass
@@ -275,6 +275,10 @@ class HuggingFaceEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        return self.embed_documents(texts)
+
 
 @register_resource(
     _("HuggingFace Instructor Embeddings"),
@@ -415,6 +419,12 @@ class HuggingFaceInstructEmbeddings(BaseModel, Embeddings):
         embedding = self.client.encode([instruction_pair], **self.encode_kwargs)[0]
         return embedding.tolist()
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        instruction_pairs = [[self.query_instruction, text] for text in texts]
+        embeddings = self.client.encode(instruction_pairs, **self.encode_kwargs)
+        return embeddings.tolist()
+
 
 # TODO: Support AWEL flow
 class HuggingFaceBgeEmbeddings(BaseModel, Embeddings):
@@ -532,6 +542,12 @@ class HuggingFaceBgeEmbeddings(BaseModel, Embeddings):
         )
         return embedding.tolist()
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        texts = [self.query_instruction + t.replace("\n", " ") for t in texts]
+        embeddings = self.client.encode(texts, **self.encode_kwargs)
+        return embeddings.tolist()
+
 
 @register_resource(
     _("HuggingFace Inference API Embeddings"),
@@ -624,6 +640,10 @@ class HuggingFaceInferenceAPIEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        return self.embed_documents(texts)
+
 
 def _handle_request_result(res: requests.Response) -> List[List[float]]:
     """Parse the result from a request.
@@ -880,6 +900,10 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        return self.embed_documents(texts)
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs.
 
@@ -914,6 +938,10 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
         embeddings = await self.aembed_documents([text])
         return embeddings[0]
 
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed multiple query texts in one call."""
+        return await self.aembed_documents(texts)
+
 
 register_embedding_adapter(
     HuggingFaceEmbeddings,
@@ -1,7 +1,8 @@
 """Embedding retriever."""
 
-from functools import reduce
-from typing import Any, Dict, List, Optional, cast
+import heapq
+import itertools
+from typing import Any, Dict, List, Optional
 
 from dbgpt.core import Chunk
 from dbgpt.rag.retriever.base import BaseRetriever, RetrieverStrategy
@@ -23,6 +24,7 @@ class EmbeddingRetriever(BaseRetriever):
         query_rewrite: Optional[QueryRewrite] = None,
         rerank: Optional[Ranker] = None,
         retrieve_strategy: Optional[RetrieverStrategy] = RetrieverStrategy.EMBEDDING,
+        batch_queries: bool = False,
     ):
         """Create EmbeddingRetriever.
 
@@ -31,6 +33,9 @@ class EmbeddingRetriever(BaseRetriever):
             top_k (int): top k
             query_rewrite (Optional[QueryRewrite]): query rewrite
             rerank (Ranker): rerank
+            batch_queries (bool): Whether to embed the origin and rewritten queries
+                in one call, search them concurrently and merge the results by
+                score without duplicates.
 
         Examples:
             .. code-block:: python
@@ -70,6 +75,7 @@ class EmbeddingRetriever(BaseRetriever):
         self._index_store = index_store
         self._rerank = rerank or DefaultRanker(self._top_k)
         self._retrieve_strategy = retrieve_strategy
+        self._batch_queries = batch_queries
 
     def load_document(self, chunks: List[Chunk], **kwargs: Dict[str, Any]) -> List[str]:
         """Load document in vector database.
@@ -97,7 +103,7 @@ class EmbeddingRetriever(BaseRetriever):
             self._index_store.similar_search(query, self._top_k, filters)
             for query in queries
         ]
-        res_candidates = cast(List[Chunk], reduce(lambda x, y: x + y, candidates))
+        res_candidates = list(itertools.chain.from_iterable(candidates))
         return res_candidates
 
     def _retrieve_with_score(
@@ -122,8 +128,8 @@ class EmbeddingRetriever(BaseRetriever):
             )
             for query in queries
         ]
-        new_candidates_with_score = cast(
-            List[Chunk], reduce(lambda x, y: x + y, candidates_with_score)
+        new_candidates_with_score = list(
+            itertools.chain.from_iterable(candidates_with_score)
         )
         new_candidates_with_score = self._rerank.rank(new_candidates_with_score, query)
         return new_candidates_with_score
@@ -153,6 +159,8 @@ class EmbeddingRetriever(BaseRetriever):
                 origin_query=query, context=context, nums=1
             )
             queries.extend(new_queries)
+        if self._batch_queries:
+            return await self._batch_similarity_search(queries, None, filters)
         candidates = [
             self._similarity_search(query, filters, root_tracer.get_current_span_id())
             for query in queries
@@ -198,9 +206,38 @@ class EmbeddingRetriever(BaseRetriever):
                 )
                 queries.extend(new_queries)
 
+        if self._batch_queries:
+            new_candidates_with_score = await self._batch_similarity_search(
+                queries, score_threshold, filters
+            )
+        else:
+            new_candidates_with_score = await self._sequential_similarity_search(
+                queries, score_threshold, filters
+            )
+
+        with root_tracer.start_span(
+            "dbgpt.rag.retriever.embeddings.rerank",
+            metadata={
+                "query": query,
+                "score_threshold": score_threshold,
+                "rerank_cls": self._rerank.__class__.__name__,
+            },
+        ):
+            new_candidates_with_score = await self._rerank.arank(
+                new_candidates_with_score, query
+            )
+            return new_candidates_with_score
+
+    async def _sequential_similarity_search(
+        self,
+        queries: List[str],
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search the queries one by one and concatenate the results."""
         with root_tracer.start_span(
             "dbgpt.rag.retriever.embeddings.similarity_search_with_score",
-            metadata={"query": query, "score_threshold": score_threshold},
+            metadata={"query": queries[0], "score_threshold": score_threshold},
         ):
             candidates_with_score = [
                 self._similarity_search_with_score(
@@ -211,22 +248,23 @@ class EmbeddingRetriever(BaseRetriever):
             res_candidates_with_score = await run_async_tasks(
                 tasks=candidates_with_score, concurrency_limit=1
             )
-            new_candidates_with_score = cast(
-                List[Chunk], reduce(lambda x, y: x + y, res_candidates_with_score)
-            )
+            return list(itertools.chain.from_iterable(res_candidates_with_score))
 
+    async def _batch_similarity_search(
+        self,
+        queries: List[str],
+        score_threshold: Optional[float],
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search all the queries in one batch and merge the results by score."""
         with root_tracer.start_span(
-            "dbgpt.rag.retriever.embeddings.rerank",
-            metadata={
-                "query": query,
-                "score_threshold": score_threshold,
-                "rerank_cls": self._rerank.__class__.__name__,
-            },
+            "dbgpt.rag.retriever.embeddings.batch_similarity_search",
+            metadata={"queries": queries, "score_threshold": score_threshold},
         ):
-            new_candidates_with_score = await self._rerank.arank(
-                new_candidates_with_score, query
+            candidates = await self._index_store.asimilar_search_batch(
+                queries, self._top_k, score_threshold, filters
             )
-            return new_candidates_with_score
+            return merge_ranked_chunks(candidates)
 
     async def _similarity_search(
         self,
@@ -247,8 +285,7 @@ class EmbeddingRetriever(BaseRetriever):
     async def _run_async_tasks(self, tasks) -> List[Chunk]:
         """Run async tasks."""
         candidates = await run_async_tasks(tasks=tasks, concurrency_limit=1)
-        candidates = reduce(lambda x, y: x + y, candidates)
-        return cast(List[Chunk], candidates)
+        return list(itertools.chain.from_iterable(candidates))
 
     async def _similarity_search_with_score(
         self,
@@ -274,3 +311,38 @@ class EmbeddingRetriever(BaseRetriever):
     def name(cls):
         """Return retriever name."""
         return "embedding_retriever"
+
+
+def merge_ranked_chunks(
+    candidates: List[List[Chunk]], top_k: Optional[int] = None
+) -> List[Chunk]:
+    """Merge the chunk lists of multiple queries by score.
+
+    It is a k-way merge of the lists sorted by score in descending order, a chunk
+    returned by multiple queries (the same chunk id or content) is kept once with
+    its highest score.
+
+    Args:
+        candidates (List[List[Chunk]]): The chunks of every query.
+        top_k (Optional[int]): The max number of chunks to return, None means all.
+
+    Returns:
+        List[Chunk]: The merged chunks sorted by score in descending order.
+    """
+    sorted_lists = [
+        sorted(chunks, key=lambda c: c.score or 0.0, reverse=True)
+        for chunks in candidates
+    ]
+    merged = heapq.merge(*sorted_lists, key=lambda c: -(c.score or 0.0))
+    seen_ids = set()
+    seen_contents = set()
+    results: List[Chunk] = []
+    for chunk in merged:
+        if chunk.chunk_id in seen_ids or chunk.content in seen_contents:
+            continue
+        seen_ids.add(chunk.chunk_id)
+        seen_contents.add(chunk.content)
+        results.append(chunk)
+        if top_k and len(results) >= top_k:
+            break
+    return results
@@ -1,12 +1,20 @@
 """Index store base class."""
 
 import asyncio
+import inspect
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
-from concurrent.futures import Executor, ThreadPoolExecutor
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from dbgpt.core import Chunk
 from dbgpt.storage.vector_store.filters import MetadataFilters
@@ -25,6 +33,122 @@ class IndexStoreConfig(BaseParameters):
         raise NotImplementedError("Current index store does not support create_store")
 
 
+@dataclass
+class IndexLoadProgress:
+    """The progress of loading chunks into the index store."""
+
+    total: int
+    loaded: int
+    skipped: int
+    group_size: int
+    group_loaded: int
+    group_latency: float
+    elapsed: float
+
+    @property
+    def finished(self) -> int:
+        """Return the number of the finished chunks."""
+        return self.loaded + self.skipped
+
+
+ProgressCallback = Callable[[IndexLoadProgress], Any]
+
+
+def _is_set(event: Optional[Any]) -> bool:
+    return event is not None and event.is_set()
+
+
+class _ChunkGroupDispatcher:
+    """Split the chunks into groups on demand and collect the loaded ids.
+
+    With the adaptive group size, the group size is halved when a group has
+    failed chunks or its latency per chunk is more than twice the moving average,
+    and it is increased by one after a normal group, up to the max group size.
+    """
+
+    def __init__(self, chunks: List[Chunk], max_group_size: int, adaptive: bool):
+        self._chunks = chunks
+        self._max_group_size = max(1, max_group_size)
+        self._group_size = self._max_group_size
+        self._adaptive = adaptive
+        self._cursor = 0
+        self._ewma_chunk_latency: Optional[float] = None
+        self._results: Dict[int, List[str]] = {}
+        self._loaded = 0
+        self._skipped = 0
+        self._start_time = time.time()
+        self._lock = threading.Lock()
+
+    def next_group(self) -> Optional[Tuple[int, List[Chunk]]]:
+        with self._lock:
+            if self._cursor >= len(self._chunks):
+                return None
+            start = self._cursor
+            self._cursor += self._group_size
+            return start, self._chunks[start : self._cursor]
+
+    def on_group_done(
+        self, start: int, chunk_group: List[Chunk], ids: List[str], latency: float
+    ) -> IndexLoadProgress:
+        with self._lock:
+            self._results[start] = ids
+            self._loaded += len(ids)
+            self._skipped += len(chunk_group) - len(ids)
+            if self._adaptive:
+                self._adjust_group_size(chunk_group, ids, latency)
+            progress = IndexLoadProgress(
+                total=len(self._chunks),
+                loaded=self._loaded,
+                skipped=self._skipped,
+                group_size=len(chunk_group),
+                group_loaded=len(ids),
+                group_latency=latency,
+                elapsed=time.time() - self._start_time,
+            )
+        logger.info(f"Loaded {progress.loaded} chunks, total {progress.total} chunks.")
+        return progress
+
+    def _adjust_group_size(
+        self, chunk_group: List[Chunk], ids: List[str], latency: float
+    ) -> None:
+        chunk_latency = latency / max(1, len(chunk_group))
+        failed = len(ids) < len(chunk_group)
+        slow = (
+            self._ewma_chunk_latency is not None
+            and chunk_latency > 2 * self._ewma_chunk_latency
+        )
+        if not failed:
+            self._ewma_chunk_latency = (
+                chunk_latency
+                if self._ewma_chunk_latency is None
+                else 0.2 * chunk_latency + 0.8 * self._ewma_chunk_latency
+            )
+        if failed or slow:
+            self._group_size = max(1, self._group_size // 2)
+        elif self._group_size < self._max_group_size:
+            self._group_size += 1
+
+    def finish(self, cancelled: bool = False) -> List[str]:
+        ids: List[str] = []
+        for start in sorted(self._results):
+            ids.extend(self._results[start])
+        total = len(self._chunks)
+        elapsed = time.time() - self._start_time
+        if cancelled and self._cursor < total:
+            logger.warning(
+                f"Loading is cancelled, loaded {self._loaded}/{total} chunks in "
+                f"{elapsed:.1f}s."
+            )
+        elif self._skipped:
+            logger.warning(
+                f"Loaded {self._loaded}/{total} chunks in {elapsed:.1f}s; "
+                f"{self._skipped} chunk(s) skipped due to load errors."
+            )
+        else:
+            logger.info(f"Loaded {total} chunks in {elapsed:.1f} seconds")
+        return ids
+
+
 class IndexStoreBase(ABC):
     """Index store base class."""
 
@@ -191,16 +315,31 @@ class IndexStoreBase(ABC):
         chunks: List[Chunk],
         max_chunks_once_load: Optional[int] = None,
         max_threads: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+        adaptive_group_size: bool = True,
     ) -> List[str]:
         """Load document in index database with specified limit.
 
+        The chunk groups are loaded in a sliding window: a new group is started as
+        soon as one of the running groups finishes, so a slow group doesn't block
+        the others.
+
         Args:
             chunks(List[Chunk]): Document chunks.
             max_chunks_once_load(int): Max number of chunks to load at once.
             max_threads(int): Max number of threads to use.
+            progress_callback(Optional[ProgressCallback]): Called with the
+                :class:`IndexLoadProgress` after every group is loaded.
+            cancel_event(Optional[threading.Event]): Stop starting new groups when
+                it is set, the running groups are finished.
+            adaptive_group_size(bool): Whether to shrink the group size when a group
+                fails or is much slower than usual, and grow it back (up to
+                max_chunks_once_load) when the groups succeed.
 
         Return:
-            List[str]: Chunk ids of successfully-loaded chunks.
+            List[str]: Chunk ids of successfully-loaded chunks, in the order of
+                the chunks.
 
         Note:
             Individual chunks that fail to load (e.g. due to embedding back-end
@@ -209,40 +348,36 @@ class IndexStoreBase(ABC):
             that need strict all-or-nothing semantics should call
             ``load_document`` directly.
         """
-        max_chunks_once_load = max_chunks_once_load or self._max_chunks_once_load
         max_threads = max_threads or self._max_threads
-        # Group the chunks into chunks of size max_chunks
-        chunk_groups = [
-            chunks[i : i + max_chunks_once_load]
-            for i in range(0, len(chunks), max_chunks_once_load)
-        ]
-        logger.info(
-            f"Loading {len(chunks)} chunks in {len(chunk_groups)} groups with "
-            f"{max_threads} threads."
+        dispatcher = _ChunkGroupDispatcher(
+            chunks,
+            max_chunks_once_load or self._max_chunks_once_load,
+            adaptive_group_size,
         )
-        ids = []
-        loaded_cnt = 0
-        skipped_cnt = 0
-        start_time = time.time()
+        logger.info(f"Loading {len(chunks)} chunks with {max_threads} threads.")
         with ThreadPoolExecutor(max_workers=max_threads) as executor:
-            tasks = []
-            for chunk_group in chunk_groups:
-                tasks.append(executor.submit(self._safe_load_group, chunk_group))
-            for future, chunk_group in zip(tasks, chunk_groups):
-                success_ids = future.result()
-                ids.extend(success_ids)
-                loaded_cnt += len(success_ids)
-                skipped_cnt += len(chunk_group) - len(success_ids)
-                logger.info(f"Loaded {loaded_cnt} chunks, total {len(chunks)} chunks.")
-        elapsed = time.time() - start_time
-        if skipped_cnt:
-            logger.warning(
-                f"Loaded {loaded_cnt}/{len(chunks)} chunks in {elapsed:.1f}s; "
-                f"{skipped_cnt} chunk(s) skipped due to load errors."
-            )
-        else:
-            logger.info(f"Loaded {len(chunks)} chunks in {elapsed:.1f} seconds")
-        return ids
+            running: Dict[Future, Tuple[int, List[Chunk], float]] = {}
+            while True:
+                while len(running) < max_threads and not _is_set(cancel_event):
+                    group = dispatcher.next_group()
+                    if not group:
+                        break
+                    future = executor.submit(self._safe_load_group, group[1])
+                    running[future] = (*group, time.time())
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, chunk_group, group_start_time = running.pop(future)
+                    progress = dispatcher.on_group_done(
+                        start,
+                        chunk_group,
+                        future.result(),
+                        time.time() - group_start_time,
+                    )
+                    if progress_callback:
+                        progress_callback(progress)
+        return dispatcher.finish(_is_set(cancel_event))
 
     async def aload_document_with_limit(
         self,
@@ -250,71 +385,92 @@ class IndexStoreBase(ABC):
         max_chunks_once_load: Optional[int] = None,
         max_threads: Optional[int] = None,
         file_id: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[asyncio.Event] = None,
+        adaptive_group_size: bool = True,
     ) -> List[str]:
         """Load document in index database with specified limit.
 
+        The chunk groups are loaded by ``max_threads`` workers in a sliding window,
+        a worker starts the next group as soon as its group is loaded. If the
+        calling task is cancelled, the running groups are cancelled too.
+
         Args:
             chunks(List[Chunk]): Document chunks.
             max_chunks_once_load(int): Max number of chunks to load at once.
-            max_threads(int): Max number of threads to use.
+            max_threads(int): Max number of concurrent groups.
+            file_id(Optional[str]): file id for document-level tracking.
+            progress_callback(Optional[ProgressCallback]): Called with the
+                :class:`IndexLoadProgress` after every group is loaded, it can be
+                a coroutine function.
+            cancel_event(Optional[asyncio.Event]): Stop starting new groups when it
+                is set, the running groups are finished.
+            adaptive_group_size(bool): Whether to shrink the group size when a group
+                fails or is much slower than usual, and grow it back (up to
+                max_chunks_once_load) when the groups succeed.
 
         Return:
-            List[str]: Chunk ids of successfully-loaded chunks.
+            List[str]: Chunk ids of successfully-loaded chunks, in the order of
+                the chunks.
 
         Note:
             Individual chunks that fail to load are skipped with a warning;
             this method no longer raises when a partial subset of chunks
             fails (matching the sync ``load_document_with_limit`` behavior).
         """
-        max_chunks_once_load = max_chunks_once_load or self._max_chunks_once_load
         max_threads = max_threads or self._max_threads
         file_id = file_id or None
-        chunk_groups = [
-            chunks[i : i + max_chunks_once_load]
-            for i in range(0, len(chunks), max_chunks_once_load)
-        ]
-        logger.info(
-            f"Loading {len(chunks)} chunks in {len(chunk_groups)} groups with "
-            f"{max_threads} threads."
+        dispatcher = _ChunkGroupDispatcher(
+            chunks,
+            max_chunks_once_load or self._max_chunks_once_load,
+            adaptive_group_size,
         )
-        tasks = []
-        for chunk_group in chunk_groups:
-            tasks.append(self._safe_aload_group(chunk_group, file_id))
-
-        results = await self._run_tasks_with_concurrency(tasks, max_threads)
-
-        ids = []
-        loaded_cnt = 0
-        skipped_cnt = 0
-        for idx, (result, chunk_group) in enumerate(zip(results, chunk_groups)):
-            if isinstance(result, Exception):
-                # _safe_aload_group already swallows per-chunk errors; an
-                # exception here would be an unexpected internal failure.
-                logger.error(
-                    f"Unexpected exception loading chunk group {idx + 1}: {result}"
+        logger.info(f"Loading {len(chunks)} chunks with {max_threads} workers.")
+
+        async def _worker():
+            while not _is_set(cancel_event):
+                group = dispatcher.next_group()
+                if not group:
+                    return
+                start, chunk_group = group
+                group_start_time = time.time()
+                try:
+                    ids = await self._safe_aload_group(chunk_group, file_id)
+                except Exception as e:
+                    # _safe_aload_group already swallows per-chunk errors; an
+                    # exception here would be an unexpected internal failure.
+                    logger.error(f"Unexpected exception loading chunk group: {e}")
+                    ids = []
+                progress = dispatcher.on_group_done(
+                    start, chunk_group, ids, time.time() - group_start_time
                 )
-                skipped_cnt += len(chunk_group)
-                continue
-            ids.extend(result)
-            loaded_cnt += len(result)
-            skipped_cnt += len(chunk_group) - len(result)
-            logger.info(f"Loaded {loaded_cnt} chunks, total {len(chunks)} chunks.")
-
-        if skipped_cnt:
-            logger.warning(
-                f"Loaded {loaded_cnt}/{len(chunks)} chunks; "
-                f"{skipped_cnt} chunk(s) skipped due to load errors."
-            )
+                if progress_callback:
+                    callback_result = progress_callback(progress)
+                    if inspect.isawaitable(callback_result):
+                        await callback_result
 
-        return ids
+        workers = [asyncio.create_task(_worker()) for _ in range(max_threads)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                if not worker.done():
+                    worker.cancel()
+        return dispatcher.finish(_is_set(cancel_event))
 
     async def _run_tasks_with_concurrency(self, tasks, max_concurrent):
-        results = []
-        for i in range(0, len(tasks), max_concurrent):
-            batch = tasks[i : i + max_concurrent]
-            batch_results = await asyncio.gather(*batch, return_exceptions=True)
-            results.extend(batch_results)
-        return results
+        """Run the tasks with at most ``max_concurrent`` tasks at the same time.
+
+        A new task is started as soon as a running task finishes, the results are
+        returned in the order of the tasks.
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def _run(task):
+            async with semaphore:
+                return await task
+
+        return await asyncio.gather(*[_run(t) for t in tasks], return_exceptions=True)
 
     def similar_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
@@ -353,6 +509,36 @@ class IndexStoreBase(ABC):
             self.similar_search_with_scores, query, topk, score_threshold, filters
         )
 
+    async def asimilar_search_batch(
+        self,
+        queries: List[str],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Similar search of multiple queries.
+
+        The queries are searched concurrently, the index stores which can embed
+        the queries in one call should override it.
+
+        Args:
+            queries(List[str]): The query texts.
+            topk(int): The number of similar documents to return for every query.
+            score_threshold(Optional[float]): The score threshold, None means
+                search without score.
+            filters(Optional[MetadataFilters]): metadata filters.
+        Return:
+            List[List[Chunk]]: The similar documents of every query.
+        """
+        if score_threshold is None:
+            tasks = [self.asimilar_search(q, topk, filters) for q in queries]
+        else:
+            tasks = [
+                self.asimilar_search_with_scores(q, topk, score_threshold, filters)
+                for q in queries
+            ]
+        return list(await asyncio.gather(*tasks))
+
     def full_text_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
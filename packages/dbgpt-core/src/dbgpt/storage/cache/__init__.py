@@ -1,7 +1,7 @@
 """Module for cache storage."""
 
 from .llm_cache import LLMCacheClient, LLMCacheKey, LLMCacheValue  # noqa: F401
-from .manager import CacheManager, initialize_cache  # noqa: F401
+from .manager import CacheManager, TieredCacheManager, initialize_cache  # noqa: F401
 from .storage.base import MemoryCacheStorage  # noqa: F401
 
 __all__ = [
@@ -9,6 +9,7 @@ __all__ = [
     "LLMCacheValue",
     "LLMCacheClient",
     "CacheManager",
+    "TieredCacheManager",
     "initialize_cache",
     "MemoryCacheStorage",
 ]
@@ -1 +1,297 @@
-"""Embeddings cache."""
+"""Embeddings cache.
+
+The embeddings of the same text are cached by the model name and the hash of the
+normalized text, so re-ingesting the unchanged documents or repeating the same
+queries don't call the embedding model again.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from dbgpt.core import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# The memory of the bookkeeping of one entry (the key, the bytes object and the
+# slot of the ordered dict)
+_ENTRY_OVERHEAD = 160
+
+
+def _normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFC", text).strip()
+
+
+def embedding_cache_key(model_name: str, text: str, kind: str = "document") -> bytes:
+    """Return the cache key of the embedding of a text.
+
+    Args:
+        model_name (str): The name of the embedding model.
+        text (str): The text to embed.
+        kind (str): "document" or "query", some models embed the queries with an
+            instruction, so the embeddings of them are cached separately.
+    """
+    data = "\0".join([model_name, kind, _normalize_text(text)]).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(data: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+class EmbeddingCacheStore:
+    """The store of the cached embeddings, shared by the cached embeddings.
+
+    The vectors are stored as float32 bytes, in memory with LRU eviction, and on
+    the disk (RocksDB) when the persist directory is provided.
+    """
+
+    def __init__(self, max_memory_mb: int = 64, persist_dir: Optional[str] = None):
+        """Create a new EmbeddingCacheStore.
+
+        Args:
+            max_memory_mb (int): The max memory of the vectors in MB.
+            persist_dir (Optional[str]): The directory of the disk store, None means
+                memory only. It requires rocksdict.
+        """
+        self.max_memory = max_memory_mb * 1024 * 1024
+        self.current_memory_usage = 0
+        self._memory: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if persist_dir:
+            from rocksdict import Rdict
+
+            self._db = Rdict(persist_dir)
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[List[float]]]:
+        """Look up the vectors of the keys, the disk is read in one batch."""
+        found: List[Optional[bytes]] = [None] * len(keys)
+        missing: List[int] = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                data = self._memory.get(key)
+                if data is None:
+                    missing.append(i)
+                    continue
+                self._memory.move_to_end(key)
+                found[i] = data
+            self._memory_hits += len(keys) - len(missing)
+        if missing and self._db is not None:
+            disk_values = self._db.get([keys[i] for i in missing])
+            disk_hits = []
+            for i, data in zip(missing, disk_values):
+                if data is not None:
+                    found[i] = data
+                    disk_hits.append(i)
+            with self._lock:
+                self._disk_hits += len(disk_hits)
+                # Promote to the memory
+                for i in disk_hits:
+                    self._put(keys[i], found[i])  # type: ignore
+            missing = [i for i in missing if found[i] is None]
+        with self._lock:
+            self._misses += len(missing)
+        return [_unpack(data) if data is not None else None for data in found]
+
+    def set_many(self, keys: List[bytes], vectors: List[List[float]]) -> None:
+        """Store the vectors of the keys, the disk is written in one batch."""
+        packed = [_pack(vector) for vector in vectors]
+        with self._lock:
+            for key, data in zip(keys, packed):
+                self._put(key, data)
+        if self._db is not None and keys:
+            from rocksdict import WriteBatch
+
+            batch = WriteBatch()
+            for key, data in zip(keys, packed):
+                batch.put(key, data)
+            self._db.write(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hit rate and the memory usage."""
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                "hits": hits,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": len(self._memory),
+                "memory_usage": self.current_memory_usage,
+                "max_memory": self.max_memory,
+                "persistent": self._db is not None,
+            }
+
+    def close(self) -> None:
+        """Close the disk store."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _put(self, key: bytes, data: bytes) -> None:
+        size = len(data) + _ENTRY_OVERHEAD
+        if size > self.max_memory:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self.current_memory_usage -= len(old) + _ENTRY_OVERHEAD
+        while self._memory and self.current_memory_usage + size > self.max_memory:
+            _, evicted = self._memory.popitem(last=False)
+            self.current_memory_usage -= len(evicted) + _ENTRY_OVERHEAD
+            self._evictions += 1
+        self._memory[key] = data
+        self.current_memory_usage += size
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings which cache the embeddings of the wrapped embeddings.
+
+    Only the texts missing in the cache are sent to the wrapped embeddings, and the
+    same texts in one batch are embedded once.
+
+    Examples:
+        .. code-block:: python
+
+            store = EmbeddingCacheStore(max_memory_mb=64, persist_dir="emb_cache")
+            embeddings = CachedEmbeddings(OpenAPIEmbeddings(...), store)
+            embeddings.embed_documents(["hello", "world"])
+            # No embedding call
+            embeddings.embed_documents(["hello", "world"])
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        store: Optional[EmbeddingCacheStore] = None,
+        model_name: Optional[str] = None,
+    ):
+        """Create a new CachedEmbeddings.
+
+        Args:
+            embeddings (Embeddings): The embeddings to wrap.
+            store (Optional[EmbeddingCacheStore]): The cache store, a new memory
+                store is created if not provided.
+            model_name (Optional[str]): The model name in the cache key, default is
+                the ``model_name`` of the embeddings or its class name.
+        """
+        self._embeddings = embeddings
+        self._store = store or EmbeddingCacheStore()
+        self._model_name = (
+            model_name
+            or getattr(embeddings, "model_name", None)
+            or type(embeddings).__name__
+        )
+        self._backend_calls = 0
+        self._backend_texts = 0
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """Return the wrapped embeddings."""
+        return self._embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed search docs, only the missing texts are embedded."""
+        return self._embed(texts, "document", self._embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed query text."""
+        return self._embed([text], "query", self._embed_queries)[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed the query texts in one batch."""
+        return self._embed(texts, "query", self._embed_queries)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous embed search docs."""
+        return await self._aembed(texts, "document", self._embeddings.aembed_documents)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronous embed query text."""
+        return (await self._aembed([text], "query", self._aembed_queries))[0]
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous embed the query texts in one batch."""
+        return await self._aembed(texts, "query", self._aembed_queries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the stats of the cache and the calls of the wrapped embeddings."""
+        return {
+            **self._store.stats(),
+            "backend_calls": self._backend_calls,
+            "backend_texts": self._backend_texts,
+        }
+
+    def _embed_queries(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) == 1:
+            return [self._embeddings.embed_query(texts[0])]
+        return self._embeddings.embed_queries(texts)
+
+    async def _aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) == 1:
+            return [await self._embeddings.aembed_query(texts[0])]
+        return await self._embeddings.aembed_queries(texts)
+
+    def _lookup(self, texts: List[str], kind: str):
+        keys = [embedding_cache_key(self._model_name, text, kind) for text in texts]
+        vectors = self._store.get_many(keys)
+        # The first index of every missing key, the same texts are embedded once
+        missing: Dict[bytes, int] = {}
+        for i, vector in enumerate(vectors):
+            if vector is None and keys[i] not in missing:
+                missing[keys[i]] = i
+        return keys, vectors, missing
+
+    def _fill(self, keys, vectors, missing, new_vectors) -> List[List[float]]:
+        if len(new_vectors) != len(missing):
+            raise ValueError(
+                f"Expect {len(missing)} embeddings, but got {len(new_vectors)}"
+            )
+        self._backend_calls += 1
+        self._backend_texts += len(missing)
+        new_by_key = dict(zip(missing, new_vectors))
+        self._store.set_many(list(new_by_key), list(new_by_key.values()))
+        return [
+            vector if vector is not None else new_by_key[keys[i]]
+            for i, vector in enumerate(vectors)
+        ]
+
+    def _embed(self, texts: List[str], kind: str, embed_func) -> List[List[float]]:
+        keys, vectors, missing = self._lookup(texts, kind)
+        if not missing:
+            return vectors
+        new_vectors = embed_func([texts[i] for i in missing.values()])
+        return self._fill(keys, vectors, missing, new_vectors)
+
+    async def _aembed(
+        self, texts: List[str], kind: str, embed_func
+    ) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        # The disk store may be read, don't block the event loop
+        keys, vectors, missing = await loop.run_in_executor(
+            None, self._lookup, texts, kind
+        )
+        if not missing:
+            return vectors
+        new_vectors = await embed_func([texts[i] for i in missing.values()])
+        return await loop.run_in_executor(
+            None, self._fill, keys, vectors, missing, new_vectors
+        )
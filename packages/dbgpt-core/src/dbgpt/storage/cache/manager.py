@@ -1,10 +1,12 @@
 """Cache manager."""
 
+import asyncio
 import logging
+import threading
 from abc import ABC, abstractmethod
-from concurrent.futures import Executor
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Optional, Type, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Type, cast
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from dbgpt.core import CacheConfig, CacheKey, CacheValue, Serializable, Serializer
@@ -13,7 +15,10 @@ from dbgpt.util.executor_utils import ExecutorFactory, blocking_func_to_async
 from dbgpt.util.i18n_utils import _
 from dbgpt.util.parameter_utils import BaseParameters
 
-from .storage.base import CacheStorage
+from .storage.base import CacheStorage, MemoryCacheStorage, StorageItem
+
+if TYPE_CHECKING:
+    from .storage.disk.disk_storage import DiskCacheStorage
 
 logger = logging.getLogger(__name__)
 
@@ -34,9 +39,13 @@ class ModelCacheParameters(BaseParameters):
         default="memory",
         metadata={
             "help": _(
-                "The storage type. Supported values: memory, disk, valkey. "
+                "The storage type. Supported values: memory, disk, tiered, valkey, "
+                "semantic. The tiered storage keeps the hot items in memory (at "
+                "most max_memory_mb) in front of the disk storage in persist_dir. "
                 "For valkey, configure via env vars: VALKEY_HOST, VALKEY_PORT, "
-                "VALKEY_PASSWORD."
+                "VALKEY_PASSWORD. The semantic storage returns the cached output "
+                "of a similar prompt, the prompts are embedded by the default "
+                "embedding model."
             ),
         },
     )
@@ -52,6 +61,65 @@ class ModelCacheParameters(BaseParameters):
             "help": _("The persist directory, default is model_cache"),
         },
     )
+    cache_policy: str = field(
+        default="lru",
+        metadata={
+            "help": _("The eviction policy of the memory cache: lru, fifo or lfu"),
+            "valid_values": ["lru", "fifo", "lfu"],
+        },
+    )
+    default_ttl: Optional[float] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The time to live of the memory cache entries in seconds, default "
+                "is never expire"
+            ),
+        },
+    )
+    admission: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The admission policy of the memory cache, 'tinylfu' only admits the "
+                "new entries accessed more frequently than the entries to evict"
+            ),
+            "valid_values": ["tinylfu"],
+        },
+    )
+    similarity_threshold: float = field(
+        default=0.95,
+        metadata={
+            "help": _(
+                "The min cosine similarity of the prompts to return a cached output "
+                "of the semantic storage, default is 0.95"
+            ),
+        },
+    )
+    enable_embedding_cache: bool = field(
+        default=False,
+        metadata={
+            "help": _(
+                "Whether to cache the embeddings of the default embedding model, the "
+                "same texts are embedded only once, default is False"
+            ),
+        },
+    )
+    embedding_cache_max_memory_mb: int = field(
+        default=64,
+        metadata={
+            "help": _("The max memory of the embedding cache in MB, default is 64"),
+        },
+    )
+    embedding_cache_persist_dir: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The persist directory of the embedding cache, default is None, "
+                "only cache the embeddings in memory"
+            ),
+        },
+    )
 
 
 class CacheManager(BaseComponent, ABC):
@@ -90,6 +158,10 @@ class CacheManager(BaseComponent, ABC):
     def serializer(self) -> Serializer:
         """Return serializer to serialize/deserialize cache value."""
 
+    def stats(self) -> Dict[str, Any]:
+        """Return the statistics of the cache, like the hits, misses and evictions."""
+        return {}
+
 
 class LocalCacheManager(CacheManager):
     """Local cache manager."""
@@ -147,9 +219,289 @@ class LocalCacheManager(CacheManager):
         """Return serializer to serialize/deserialize cache value."""
         return self._serializer
 
+    def stats(self) -> Dict[str, Any]:
+        """Return the statistics of the cache storage."""
+        return {"storage": type(self._storage).__name__, **self._storage.stats()}
+
+
+class TieredCacheManager(CacheManager):
+    """A two-tier cache manager, a hot memory tier in front of a disk tier.
+
+    The memory tier is read on the event loop without any thread hop. The reads
+    missing the memory tier are collected and sent to the disk in one batch by a
+    dedicated disk thread, and the items found on the disk are promoted to the
+    memory tier.
+
+    The new items are written to the memory tier. When a new item is evicted from
+    the memory tier, it is demoted to the disk tier by the background writer, which
+    writes the demoted items in batches. With ``write_through``, every new item is
+    written to the disk tier in the background too. The items not written yet are
+    still readable, and they are flushed when the system stops.
+
+    Examples:
+        .. code-block:: python
+
+            from dbgpt.storage.cache.storage.disk.disk_storage import DiskCacheStorage
+            from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+            cache_manager = TieredCacheManager(
+                system_app,
+                JsonSerializer(),
+                memory_max_memory_mb=256,
+                disk_storage=DiskCacheStorage("model_cache"),
+            )
+    """
+
+    def __init__(
+        self,
+        system_app: SystemApp,
+        serializer: Serializer,
+        disk_storage: "DiskCacheStorage",
+        memory_max_memory_mb: int = 256,
+        memory_storage: Optional[MemoryCacheStorage] = None,
+        write_through: bool = False,
+        flush_interval: float = 1.0,
+        max_batch_size: int = 256,
+    ) -> None:
+        """Create a tiered cache manager.
+
+        Args:
+            system_app (SystemApp): The system app.
+            serializer (Serializer): The serializer of the cache values.
+            disk_storage (DiskCacheStorage): The disk tier.
+            memory_max_memory_mb (int): The max memory of the memory tier in MB, used
+                when memory_storage is not provided.
+            memory_storage (Optional[MemoryCacheStorage]): The memory tier, its
+                ``on_evict`` callback is replaced by the manager.
+            write_through (bool): Whether to write every new item to the disk tier,
+                otherwise only the evicted items are written.
+            flush_interval (float): The max seconds an item waits in the write
+                buffer.
+            max_batch_size (int): Flush the write buffer when it has so many items.
+        """
+        super().__init__(system_app)
+        self._serializer = serializer
+        self._memory = memory_storage or MemoryCacheStorage(
+            max_memory_mb=memory_max_memory_mb
+        )
+        self._memory._on_evict = self._demote
+        self._disk = disk_storage
+        self._write_through = write_through
+        self._flush_interval = flush_interval
+        self._max_batch_size = max_batch_size
+        # One thread, the disk reads and writes are batched
+        self._disk_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="dbgpt-cache-disk"
+        )
+        self._lock = threading.Lock()
+        # The items in the memory tier which are not on the disk
+        self._dirty: Set[bytes] = set()
+        # The items waiting to be written to the disk
+        self._write_buffer: Dict[bytes, StorageItem] = {}
+        self._flush_scheduled = False
+        self._closed = False
+        self._read_queue: List[Tuple[bytes, asyncio.Future]] = []
+        self._disk_hits = 0
+        self._disk_misses = 0
+        self._promotions = 0
+        self._demotions = 0
+        self._batches_written = 0
+        self._batches_read = 0
+
+    def before_stop(self):
+        """Write the pending items to the disk before the system stops."""
+        self._closed = True
+        self._disk_executor.shutdown(wait=True)
+        self.flush()
+
+    @property
+    def serializer(self) -> Serializer:
+        """Return serializer to serialize/deserialize cache value."""
+        return self._serializer
+
+    async def set(
+        self,
+        key: CacheKey[K],
+        value: CacheValue[V],
+        cache_config: Optional[CacheConfig] = None,
+    ):
+        """Set cache with key, the disk tier is written in the background."""
+        item = StorageItem.build_from_kv(key, value)
+        with self._lock:
+            if self._write_through:
+                self._write_buffer[item.key_hash] = item
+            else:
+                self._dirty.add(item.key_hash)
+        self._memory.set_item(key, item, cache_config)
+        if self._write_through:
+            self._schedule_flush()
+        elif not self._memory.exists(key):
+            # Rejected by the memory tier, write it to the disk tier directly
+            self._demote(item)
+
+    async def get(
+        self,
+        key: CacheKey[K],
+        cls: Type[Serializable],
+        cache_config: Optional[CacheConfig] = None,
+    ) -> Optional[CacheValue[V]]:
+        """Retrieve cache with key, read the disk tier if the memory tier misses."""
+        item = self._memory.get(key, cache_config)
+        if not item:
+            key_hash = key.get_hash_bytes()
+            with self._lock:
+                item = self._write_buffer.get(key_hash)
+            if not item:
+                item = await self._read_disk(key_hash)
+            with self._lock:
+                if item:
+                    self._disk_hits += 1
+                    self._promotions += 1
+                else:
+                    self._disk_misses += 1
+            if not item:
+                return None
+            self._memory.set_item(key, item, cache_config)
+        return cast(CacheValue[V], self._serializer.deserialize(item.value_data, cls))
+
+    def flush(self) -> None:
+        """Write all the items not on the disk now, in the current thread."""
+        with self._lock:
+            items = list(self._write_buffer.values())
+            dirty, self._dirty = self._dirty, set()
+        with self._memory._lock:
+            entries = list(self._memory.cache.values())
+        items.extend(entry.item for entry in entries if entry.item.key_hash in dirty)
+        self._disk.set_many(items)
+        with self._lock:
+            for item in items:
+                if self._write_buffer.get(item.key_hash) is item:
+                    del self._write_buffer[item.key_hash]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hit rate of every tier and the stats of the disk I/O."""
+        memory_stats = self._memory.stats()
+        with self._lock:
+            disk_requests = self._disk_hits + self._disk_misses
+            requests = memory_stats["hits"] + memory_stats["misses"]
+            hits = memory_stats["hits"] + self._disk_hits
+            return {
+                "storage": "tiered",
+                "hit_rate": hits / requests if requests else 0.0,
+                "memory": memory_stats,
+                "disk": {
+                    "hits": self._disk_hits,
+                    "misses": self._disk_misses,
+                    "hit_rate": (
+                        self._disk_hits / disk_requests if disk_requests else 0.0
+                    ),
+                    "batches_read": self._batches_read,
+                    "batches_written": self._batches_written,
+                },
+                "promotions": self._promotions,
+                "demotions": self._demotions,
+                "pending_writes": len(self._write_buffer),
+            }
+
+    def _demote(self, item: StorageItem) -> None:
+        """Move an item evicted from the memory tier to the write buffer."""
+        with self._lock:
+            if item.key_hash not in self._dirty:
+                # Already on the disk or in the write buffer
+                return
+            self._dirty.discard(item.key_hash)
+            self._write_buffer[item.key_hash] = item
+            self._demotions += 1
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        with self._lock:
+            full = len(self._write_buffer) >= self._max_batch_size
+            if self._flush_scheduled and not full:
+                return
+            self._flush_scheduled = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if full or not loop:
+            self._submit_write()
+        else:
+            loop.call_later(self._flush_interval, self._submit_write)
+
+    def _submit_write(self) -> None:
+        if not self._closed:
+            self._disk_executor.submit(self._write_batch)
+
+    def _write_batch(self) -> None:
+        """Write the buffered items in one batch, run in the disk thread."""
+        with self._lock:
+            self._flush_scheduled = False
+            items = list(self._write_buffer.values())
+        if not items:
+            return
+        try:
+            self._disk.set_many(items)
+        except Exception as e:
+            logger.warning(f"Write {len(items)} cache items to disk failed: {e}")
+            return
+        with self._lock:
+            self._batches_written += 1
+            for item in items:
+                if self._write_buffer.get(item.key_hash) is item:
+                    del self._write_buffer[item.key_hash]
+
+    async def _read_disk(self, key_hash: bytes) -> Optional[StorageItem]:
+        """Read the disk tier, the concurrent reads are sent in one batch."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self._read_queue.append((key_hash, future))
+            first = len(self._read_queue) == 1
+        if first:
+            # Collect the reads of the current loop iteration
+            loop.call_soon(self._dispatch_reads)
+        return await future
+
+    def _dispatch_reads(self) -> None:
+        with self._lock:
+            batch, self._read_queue = self._read_queue, []
+            self._batches_read += 1
+        disk_future = self._disk_executor.submit(
+            self._disk.get_many, [key_hash for key_hash, _ in batch]
+        )
+
+        def _resolve(done: Future) -> None:
+            error = done.exception()
+            items = None if error else done.result()
+            for i, (_key_hash, future) in enumerate(batch):
+                future.get_loop().call_soon_threadsafe(
+                    _set_future, future, items[i] if items else None, error
+                )
+
+        disk_future.add_done_callback(_resolve)
+
+
+def _set_future(
+    future: asyncio.Future, result: Any, error: Optional[BaseException]
+) -> None:
+    if future.done():
+        return
+    if error:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
 
 def initialize_cache(
-    system_app: SystemApp, storage_type: str, max_memory_mb: int, persist_dir: str
+    system_app: SystemApp,
+    storage_type: str,
+    max_memory_mb: int,
+    persist_dir: str,
+    cache_policy: str = "lru",
+    default_ttl: Optional[float] = None,
+    admission: Optional[str] = None,
+    similarity_threshold: float = 0.95,
 ):
     """Initialize cache manager.
 
@@ -158,10 +510,22 @@ def initialize_cache(
         storage_type (str): The storage type.
         max_memory_mb (int): The max memory in MB.
         persist_dir (str): The persist directory.
+        cache_policy (str): The eviction policy of the memory cache.
+        default_ttl (Optional[float]): The time to live of the memory cache entries.
+        admission (Optional[str]): The admission policy of the memory cache.
+        similarity_threshold (float): The min similarity of the prompts of the
+            semantic storage.
     """
+    from dbgpt.core.interface.cache import CachePolicy
     from dbgpt.util.serialization.json_serialization import JsonSerializer
 
-    from .storage.base import MemoryCacheStorage
+    def _memory_storage() -> MemoryCacheStorage:
+        return MemoryCacheStorage(
+            max_memory_mb=max_memory_mb,
+            cache_policy=CachePolicy(cache_policy or "lru"),
+            default_ttl=default_ttl,
+            admission=admission,
+        )
 
     if storage_type == "disk":
         try:
@@ -175,7 +539,26 @@ def initialize_cache(
                 f"Can't import DiskCacheStorage, use MemoryCacheStorage, import error "
                 f"message: {str(e)}"
             )
-            cache_storage = MemoryCacheStorage(max_memory_mb=max_memory_mb)
+            cache_storage = _memory_storage()
+    elif storage_type == "tiered":
+        try:
+            from .storage.disk.disk_storage import DiskCacheStorage
+
+            disk_storage = DiskCacheStorage(persist_dir)
+        except ImportError as e:
+            logger.warning(
+                f"Can't import DiskCacheStorage, use MemoryCacheStorage, import error "
+                f"message: {str(e)}"
+            )
+            cache_storage = _memory_storage()
+        else:
+            system_app.register(
+                TieredCacheManager,
+                serializer=JsonSerializer(),
+                disk_storage=disk_storage,
+                memory_storage=_memory_storage(),
+            )
+            return
     elif storage_type == "valkey":
         try:
             from dbgpt_ext.storage.cache.valkey_cache import ValkeyCacheStorage
@@ -190,9 +573,22 @@ def initialize_cache(
                 "across nodes. Import error: %s",
                 e,
             )
-            cache_storage = MemoryCacheStorage(max_memory_mb=max_memory_mb)
+            cache_storage = _memory_storage()
+    elif storage_type == "semantic":
+        from dbgpt.rag.embedding.embedding_factory import EmbeddingFactory
+
+        from .storage.semantic.semantic_storage import SemanticCacheStorage
+
+        cache_storage = SemanticCacheStorage(
+            # The embedding model may be not ready now, create it at the first use
+            embeddings_factory=lambda: EmbeddingFactory.get_instance(
+                system_app
+            ).create(),
+            similarity_threshold=similarity_threshold,
+            max_memory_mb=max_memory_mb,
+        )
     else:
-        cache_storage = MemoryCacheStorage(max_memory_mb=max_memory_mb)
+        cache_storage = _memory_storage()
     system_app.register(
         LocalCacheManager, serializer=JsonSerializer(), storage=cache_storage
     )
@@ -1,9 +1,10 @@
 """Operators for processing model outputs with caching support."""
 
+import asyncio
 import logging
 from typing import AsyncIterator, Dict, List, Optional, Union, cast
 
-from dbgpt.core import ModelOutput, ModelRequest
+from dbgpt.core import LLMClient, ModelOutput, ModelRequest
 from dbgpt.core.awel import (
     BaseOperator,
     BranchFunc,
@@ -15,11 +16,13 @@ from dbgpt.core.awel import (
 
 from .llm_cache import LLMCacheClient, LLMCacheKey, LLMCacheValue
 from .manager import CacheManager
+from .single_flight import InFlightCall, get_single_flight
 
 logger = logging.getLogger(__name__)
 
 _LLM_MODEL_INPUT_VALUE_KEY = "llm_model_input_value"
 _LLM_MODEL_OUTPUT_CACHE_KEY = "llm_model_output_cache"
+_LLM_MODEL_IN_FLIGHT_CALL_KEY = "llm_model_in_flight_call"
 
 
 class CachedModelStreamOperator(StreamifyAbsOperator[ModelRequest, ModelOutput]):
@@ -27,6 +30,10 @@ class CachedModelStreamOperator(StreamifyAbsOperator[ModelRequest, ModelOutput])
 
     Args:
         cache_manager (CacheManager): The cache manager to handle caching operations.
+        llm_client (Optional[LLMClient]): The LLM client to call the model when the
+            output of the in-flight call of the same request is not available, e.g.
+            the call failed or finished without caching its output. Defaults to
+            None, raise an error then.
         **kwargs: Additional keyword arguments.
 
     Methods:
@@ -34,11 +41,17 @@ class CachedModelStreamOperator(StreamifyAbsOperator[ModelRequest, ModelOutput])
             outputs.
     """
 
-    def __init__(self, cache_manager: CacheManager, **kwargs) -> None:
+    def __init__(
+        self,
+        cache_manager: CacheManager,
+        llm_client: Optional[LLMClient] = None,
+        **kwargs,
+    ) -> None:
         """Create a new instance of CachedModelStreamOperator."""
         super().__init__(**kwargs)
         self._cache_manager = cache_manager
         self._client = LLMCacheClient(cache_manager)
+        self._llm_client = llm_client
 
     async def streamify(self, input_value: ModelRequest):
         """Process inputs as a stream with cache support and yield model outputs.
@@ -51,13 +64,33 @@ class CachedModelStreamOperator(StreamifyAbsOperator[ModelRequest, ModelOutput])
         """
         cache_dict = _parse_cache_key_dict(input_value)
         llm_cache_key: LLMCacheKey = self._client.new_key(**cache_dict)
-        llm_cache_value = await self._client.get(llm_cache_key)
-        logger.info(f"llm_cache_value: {llm_cache_value}")
-        if not llm_cache_value:
-            raise ValueError(f"Cache value not found for key: {llm_cache_key}")
-        outputs = cast(List[ModelOutput], llm_cache_value.get_value().output)
-        for out in outputs:
-            yield cast(ModelOutput, out)
+        single_flight = get_single_flight(self._cache_manager)
+        call = single_flight.get(hash(llm_cache_key))
+        if call:
+            # Attach to the output stream of the leader
+            try:
+                async for out in call.stream(single_flight.timeout):
+                    yield cast(ModelOutput, out)
+                return
+            except Exception as e:
+                error: Exception = e
+            logger.warning(f"The in-flight call of {llm_cache_key} failed: {error}")
+        else:
+            llm_cache_value = await self._client.get(llm_cache_key)
+            logger.info(f"llm_cache_value: {llm_cache_value}")
+            if llm_cache_value:
+                outputs = cast(List[ModelOutput], llm_cache_value.get_value().output)
+                for out in outputs:
+                    yield cast(ModelOutput, out)
+                return
+            # The leader finished without caching its output
+            error = ValueError(f"Cache value not found for key: {llm_cache_key}")
+        if not self._llm_client:
+            raise error
+        # Every output contains the whole text so far, the stream restarts from the
+        # beginning
+        async for out in self._llm_client.generate_stream(input_value):
+            yield out
 
 
 class CachedModelOperator(MapOperator[ModelRequest, ModelOutput]):
@@ -65,17 +98,27 @@ class CachedModelOperator(MapOperator[ModelRequest, ModelOutput]):
 
     Args:
         cache_manager (CacheManager): Manager for caching operations.
+        llm_client (Optional[LLMClient]): The LLM client to call the model when the
+            output of the in-flight call of the same request is not available, e.g.
+            the call failed or finished without caching its output. Defaults to
+            None, raise an error then.
         **kwargs: Additional keyword arguments.
 
     Methods:
         map: Processes a single input with cache support and returns the model output.
     """
 
-    def __init__(self, cache_manager: CacheManager, **kwargs) -> None:
+    def __init__(
+        self,
+        cache_manager: CacheManager,
+        llm_client: Optional[LLMClient] = None,
+        **kwargs,
+    ) -> None:
         """Create a new instance of CachedModelOperator."""
         super().__init__(**kwargs)
         self._cache_manager = cache_manager
         self._client = LLMCacheClient(cache_manager)
+        self._llm_client = llm_client
 
     async def map(self, input_value: ModelRequest) -> ModelOutput:
         """Process a single input with cache support and return the model output.
@@ -88,11 +131,28 @@ class CachedModelOperator(MapOperator[ModelRequest, ModelOutput]):
         """
         cache_dict = _parse_cache_key_dict(input_value)
         llm_cache_key: LLMCacheKey = self._client.new_key(**cache_dict)
-        llm_cache_value = await self._client.get(llm_cache_key)
-        if not llm_cache_value:
-            raise ValueError(f"Cache value not found for key: {llm_cache_key}")
-        logger.info(f"llm_cache_value: {llm_cache_value}")
-        return cast(ModelOutput, llm_cache_value.get_value().output)
+        single_flight = get_single_flight(self._cache_manager)
+        call = single_flight.get(hash(llm_cache_key))
+        if call:
+            # Wait for the output of the leader
+            try:
+                output = await call.wait(single_flight.timeout)
+                if isinstance(output, list):
+                    output = output[-1]
+                return cast(ModelOutput, output)
+            except Exception as e:
+                error: Exception = e
+            logger.warning(f"The in-flight call of {llm_cache_key} failed: {error}")
+        else:
+            llm_cache_value = await self._client.get(llm_cache_key)
+            logger.info(f"llm_cache_value: {llm_cache_value}")
+            if llm_cache_value:
+                return cast(ModelOutput, llm_cache_value.get_value().output)
+            # The leader finished without caching its output
+            error = ValueError(f"Cache value not found for key: {llm_cache_key}")
+        if not self._llm_client:
+            raise error
+        return await self._llm_client.generate(input_value)
 
 
 class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
@@ -101,10 +161,16 @@ class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
     A branch operator that decides whether to use cached data or to process data using
     the model.
 
+    With single-flight, when the cache misses and the same request is already
+    calling the model, the request goes to the cache task and waits for the output
+    of the running request instead of calling the model again.
+
     Args:
         cache_manager (CacheManager): The cache manager for managing cache operations.
         model_task_name (str): The name of the task to process data using the model.
         cache_task_name (str): The name of the task to process data using the cache.
+        single_flight (bool): Whether to coalesce the concurrent requests of the
+            same cache key, default is True.
         **kwargs: Additional keyword arguments.
     """
 
@@ -113,6 +179,7 @@ class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
         cache_manager: CacheManager,
         model_task_name: str,
         cache_task_name: str,
+        single_flight: bool = True,
         **kwargs,
     ):
         """Create a new instance of ModelCacheBranchOperator."""
@@ -121,6 +188,11 @@ class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
         self._client = LLMCacheClient(cache_manager)
         self._model_task_name = model_task_name
         self._cache_task_name = cache_task_name
+        self._single_flight = (
+            get_single_flight(cache_manager) if single_flight else None
+        )
+        # The in-flight calls led by the running DAGs, key is the event loop task id
+        self._leading_calls: Dict[int, InFlightCall] = {}
 
     async def branches(
         self,
@@ -133,11 +205,10 @@ class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
             Dict[BranchFunc[Dict], Union[BaseOperator, str]]: A dictionary mapping
                 branch functions to task names.
         """
+        # Both branch functions share the result of one cache check
+        check_task: Optional[asyncio.Future] = None
 
-        async def check_cache_true(input_value: ModelRequest) -> bool:
-            # Check if the cache contains the result for the given input
-            if input_value.context and not input_value.context.cache_enable:
-                return False
+        async def _check_cache(input_value: ModelRequest) -> bool:
             cache_dict = _parse_cache_key_dict(input_value)
             cache_key: LLMCacheKey = self._client.new_key(**cache_dict)
             cache_value = await self._client.get(cache_key)
@@ -145,10 +216,36 @@ class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
                 f"cache_key: {cache_key}, hash key: {hash(cache_key)}, cache_value: "
                 f"{cache_value}"
             )
-            await self.current_dag_context.save_to_share_data(
+            dag_ctx = self.current_dag_context
+            await dag_ctx.save_to_share_data(
                 _LLM_MODEL_INPUT_VALUE_KEY, cache_key, overwrite=True
             )
-            return bool(cache_value)
+            if cache_value:
+                return True
+            if self._single_flight is None:
+                return False
+            call, is_leader = self._single_flight.acquire(hash(cache_key))
+            if not is_leader:
+                logger.info(f"Wait for the in-flight call of cache key {cache_key}")
+                return True
+            for task_id, led_call in list(self._leading_calls.items()):
+                if led_call.done:
+                    # The DAG failed before after_dag_end was called
+                    del self._leading_calls[task_id]
+            self._leading_calls[dag_ctx._event_loop_task_id] = call
+            await dag_ctx.save_to_share_data(
+                _LLM_MODEL_IN_FLIGHT_CALL_KEY, call, overwrite=True
+            )
+            return False
+
+        async def check_cache_true(input_value: ModelRequest) -> bool:
+            # Check if the cache contains the result for the given input
+            nonlocal check_task
+            if input_value.context and not input_value.context.cache_enable:
+                return False
+            if check_task is None:
+                check_task = asyncio.ensure_future(_check_cache(input_value))
+            return await check_task
 
         async def check_cache_false(input_value: ModelRequest):
             # Inverse of check_cache_true
@@ -159,6 +256,12 @@ class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
             check_cache_false: self._model_task_name,
         }
 
+    async def after_dag_end(self, event_loop_task_id: int):
+        """Release the in-flight call if the model task failed to finish it."""
+        call = self._leading_calls.pop(event_loop_task_id, None)
+        if call and not call.done:
+            call.fail(RuntimeError("The leader request ended without model output"))
+
 
 class ModelStreamSaveCacheOperator(
     TransformStreamAbsOperator[ModelOutput, ModelOutput]
@@ -190,17 +293,36 @@ class ModelStreamSaveCacheOperator(
                 saved to cache.
         """
         llm_cache_key: Optional[LLMCacheKey] = None
+        dag_ctx = self.current_dag_context
+        call: Optional[InFlightCall] = await dag_ctx.get_from_share_data(
+            _LLM_MODEL_IN_FLIGHT_CALL_KEY
+        )
         outputs = []
-        async for out in input_value:
-            if not llm_cache_key:
-                llm_cache_key = await self.current_dag_context.get_from_share_data(
-                    _LLM_MODEL_INPUT_VALUE_KEY
-                )
-            outputs.append(out)
-            yield out
-        if llm_cache_key and _is_success_model_output(outputs):
-            llm_cache_value: LLMCacheValue = self._client.new_value(output=outputs)
-            await self._client.set(llm_cache_key, llm_cache_value)
+        completed = False
+        try:
+            async for out in input_value:
+                if not llm_cache_key:
+                    llm_cache_key = await dag_ctx.get_from_share_data(
+                        _LLM_MODEL_INPUT_VALUE_KEY
+                    )
+                outputs.append(out)
+                if call:
+                    call.publish(out)
+                yield out
+            completed = True
+            if llm_cache_key and _is_success_model_output(outputs):
+                llm_cache_value: LLMCacheValue = self._client.new_value(output=outputs)
+                await self._client.set(llm_cache_key, llm_cache_value)
+        except Exception as e:
+            if call:
+                call.fail(e)
+            raise
+        finally:
+            if call and completed:
+                call.finish()
+            elif call:
+                # The stream is closed by the consumer of the leader
+                call.fail(RuntimeError("The leader request is cancelled"))
 
 
 class ModelSaveCacheOperator(MapOperator[ModelOutput, ModelOutput]):
@@ -226,12 +348,21 @@ class ModelSaveCacheOperator(MapOperator[ModelOutput, ModelOutput]):
         Returns:
             ModelOutput: The same input model output.
         """
-        llm_cache_key: LLMCacheKey = await self.current_dag_context.get_from_share_data(
+        dag_ctx = self.current_dag_context
+        llm_cache_key: LLMCacheKey = await dag_ctx.get_from_share_data(
             _LLM_MODEL_INPUT_VALUE_KEY
         )
+        call: Optional[InFlightCall] = await dag_ctx.get_from_share_data(
+            _LLM_MODEL_IN_FLIGHT_CALL_KEY
+        )
         llm_cache_value: LLMCacheValue = self._client.new_value(output=input_value)
-        if llm_cache_key and _is_success_model_output(input_value):
-            await self._client.set(llm_cache_key, llm_cache_value)
+        try:
+            if llm_cache_key and _is_success_model_output(input_value):
+                await self._client.set(llm_cache_key, llm_cache_value)
+        finally:
+            if call:
+                # The followers get the output even if it is not cached
+                call.finish(input_value)
         return input_value
 
 
@@ -0,0 +1,188 @@
+"""Coalesce the concurrent model calls of the same cache key.
+
+When many identical requests arrive at the same time, all of them miss the cache
+and call the model before the first output is saved. With single-flight, the first
+request (the leader) calls the model, and the concurrent requests (the followers)
+wait for the result of the leader, or attach to its output stream.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class InFlightCall:
+    """A model call in flight, the outputs are shared with the followers."""
+
+    def __init__(self, key: Hashable, owner: "SingleFlight"):
+        """Create a new in-flight call of the key."""
+        self.key = key
+        self.created_at = time.monotonic()
+        self._owner = owner
+        self._loop = asyncio.get_running_loop()
+        self._changed: asyncio.Future = self._loop.create_future()
+        self._chunks: List[Any] = []
+        self._result: Any = None
+        self._error: Optional[BaseException] = None
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the call is finished."""
+        return self._done
+
+    def publish(self, chunk: Any) -> None:
+        """Publish a chunk of the output stream to the followers."""
+        if self._done:
+            return
+        self._chunks.append(chunk)
+        self._notify()
+
+    def finish(self, result: Any = None) -> None:
+        """Finish the call with the final result.
+
+        Args:
+            result (Any): The final result, None means the published chunks.
+        """
+        if self._done:
+            return
+        self._result = result if result is not None else list(self._chunks)
+        self._done = True
+        self._notify()
+        self._owner._release(self)
+
+    def fail(self, error: BaseException) -> None:
+        """Finish the call with an error, the followers will raise it."""
+        if self._done:
+            return
+        self._error = error
+        self._done = True
+        self._notify()
+        self._owner._release(self)
+
+    async def wait(self, timeout: Optional[float] = None) -> Any:
+        """Wait for the final result of the call."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._done:
+            await self._wait_changed(deadline)
+        if self._error:
+            raise self._error
+        return self._result
+
+    async def stream(self, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """Iterate the output stream from the first chunk.
+
+        If the leader is not a streaming call, the final result is yielded.
+
+        Args:
+            timeout (Optional[float]): The max seconds to wait for the next chunk, a
+                long stream which keeps producing chunks doesn't time out.
+        """
+        index = 0
+        while True:
+            while index < len(self._chunks):
+                yield self._chunks[index]
+                index += 1
+            if self._done:
+                break
+            deadline = None if timeout is None else time.monotonic() + timeout
+            await self._wait_changed(deadline)
+        if self._error:
+            raise self._error
+        if not self._chunks and self._result is not None:
+            results = self._result if isinstance(self._result, list) else [self._result]
+            for result in results:
+                yield result
+
+    async def _wait_changed(self, deadline: Optional[float]) -> None:
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._changed), timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(
+                f"Timeout waiting for the in-flight call of key {self.key}"
+            )
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, self._loop.create_future()
+        changed.set_result(None)
+
+
+class SingleFlight:
+    """The registry of the in-flight calls.
+
+    Examples:
+        .. code-block:: python
+
+            single_flight = SingleFlight()
+            call, is_leader = single_flight.acquire(key)
+            if is_leader:
+                try:
+                    call.finish(await model.generate(request))
+                except Exception as e:
+                    call.fail(e)
+                    raise
+            result = await call.wait()
+    """
+
+    def __init__(self, timeout: float = 300) -> None:
+        """Create a new SingleFlight.
+
+        Args:
+            timeout (float): The max seconds to wait for a leader, the call older
+                than it is treated as stale and replaced by a new leader.
+        """
+        self.timeout = timeout
+        self._calls: Dict[Hashable, InFlightCall] = {}
+
+    def acquire(self, key: Hashable) -> Tuple[InFlightCall, bool]:
+        """Join the in-flight call of the key, or start a new one.
+
+        Returns:
+            Tuple[InFlightCall, bool]: The call and whether the caller is the leader.
+        """
+        call = self.get(key)
+        if call is not None:
+            return call, False
+        call = InFlightCall(key, self)
+        self._calls[key] = call
+        return call, True
+
+    def get(self, key: Hashable) -> Optional[InFlightCall]:
+        """Return the in-flight call of the key in the current event loop."""
+        call = self._calls.get(key)
+        if call is None:
+            return None
+        if time.monotonic() - call.created_at > self.timeout:
+            logger.warning(f"The in-flight call of key {key} is stale, drop it")
+            call.fail(asyncio.TimeoutError(f"The in-flight call of {key} is stale"))
+            return None
+        if call._loop is not asyncio.get_running_loop():
+            return None
+        return call
+
+    def _release(self, call: InFlightCall) -> None:
+        if self._calls.get(call.key) is call:
+            del self._calls[call.key]
+
+    def __len__(self) -> int:
+        """Return the number of the in-flight calls."""
+        return len(self._calls)
+
+
+_SINGLE_FLIGHTS: "weakref.WeakKeyDictionary[Any, SingleFlight]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_single_flight(cache_manager: Any) -> SingleFlight:
+    """Return the SingleFlight shared by the operators of the cache manager."""
+    single_flight = _SINGLE_FLIGHTS.get(cache_manager)
+    if single_flight is None:
+        single_flight = SingleFlight()
+        _SINGLE_FLIGHTS[cache_manager] = single_flight
+    return single_flight
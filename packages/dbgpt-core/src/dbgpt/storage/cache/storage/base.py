@@ -1,10 +1,13 @@
 """Base cache storage class."""
 
 import logging
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Callable, Dict, Hashable, List, Optional
 
 import msgpack
 
@@ -17,11 +20,18 @@ from dbgpt.core.interface.cache import (
     RetrievalPolicy,
     V,
 )
-from dbgpt.util.memory_utils import _get_object_bytes
 
 logger = logging.getLogger(__name__)
 
 
+def _bytes_size(data: bytes) -> int:
+    """Return the memory size of a bytes object, aligned to 8 bytes.
+
+    It is the same as ``pympler.asizeof`` for bytes objects, but much faster.
+    """
+    return (sys.getsizeof(data) + 7) & ~7
+
+
 @dataclass
 class StorageItem:
     """A class representing a storage item.
@@ -46,12 +56,8 @@ class StorageItem:
         key_hash: bytes, key_data: bytes, value_data: bytes
     ) -> "StorageItem":
         """Build a StorageItem from the provided key and value data."""
-        length = (
-            32
-            + _get_object_bytes(key_hash)
-            + _get_object_bytes(key_data)
-            + _get_object_bytes(value_data)
-        )
+        length = 32 + _bytes_size(key_hash) + _bytes_size(key_data)
+        length += _bytes_size(value_data)
         return StorageItem(
             length=length, key_hash=key_hash, key_data=key_data, value_data=value_data
         )
@@ -190,15 +196,212 @@ class CacheStorage(ABC):
         """
         raise NotImplementedError
 
+    def stats(self) -> Dict[str, Any]:
+        """Return the statistics of the cache storage, like the hits and misses."""
+        return {}
+
+
+# The memory of the bookkeeping of one cache entry (the entry object, the dict
+# slots and the links of the eviction policy)
+_ENTRY_OVERHEAD = 240
+
+
+@dataclass
+class _CacheEntry:
+    item: StorageItem
+    size: int
+    expires_at: Optional[float] = None
+
+
+class _EvictionPolicy(ABC):
+    """Track the order of the keys and choose the victim in O(1)."""
+
+    @abstractmethod
+    def on_insert(self, key: Hashable) -> None:
+        """Add a new key."""
+
+    @abstractmethod
+    def on_access(self, key: Hashable) -> None:
+        """Record an access of the key."""
+
+    @abstractmethod
+    def on_remove(self, key: Hashable) -> None:
+        """Remove the key."""
+
+    @abstractmethod
+    def victim(self) -> Optional[Hashable]:
+        """Return the key to evict next."""
+
+
+class _LRUPolicy(_EvictionPolicy):
+    def __init__(self):
+        self._order: OrderedDict = OrderedDict()
+
+    def on_insert(self, key: Hashable) -> None:
+        self._order[key] = None
+
+    def on_access(self, key: Hashable) -> None:
+        self._order.move_to_end(key)
+
+    def on_remove(self, key: Hashable) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> Optional[Hashable]:
+        return next(iter(self._order), None)
+
+
+class _FIFOPolicy(_LRUPolicy):
+    def on_access(self, key: Hashable) -> None:
+        pass
+
+
+class _LFUPolicy(_EvictionPolicy):
+    """The least frequently used key is evicted, the ties are evicted in LRU order."""
+
+    def __init__(self):
+        self._freqs: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._min_freq = 0
+
+    def _add_to_bucket(self, key: Hashable, freq: int) -> None:
+        self._freqs[key] = freq
+        self._buckets.setdefault(freq, OrderedDict())[key] = None
+
+    def _remove_from_bucket(self, key: Hashable) -> int:
+        freq = self._freqs.pop(key)
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if freq == self._min_freq:
+                self._min_freq = min(self._buckets) if self._buckets else 0
+        return freq
+
+    def on_insert(self, key: Hashable) -> None:
+        self._add_to_bucket(key, 1)
+        self._min_freq = 1
+
+    def on_access(self, key: Hashable) -> None:
+        freq = self._remove_from_bucket(key) + 1
+        self._add_to_bucket(key, freq)
+        if not self._min_freq or freq < self._min_freq:
+            self._min_freq = freq
+
+    def on_remove(self, key: Hashable) -> None:
+        if key in self._freqs:
+            self._remove_from_bucket(key)
+
+    def victim(self) -> Optional[Hashable]:
+        bucket = self._buckets.get(self._min_freq)
+        return next(iter(bucket), None) if bucket else None
+
+
+class _FrequencySketch:
+    """A count-min sketch of the access frequency, used by the TinyLFU admission.
+
+    The counters are capped at 15 and halved after ``10 * width`` increments, so
+    the old popularity fades out.
+    """
+
+    _DEPTH = 4
+    _MAX_COUNT = 15
+
+    def __init__(self, width: int = 4096):
+        self._width = 1 << max(4, (width - 1).bit_length())
+        self._mask = self._width - 1
+        self._table = [[0] * self._width for _ in range(self._DEPTH)]
+        self._additions = 0
+        self._sample_size = 10 * self._width
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        return [hash((key, i)) & self._mask for i in range(self._DEPTH)]
+
+    def increment(self, key: Hashable) -> None:
+        added = False
+        for row, index in zip(self._table, self._indexes(key)):
+            if row[index] < self._MAX_COUNT:
+                row[index] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= self._sample_size:
+                self._reset()
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._table, self._indexes(key)))
+
+    def _reset(self) -> None:
+        for row in self._table:
+            for i in range(self._width):
+                row[i] >>= 1
+        self._additions //= 2
+
+
+_POLICIES = {
+    CachePolicy.LRU: _LRUPolicy,
+    CachePolicy.FIFO: _FIFOPolicy,
+    CachePolicy.LFU: _LFUPolicy,
+}
+
 
 class MemoryCacheStorage(CacheStorage):
-    """A simple in-memory cache storage implementation."""
+    """An in-memory cache storage with bounded memory.
+
+    All operations are O(1). The memory usage is accounted by the bytes of the
+    stored items, and it is released when the items are evicted or expired.
+
+    Examples:
+        .. code-block:: python
 
-    def __init__(self, max_memory_mb: int = 256):
-        """Create a new instance of MemoryCacheStorage."""
-        self.cache: OrderedDict = OrderedDict()
+            storage = MemoryCacheStorage(
+                max_memory_mb=256,
+                cache_policy=CachePolicy.LFU,
+                admission="tinylfu",
+                default_ttl=3600,
+            )
+    """
+
+    def __init__(
+        self,
+        max_memory_mb: int = 256,
+        cache_policy: CachePolicy = CachePolicy.LRU,
+        default_ttl: Optional[float] = None,
+        admission: Optional[str] = None,
+        on_evict: Optional[Callable[[StorageItem], None]] = None,
+    ):
+        """Create a new instance of MemoryCacheStorage.
+
+        Args:
+            max_memory_mb (int): The max memory of the cached items in MB.
+            cache_policy (CachePolicy): The eviction policy: LRU, FIFO or LFU. The
+                policy in the per-call CacheConfig is ignored, it is fixed for the
+                storage.
+            default_ttl (Optional[float]): The default time to live of the entries
+                in seconds, None means never expire. The ``ttl`` of CacheConfig
+                overrides it.
+            admission (Optional[str]): The admission policy, "tinylfu" only admits
+                a new entry when it is accessed more frequently than the entry it
+                would evict. None means admit all entries.
+            on_evict (Optional[Callable[[StorageItem], None]]): Called with the
+                items evicted to make room for the new items, outside the lock. The
+                expired and replaced items are not passed to it.
+        """
+        if admission not in (None, "tinylfu"):
+            raise ValueError(f"Unsupported admission policy: {admission}")
+        self.cache: Dict[Hashable, _CacheEntry] = {}
         self.max_memory = max_memory_mb * 1024 * 1024
         self.current_memory_usage = 0
+        self.default_ttl = default_ttl
+        self._cache_policy = CachePolicy(cache_policy)
+        self._policy: _EvictionPolicy = _POLICIES[self._cache_policy]()
+        self._sketch = _FrequencySketch() if admission == "tinylfu" else None
+        self._on_evict = on_evict
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._rejections = 0
 
     def check_config(
         self,
@@ -224,14 +427,22 @@ class MemoryCacheStorage(CacheStorage):
         self.check_config(cache_config, raise_error=True)
         # Exact match retrieval
         key_hash = hash(key)
-        item: Optional[StorageItem] = self.cache.get(key_hash)
-        logger.debug(f"MemoryCacheStorage get key {key}, hash {key_hash}, item: {item}")
-
-        if not item:
-            return None
-        # Move the item to the end of the OrderedDict to signify recent use.
-        self.cache.move_to_end(key_hash)
-        return item
+        with self._lock:
+            if self._sketch:
+                self._sketch.increment(key_hash)
+            entry = self.cache.get(key_hash)
+            if entry and entry.expires_at and entry.expires_at <= time.monotonic():
+                self._remove(key_hash)
+                self._expirations += 1
+                entry = None
+            if not entry:
+                self._misses += 1
+                logger.debug(f"MemoryCacheStorage get key {key}, hash {key_hash} miss")
+                return None
+            self._hits += 1
+            self._policy.on_access(key_hash)
+        logger.debug(f"MemoryCacheStorage get key {key}, hash {key_hash} hit")
+        return entry.item
 
     def set(
         self,
@@ -240,28 +451,109 @@ class MemoryCacheStorage(CacheStorage):
         cache_config: Optional[CacheConfig] = None,
     ) -> None:
         """Set a value in the cache for the provided key."""
+        self.set_item(key, StorageItem.build_from_kv(key, value), cache_config)
+
+    def set_item(
+        self,
+        key: CacheKey[K],
+        item: StorageItem,
+        cache_config: Optional[CacheConfig] = None,
+    ) -> None:
+        """Set a built storage item, like the item read from another storage."""
         key_hash = hash(key)
-        item = StorageItem.build_from_kv(key, value)
-        # Calculate memory size of the new entry
-        new_entry_size = _get_object_bytes(item)
-        # Evict entries if necessary
-        while self.current_memory_usage + new_entry_size > self.max_memory:
-            self._apply_cache_policy(cache_config)
-
-        # Store the item in the cache.
-        self.cache[key_hash] = item
-        self.current_memory_usage += new_entry_size
-        logger.debug(f"MemoryCacheStorage set key {key}, hash {key_hash}, item: {item}")
+        size = item.length + _ENTRY_OVERHEAD
+        if size > self.max_memory:
+            logger.warning(
+                f"The cache item of key {key} is larger than the max memory, skip it"
+            )
+            return
+        ttl = cache_config.ttl if cache_config and cache_config.ttl else None
+        ttl = ttl or self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if self._sketch:
+                self._sketch.increment(key_hash)
+            if key_hash in self.cache:
+                # Replace the old value
+                self._remove(key_hash)
+            elif not self._admit(key_hash, size):
+                self._rejections += 1
+                return
+            evicted = self._evict_to_fit(size)
+            self.cache[key_hash] = _CacheEntry(item, size, expires_at)
+            self.current_memory_usage += size
+            self._policy.on_insert(key_hash)
+        logger.debug(f"MemoryCacheStorage set key {key}, hash {key_hash}")
+        if self._on_evict:
+            for evicted_item in evicted:
+                self._on_evict(evicted_item)
 
     def exists(
         self, key: CacheKey[K], cache_config: Optional[CacheConfig] = None
     ) -> bool:
         """Check if the key exists in the cache."""
-        return self.get(key, cache_config) is not None
-
-    def _apply_cache_policy(self, cache_config: Optional[CacheConfig] = None):
-        # Remove the oldest/newest item based on the cache policy.
-        if cache_config and cache_config.cache_policy == CachePolicy.FIFO:
-            self.cache.popitem(last=False)
-        else:  # Default is LRU
-            self.cache.popitem(last=True)
+        key_hash = hash(key)
+        with self._lock:
+            entry = self.cache.get(key_hash)
+            return bool(
+                entry and (not entry.expires_at or entry.expires_at > time.monotonic())
+            )
+
+    def purge_expired(self) -> int:
+        """Remove all the expired entries.
+
+        Returns:
+            int: The number of the removed entries.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                k
+                for k, entry in self.cache.items()
+                if entry.expires_at and entry.expires_at <= now
+            ]
+            for k in expired:
+                self._remove(k)
+            self._expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the statistics of the cache storage."""
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / requests if requests else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "rejections": self._rejections,
+                "entries": len(self.cache),
+                "memory_usage": self.current_memory_usage,
+                "max_memory": self.max_memory,
+                "cache_policy": self._cache_policy.value,
+            }
+
+    def _admit(self, key_hash: Hashable, size: int) -> bool:
+        if not self._sketch or self.current_memory_usage + size <= self.max_memory:
+            return True
+        victim = self._policy.victim()
+        if victim is None:
+            return True
+        return self._sketch.estimate(key_hash) > self._sketch.estimate(victim)
+
+    def _evict_to_fit(self, size: int) -> List[StorageItem]:
+        evicted = []
+        while self.current_memory_usage + size > self.max_memory:
+            victim = self._policy.victim()
+            if victim is None:
+                break
+            evicted.append(self._remove(victim).item)
+            self._evictions += 1
+        return evicted
+
+    def _remove(self, key_hash: Hashable) -> _CacheEntry:
+        entry = self.cache.pop(key_hash)
+        self.current_memory_usage -= entry.size
+        self._policy.on_remove(key_hash)
+        return entry
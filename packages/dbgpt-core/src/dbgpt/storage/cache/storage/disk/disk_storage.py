@@ -4,9 +4,9 @@ Implement the cache storage using rocksdb.
 """
 
 import logging
-from typing import Optional
+from typing import List, Optional
 
-from rocksdict import Options, Rdict
+from rocksdict import Options, Rdict, WriteBatch
 
 from dbgpt.core.interface.cache import (
     CacheConfig,
@@ -99,3 +99,32 @@ class DiskCacheStorage(CacheStorage):
         key_hash = item.key_hash
         self.db[key_hash] = item.serialize()
         logger.debug(f"Save file cache, key: {key}, value: {value}")
+
+    def get_many(self, key_hashes: List[bytes]) -> List[Optional[StorageItem]]:
+        """Retrieve the storage items of the key hashes in one read.
+
+        Args:
+            key_hashes (List[bytes]): The hash bytes of the keys.
+
+        Returns:
+            List[Optional[StorageItem]]: The storage items in the order of the key
+                hashes, None if the key not exists.
+        """
+        if not key_hashes:
+            return []
+        items_bytes = self.db.get(key_hashes)
+        return [StorageItem.deserialize(b) if b else None for b in items_bytes]
+
+    def set_many(self, items: List[StorageItem]) -> None:
+        """Write the storage items in one batch."""
+        if not items:
+            return
+        batch = WriteBatch()
+        for item in items:
+            batch.put(item.key_hash, item.serialize())
+        self.db.write(batch)
+        logger.debug(f"Save {len(items)} items to file cache in one batch")
+
+    def close(self) -> None:
+        """Close the database."""
+        self.db.close()
@@ -0,0 +1,304 @@
+"""Semantic cache storage, retrieve the cache by the similarity of the prompts."""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from dbgpt.core import Embeddings
+from dbgpt.core.interface.cache import (
+    CacheConfig,
+    CacheKey,
+    CacheValue,
+    K,
+    RetrievalPolicy,
+    V,
+)
+
+from ..base import _ENTRY_OVERHEAD, CacheStorage, StorageItem, _LRUPolicy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _VectorIndex:
+    """A flat inner-product index of the normalized prompt vectors.
+
+    The vectors are kept in one contiguous matrix, so a search is one
+    matrix-vector product. Removing a vector moves the last vector to its row.
+    """
+
+    def __init__(self, dim: int, initial_capacity: int = 64):
+        import numpy as np
+
+        self._matrix = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._keys: List[Hashable] = []
+        self._rows: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Hashable, vector: "np.ndarray") -> None:
+        import numpy as np
+
+        if key in self._rows:
+            self._matrix[self._rows[key]] = vector
+            return
+        size = len(self._keys)
+        if size == len(self._matrix):
+            grown = np.zeros((size * 2, self._matrix.shape[1]), dtype=np.float32)
+            grown[:size] = self._matrix
+            self._matrix = grown
+        self._matrix[size] = vector
+        self._rows[key] = size
+        self._keys.append(key)
+
+    def remove(self, key: Hashable) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self._keys) - 1
+        last_key = self._keys.pop()
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self._keys[row] = last_key
+            self._rows[last_key] = row
+
+    def search(self, vector: "np.ndarray") -> Optional[Tuple[Hashable, float]]:
+        size = len(self._keys)
+        if not size:
+            return None
+        scores = self._matrix[:size] @ vector
+        row = int(scores.argmax())
+        return self._keys[row], float(scores[row])
+
+
+@dataclass
+class _SemanticEntry:
+    item: StorageItem
+    size: int
+    partition: Optional[Tuple] = None
+
+
+class SemanticCacheStorage(CacheStorage):
+    """A cache storage which returns the cached value of a similar prompt.
+
+    The prompt of the cache key is embedded by the :class:`Embeddings`, a cached
+    value is returned when the cosine similarity of the prompts is not less than
+    the similarity threshold. Only the entries with the same guard fields (the
+    model name and the temperature by default) are compared, so the outputs of
+    another model or another temperature are never returned.
+
+    The exact match is tried before the similarity match, and the similarity match
+    is the default retrieval policy when no cache config is passed, so it works
+    with the cache operators unchanged.
+
+    Examples:
+        .. code-block:: python
+
+            from dbgpt.storage.cache.manager import LocalCacheManager
+            from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+            storage = SemanticCacheStorage(embeddings, similarity_threshold=0.95)
+            cache_manager = LocalCacheManager(system_app, JsonSerializer(), storage)
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        embeddings_factory: Optional[Callable[[], Embeddings]] = None,
+        similarity_threshold: float = 0.95,
+        max_memory_mb: int = 256,
+        guard_fields: Sequence[str] = ("model_name", "temperature"),
+        max_temperature: Optional[float] = None,
+    ):
+        """Create a new instance of SemanticCacheStorage.
+
+        Args:
+            embeddings (Optional[Embeddings]): The embeddings to embed the prompts.
+            embeddings_factory (Optional[Callable[[], Embeddings]]): Create the
+                embeddings at the first use, used when the embeddings are not
+                ready when the storage is created.
+            similarity_threshold (float): The min cosine similarity of the prompts
+                to return a cached value.
+            max_memory_mb (int): The max memory of the cached items and vectors in
+                MB, the least recently used entries are evicted.
+            guard_fields (Sequence[str]): The fields of the cache key which must be
+                equal to return a similar entry.
+            max_temperature (Optional[float]): Don't match the similar prompts when
+                the temperature of the request is greater than it, None means no
+                limit.
+        """
+        if not embeddings and not embeddings_factory:
+            raise ValueError("One of embeddings and embeddings_factory is required")
+        self._embeddings = embeddings
+        self._embeddings_factory = embeddings_factory
+        self.similarity_threshold = similarity_threshold
+        self.max_memory = max_memory_mb * 1024 * 1024
+        self.current_memory_usage = 0
+        self._guard_fields = tuple(guard_fields)
+        self._max_temperature = max_temperature
+        self._entries: Dict[Hashable, _SemanticEntry] = {}
+        self._indexes: Dict[Tuple, _VectorIndex] = {}
+        self._policy = _LRUPolicy()
+        self._lock = threading.Lock()
+        self._exact_hits = 0
+        self._similar_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """Return the embeddings."""
+        if not self._embeddings:
+            self._embeddings = self._embeddings_factory()  # type: ignore
+        return self._embeddings
+
+    def check_config(
+        self,
+        cache_config: Optional[CacheConfig] = None,
+        raise_error: Optional[bool] = True,
+    ) -> bool:
+        """Check whether the CacheConfig is legal, all retrieval policies work."""
+        return True
+
+    def get(
+        self, key: CacheKey[K], cache_config: Optional[CacheConfig] = None
+    ) -> Optional[StorageItem]:
+        """Retrieve the storage item of the key or of the most similar prompt."""
+        key_hash = hash(key)
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry:
+                self._exact_hits += 1
+                self._policy.on_access(key_hash)
+                return entry.item
+        if cache_config and (
+            cache_config.retrieval_policy == RetrievalPolicy.EXACT_MATCH
+        ):
+            with self._lock:
+                self._misses += 1
+            return None
+        prompt, partition = self._parse_key(key)
+        if prompt is None:
+            with self._lock:
+                self._misses += 1
+            return None
+        vector = self._embed(prompt)
+        with self._lock:
+            index = self._indexes.get(partition)
+            result = index.search(vector) if index else None
+            if result and result[1] >= self.similarity_threshold:
+                self._similar_hits += 1
+                self._policy.on_access(result[0])
+                logger.debug(
+                    f"SemanticCacheStorage hit similar prompt, score: {result[1]}"
+                )
+                return self._entries[result[0]].item
+            self._misses += 1
+        return None
+
+    def set(
+        self,
+        key: CacheKey[K],
+        value: CacheValue[V],
+        cache_config: Optional[CacheConfig] = None,
+    ) -> None:
+        """Set the value of the key and index its prompt."""
+        key_hash = hash(key)
+        item = StorageItem.build_from_kv(key, value)
+        prompt, partition = self._parse_key(key)
+        vector = self._embed(prompt) if prompt is not None else None
+        size = item.length + _ENTRY_OVERHEAD
+        if vector is not None:
+            size += vector.nbytes
+        if size > self.max_memory:
+            logger.warning(
+                f"The cache item of key {key} is larger than the max memory, skip it"
+            )
+            return
+        with self._lock:
+            if key_hash in self._entries:
+                self._remove(key_hash)
+            while self.current_memory_usage + size > self.max_memory:
+                victim = self._policy.victim()
+                if victim is None:
+                    break
+                self._remove(victim)
+                self._evictions += 1
+            self._entries[key_hash] = _SemanticEntry(
+                item, size, partition if vector is not None else None
+            )
+            self.current_memory_usage += size
+            self._policy.on_insert(key_hash)
+            if vector is not None:
+                index = self._indexes.get(partition)
+                if index is None:
+                    index = _VectorIndex(len(vector))
+                    self._indexes[partition] = index
+                index.add(key_hash, vector)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the statistics of the cache storage."""
+        with self._lock:
+            hits = self._exact_hits + self._similar_hits
+            requests = hits + self._misses
+            return {
+                "hits": hits,
+                "exact_hits": self._exact_hits,
+                "similar_hits": self._similar_hits,
+                "misses": self._misses,
+                "hit_rate": hits / requests if requests else 0.0,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "memory_usage": self.current_memory_usage,
+                "max_memory": self.max_memory,
+            }
+
+    def _remove(self, key_hash: Hashable) -> None:
+        entry = self._entries.pop(key_hash)
+        self.current_memory_usage -= entry.size
+        self._policy.on_remove(key_hash)
+        if entry.partition is not None:
+            index = self._indexes[entry.partition]
+            index.remove(key_hash)
+            if not len(index):
+                del self._indexes[entry.partition]
+
+    def _parse_key(self, key: CacheKey[K]) -> Tuple[Optional[str], Tuple]:
+        """Return the prompt and the guard values of the cache key."""
+        value = key.get_value()
+        if isinstance(value, dict):
+            fields = value
+        else:
+            fields = getattr(value, "__dict__", {})
+        prompt = fields.get("prompt")
+        if not isinstance(prompt, str) or not prompt:
+            return None, ()
+        temperature = fields.get("temperature")
+        if (
+            self._max_temperature is not None
+            and temperature is not None
+            and temperature > self._max_temperature
+        ):
+            return None, ()
+        return prompt, tuple(fields.get(f) for f in self._guard_fields)
+
+    def _embed(self, prompt: str) -> "np.ndarray":
+        import numpy as np
+
+        vector = np.asarray(self.embeddings.embed_query(prompt), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
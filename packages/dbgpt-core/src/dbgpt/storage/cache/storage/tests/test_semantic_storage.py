@@ -0,0 +1,131 @@
+import hashlib
+import re
+from typing import List
+
+import pytest
+
+from dbgpt.core import Embeddings, ModelOutput
+from dbgpt.core.interface.cache import CacheConfig, RetrievalPolicy
+from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+from ...llm_cache import LLMCacheKey, LLMCacheValue
+from ..semantic.semantic_storage import SemanticCacheStorage
+
+
+class BagOfWordsEmbeddings(Embeddings):
+    """Deterministic embeddings, the prompts with the same words are similar."""
+
+    def __init__(self, dim: int = 64):
+        self.dim = dim
+        self.calls = 0
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        vector = [0.0] * self.dim
+        for word in re.findall(r"\w+", text.lower()):
+            index = int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim
+            vector[index] += 1.0
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+def _key(prompt: str, model_name: str = "vicuna", temperature: float = 0.7):
+    key = LLMCacheKey(prompt=prompt, model_name=model_name, temperature=temperature)
+    key.set_serializer(JsonSerializer())
+    return key
+
+
+def _value(text: str):
+    value = LLMCacheValue(output=ModelOutput(text=text, error_code=0).to_dict())
+    value.set_serializer(JsonSerializer())
+    return value
+
+
+def _text(item) -> str:
+    value = JsonSerializer().deserialize(item.value_data, LLMCacheValue)
+    return value.get_value().output.text
+
+
+@pytest.fixture
+def storage():
+    return SemanticCacheStorage(BagOfWordsEmbeddings(), similarity_threshold=0.8)
+
+
+def test_exact_match(storage: SemanticCacheStorage):
+    storage.set(_key("What is the capital of France"), _value("Paris"))
+    item = storage.get(_key("What is the capital of France"))
+    assert _text(item) == "Paris"
+    assert storage.stats()["exact_hits"] == 1
+
+
+def test_similar_match(storage: SemanticCacheStorage):
+    storage.set(_key("What is the capital of France"), _value("Paris"))
+    item = storage.get(_key("what is the capital of France?"))
+    assert _text(item) == "Paris"
+    assert storage.get(_key("How to cook rice")) is None
+    stats = storage.stats()
+    assert stats["similar_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_exact_match_policy(storage: SemanticCacheStorage):
+    storage.set(_key("What is the capital of France"), _value("Paris"))
+    config = CacheConfig(retrieval_policy=RetrievalPolicy.EXACT_MATCH)
+    assert storage.get(_key("what is the capital of France?"), config) is None
+
+
+def test_guard_fields(storage: SemanticCacheStorage):
+    storage.set(_key("What is the capital of France"), _value("Paris"))
+    assert storage.get(_key("What is the capital of France?", "chatglm")) is None
+    assert storage.get(_key("What is the capital of France?", temperature=0.1)) is None
+
+
+def test_max_temperature():
+    storage = SemanticCacheStorage(
+        BagOfWordsEmbeddings(), similarity_threshold=0.8, max_temperature=0.5
+    )
+    storage.set(_key("What is the capital of France", temperature=0.9), _value("P"))
+    assert storage.get(_key("What is the capital of France", temperature=0.9))
+    assert storage.get(_key("what is the capital of France?", temperature=0.9)) is None
+
+
+def test_embeddings_factory():
+    embeddings = BagOfWordsEmbeddings()
+    created = []
+
+    def _factory():
+        created.append(embeddings)
+        return embeddings
+
+    storage = SemanticCacheStorage(embeddings_factory=_factory)
+    assert not created
+    storage.set(_key("hello world"), _value("hi"))
+    storage.get(_key("hello world!"))
+    assert len(created) == 1
+
+
+def test_eviction_and_index():
+    storage = SemanticCacheStorage(
+        BagOfWordsEmbeddings(), similarity_threshold=0.99, max_memory_mb=1
+    )
+    storage.max_memory = 8 * 1024
+    for i in range(100):
+        storage.set(_key(f"question number {i}"), _value("x" * 100))
+    stats = storage.stats()
+    assert stats["evictions"] > 0
+    assert stats["memory_usage"] <= storage.max_memory
+    assert stats["entries"] < 100
+    # The latest entry is still found by similarity, the evicted one is not
+    assert storage.get(_key("Question number 99"))
+    assert storage.get(_key("Question number 0")) is None
+
+
+def test_replace_value(storage: SemanticCacheStorage):
+    storage.set(_key("What is the capital of France"), _value("Paris"))
+    storage.set(_key("What is the capital of France"), _value("Paris, France"))
+    assert storage.stats()["entries"] == 1
+    assert _text(storage.get(_key("what is the capital of France?"))) == (
+        "Paris, France"
+    )
@@ -1,6 +1,11 @@
+import time
+
+import pytest
+
+from dbgpt.core.interface.cache import CacheConfig, CachePolicy
 from dbgpt.util.memory_utils import _get_object_bytes
 
-from ..base import StorageItem
+from ..base import MemoryCacheStorage, StorageItem
 
 
 def test_build_from():
@@ -51,3 +56,134 @@ def test_serialize_deserialize():
     assert deserialized.key_data == item.key_data
     assert deserialized.value_data == item.value_data
     assert deserialized.length == item.length
+
+
+class _Key:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def get_hash_bytes(self):
+        return self.name.encode()
+
+    def serialize(self):
+        return self.name.encode()
+
+
+class _Value:
+    def __init__(self, size: int = 1000):
+        self.data = b"x" * size
+
+    def serialize(self):
+        return self.data
+
+
+def _new_storage(num_items: int, item_size: int = 1000, **kwargs):
+    storage = MemoryCacheStorage(**kwargs)
+    # Room for num_items items
+    item = StorageItem.build_from_kv(_Key("k0"), _Value(item_size))
+    storage.max_memory = num_items * (item.length + 240)
+    return storage
+
+
+def test_memory_storage_lru():
+    storage = _new_storage(3)
+    for name in ["a", "b", "c"]:
+        storage.set(_Key(name), _Value())
+    # "a" is the most recently used now
+    assert storage.get(_Key("a")) is not None
+    storage.set(_Key("d"), _Value())
+    assert storage.get(_Key("b")) is None
+    for name in ["a", "c", "d"]:
+        assert storage.get(_Key(name)) is not None
+    assert storage.stats()["evictions"] == 1
+    assert storage.stats()["entries"] == 3
+
+
+def test_memory_storage_fifo():
+    storage = _new_storage(2, cache_policy=CachePolicy.FIFO)
+    storage.set(_Key("a"), _Value())
+    storage.set(_Key("b"), _Value())
+    storage.get(_Key("a"))
+    storage.set(_Key("c"), _Value())
+    assert storage.get(_Key("a")) is None
+    assert storage.get(_Key("b")) is not None
+
+
+def test_memory_storage_lfu():
+    storage = _new_storage(2, cache_policy=CachePolicy.LFU)
+    storage.set(_Key("a"), _Value())
+    storage.set(_Key("b"), _Value())
+    for _ in range(3):
+        storage.get(_Key("a"))
+    storage.get(_Key("b"))
+    storage.set(_Key("c"), _Value())
+    assert storage.get(_Key("b")) is None
+    assert storage.get(_Key("a")) is not None
+    assert storage.get(_Key("c")) is not None
+
+
+def test_memory_storage_accounting():
+    storage = _new_storage(10)
+    for i in range(100):
+        storage.set(_Key(f"k{i}"), _Value())
+        assert storage.current_memory_usage <= storage.max_memory
+    assert storage.stats()["entries"] == 10
+    assert storage.current_memory_usage == sum(e.size for e in storage.cache.values())
+    # Replace the values
+    for i in range(90, 100):
+        storage.set(_Key(f"k{i}"), _Value(10))
+    assert storage.current_memory_usage == sum(e.size for e in storage.cache.values())
+    # Too large item is skipped
+    storage.set(_Key("large"), _Value(100 * 1000))
+    assert storage.get(_Key("large")) is None
+
+
+def test_memory_storage_ttl():
+    storage = MemoryCacheStorage(default_ttl=0.05)
+    storage.set(_Key("a"), _Value())
+    storage.set(_Key("b"), _Value(), CacheConfig(ttl=10))
+    assert storage.get(_Key("a")) is not None
+    time.sleep(0.06)
+    assert storage.get(_Key("a")) is None
+    assert storage.exists(_Key("b"))
+    storage.set(_Key("c"), _Value())
+    time.sleep(0.06)
+    assert storage.purge_expired() == 1
+    stats = storage.stats()
+    assert stats["expirations"] == 2
+    assert stats["entries"] == 1
+
+
+def test_memory_storage_tinylfu_admission():
+    storage = _new_storage(2, admission="tinylfu")
+    storage.set(_Key("a"), _Value())
+    storage.set(_Key("b"), _Value())
+    for _ in range(5):
+        storage.get(_Key("a"))
+        storage.get(_Key("b"))
+    # A new key seen once can't evict the popular keys
+    storage.set(_Key("c"), _Value())
+    assert storage.get(_Key("c")) is None
+    assert storage.stats()["rejections"] == 1
+    # It is admitted after it becomes popular
+    for _ in range(10):
+        storage.get(_Key("c"))
+    storage.set(_Key("c"), _Value())
+    assert storage.get(_Key("c")) is not None
+    assert storage.stats()["entries"] == 2
+
+
+def test_memory_storage_stats():
+    storage = MemoryCacheStorage()
+    storage.set(_Key("a"), _Value())
+    storage.get(_Key("a"))
+    storage.get(_Key("b"))
+    stats = storage.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    with pytest.raises(ValueError):
+        MemoryCacheStorage(admission="unknown")
@@ -0,0 +1,109 @@
+from typing import List
+
+import pytest
+
+from dbgpt.core import Embeddings
+
+from ..embedding_cache import CachedEmbeddings, EmbeddingCacheStore, _pack
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self, model_name: str = "test-embedding"):
+        self.model_name = model_name
+        self.document_texts: List[str] = []
+        self.query_texts: List[str] = []
+
+    def _embed(self, text: str) -> List[float]:
+        return [float(len(text)), 0.5, -1.25]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.document_texts.extend(texts)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.query_texts.append(text)
+        return self._embed("query: " + text)
+
+
+def test_only_misses_are_embedded():
+    backend = CountingEmbeddings()
+    embeddings = CachedEmbeddings(backend)
+    vectors = embeddings.embed_documents(["hello", "world", "hello"])
+    assert backend.document_texts == ["hello", "world"]
+    assert vectors[0] == vectors[2] == [5.0, 0.5, -1.25]
+
+    vectors = embeddings.embed_documents(["world", " hello ", "new text"])
+    assert backend.document_texts == ["hello", "world", "new text"]
+    assert vectors[1] == [5.0, 0.5, -1.25]
+
+    # Re-ingesting the unchanged documents makes no embedding call
+    embeddings.embed_documents(["hello", "world", "new text"])
+    assert len(backend.document_texts) == 3
+    stats = embeddings.stats()
+    assert stats["backend_calls"] == 2
+    assert stats["backend_texts"] == 3
+    assert stats["hits"] == 5
+
+
+def test_query_and_document_cached_separately():
+    backend = CountingEmbeddings()
+    embeddings = CachedEmbeddings(backend)
+    document = embeddings.embed_documents(["hello"])[0]
+    query = embeddings.embed_query("hello")
+    assert document != query
+    assert embeddings.embed_query("hello") == query
+    assert backend.query_texts == ["hello"]
+
+
+def test_model_name_in_key():
+    store = EmbeddingCacheStore()
+    backend_a = CountingEmbeddings("model-a")
+    backend_b = CountingEmbeddings("model-b")
+    CachedEmbeddings(backend_a, store).embed_documents(["hello"])
+    CachedEmbeddings(backend_b, store).embed_documents(["hello"])
+    assert backend_b.document_texts == ["hello"]
+
+
+@pytest.mark.asyncio
+async def test_async_embed():
+    backend = CountingEmbeddings()
+    embeddings = CachedEmbeddings(backend)
+    await embeddings.aembed_documents(["a", "b"])
+    await embeddings.aembed_documents(["a", "b", "c"])
+    assert backend.document_texts == ["a", "b", "c"]
+    assert await embeddings.aembed_query("a") == await embeddings.aembed_query("a")
+    assert backend.query_texts == ["a"]
+
+
+def test_lru_eviction():
+    store = EmbeddingCacheStore(max_memory_mb=1)
+    entry_size = len(_pack([0.0] * 3)) + 160
+    store.max_memory = entry_size * 2
+    embeddings = CachedEmbeddings(CountingEmbeddings(), store)
+    embeddings.embed_documents(["a"])
+    embeddings.embed_documents(["b"])
+    embeddings.embed_documents(["a"])
+    embeddings.embed_documents(["c"])
+    stats = store.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["memory_usage"] <= store.max_memory
+    # "b" is the least recently used one
+    embeddings.embed_documents(["a", "b"])
+    assert embeddings.embeddings.document_texts == ["a", "b", "c", "b"]
+
+
+def test_persistent_store(tmp_path):
+    pytest.importorskip("rocksdict")
+    persist_dir = str(tmp_path / "embedding_cache")
+    store = EmbeddingCacheStore(persist_dir=persist_dir)
+    CachedEmbeddings(CountingEmbeddings(), store).embed_documents(["a", "b"])
+    store.close()
+
+    store = EmbeddingCacheStore(persist_dir=persist_dir)
+    backend = CountingEmbeddings()
+    vectors = CachedEmbeddings(backend, store).embed_documents(["a", "b"])
+    assert backend.document_texts == []
+    assert vectors == [[1.0, 0.5, -1.25], [1.0, 0.5, -1.25]]
+    assert store.stats()["disk_hits"] == 2
+    store.close()
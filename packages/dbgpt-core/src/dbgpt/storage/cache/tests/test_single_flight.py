@@ -0,0 +1,259 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+
+from dbgpt.component import SystemApp
+from dbgpt.core import (
+    LLMClient,
+    ModelMessage,
+    ModelMetadata,
+    ModelOutput,
+    ModelRequest,
+    ModelRequestContext,
+)
+from dbgpt.core.awel import (
+    DAG,
+    BranchJoinOperator,
+    InputOperator,
+    MapOperator,
+    SimpleCallDataInputSource,
+    StreamifyAbsOperator,
+)
+from dbgpt.util.executor_utils import DefaultExecutorFactory
+from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+from ..manager import LocalCacheManager
+from ..operators import (
+    CachedModelOperator,
+    CachedModelStreamOperator,
+    ModelCacheBranchOperator,
+    ModelSaveCacheOperator,
+    ModelStreamSaveCacheOperator,
+    _parse_cache_key_dict,
+)
+from ..single_flight import SingleFlight, get_single_flight
+from ..storage.base import MemoryCacheStorage
+
+
+class _FakeLLMOperator(MapOperator[ModelRequest, ModelOutput]):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    async def map(self, request: ModelRequest) -> ModelOutput:
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        return ModelOutput(text=f"answer {self.calls}", error_code=0)
+
+
+class _FakeStreamLLMOperator(StreamifyAbsOperator[ModelRequest, ModelOutput]):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    async def streamify(self, request: ModelRequest) -> AsyncIterator[ModelOutput]:
+        self.calls += 1
+        text = ""
+        for i in range(3):
+            await asyncio.sleep(0.03)
+            text += f"token{i} "
+            yield ModelOutput(text=text, error_code=0)
+
+
+class _FakeLLMClient(LLMClient):
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, request, message_converter=None) -> ModelOutput:
+        self.calls += 1
+        return ModelOutput(text="direct answer", error_code=0)
+
+    async def generate_stream(
+        self, request, message_converter=None
+    ) -> AsyncIterator[ModelOutput]:
+        self.calls += 1
+        yield ModelOutput(text="direct", error_code=0)
+        yield ModelOutput(text="direct answer", error_code=0)
+
+    async def models(self) -> List[ModelMetadata]:
+        return []
+
+    async def count_token(self, model: str, prompt: str) -> int:
+        return 0
+
+
+@pytest.fixture
+def cache_manager():
+    system_app = SystemApp()
+    system_app.register(DefaultExecutorFactory)
+    return LocalCacheManager(system_app, JsonSerializer(), MemoryCacheStorage())
+
+
+def _build_dag(cache_manager, is_streaming: bool):
+    with DAG("test_single_flight_dag"):
+        input_task = InputOperator(SimpleCallDataInputSource())
+        if is_streaming:
+            llm_task = _FakeStreamLLMOperator(task_name="llm_task")
+            cache_task = CachedModelStreamOperator(cache_manager, task_name="cache")
+            save_cache_task = ModelStreamSaveCacheOperator(cache_manager)
+        else:
+            llm_task = _FakeLLMOperator(task_name="llm_task")
+            cache_task = CachedModelOperator(cache_manager, task_name="cache")
+            save_cache_task = ModelSaveCacheOperator(cache_manager)
+        branch_task = ModelCacheBranchOperator(
+            cache_manager, model_task_name="llm_task", cache_task_name="cache"
+        )
+        join_task = BranchJoinOperator()
+        input_task >> branch_task
+        branch_task >> llm_task >> save_cache_task >> join_task
+        branch_task >> cache_task >> join_task
+    return join_task, llm_task
+
+
+def _request(content: str = "hello") -> ModelRequest:
+    return ModelRequest(
+        model="test_model",
+        messages=[ModelMessage(role="human", content=content)],
+        context=ModelRequestContext(cache_enable=True),
+    )
+
+
+@pytest.mark.asyncio
+async def test_single_flight_leader_and_followers():
+    single_flight = SingleFlight()
+    call, is_leader = single_flight.acquire("key")
+    follower_call, follower_is_leader = single_flight.acquire("key")
+    assert is_leader and not follower_is_leader
+    assert follower_call is call
+
+    async def _follow():
+        return [chunk async for chunk in call.stream(timeout=1)]
+
+    follower = asyncio.create_task(_follow())
+    await asyncio.sleep(0)
+    call.publish("a")
+    call.publish("b")
+    call.finish()
+    assert await follower == ["a", "b"]
+    assert await call.wait() == ["a", "b"]
+    assert len(single_flight) == 0
+    # A late follower gets the whole stream too
+    assert [chunk async for chunk in call.stream()] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_fail_and_timeout():
+    single_flight = SingleFlight()
+    call, _ = single_flight.acquire("key")
+    waiter = asyncio.create_task(call.wait(timeout=1))
+    await asyncio.sleep(0)
+    call.fail(ValueError("model error"))
+    with pytest.raises(ValueError):
+        await waiter
+
+    call, is_leader = single_flight.acquire("key")
+    assert is_leader
+    with pytest.raises(asyncio.TimeoutError):
+        await call.wait(timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_stale_call_is_replaced():
+    single_flight = SingleFlight(timeout=0.01)
+    call, _ = single_flight.acquire("key")
+    await asyncio.sleep(0.02)
+    new_call, is_leader = single_flight.acquire("key")
+    assert is_leader and new_call is not call
+    with pytest.raises(asyncio.TimeoutError):
+        await call.wait()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_concurrent_requests(cache_manager):
+    join_task, llm_task = _build_dag(cache_manager, is_streaming=False)
+    outputs = await asyncio.gather(
+        *[join_task.call(call_data=_request()) for _ in range(5)]
+    )
+    assert llm_task.calls == 1
+    assert {out.text for out in outputs} == {"answer 1"}
+
+    # Hit the cache, no model call
+    output = await join_task.call(call_data=_request())
+    assert output.text == "answer 1"
+    # Another prompt is not coalesced
+    output = await join_task.call(call_data=_request("world"))
+    assert output.text == "answer 2"
+    assert llm_task.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_concurrent_stream_requests(cache_manager):
+    join_task, llm_task = _build_dag(cache_manager, is_streaming=True)
+
+    async def _stream():
+        return [out.text async for out in await join_task.call_stream(_request())]
+
+    results = await asyncio.gather(*[_stream() for _ in range(4)])
+    assert llm_task.calls == 1
+    expected = ["token0 ", "token0 token1 ", "token0 token1 token2 "]
+    for result in results:
+        assert result == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("leader_error", [None, RuntimeError("model error")])
+async def test_follower_run_directly(cache_manager, leader_error):
+    llm_client = _FakeLLMClient()
+    with DAG("test_follower_run_directly"):
+        cache_task = CachedModelOperator(cache_manager, llm_client=llm_client)
+    request = _request()
+    single_flight = get_single_flight(cache_manager)
+    cache_key = cache_task._client.new_key(**_parse_cache_key_dict(request))
+    if leader_error:
+        # The leader fails while the follower waits
+        call, _ = single_flight.acquire(hash(cache_key))
+        asyncio.get_running_loop().call_later(0.01, call.fail, leader_error)
+    # Otherwise the leader finished without caching its output
+    output = await cache_task.map(request)
+    assert output.text == "direct answer"
+    assert llm_client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_follower_run_directly(cache_manager):
+    llm_client = _FakeLLMClient()
+    with DAG("test_stream_follower_run_directly"):
+        cache_task = CachedModelStreamOperator(cache_manager, llm_client=llm_client)
+    request = _request()
+    single_flight = get_single_flight(cache_manager)
+    cache_key = cache_task._client.new_key(**_parse_cache_key_dict(request))
+    call, _ = single_flight.acquire(hash(cache_key))
+    call.publish(ModelOutput(text="token0", error_code=0))
+    asyncio.get_running_loop().call_later(0.01, call.fail, RuntimeError("cancelled"))
+    outputs = [out.text async for out in cache_task.streamify(request)]
+    # The stream restarts from the model
+    assert outputs == ["token0", "direct", "direct answer"]
+    assert llm_client.calls == 1
+
+    # No in-flight call and no cached output
+    outputs = [out.text async for out in cache_task.streamify(_request("world"))]
+    assert outputs == ["direct", "direct answer"]
+    assert llm_client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_timeout_waits_next_chunk():
+    single_flight = SingleFlight()
+    call, _ = single_flight.acquire("key")
+
+    async def _produce():
+        for i in range(5):
+            await asyncio.sleep(0.02)
+            call.publish(i)
+        call.finish()
+
+    producer = asyncio.create_task(_produce())
+    # The whole stream takes longer than the timeout, every chunk comes in time
+    assert [chunk async for chunk in call.stream(timeout=0.05)] == [0, 1, 2, 3, 4]
+    await producer
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from dbgpt.core import ModelOutput
+from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+from ..llm_cache import LLMCacheKey, LLMCacheValue
+from ..manager import TieredCacheManager
+from ..storage.base import MemoryCacheStorage
+
+pytest.importorskip("rocksdict")
+
+
+def _key(prompt: str) -> LLMCacheKey:
+    key = LLMCacheKey(prompt=prompt, model_name="test_model")
+    key.set_serializer(JsonSerializer())
+    return key
+
+
+def _value(text: str) -> LLMCacheValue:
+    value = LLMCacheValue(output=ModelOutput(text=text, error_code=0).to_dict())
+    value.set_serializer(JsonSerializer())
+    return value
+
+
+def _new_manager(persist_dir, **kwargs) -> TieredCacheManager:
+    from ..storage.disk.disk_storage import DiskCacheStorage
+
+    memory_storage = MemoryCacheStorage(max_memory_mb=1)
+    # Keep about 4 items in the memory tier
+    memory_storage.max_memory = 4 * 1024
+    return TieredCacheManager(
+        None,
+        JsonSerializer(),
+        disk_storage=DiskCacheStorage(str(persist_dir)),
+        memory_storage=memory_storage,
+        flush_interval=0.01,
+        **kwargs,
+    )
+
+
+async def _get_text(manager: TieredCacheManager, prompt: str):
+    value = await manager.get(_key(prompt), LLMCacheValue)
+    return value.get_value().output.text if value else None
+
+
+@pytest.mark.asyncio
+async def test_demote_and_promote(tmp_path):
+    manager = _new_manager(tmp_path)
+    for i in range(20):
+        await manager.set(_key(f"prompt {i}"), _value("x" * 200 + str(i)))
+    stats = manager.stats()
+    assert stats["demotions"] > 0
+    assert stats["memory"]["evictions"] > 0
+
+    # The demoted items are readable before and after they are written
+    assert await _get_text(manager, "prompt 0") == "x" * 200 + "0"
+    await asyncio.sleep(0.1)
+    assert manager.stats()["pending_writes"] == 0
+    assert manager.stats()["disk"]["batches_written"] >= 1
+    assert await _get_text(manager, "prompt 1") == "x" * 200 + "1"
+    assert manager.stats()["promotions"] == 2
+    # Promoted to the memory tier
+    assert manager._memory.exists(_key("prompt 1"))
+    assert await _get_text(manager, "not exists") is None
+    manager.before_stop()
+
+
+@pytest.mark.asyncio
+async def test_batched_disk_reads(tmp_path):
+    manager = _new_manager(tmp_path, write_through=True)
+    for i in range(20):
+        await manager.set(_key(f"prompt {i}"), _value(f"answer {i}"))
+    await asyncio.sleep(0.1)
+    assert manager.stats()["pending_writes"] == 0
+    manager.before_stop()
+    manager._disk.close()
+
+    manager = _new_manager(tmp_path)
+    texts = await asyncio.gather(
+        *[_get_text(manager, f"prompt {i}") for i in range(10)]
+    )
+    assert texts == [f"answer {i}" for i in range(10)]
+    # The concurrent misses are read from the disk in one batch
+    assert manager.stats()["disk"]["batches_read"] == 1
+    assert manager.stats()["disk"]["hits"] == 10
+    manager.before_stop()
+
+
+@pytest.mark.asyncio
+async def test_flush_on_stop(tmp_path):
+    manager = _new_manager(tmp_path / "db")
+    await manager.set(_key("hot prompt"), _value("hot answer"))
+    manager.before_stop()
+    manager._disk.close()
+
+    new_manager = _new_manager(tmp_path / "db")
+    assert await _get_text(new_manager, "hot prompt") == "hot answer"
+    stats = new_manager.stats()
+    assert stats["disk"]["hit_rate"] == 1.0
+    assert stats["memory"]["hit_rate"] == 0.0
+    new_manager.before_stop()
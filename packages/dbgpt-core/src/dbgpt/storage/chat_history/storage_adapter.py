@@ -3,6 +3,7 @@
 import json
 from typing import Dict, List, Optional, Type
 
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 from dbgpt.core.interface.message import (
@@ -133,6 +134,33 @@ class DBMessageStorageItemAdapter(
             ChatHistoryMessageEntity.index == resource_id.index,
         )
 
+    def get_query_for_identifiers(
+        self,
+        storage_format: Type[ChatHistoryMessageEntity],
+        resource_ids: List[MessageIdentifier],  # type: ignore
+        **kwargs,
+    ):
+        """Get query for the messages, grouped by the conversations."""
+        session: Optional[Session] = kwargs.get("session")
+        if session is None:
+            raise Exception("session is None")
+        indexes_by_conv: Dict[str, List[int]] = {}
+        for resource_id in resource_ids:
+            indexes_by_conv.setdefault(resource_id.conv_uid, []).append(
+                resource_id.index
+            )
+        return session.query(ChatHistoryMessageEntity).filter(
+            or_(
+                *[
+                    and_(
+                        ChatHistoryMessageEntity.conv_uid == conv_uid,
+                        ChatHistoryMessageEntity.index.in_(indexes),
+                    )
+                    for conv_uid, indexes in indexes_by_conv.items()
+                ]
+            )
+        )
+
 
 def _parse_old_conversations(old_conversations: List[Dict]) -> List[BaseMessage]:
     old_messages_dict = []
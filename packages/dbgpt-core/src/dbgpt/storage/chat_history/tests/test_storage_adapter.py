@@ -1,8 +1,15 @@
 from typing import List
 
 import pytest
-
-from dbgpt.core.interface.message import AIMessage, HumanMessage, StorageConversation
+from sqlalchemy import event
+
+from dbgpt.core.interface.message import (
+    AIMessage,
+    HumanMessage,
+    MessageIdentifier,
+    MessageStorageItem,
+    StorageConversation,
+)
 from dbgpt.core.interface.storage import QuerySpec
 from dbgpt.storage.chat_history.chat_history_db import (
     ChatHistoryEntity,
@@ -218,3 +225,26 @@ def test_query_with_page(
     assert page_result.page_size == 2
     assert len(page_result.items) == 2
     assert page_result.items[0].conv_uid == "conv0"
+
+
+def test_load_messages_in_one_query(
+    four_round_conversation: StorageConversation, message_storage
+):
+    message_ids = [
+        MessageIdentifier.from_str_identifier(message_id)
+        for message_id in reversed(four_round_conversation.message_ids)
+    ]
+    statements = []
+
+    def _before_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    engine = message_storage.db_manager.engine
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    try:
+        messages = message_storage.load_list(message_ids, MessageStorageItem)
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_execute)
+    assert len(statements) == 1
+    assert [m.index for m in messages] == [m.index for m in message_ids]
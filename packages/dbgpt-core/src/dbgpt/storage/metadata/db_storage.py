@@ -1,7 +1,7 @@
 """Database storage implementation using SQLAlchemy."""
 
 from contextlib import contextmanager
-from typing import Dict, Iterator, List, Optional, Type, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Type, Union
 
 from sqlalchemy import URL, inspect
 from sqlalchemy.orm import DeclarativeMeta, Session
@@ -17,6 +17,9 @@ from dbgpt.core.interface.storage import (
 
 from .db_manager import BaseModel, BaseQuery, DatabaseManager
 
+# Keep the bound parameters of a batch query under the limits of the databases
+_QUERY_BATCH_SIZE = 500
+
 
 def _copy_public_properties(src: BaseModel, dest: BaseModel):
     """Copy public properties from src to dest."""
@@ -88,6 +91,37 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
                 return
         self.save(data)
 
+    def save_list(self, data: List[T]) -> None:
+        """Save a batch of data to the storage in one transaction."""
+        if not data:
+            return
+        with self.session() as session:
+            session.add_all([self.adapter.to_storage_format(d) for d in data])
+
+    def save_or_update_list(self, data: List[T]) -> None:
+        """Save or update a batch of data in the storage in one transaction.
+
+        The existing rows are loaded with batch queries if the adapter supports it,
+        otherwise the data is saved or updated one by one.
+        """
+        if not data:
+            return
+        with self.session() as session:
+            existing = self._query_by_identifiers(session, [d.identifier for d in data])
+            if existing is not None:
+                for d in data:
+                    new_instance = self.adapter.to_storage_format(d)
+                    str_identifier = d.identifier.str_identifier
+                    if str_identifier in existing:
+                        _copy_public_properties(
+                            new_instance, existing[str_identifier][0]
+                        )
+                    else:
+                        session.add(new_instance)
+                        existing[str_identifier] = (new_instance, d)
+                return
+        super().save_or_update_list(data)
+
     def load(self, resource_id: ResourceIdentifier, cls: Type[T]) -> Optional[T]:
         """Load data by identifier from the storage."""
         with self.session() as session:
@@ -99,6 +133,47 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
                 return self.adapter.from_storage_format(model_instance)
             return None
 
+    def load_list(self, resource_id: List[ResourceIdentifier], cls: Type[T]) -> List[T]:
+        """Load a batch of data by identifiers, in the order of the identifiers.
+
+        The missing data is skipped.
+        """
+        if not resource_id:
+            return []
+        with self.session() as session:
+            existing = self._query_by_identifiers(session, resource_id)
+            if existing is not None:
+                return [
+                    existing[r.str_identifier][1]
+                    for r in resource_id
+                    if r.str_identifier in existing
+                ]
+        return super().load_list(resource_id, cls)
+
+    def _query_by_identifiers(
+        self, session: Session, resource_ids: List[ResourceIdentifier]
+    ) -> Optional[Dict[str, Tuple[BaseModel, T]]]:
+        """Query the models and the items of the identifiers in batches.
+
+        Returns:
+            Optional[Dict[str, Tuple[BaseModel, T]]]: The models and the items by
+                the string identifiers, None if the adapter can't query a batch.
+        """
+        unique_ids = list({r.str_identifier: r for r in resource_ids}.values())
+        result: Dict[str, Tuple[BaseModel, T]] = {}
+        for i in range(0, len(unique_ids), _QUERY_BATCH_SIZE):
+            query = self.adapter.get_query_for_identifiers(
+                self._model_class,
+                unique_ids[i : i + _QUERY_BATCH_SIZE],
+                session=session,
+            )
+            if query is None:
+                return None
+            for model_instance in query.with_session(session).all():
+                item = self.adapter.from_storage_format(model_instance)
+                result[item.identifier.str_identifier] = (model_instance, item)
+        return result
+
     def delete(self, resource_id: ResourceIdentifier) -> None:
         """Delete data by identifier from the storage."""
         with self.session() as session:
@@ -1,4 +1,4 @@
-from typing import Dict, Type
+from typing import Dict, List, Type
 
 import pytest
 from sqlalchemy import Column, Integer, String
@@ -70,6 +70,26 @@ class MockStorageItemAdapter(StorageItemAdapter[MockStorageItem, MockModel]):
             storage_format.id == int(resource_id.str_identifier)
         )
 
+    def get_query_for_identifiers(
+        self,
+        storage_format: Type[MockModel],
+        resource_ids: List[ResourceIdentifier],
+        **kwargs,
+    ):
+        session: Session = kwargs.get("session")
+        if session is None:
+            raise ValueError("session is required for this adapter")
+        return session.query(storage_format).filter(
+            storage_format.id.in_([int(r.str_identifier) for r in resource_ids])
+        )
+
+
+class MockNoBatchStorageItemAdapter(MockStorageItemAdapter):
+    """The adapter which can't query a batch."""
+
+    def get_query_for_identifiers(self, storage_format, resource_ids, **kwargs):
+        return None
+
 
 @pytest.fixture
 def serializer():
@@ -82,9 +102,9 @@ def db_url():
     return "sqlite:///:memory:"
 
 
-@pytest.fixture
-def sqlalchemy_storage(db_url, serializer):
-    adapter = MockStorageItemAdapter()
+@pytest.fixture(params=[MockStorageItemAdapter, MockNoBatchStorageItemAdapter])
+def sqlalchemy_storage(request, db_url, serializer):
+    adapter = request.param()
     storage = SQLAlchemyStorage(db_url, MockModel, adapter, serializer, base=Base)
     Base.metadata.create_all(storage.db_manager.engine)
     return storage
@@ -169,3 +189,35 @@ def test_paginate_query(sqlalchemy_storage):
     assert page_result.page == page_number
     assert page_result.total_pages == 4
     assert page_result.total_count == 10
+
+
+def test_save_and_load_list(sqlalchemy_storage):
+    items = [
+        MockStorageItem(MockResourceIdentifier(str(i)), f"test_data_{i}")
+        for i in range(5)
+    ]
+    sqlalchemy_storage.save_list(items)
+    ids = [MockResourceIdentifier(str(i)) for i in (3, 1, 10, 4, 1)]
+    loaded = sqlalchemy_storage.load_list(ids, MockStorageItem)
+    # In the order of the identifiers, the missing one is skipped
+    assert [item.data for item in loaded] == [
+        "test_data_3",
+        "test_data_1",
+        "test_data_4",
+        "test_data_1",
+    ]
+    assert sqlalchemy_storage.load_list([], MockStorageItem) == []
+
+
+def test_save_or_update_list(sqlalchemy_storage):
+    sqlalchemy_storage.save_list(
+        [MockStorageItem(MockResourceIdentifier(str(i)), "old") for i in range(3)]
+    )
+    sqlalchemy_storage.save_or_update_list(
+        [MockStorageItem(MockResourceIdentifier(str(i)), "new") for i in range(1, 5)]
+    )
+    loaded = sqlalchemy_storage.load_list(
+        [MockResourceIdentifier(str(i)) for i in range(5)], MockStorageItem
+    )
+    assert [item.data for item in loaded] == ["old", "new", "new", "new", "new"]
+    assert sqlalchemy_storage.count(QuerySpec(conditions={}), MockStorageItem) == 5
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+from typing import List, Optional
+
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt.storage.base import IndexLoadProgress, IndexStoreBase, IndexStoreConfig
+
+
+class _MockIndexStore(IndexStoreBase):
+    def __init__(self, delays=None, bad_chunks=None, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = delays or {}
+        self.bad_chunks = set(bad_chunks or [])
+        self.group_sizes: List[int] = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def get_config(self) -> IndexStoreConfig:
+        return IndexStoreConfig()
+
+    def _check(self, chunks: List[Chunk]) -> List[str]:
+        with self._lock:
+            self.group_sizes.append(len(chunks))
+        if any(c.content in self.bad_chunks for c in chunks):
+            raise ValueError("bad chunk")
+        return [c.chunk_id for c in chunks]
+
+    def load_document(self, chunks: List[Chunk]) -> List[str]:
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delays.get(chunks[0].content, 0.01))
+            return self._check(chunks)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    async def aload_document(
+        self, chunks: List[Chunk], file_id: Optional[str] = None
+    ) -> List[str]:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(chunks[0].content, 0.01))
+            return self._check(chunks)
+        finally:
+            self.running -= 1
+
+    def similar_search_with_scores(self, text, topk, score_threshold, filters=None):
+        return []
+
+    def delete_by_ids(self, ids: str) -> List[str]:
+        return []
+
+    def truncate(self) -> List[str]:
+        return []
+
+    def delete_vector_name(self, index_name: str):
+        pass
+
+
+def _chunks(n: int) -> List[Chunk]:
+    return [Chunk(content=str(i), chunk_id=f"id-{i}") for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_aload_sliding_window():
+    # The first group is slow, the other groups should not wait for it
+    store = _MockIndexStore(delays={"0": 0.3})
+    chunks = _chunks(40)
+    start = time.time()
+    ids = await store.aload_document_with_limit(
+        chunks, max_chunks_once_load=2, max_threads=2
+    )
+    assert time.time() - start < 0.5
+    assert ids == [c.chunk_id for c in chunks]
+    assert store.max_running == 2
+
+
+def test_load_sliding_window():
+    store = _MockIndexStore(delays={"0": 0.3})
+    chunks = _chunks(40)
+    start = time.time()
+    ids = store.load_document_with_limit(chunks, max_chunks_once_load=2, max_threads=2)
+    assert time.time() - start < 0.5
+    assert ids == [c.chunk_id for c in chunks]
+    assert store.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_aload_progress_callback():
+    store = _MockIndexStore(bad_chunks={"3"})
+    progresses: List[IndexLoadProgress] = []
+
+    async def on_progress(progress: IndexLoadProgress):
+        progresses.append(progress)
+
+    ids = await store.aload_document_with_limit(
+        _chunks(10), max_chunks_once_load=5, progress_callback=on_progress
+    )
+    assert len(ids) == 9
+    assert progresses[-1].finished == 10
+    assert progresses[-1].loaded == 9
+    assert progresses[-1].skipped == 1
+
+
+@pytest.mark.parametrize("adaptive", [True, False])
+def test_adaptive_group_size(adaptive: bool):
+    store = _MockIndexStore(bad_chunks={"0"})
+    store.load_document_with_limit(
+        _chunks(20), max_chunks_once_load=8, adaptive_group_size=adaptive
+    )
+    # The first group fails and is retried chunk by chunk
+    load_sizes = [s for s in store.group_sizes if s > 1]
+    if adaptive:
+        assert load_sizes[:2] == [8, 4]
+    else:
+        assert set(load_sizes) == {8, 4}
+
+
+@pytest.mark.asyncio
+async def test_aload_cancel_event():
+    store = _MockIndexStore()
+    cancel_event = asyncio.Event()
+
+    def on_progress(progress: IndexLoadProgress):
+        if progress.loaded >= 4:
+            cancel_event.set()
+
+    ids = await store.aload_document_with_limit(
+        _chunks(20),
+        max_chunks_once_load=2,
+        progress_callback=on_progress,
+        cancel_event=cancel_event,
+    )
+    assert ids == [f"id-{i}" for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_aload_task_cancelled():
+    store = _MockIndexStore(delays={"0": 10})
+    task = asyncio.create_task(
+        store.aload_document_with_limit(_chunks(4), max_chunks_once_load=2)
+    )
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+    assert store.running == 0
+
+
+@pytest.mark.asyncio
+async def test_asimilar_search_batch():
+    store = _MockIndexStore()
+    store.similar_search_with_scores = lambda text, topk, score_threshold, filters: [
+        Chunk(content=text, score=score_threshold)
+    ]
+    results = await store.asimilar_search_batch(["a", "b"], 2, 0.5)
+    assert [[c.content for c in chunks] for chunks in results] == [["a"], ["b"]]
@@ -0,0 +1,102 @@
+"""Benchmark loading and saving the messages of a conversation.
+
+It compares the batched ``load_list`` and ``save_list`` of
+:class:`SQLAlchemyStorage` with loading and saving the messages one by one, over
+conversations of different lengths.
+
+Usage:
+
+.. code-block:: shell
+
+    python packages/dbgpt-core/src/dbgpt/util/benchmarks/chat_history_benchmarks.py \\
+        --num_messages 10 100 1000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from dbgpt.core.interface.message import MessageIdentifier, MessageStorageItem
+from dbgpt.core.interface.storage import StorageInterface
+from dbgpt.storage.chat_history.chat_history_db import ChatHistoryMessageEntity
+from dbgpt.storage.chat_history.storage_adapter import DBMessageStorageItemAdapter
+from dbgpt.storage.metadata import db
+from dbgpt.storage.metadata.db_storage import SQLAlchemyStorage
+
+
+def _make_messages(conv_uid: str, num_messages: int) -> List[MessageStorageItem]:
+    return [
+        MessageStorageItem(
+            conv_uid,
+            i,
+            {
+                "type": "human" if i % 2 == 0 else "ai",
+                "data": {"content": f"message {i} " * 20},
+                "index": i,
+                "round_index": i // 2 + 1,
+            },
+        )
+        for i in range(num_messages)
+    ]
+
+
+def run_benchmarks(num_messages_list: List[int]) -> Dict[str, Dict[str, float]]:
+    """Run the benchmarks.
+
+    Returns:
+        Dict[str, Dict[str, float]]: The milliseconds of every case.
+    """
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.init_db(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        db.create_all()
+        storage = SQLAlchemyStorage(
+            db, ChatHistoryMessageEntity, DBMessageStorageItemAdapter()
+        )
+        for num_messages in num_messages_list:
+            messages = _make_messages(f"batch_{num_messages}", num_messages)
+            ids = [m.identifier for m in messages]
+            start = time.perf_counter()
+            storage.save_list(messages)
+            batch_save = time.perf_counter() - start
+            start = time.perf_counter()
+            loaded = storage.load_list(ids, MessageStorageItem)
+            batch_load = time.perf_counter() - start
+            assert len(loaded) == num_messages
+
+            messages = _make_messages(f"single_{num_messages}", num_messages)
+            ids = [MessageIdentifier(m.conv_uid, m.index) for m in messages]
+            start = time.perf_counter()
+            StorageInterface.save_list(storage, messages)
+            single_save = time.perf_counter() - start
+            start = time.perf_counter()
+            StorageInterface.load_list(storage, ids, MessageStorageItem)
+            single_load = time.perf_counter() - start
+            report[str(num_messages)] = {
+                "single_save_ms": single_save * 1000,
+                "batch_save_ms": batch_save * 1000,
+                "single_load_ms": single_load * 1000,
+                "batch_load_ms": batch_load * 1000,
+            }
+        db.engine.dispose()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_messages", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    result = run_benchmarks(args.num_messages)
+    print(
+        f"{'messages':<10}{'save(ms)':>12}{'bsave(ms)':>12}"
+        f"{'load(ms)':>12}{'bload(ms)':>12}"
+    )
+    for case_name, metrics in result.items():
+        print(
+            f"{case_name:<10}{metrics['single_save_ms']:>12.2f}"
+            f"{metrics['batch_save_ms']:>12.2f}{metrics['single_load_ms']:>12.2f}"
+            f"{metrics['batch_load_ms']:>12.2f}"
+        )
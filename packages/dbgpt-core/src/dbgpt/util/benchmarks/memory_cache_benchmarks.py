@@ -0,0 +1,109 @@
+"""Benchmark the in-memory cache storage.
+
+It replays a Zipf distributed workload (a few hot prompts and a long tail) against
+:class:`MemoryCacheStorage` with different eviction and admission policies, and
+reports the hit rate and the latency of the operations.
+
+Usage:
+
+.. code-block:: shell
+
+    python packages/dbgpt-core/src/dbgpt/util/benchmarks/memory_cache_benchmarks.py \\
+        --num_requests 100000 --num_keys 20000 --max_memory_mb 4
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from dbgpt.core.interface.cache import CachePolicy
+from dbgpt.storage.cache.storage.base import MemoryCacheStorage
+
+
+class _Key:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def get_hash_bytes(self) -> bytes:
+        return self.name.encode()
+
+    def serialize(self) -> bytes:
+        return self.name.encode()
+
+
+class _Value:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def serialize(self) -> bytes:
+        return self.data
+
+
+def _zipf_workload(num_requests: int, num_keys: int, alpha: float) -> List[int]:
+    weights = [1.0 / (i + 1) ** alpha for i in range(num_keys)]
+    rnd = random.Random(42)
+    keys = list(range(num_keys))
+    rnd.shuffle(keys)
+    return rnd.choices(keys, weights=weights, k=num_requests)
+
+
+def run_benchmarks(
+    num_requests: int, num_keys: int, max_memory_mb: int, value_size: int = 1024
+) -> Dict[str, Dict[str, float]]:
+    """Run the benchmarks with a cache-aside workload.
+
+    Returns:
+        Dict[str, Dict[str, float]]: The report of every policy.
+    """
+    workload = _zipf_workload(num_requests, num_keys, alpha=1.0)
+    keys = [_Key(f"prompt-{i}") for i in range(num_keys)]
+    value = _Value(b"x" * value_size)
+    cases = {
+        "lru": dict(cache_policy=CachePolicy.LRU),
+        "lfu": dict(cache_policy=CachePolicy.LFU),
+        "lru+tinylfu": dict(cache_policy=CachePolicy.LRU, admission="tinylfu"),
+        "lfu+tinylfu": dict(cache_policy=CachePolicy.LFU, admission="tinylfu"),
+    }
+    report = {}
+    for name, kwargs in cases.items():
+        storage = MemoryCacheStorage(max_memory_mb=max_memory_mb, **kwargs)
+        get_time = set_time = 0.0
+        sets = 0
+        for i in workload:
+            key = keys[i]
+            start = time.perf_counter()
+            item = storage.get(key)
+            get_time += time.perf_counter() - start
+            if item is None:
+                start = time.perf_counter()
+                storage.set(key, value)
+                set_time += time.perf_counter() - start
+                sets += 1
+        stats = storage.stats()
+        report[name] = {
+            "hit_rate": stats["hit_rate"],
+            "get_us": get_time / num_requests * 1e6,
+            "set_us": set_time / max(1, sets) * 1e6,
+            "evictions": stats["evictions"],
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_requests", type=int, default=100000)
+    parser.add_argument("--num_keys", type=int, default=20000)
+    parser.add_argument("--max_memory_mb", type=int, default=4)
+    args = parser.parse_args()
+
+    result = run_benchmarks(args.num_requests, args.num_keys, args.max_memory_mb)
+    print(f"{'policy':<16}{'hit rate':>10}{'get(us)':>10}{'set(us)':>10}{'evict':>10}")
+    for case_name, metrics in result.items():
+        print(
+            f"{case_name:<16}{metrics['hit_rate']:>10.3f}{metrics['get_us']:>10.2f}"
+            f"{metrics['set_us']:>10.2f}{metrics['evictions']:>10}"
+        )
@@ -0,0 +1,140 @@
+"""Benchmark the HTTP transport between the webserver and the remote model workers.
+
+It starts a local stub worker, then sends the token counting and embedding requests
+with a new client per request (the old transport) and with the pooled client of
+:class:`RemoteModelWorker`, and reports the p50/p99 latency of both.
+
+Usage:
+
+.. code-block:: shell
+
+    python -m dbgpt.util.benchmarks.remote_worker_benchmarks \\
+        --num_requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from aiohttp import web
+
+from dbgpt.model.cluster.worker.http_client import (
+    WorkerHttpClientParameters,
+    WorkerHttpClientPool,
+)
+from dbgpt.model.cluster.worker.remote_worker import RemoteModelWorker
+
+
+async def _start_stub_worker(host: str) -> Tuple[web.AppRunner, int]:
+    async def count_token(request: web.Request):
+        data = await request.json()
+        return web.json_response(len(data["prompt"]))
+
+    async def embeddings(request: web.Request):
+        data = await request.json()
+        return web.json_response([[0.0] * 8 for _ in data["input"]])
+
+    app = web.Application()
+    app.router.add_post("/api/worker/count_token", count_token)
+    app.router.add_post("/api/worker/embeddings", embeddings)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore
+    return runner, port
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+async def _run(
+    request_func: Callable[[int], Awaitable], num_requests: int, concurrency: int
+) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def _timed(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await request_func(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[_timed(i) for i in range(num_requests)])
+    total_time = time.perf_counter() - start_time
+    return {
+        "p50_ms": _percentile(latencies, 50),
+        "p99_ms": _percentile(latencies, 99),
+        "qps": num_requests / total_time,
+    }
+
+
+async def run_benchmarks(
+    num_requests: int, concurrency: int, host: str = "127.0.0.1"
+) -> Dict[str, Dict[str, float]]:
+    """Run the benchmarks against a local stub worker.
+
+    Returns:
+        Dict[str, Dict[str, float]]: The latency report of every case.
+    """
+    import httpx
+
+    runner, port = await _start_stub_worker(host)
+    pool = WorkerHttpClientPool(
+        WorkerHttpClientParameters(max_keepalive_connections=concurrency)
+    )
+    worker = RemoteModelWorker(client_pool=pool)
+    worker.load_worker("stub", host=host, port=port)
+
+    async def count_token_per_request_client(i: int):
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                worker.worker_addr + "/count_token", json={"prompt": f"hello {i}"}
+            )
+            return response.json()
+
+    async def embeddings_per_request_client(i: int):
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                worker.worker_addr + "/embeddings", json={"input": [f"hello {i}"]}
+            )
+            return response.json()
+
+    cases = {
+        "count_token(per-request client)": count_token_per_request_client,
+        "count_token(pooled client)": lambda i: worker.async_count_token(f"hello {i}"),
+        "embeddings(per-request client)": embeddings_per_request_client,
+        "embeddings(pooled client)": lambda i: worker.async_embeddings(
+            {"input": [f"hello {i}"]}
+        ),
+    }
+    report = {}
+    try:
+        for name, func in cases.items():
+            # Warm up
+            await _run(func, min(num_requests, concurrency), concurrency)
+            report[name] = await _run(func, num_requests, concurrency)
+    finally:
+        await pool.aclose()
+        await runner.cleanup()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmarks(args.num_requests, args.concurrency))
+    print(f"{'case':<36}{'p50(ms)':>10}{'p99(ms)':>10}{'qps':>10}")
+    for case_name, metrics in result.items():
+        print(
+            f"{case_name:<36}{metrics['p50_ms']:>10.2f}{metrics['p99_ms']:>10.2f}"
+            f"{metrics['qps']:>10.1f}"
+        )
@@ -0,0 +1,116 @@
+"""Benchmark the per-span overhead of the tracer storages.
+
+It measures the time the caller spends in :meth:`SpanStorageContainer.append_span`
+with different sample rates, and the time :class:`FileSpanStorage` spends writing
+a batch of spans.
+
+Usage:
+
+.. code-block:: shell
+
+    python packages/dbgpt-core/src/dbgpt/util/benchmarks/tracer_benchmarks.py \\
+        --num_traces 10000 --spans_per_trace 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+from typing import Dict, List
+
+from dbgpt.util.tracer import (
+    FileSpanStorage,
+    Span,
+    SpanSampler,
+    SpanStorageContainer,
+    SpanType,
+)
+
+
+def _make_spans(num_traces: int, spans_per_trace: int) -> List[Span]:
+    """Return the start and end spans of the traces, in the order of a tracer."""
+    spans = []
+    for _ in range(num_traces):
+        trace_id = str(uuid.uuid4())
+        root = Span(trace_id, f"{trace_id}:0", SpanType.CHAT, operation_name="root")
+        children = [
+            Span(
+                trace_id,
+                f"{trace_id}:{i}",
+                SpanType.BASE,
+                parent_span_id=root.span_id,
+                operation_name=f"op{i % 5}",
+                metadata={"model": "model", "sql": "SELECT * FROM users"},
+            )
+            for i in range(1, spans_per_trace)
+        ]
+        spans.append(root.copy())
+        for child in children:
+            spans.append(child.copy())
+            ended = child.copy()
+            ended.end_time = ended.start_time + timedelta(milliseconds=5)
+            spans.append(ended)
+        ended = root.copy()
+        ended.end_time = ended.start_time + timedelta(milliseconds=50)
+        spans.append(ended)
+    return spans
+
+
+def run_benchmarks(
+    num_traces: int, spans_per_trace: int, batch_size: int = 100
+) -> Dict[str, Dict[str, float]]:
+    """Run the benchmarks.
+
+    Returns:
+        Dict[str, Dict[str, float]]: The report of every case.
+    """
+    spans = _make_spans(num_traces, spans_per_trace)
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for sample_rate in (1.0, 0.1):
+            storage = FileSpanStorage(os.path.join(tmp_dir, f"{sample_rate}.jsonl"))
+            container = SpanStorageContainer(
+                batch_size=batch_size,
+                max_buffer_size=len(spans),
+                sampler=SpanSampler(sample_rate=sample_rate),
+            )
+            container.append_storage(storage)
+            start = time.perf_counter()
+            for span in spans:
+                container.append_span(span)
+            append_time = time.perf_counter() - start
+            # End the grace window of the traces to count the sampled out spans
+            container.sampler.expire(float("inf"))
+            stats = container.stats()
+            container.before_stop()
+            report[f"append(rate={sample_rate})"] = {
+                "us_per_span": append_time / len(spans) * 1e6,
+                "stored": len(spans) - stats["sampled_out"] - stats["dropped"],
+            }
+
+        storage = FileSpanStorage(os.path.join(tmp_dir, "write.jsonl"))
+        start = time.perf_counter()
+        for i in range(0, len(spans), batch_size):
+            storage.append_span_batch(spans[i : i + batch_size])
+        write_time = time.perf_counter() - start
+        storage.close()
+        report["file write"] = {
+            "us_per_span": write_time / len(spans) * 1e6,
+            "stored": len(spans),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_traces", type=int, default=10000)
+    parser.add_argument("--spans_per_trace", type=int, default=10)
+    parser.add_argument("--batch_size", type=int, default=100)
+    args = parser.parse_args()
+
+    result = run_benchmarks(args.num_traces, args.spans_per_trace, args.batch_size)
+    print(f"{'case':<20}{'us/span':>10}{'stored':>10}")
+    for case_name, metrics in result.items():
+        print(f"{case_name:<20}{metrics['us_per_span']:>10.2f}{metrics['stored']:>10}")
@@ -1,11 +1,31 @@
 """Utility functions for calculating similarity."""
 
-from typing import TYPE_CHECKING, Any, List, Sequence
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple, Union
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from dbgpt.core.interface.embeddings import Embeddings
 
 
+def _import_numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("numpy is required for SimilarityMetric")
+    return np
+
+
+def _normalize_rows(vectors: Any) -> "np.ndarray":
+    """Return the float32 rows divided by their norms, zero rows are kept zero."""
+    np = _import_numpy()
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
 def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float:
     """Calculate the cosine similarity between two vectors.
 
@@ -16,10 +36,7 @@ def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float
     Returns:
         float: The cosine similarity.
     """
-    try:
-        import numpy as np
-    except ImportError:
-        raise ImportError("numpy is required for SimilarityMetric")
+    np = _import_numpy()
     dot_product = np.dot(embedding1, embedding2)
     norm1 = np.linalg.norm(embedding1)
     norm2 = np.linalg.norm(embedding2)
@@ -27,7 +44,25 @@ def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float
     return similarity
 
 
-def sigmoid_function(x: float) -> float:
+def cosine_similarities(
+    query_embedding: Sequence[float], embeddings: Any
+) -> "np.ndarray":
+    """Calculate the cosine similarities between a vector and a batch of vectors.
+
+    Args:
+        query_embedding(Sequence[float]): The query vector.
+        embeddings(Any): The vectors, a list of vectors or a 2-D array.
+
+    Returns:
+        numpy.ndarray: The similarity of every vector, 0 for a zero vector.
+    """
+    np = _import_numpy()
+    if len(embeddings) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return _normalize_rows(embeddings) @ _normalize_rows(query_embedding)[0]
+
+
+def sigmoid_function(x: Any) -> Any:
     """Calculate the sigmoid function.
 
     The sigmoid function is defined as:
@@ -37,15 +72,12 @@ def sigmoid_function(x: float) -> float:
     It is used to map the input to a value between 0 and 1.
 
     Args:
-        x(float): The input to the sigmoid function.
+        x(Any): The input to the sigmoid function, a float or a numpy array.
 
     Returns:
-        float: The output of the sigmoid function.
+        Any: The output of the sigmoid function, in the shape of the input.
     """
-    try:
-        import numpy as np
-    except ImportError:
-        raise ImportError("numpy is required for sigmoid_function")
+    np = _import_numpy()
     return 1 / (1 + np.exp(-x))
 
 
@@ -54,6 +86,8 @@ def calculate_cosine_similarity(
 ) -> Any:
     """Calculate the cosine similarity between a prediction and a list of contexts.
 
+    The prediction is embedded once and the contexts in one batch.
+
     Args:
         embeddings(Embeddings): The embeddings to use.
         prediction(str): The prediction.
@@ -62,20 +96,133 @@ def calculate_cosine_similarity(
     Returns:
         numpy.ndarray: The cosine similarity.
     """
-    try:
-        import numpy as np
-    except ImportError:
-        raise ImportError("numpy is required for SimilarityMetric")
-    prediction_vec = np.asarray(embeddings.embed_query(prediction)).reshape(1, -1)
+    np = _import_numpy()
     context_list = list(contexts)
-    context_list_vec = np.asarray(embeddings.embed_documents(context_list)).reshape(
-        len(contexts), -1
-    )
-    # cos(a,b) = dot(a,b) / (norm(a) * norm(b))
-    dot = np.dot(context_list_vec, prediction_vec.T).reshape(
-        -1,
-    )
-    norm = np.linalg.norm(context_list_vec, axis=1) * np.linalg.norm(
-        prediction_vec, axis=1
-    )
-    return dot / norm
+    if not context_list:
+        return np.zeros(0, dtype=np.float32)
+    prediction_vec = embeddings.embed_query(prediction)
+    context_list_vec = embeddings.embed_documents(context_list)
+    return cosine_similarities(prediction_vec, context_list_vec)
+
+
+class EmbeddingMatrix:
+    """A contiguous float32 matrix of normalized embeddings.
+
+    The similarities of a query with all the stored embeddings are one
+    matrix-vector product. The rows are addressed by position: appending is
+    amortized O(1) rows, deleting a row moves the following rows up by one.
+
+    Example:
+        .. code-block:: python
+
+            matrix = EmbeddingMatrix()
+            matrix.extend(embeddings.embed_documents(texts))
+            for idx, score in matrix.top_k(embeddings.embed_query(query), 5):
+                print(texts[idx], score)
+    """
+
+    def __init__(self, initial_capacity: int = 16):
+        """Create an empty EmbeddingMatrix.
+
+        Args:
+            initial_capacity(int): The rows allocated for the first embedding, the
+                capacity doubles when it is full.
+        """
+        self._np = _import_numpy()
+        self._initial_capacity = max(1, initial_capacity)
+        self._data: Optional["np.ndarray"] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of the embeddings."""
+        return self._size
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Return the dimension of the embeddings, None if it is empty."""
+        return None if self._data is None else self._data.shape[1]
+
+    @property
+    def matrix(self) -> "np.ndarray":
+        """Return the normalized embeddings, a view of the storage."""
+        if self._data is None:
+            return self._np.zeros((0, 0), dtype=self._np.float32)
+        return self._data[: self._size]
+
+    def append(self, embedding: Sequence[float]) -> int:
+        """Append an embedding, return its position."""
+        self.extend([embedding])
+        return self._size - 1
+
+    def extend(self, embeddings: Any) -> None:
+        """Append a batch of embeddings."""
+        if len(embeddings) == 0:
+            return
+        rows = _normalize_rows(embeddings)
+        if self._data is None:
+            self._data = self._np.empty(
+                (max(self._initial_capacity, len(rows)), rows.shape[1]),
+                dtype=self._np.float32,
+            )
+        elif rows.shape[1] != self._data.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {rows.shape[1]} does not match "
+                f"{self._data.shape[1]}"
+            )
+        new_size = self._size + len(rows)
+        if new_size > len(self._data):
+            capacity = max(new_size, len(self._data) * 2)
+            data = self._np.empty(
+                (capacity, self._data.shape[1]), dtype=self._np.float32
+            )
+            data[: self._size] = self._data[: self._size]
+            self._data = data
+        self._data[self._size : new_size] = rows
+        self._size = new_size
+
+    def delete(self, indexes: Union[int, Sequence[int]]) -> None:
+        """Delete the embeddings at the positions, the rest keep their order."""
+        if isinstance(indexes, int):
+            indexes = [indexes]
+        if not indexes or self._data is None:
+            return
+        keep = self._np.ones(self._size, dtype=bool)
+        keep[list(indexes)] = False
+        rows = self._data[: self._size][keep]
+        self._size = len(rows)
+        self._data[: self._size] = rows
+
+    def similarities(self, query_embedding: Sequence[float]) -> "np.ndarray":
+        """Return the cosine similarity of the query with every embedding."""
+        if self._size == 0:
+            return self._np.zeros(0, dtype=self._np.float32)
+        return self.matrix @ _normalize_rows(query_embedding)[0]
+
+    def top_k(
+        self, query_embedding: Sequence[float], k: int
+    ) -> List[Tuple[int, float]]:
+        """Return the positions and similarities of the k most similar embeddings.
+
+        Sorted by the similarity in descending order.
+        """
+        scores = self.similarities(query_embedding)
+        if k <= 0 or len(scores) == 0:
+            return []
+        if k < len(scores):
+            candidates = self._np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = self._np.arange(len(scores))
+        ordered = candidates[self._np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in ordered]
+
+    def search_by_threshold(
+        self, query_embedding: Sequence[float], threshold: float
+    ) -> List[Tuple[int, float]]:
+        """Return the embeddings with a similarity not less than the threshold.
+
+        Sorted by the similarity in descending order.
+        """
+        scores = self.similarities(query_embedding)
+        candidates = self._np.flatnonzero(scores >= threshold)
+        ordered = candidates[self._np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in ordered]
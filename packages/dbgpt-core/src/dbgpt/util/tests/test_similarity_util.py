@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from dbgpt.util.similarity_util import (
+    EmbeddingMatrix,
+    calculate_cosine_similarity,
+    cosine_similarities,
+    cosine_similarity,
+)
+
+
+class _CountingEmbeddings:
+    def __init__(self):
+        self.query_calls = 0
+        self.document_calls = 0
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return [float(len(text)), 1.0]
+
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def test_cosine_similarities():
+    vectors = [[1.0, 0.0], [0.0, 2.0], [1.0, 1.0], [0.0, 0.0]]
+    scores = cosine_similarities([2.0, 0.0], vectors)
+    assert scores.dtype == np.float32
+    np.testing.assert_allclose(scores, [1.0, 0.0, 2**-0.5, 0.0], atol=1e-6)
+    for vector, score in zip(vectors[:3], scores):
+        assert score == pytest.approx(cosine_similarity(vector, [2.0, 0.0]))
+    assert len(cosine_similarities([1.0], [])) == 0
+
+
+def test_calculate_cosine_similarity_embeds_once():
+    embeddings = _CountingEmbeddings()
+    scores = calculate_cosine_similarity(embeddings, "abc", ["a", "abc", "abcdef"])
+    assert len(scores) == 3
+    assert embeddings.query_calls == 1
+    assert embeddings.document_calls == 1
+
+
+def test_embedding_matrix_append_and_delete():
+    matrix = EmbeddingMatrix(initial_capacity=1)
+    assert len(matrix) == 0
+    assert matrix.similarities([1.0, 0.0]).shape == (0,)
+    for i in range(5):
+        assert matrix.append([1.0, float(i)]) == i
+    assert len(matrix) == 5
+    assert matrix.dim == 2
+    np.testing.assert_allclose(np.linalg.norm(matrix.matrix, axis=1), 1.0, rtol=1e-6)
+
+    matrix.delete([0, 2])
+    expected = cosine_similarities([1.0, 0.0], [[1.0, 1.0], [1.0, 3.0], [1.0, 4.0]])
+    np.testing.assert_allclose(matrix.similarities([1.0, 0.0]), expected)
+    matrix.delete(2)
+    assert len(matrix) == 2
+    with pytest.raises(ValueError):
+        matrix.append([1.0, 0.0, 0.0])
+
+
+def test_embedding_matrix_search():
+    matrix = EmbeddingMatrix()
+    matrix.extend([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.1]])
+    top = matrix.top_k([1.0, 0.0], 2)
+    assert [idx for idx, _ in top] == [0, 3]
+    assert top[0][1] == pytest.approx(1.0)
+    assert [idx for idx, _ in matrix.top_k([1.0, 0.0], 10)] == [0, 3, 2, 1]
+    assert matrix.top_k([1.0, 0.0], 0) == []
+    assert [idx for idx, _ in matrix.search_by_threshold([1.0, 0.0], 0.7)] == [0, 3, 2]
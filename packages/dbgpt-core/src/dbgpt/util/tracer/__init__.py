@@ -8,6 +8,7 @@ from dbgpt.util.tracer.base import (
     Tracer,
     TracerContext,
 )
+from dbgpt.util.tracer.span_sampler import SpanSampler
 from dbgpt.util.tracer.span_storage import (
     FileSpanStorage,
     MemorySpanStorage,
@@ -34,6 +35,7 @@ __all__ = [
     "MemorySpanStorage",
     "FileSpanStorage",
     "SpanStorageContainer",
+    "SpanSampler",
     "root_tracer",
     "trace",
     "initialize_tracer",
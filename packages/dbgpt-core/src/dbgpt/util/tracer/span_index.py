@@ -0,0 +1,327 @@
+"""Indexed store of the trace spans written by :class:`FileSpanStorage`.
+
+The span files are JSON lines, the index keeps the parsed spans in a SQLite
+database with indexes on trace_id, span_id, operation_name and start time. Only
+the bytes appended since the last run are parsed again, a rolled over or
+truncated file is indexed from the beginning.
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump it when the schema changes, the old index is rebuilt
+_SPAN_INDEX_VERSION = 1
+_INSERT_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS span_files (
+    file_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS spans (
+    file_id INTEGER NOT NULL,
+    trace_id TEXT,
+    span_id TEXT,
+    parent_span_id TEXT,
+    span_type TEXT,
+    operation_name TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    duration_ms REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_spans_trace_id ON spans (trace_id);
+CREATE INDEX IF NOT EXISTS idx_spans_span_id ON spans (span_id);
+CREATE INDEX IF NOT EXISTS idx_spans_operation_name
+    ON spans (operation_name, duration_ms);
+CREATE INDEX IF NOT EXISTS idx_spans_start_time ON spans (start_time);
+CREATE INDEX IF NOT EXISTS idx_spans_file_id ON spans (file_id);
+"""
+
+
+def _duration_ms(start_time: Optional[str], end_time: Optional[str]) -> Optional[float]:
+    """Return the milliseconds between the span times, None if not ended."""
+    if not start_time or not end_time:
+        return None
+    fmt = "%Y-%m-%d %H:%M:%S.%f"
+    try:
+        delta = datetime.strptime(end_time, fmt) - datetime.strptime(start_time, fmt)
+    except ValueError:
+        return None
+    return delta.total_seconds() * 1000
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Return the p-th percentile of the sorted values by linear interpolation."""
+    if not sorted_values:
+        return math.nan
+    k = (len(sorted_values) - 1) * p / 100
+    low = math.floor(k)
+    high = math.ceil(k)
+    if low == high:
+        return sorted_values[int(k)]
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (k - low)
+
+
+class SpanIndex:
+    """The SQLite index of the span files.
+
+    Example:
+        .. code-block:: python
+
+            with SpanIndex("logs/dbgpt_trace_index.db") as index:
+                file_ids = index.sync(["logs/dbgpt*.jsonl"])
+                spans = index.query_spans(file_ids, trace_id="xxx")
+    """
+
+    def __init__(self, index_path: str = ":memory:"):
+        """Create a new SpanIndex.
+
+        Args:
+            index_path (str): The SQLite database file of the index.
+        """
+        if index_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        self._conn = sqlite3.connect(index_path)
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SPAN_INDEX_VERSION:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS spans; DROP TABLE IF EXISTS span_files;"
+            )
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {_SPAN_INDEX_VERSION}")
+        self._conn.commit()
+
+    def close(self):
+        """Close the index database."""
+        self._conn.close()
+
+    def __enter__(self):
+        """Return self when entering the context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the index when exiting the context."""
+        self.close()
+
+    def sync(self, filenames: Iterable[str]) -> List[int]:
+        """Index the spans appended to the files since the last sync.
+
+        Args:
+            filenames (Iterable[str]): The span files.
+
+        Returns:
+            List[int]: The ids of the files, pass them to the queries.
+        """
+        file_ids = []
+        for filename in filenames:
+            path = os.path.abspath(filename)
+            try:
+                file_ids.append(self._sync_file(path))
+            except OSError as e:
+                logger.warning(f"Skip the span file {path}: {e}")
+        self._conn.commit()
+        return file_ids
+
+    def _sync_file(self, path: str) -> int:
+        stat = os.stat(path)
+        row = self._conn.execute(
+            "SELECT file_id, inode, offset FROM span_files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            cursor = self._conn.execute(
+                "INSERT INTO span_files (path, inode, offset) VALUES (?, ?, 0)",
+                (path, stat.st_ino),
+            )
+            file_id, offset = cursor.lastrowid, 0
+        else:
+            file_id, inode, offset = row
+            if inode != stat.st_ino or stat.st_size < offset:
+                # Rolled over or truncated, index it again
+                self._conn.execute("DELETE FROM spans WHERE file_id = ?", (file_id,))
+                offset = 0
+        if stat.st_size > offset:
+            offset = self._index_lines(file_id, path, offset)
+        self._conn.execute(
+            "UPDATE span_files SET inode = ?, offset = ? WHERE file_id = ?",
+            (stat.st_ino, offset, file_id),
+        )
+        return file_id
+
+    def _index_lines(self, file_id: int, path: str, offset: int) -> int:
+        """Index the complete lines after the offset, return the new offset."""
+        rows = []
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # The line is being written, index it next time
+                    break
+                offset += len(line)
+                text = line.decode("utf-8").strip()
+                if not text:
+                    continue
+                try:
+                    span = json.loads(text)
+                except ValueError as e:
+                    logger.warning(f"Skip the broken span line in {path}: {e}")
+                    continue
+                start_time, end_time = span.get("start_time"), span.get("end_time")
+                rows.append(
+                    (
+                        file_id,
+                        span.get("trace_id"),
+                        span.get("span_id"),
+                        span.get("parent_span_id"),
+                        span.get("span_type"),
+                        span.get("operation_name"),
+                        start_time,
+                        end_time,
+                        _duration_ms(start_time, end_time),
+                        text,
+                    )
+                )
+                if len(rows) >= _INSERT_BATCH_SIZE:
+                    self._insert(rows)
+                    rows = []
+        self._insert(rows)
+        return offset
+
+    def _insert(self, rows: List[Tuple]) -> None:
+        if rows:
+            self._conn.executemany(
+                "INSERT INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def query_spans(
+        self,
+        file_ids: List[int],
+        trace_id: Optional[str] = None,
+        span_id: Optional[str] = None,
+        span_type: Optional[str] = None,
+        parent_span_id: Optional[str] = None,
+        operation_name: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        desc: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Return the spans matching the filters, ordered by the start time.
+
+        The spans of the same start time keep the order in the files.
+
+        Args:
+            file_ids (List[int]): The ids returned by :meth:`sync`.
+            start_time (Optional[str]): The min start time, in the format of the
+                span, "YYYY-MM-DD HH:MM:SS.mmm".
+            end_time (Optional[str]): The max start time.
+        """
+        if not file_ids:
+            return []
+        conditions = [f"file_id IN ({', '.join('?' * len(file_ids))})"]
+        params: List = list(file_ids)
+        for column, value in (
+            ("trace_id", trace_id),
+            ("span_id", span_id),
+            ("span_type", span_type),
+            ("parent_span_id", parent_span_id),
+            ("operation_name", operation_name),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if start_time:
+            conditions.append("start_time >= ?")
+            params.append(start_time)
+        if end_time:
+            conditions.append("start_time <= ?")
+            params.append(end_time)
+        order = "DESC" if desc else "ASC"
+        sql = (
+            f"SELECT data FROM spans WHERE {' AND '.join(conditions)} "
+            f"ORDER BY start_time {order}, rowid {order}"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row[0]) for row in self._conn.execute(sql, params)]
+
+    def latest_trace_id(
+        self, file_ids: List[int], span_type: str = "chat"
+    ) -> Optional[str]:
+        """Return the trace id of the latest span of the span type."""
+        spans = self.query_spans(file_ids, span_type=span_type, desc=True, limit=1)
+        return spans[0]["trace_id"] if spans else None
+
+    def latency_stats(
+        self,
+        file_ids: List[int],
+        operation_name: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        percentiles: Sequence[float] = (50, 90, 95, 99),
+    ) -> List[Dict]:
+        """Return the latency percentiles of the ended spans per operation name.
+
+        Returns:
+            List[Dict]: Every item contains operation_name, count, avg, max and
+                p50, p90 ... in milliseconds, ordered by the operation name.
+        """
+        if not file_ids:
+            return []
+        conditions = [
+            f"file_id IN ({', '.join('?' * len(file_ids))})",
+            "duration_ms IS NOT NULL",
+        ]
+        params: List = list(file_ids)
+        if operation_name:
+            conditions.append("operation_name = ?")
+            params.append(operation_name)
+        if start_time:
+            conditions.append("start_time >= ?")
+            params.append(start_time)
+        if end_time:
+            conditions.append("start_time <= ?")
+            params.append(end_time)
+        # The index on (operation_name, duration_ms) returns the sorted durations
+        sql = (
+            f"SELECT operation_name, duration_ms FROM spans "
+            f"WHERE {' AND '.join(conditions)} ORDER BY operation_name, duration_ms"
+        )
+        stats = []
+        current_name: Optional[str] = None
+        durations: List[float] = []
+        for name, duration in self._conn.execute(sql, params):
+            if durations and name != current_name:
+                stats.append(_latency_item(current_name, durations, percentiles))
+                durations = []
+            current_name = name
+            durations.append(duration)
+        if durations:
+            stats.append(_latency_item(current_name, durations, percentiles))
+        return stats
+
+
+def _latency_item(
+    operation_name: Optional[str],
+    durations: List[float],
+    percentiles: Sequence[float],
+) -> Dict:
+    item = {
+        "operation_name": operation_name,
+        "count": len(durations),
+        "avg": sum(durations) / len(durations),
+        "max": durations[-1],
+    }
+    for p in percentiles:
+        item[f"p{p:g}"] = percentile(durations, p)
+    return item
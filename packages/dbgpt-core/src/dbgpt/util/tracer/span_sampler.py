@@ -0,0 +1,168 @@
+"""Head and tail based sampling of the trace spans."""
+
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from dbgpt.util.tracer.base import Span
+
+# The spans of a trace waiting for the tail decision are bounded
+_MAX_PENDING_SPANS_PER_TRACE = 1000
+
+
+class _PendingTrace:
+    """The spans of a not sampled trace waiting for the tail decision."""
+
+    def __init__(self, root_span_id: str):
+        # The first span seen for the trace in this process
+        self.root_span_id = root_span_id
+        self.spans: List[Span] = []
+
+
+class SpanSampler:
+    """Decide which spans to store.
+
+    The head decision is made from the trace id, so all the spans of a trace, even
+    in different processes, share the same decision. The spans of a trace which is
+    not head sampled are held until the trace ends: they are all kept if a span of
+    the trace fails or is slow, otherwise they are dropped a grace window after the
+    root span ends.
+
+    The root span is the first span seen for the trace in this process, in a worker
+    process it has a remote parent. It may end before its children (e.g. the root
+    span of a streaming response), so the children ending in the grace window still
+    keep the trace, and the spans arriving after the trace is dropped are dropped
+    too unless they fail or are slow.
+
+    Example:
+        .. code-block:: python
+
+            sampler = SpanSampler(sample_rate=0.1, slow_span_threshold_ms=2000)
+            for span_to_store in sampler.sample(span):
+                storage.append_span(span_to_store)
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        slow_span_threshold_ms: Optional[float] = None,
+        max_pending_traces: int = 1000,
+        root_end_grace_ms: float = 30000,
+    ):
+        """Create a new SpanSampler.
+
+        Args:
+            sample_rate (float): The ratio of the traces to keep, between 0 and 1.
+            slow_span_threshold_ms (Optional[float]): The spans taking longer are
+                always kept with their trace, None to disable it.
+            max_pending_traces (int): The max number of the not sampled traces
+                waiting for the tail decision, the oldest one is dropped.
+            root_end_grace_ms (float): How long the spans of a trace are still held
+                after its root span ends.
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.slow_span_threshold_ms = slow_span_threshold_ms
+        self.max_pending_traces = max_pending_traces
+        self.root_end_grace_ms = root_end_grace_ms
+        self._threshold = int(sample_rate * 0xFFFFFFFF)
+        self._pending: "OrderedDict[str, _PendingTrace]" = OrderedDict()
+        # The deadlines of the pending traces whose root span ended, in end order
+        self._ended: "OrderedDict[str, float]" = OrderedDict()
+        # The not sampled traces which failed or were slow
+        self._kept_traces: "OrderedDict[str, None]" = OrderedDict()
+        # The not sampled traces which were dropped
+        self._dropped_traces: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+
+    def is_head_sampled(self, trace_id: str) -> bool:
+        """Return whether the trace is kept by the head decision."""
+        if self.sample_rate >= 1:
+            return True
+        return zlib.crc32(trace_id.encode("utf-8")) <= self._threshold
+
+    def sample(self, span: Span) -> List[Span]:
+        """Return the spans to store, may include the held spans of the trace."""
+        if self.is_head_sampled(span.trace_id):
+            return [span]
+        trace_id = span.trace_id
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if trace_id in self._kept_traces:
+                return [span]
+            if span.end_time is not None and self._is_interesting(span):
+                self._remember(self._kept_traces, trace_id)
+                self._dropped_traces.pop(trace_id, None)
+                self._ended.pop(trace_id, None)
+                pending = self._pending.pop(trace_id, None)
+                return (pending.spans if pending else []) + [span]
+            if trace_id in self._dropped_traces:
+                # A late span of a dropped trace
+                self.sampled_out += 1
+                return []
+            pending = self._hold(trace_id, span)
+            if span.end_time is not None and span.span_id == pending.root_span_id:
+                # The root span ends without any error or slow span, wait for the
+                # children still running
+                self._ended[trace_id] = now + self.root_end_grace_ms / 1000
+                self._expire(now)
+            return []
+
+    def expire(self, now: Optional[float] = None) -> None:
+        """Drop the pending traces whose grace window after the root end is over."""
+        with self._lock:
+            self._expire(time.monotonic() if now is None else now)
+
+    def _expire(self, now: float) -> None:
+        while self._ended:
+            trace_id, deadline = next(iter(self._ended.items()))
+            if deadline > now:
+                break
+            del self._ended[trace_id]
+            self._drop(trace_id)
+
+    def _drop(self, trace_id: str) -> None:
+        pending = self._pending.pop(trace_id, None)
+        if pending:
+            self.sampled_out += len(pending.spans)
+        self._remember(self._dropped_traces, trace_id)
+
+    def _is_interesting(self, span: Span) -> bool:
+        if span.metadata and "error" in span.metadata:
+            return True
+        if self.slow_span_threshold_ms is None or not span.start_time:
+            return False
+        duration = (span.end_time - span.start_time).total_seconds() * 1000
+        return duration >= self.slow_span_threshold_ms
+
+    def _remember(self, traces: "OrderedDict[str, None]", trace_id: str) -> None:
+        traces[trace_id] = None
+        while len(traces) > self.max_pending_traces:
+            traces.popitem(last=False)
+
+    def _hold(self, trace_id: str, span: Span) -> _PendingTrace:
+        pending = self._pending.get(trace_id)
+        if pending is None:
+            pending = self._pending[trace_id] = _PendingTrace(span.span_id)
+            while len(self._pending) > self.max_pending_traces:
+                evicted_id = next(iter(self._pending))
+                self._ended.pop(evicted_id, None)
+                self._drop(evicted_id)
+        if len(pending.spans) >= _MAX_PENDING_SPANS_PER_TRACE:
+            self.sampled_out += 1
+        else:
+            pending.spans.append(span)
+        return pending
+
+    def stats(self) -> Dict[str, int]:
+        """Return the counters of the sampler."""
+        with self._lock:
+            return {
+                "sampled_out": self.sampled_out,
+                "pending_traces": len(self._pending),
+            }
@@ -5,11 +5,13 @@ import os
 import queue
 import threading
 import time
+from collections import deque
 from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import List
+from typing import Callable, Deque, Dict, List, Optional, TextIO
 
 from dbgpt.component import SystemApp
 from dbgpt.util.tracer.base import Span, SpanStorage
+from dbgpt.util.tracer.span_sampler import SpanSampler
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +34,24 @@ class SpanStorageContainer(SpanStorage):
         batch_size=10,
         flush_interval=10,
         executor: Executor = None,
+        max_buffer_size: int = 10000,
+        sampler: Optional[SpanSampler] = None,
+        stats_log_interval: Optional[int] = 60,
     ):
+        """Create a new SpanStorageContainer.
+
+        Args:
+            batch_size (int): Flush when the buffered spans reach it.
+            flush_interval (int): Flush at least once in these seconds.
+            executor (Executor): The executor to write the storages.
+            max_buffer_size (int): The capacity of the ring buffer, the oldest span
+                is dropped and counted when it is full.
+            sampler (Optional[SpanSampler]): The sampler, all the spans are kept if
+                None.
+            stats_log_interval (Optional[int]): Log the :meth:`stats` at most once
+                in these seconds when the dropped or sampled out spans change, None
+                to disable it.
+        """
         super().__init__(system_app)
         if not executor:
             executor = ThreadPoolExecutor(thread_name_prefix="trace_storage_sync_")
@@ -41,11 +60,18 @@ class SpanStorageContainer(SpanStorage):
         self.last_date = (
             datetime.datetime.now().date()
         )  # Store the current date for checking date changes
-        self.queue = queue.Queue()
+        self.max_buffer_size = max_buffer_size
+        self.sampler = sampler
+        self._buffer: Deque[Span] = deque()
+        self._buffer_lock = threading.Lock()
+        self.dropped_spans = 0
         self.batch_size = batch_size
         self.flush_interval = flush_interval
         self.last_flush_time = time.time()
-        self.flush_signal_queue = queue.Queue()
+        self.stats_log_interval = stats_log_interval
+        self._last_stats_log_time = time.time()
+        self._last_logged_stats: Dict[str, int] = {}
+        self._flush_event = threading.Event()
         self.flush_thread = threading.Thread(
             target=self._flush_to_storages, daemon=True
         )
@@ -62,57 +88,108 @@ class SpanStorageContainer(SpanStorage):
         self.storages.append(storage)
 
     def append_span(self, span: Span):
-        self.queue.put(span)
-        if self.queue.qsize() >= self.batch_size:
-            try:
-                self.flush_signal_queue.put_nowait(True)
-            except queue.Full:
-                pass  # If the signal queue is full, it's okay. The flush thread will
-                # handle it.
+        spans = self.sampler.sample(span) if self.sampler else (span,)
+        if not spans:
+            return
+        with self._buffer_lock:
+            for sp in spans:
+                if len(self._buffer) >= self.max_buffer_size:
+                    # Drop the oldest span, the hot path never blocks
+                    self._buffer.popleft()
+                    self.dropped_spans += 1
+                self._buffer.append(sp)
+            size = len(self._buffer)
+        if size >= self.batch_size:
+            self._flush_event.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the counters of the buffered, dropped and sampled out spans."""
+        stats = {"buffered": len(self._buffer), "dropped": self.dropped_spans}
+        if self.sampler:
+            stats.update(self.sampler.stats())
+        return stats
+
+    def _log_stats(self) -> None:
+        if (
+            self.stats_log_interval is None
+            or time.time() - self._last_stats_log_time < self.stats_log_interval
+        ):
+            return
+        self._last_stats_log_time = time.time()
+        stats = self.stats()
+        counters = {k: v for k, v in stats.items() if k in ("dropped", "sampled_out")}
+        if any(counters.values()) and counters != self._last_logged_stats:
+            self._last_logged_stats = counters
+            logger.info(f"Span storage stats: {stats}")
+
+    def _drain(self) -> List[Span]:
+        with self._buffer_lock:
+            spans = list(self._buffer)
+            self._buffer.clear()
+        return spans
 
     def _flush_to_storages(self):
         while not self._stop_event.is_set():
             interval = time.time() - self.last_flush_time
             if interval < self.flush_interval:
-                try:
-                    self.flush_signal_queue.get(
-                        block=True, timeout=self.flush_interval - interval
-                    )
-                except Exception:
-                    # Timeout
-                    pass
-
-            spans_to_write = []
-            while not self.queue.empty():
-                spans_to_write.append(self.queue.get())
-            for s in self.storages:
+                self._flush_event.wait(timeout=self.flush_interval - interval)
+            self._flush_event.clear()
 
-                def append_and_ignore_error(
-                    storage: SpanStorage, spans_to_write: List[SpanStorage]
-                ):
+            if self.sampler:
+                # Drop the traces ended without new spans since
+                self.sampler.expire()
+            spans_to_write = self._drain()
+            if spans_to_write:
+                for s in self.storages:
                     try:
-                        storage.append_span_batch(spans_to_write)
-                    except Exception as e:
-                        logger.warning(
-                            f"Append spans to storage {str(storage)} failed: {str(e)},"
-                            f" span_data: {spans_to_write}"
+                        self.executor.submit(
+                            _append_and_ignore_error, s, spans_to_write
                         )
-
-                try:
-                    self.executor.submit(append_and_ignore_error, s, spans_to_write)
-                except RuntimeError:
-                    append_and_ignore_error(s, spans_to_write)
+                    except RuntimeError:
+                        _append_and_ignore_error(s, spans_to_write)
             self.last_flush_time = time.time()
+            self._log_stats()
+        # Write the spans left when stopping
+        spans_to_write = self._drain()
+        for s in self.storages:
+            if spans_to_write:
+                _append_and_ignore_error(s, spans_to_write)
 
     def before_stop(self):
         try:
-            self.flush_signal_queue.put(True)
             self._stop_event.set()
+            self._flush_event.set()
             self.flush_thread.join()
+            for s in self.storages:
+                if isinstance(s, FileSpanStorage):
+                    s.close()
         except Exception:
             pass
 
 
+def _append_and_ignore_error(storage: SpanStorage, spans_to_write: List[Span]):
+    try:
+        storage.append_span_batch(spans_to_write)
+    except Exception as e:
+        logger.warning(
+            f"Append spans to storage {str(storage)} failed: {str(e)},"
+            f" span_data: {spans_to_write}"
+        )
+
+
+def _new_span_serializer() -> Callable[[Dict], str]:
+    """Return the fastest available JSON serializer of the span dict."""
+    try:
+        import orjson
+
+        def _dumps(data: Dict) -> str:
+            return orjson.dumps(data).decode("utf-8")
+
+        return _dumps
+    except ImportError:
+        return json.JSONEncoder(ensure_ascii=False).encode
+
+
 class FileSpanStorage(SpanStorage):
     def __init__(self, filename: str):
         super().__init__()
@@ -125,6 +202,10 @@ class FileSpanStorage(SpanStorage):
             datetime.datetime.now().date()
         )  # Store the current date for checking date changes
         self.queue = queue.Queue()
+        # The file is kept open between the writes, it is reopened after a rollover
+        self._file: Optional[TextIO] = None
+        self._file_lock = threading.Lock()
+        self._dumps = _new_span_serializer()
 
         if not os.path.exists(filename):
             # New file if not exist
@@ -148,19 +229,35 @@ class FileSpanStorage(SpanStorage):
         current file."""
         current_date = datetime.datetime.now().date()
         if current_date != self.last_date:
+            self._close_file()
             if os.path.exists(self.filename):
                 os.rename(self.filename, self._get_dated_filename(self.last_date))
             self.last_date = current_date
 
     def _write_to_file(self, spans: List[Span]):
-        self._roll_over_if_needed()
-
-        with open(self.filename, "a", encoding="utf8") as file:
-            for span in spans:
-                span_data = span.to_dict()
-                try:
-                    file.write(json.dumps(span_data, ensure_ascii=False) + "\n")
-                except Exception as e:
-                    logger.warning(
-                        f"Write span to file failed: {str(e)}, span_data: {span_data}"
-                    )
+        lines = []
+        for span in spans:
+            span_data = span.to_dict()
+            try:
+                lines.append(self._dumps(span_data) + "\n")
+            except Exception as e:
+                logger.warning(
+                    f"Write span to file failed: {str(e)}, span_data: {span_data}"
+                )
+        with self._file_lock:
+            self._roll_over_if_needed()
+            if self._file is None:
+                self._file = open(self.filename, "a", encoding="utf8")
+            self._file.writelines(lines)
+            # One flush per batch, the readers see the complete lines
+            self._file.flush()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """Close the span file."""
+        with self._file_lock:
+            self._close_file()
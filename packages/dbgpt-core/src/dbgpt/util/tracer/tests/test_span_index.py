@@ -0,0 +1,130 @@
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from dbgpt.util.tracer import tracer_cli
+from dbgpt.util.tracer.span_index import SpanIndex, percentile
+from dbgpt.util.tracer.tracer_cli import _build_trace_hierarchy
+
+
+def _span(span_id, parent_span_id=None, op="op", start=0, end=None, trace_id="t1"):
+    return {
+        "span_type": "base",
+        "trace_id": trace_id,
+        "span_id": span_id,
+        "parent_span_id": parent_span_id,
+        "operation_name": op,
+        "start_time": f"2024-01-01 00:00:{start:02d}.000",
+        "end_time": None if end is None else f"2024-01-01 00:00:{end:02d}.000",
+        "metadata": None,
+    }
+
+
+def _write(path, spans, mode="a"):
+    with open(path, mode, encoding="utf8") as f:
+        for span in spans:
+            f.write(json.dumps(span) + "\n")
+
+
+@pytest.fixture
+def span_file(tmp_path):
+    path = str(tmp_path / "dbgpt.jsonl")
+    _write(
+        path,
+        [
+            _span("a", op="root", start=0),
+            _span("b", "a", op="child", start=1),
+            _span("b", "a", op="child", start=1, end=3),
+            _span("a", op="root", start=0, end=4),
+        ],
+    )
+    return path
+
+
+def test_sync_and_query(span_file):
+    with SpanIndex() as index:
+        file_ids = index.sync([span_file])
+        assert len(index.query_spans(file_ids)) == 4
+        assert len(index.query_spans(file_ids, span_id="b")) == 2
+        assert len(index.query_spans(file_ids, parent_span_id="a")) == 2
+        spans = index.query_spans(file_ids, desc=True, limit=1)
+        assert spans[0]["span_id"] == "b"
+        spans = index.query_spans(file_ids, start_time="2024-01-01 00:00:01.000")
+        assert [s["span_id"] for s in spans] == ["b", "b"]
+        assert index.query_spans(file_ids, trace_id="t2") == []
+
+
+def test_sync_incrementally(span_file):
+    with SpanIndex() as index:
+        file_ids = index.sync([span_file])
+        _write(span_file, [_span("c", trace_id="t2", start=5)])
+        # A line being written is indexed next time
+        line = json.dumps(_span("d", trace_id="t2", start=6)) + "\n"
+        with open(span_file, "a") as f:
+            f.write(line[:10])
+        file_ids = index.sync([span_file])
+        assert len(index.query_spans(file_ids)) == 5
+        with open(span_file, "a") as f:
+            f.write(line[10:])
+        file_ids = index.sync([span_file])
+        assert len(index.query_spans(file_ids)) == 6
+        assert len(index.query_spans(file_ids, trace_id="t2")) == 2
+
+
+def test_sync_rolled_over(span_file, tmp_path):
+    with SpanIndex() as index:
+        index.sync([span_file])
+        rolled = str(tmp_path / "dbgpt_2024-01-01.jsonl")
+        os.rename(span_file, rolled)
+        _write(span_file, [_span("c", trace_id="t2", start=5)])
+        file_ids = index.sync([span_file, rolled])
+        assert len(index.query_spans(file_ids)) == 5
+        assert len(index.query_spans(file_ids[:1])) == 1
+
+
+def test_latency_stats(span_file):
+    with SpanIndex() as index:
+        file_ids = index.sync([span_file])
+        stats = {s["operation_name"]: s for s in index.latency_stats(file_ids)}
+    assert stats["root"]["count"] == 1
+    assert stats["root"]["p99"] == 4000
+    assert stats["child"]["max"] == 2000
+
+
+def test_percentile():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([1, 2, 3, 4], 100) == 4
+    assert percentile([5], 99) == 5
+
+
+def test_build_trace_hierarchy(span_file):
+    with open(span_file) as f:
+        spans = [json.loads(line) for line in f]
+    hierarchy = _build_trace_hierarchy(spans)
+    assert [(e["span_id"], e["end_time"] is None) for e in hierarchy] == [
+        ("a", True),
+        ("a", False),
+    ]
+    children = hierarchy[0]["children"]
+    assert [(e["span_id"], e["end_time"] is None) for e in children] == [
+        ("b", True),
+        ("b", False),
+    ]
+
+
+def test_cli(span_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        tracer_cli, "_DEFAULT_INDEX_PATH", str(tmp_path / "index" / "trace.db")
+    )
+    runner = CliRunner()
+    result = runner.invoke(tracer_cli.tree, ["--trace_id", "t1", span_file])
+    assert result.exit_code == 0
+    assert "  Operation: child" in result.output
+    result = runner.invoke(tracer_cli.latency, [span_file])
+    assert result.exit_code == 0
+    assert "root" in result.output
+    result = runner.invoke(tracer_cli.list, ["--search", "child", span_file])
+    assert result.exit_code == 0
+    assert result.output.count("child") == 2
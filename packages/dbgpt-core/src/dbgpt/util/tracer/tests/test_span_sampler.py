@@ -0,0 +1,157 @@
+import logging
+import time
+from datetime import timedelta
+
+import pytest
+
+from dbgpt.util.tracer import Span, SpanSampler, SpanStorageContainer, SpanType
+from dbgpt.util.tracer.span_storage import MemorySpanStorage
+
+
+def _ended(span: Span, duration_ms: float = 1, metadata=None) -> Span:
+    span = span.copy()
+    span.end_time = span.start_time + timedelta(milliseconds=duration_ms)
+    if metadata is not None:
+        span.metadata = metadata
+    return span
+
+
+def _not_sampled_trace_id(sampler: SpanSampler) -> str:
+    return next(
+        f"trace-{i}" for i in range(1000) if not sampler.is_head_sampled(f"trace-{i}")
+    )
+
+
+def test_head_sampling():
+    sampler = SpanSampler(sample_rate=0.3)
+    trace_ids = [f"trace-{i}" for i in range(2000)]
+    kept = sum(sampler.is_head_sampled(t) for t in trace_ids)
+    assert 400 < kept < 800
+    # The same decision for the same trace
+    assert [sampler.is_head_sampled(t) for t in trace_ids] == [
+        SpanSampler(sample_rate=0.3).is_head_sampled(t) for t in trace_ids
+    ]
+    assert all(SpanSampler().is_head_sampled(t) for t in trace_ids)
+    with pytest.raises(ValueError):
+        SpanSampler(sample_rate=2)
+
+
+def test_not_sampled_trace_dropped():
+    sampler = SpanSampler(sample_rate=0)
+    trace_id = _not_sampled_trace_id(sampler)
+    root = Span(trace_id, "root", SpanType.BASE)
+    child = Span(trace_id, "child", SpanType.BASE, parent_span_id="root")
+    assert sampler.sample(root.copy()) == []
+    assert sampler.sample(child.copy()) == []
+    assert sampler.sample(_ended(child)) == []
+    assert sampler.stats()["pending_traces"] == 1
+    assert sampler.sample(_ended(root)) == []
+    # Held in the grace window after the root end
+    assert sampler.stats() == {"sampled_out": 0, "pending_traces": 1}
+    sampler.expire(time.monotonic() + 60)
+    assert sampler.stats() == {"sampled_out": 4, "pending_traces": 0}
+    # A late span of the dropped trace
+    assert sampler.sample(_ended(child)) == []
+    assert sampler.stats() == {"sampled_out": 5, "pending_traces": 0}
+
+
+def test_child_fails_after_root_end():
+    sampler = SpanSampler(sample_rate=0)
+    trace_id = _not_sampled_trace_id(sampler)
+    root = Span(trace_id, "root", SpanType.BASE)
+    child = Span(trace_id, "child", SpanType.BASE, parent_span_id="root")
+    assert sampler.sample(root.copy()) == []
+    assert sampler.sample(child.copy()) == []
+    # The root span of a streaming response ends before its children
+    assert sampler.sample(_ended(root)) == []
+    spans = sampler.sample(_ended(child, metadata={"error": "boom"}))
+    assert [(s.span_id, s.end_time is not None) for s in spans] == [
+        ("root", False),
+        ("child", False),
+        ("root", True),
+        ("child", True),
+    ]
+    assert sampler.stats() == {"sampled_out": 0, "pending_traces": 0}
+
+
+def test_first_span_is_root():
+    sampler = SpanSampler(sample_rate=0, root_end_grace_ms=0)
+    trace_id = _not_sampled_trace_id(sampler)
+    # The first span in a worker process has a remote parent
+    root = Span(trace_id, "worker", SpanType.BASE, parent_span_id="remote")
+    child = Span(trace_id, "child", SpanType.BASE, parent_span_id="worker")
+    sampler.sample(root.copy())
+    sampler.sample(child.copy())
+    sampler.sample(_ended(child))
+    assert sampler.stats()["pending_traces"] == 1
+    sampler.sample(_ended(root))
+    assert sampler.stats() == {"sampled_out": 4, "pending_traces": 0}
+
+
+def test_error_and_slow_trace_kept():
+    sampler = SpanSampler(sample_rate=0, slow_span_threshold_ms=100)
+    trace_id = _not_sampled_trace_id(sampler)
+    root = Span(trace_id, "root", SpanType.BASE)
+    child = Span(trace_id, "child", SpanType.BASE, parent_span_id="root")
+    sampler.sample(root.copy())
+    sampler.sample(child.copy())
+    spans = sampler.sample(_ended(child, metadata={"error": "boom"}))
+    assert [s.span_id for s in spans] == ["root", "child", "child"]
+    # The rest of the trace is kept
+    assert len(sampler.sample(_ended(root))) == 1
+
+    trace_id = _not_sampled_trace_id(SpanSampler(sample_rate=0))
+    sampler = SpanSampler(sample_rate=0, slow_span_threshold_ms=100)
+    root = Span(trace_id, "root", SpanType.BASE)
+    sampler.sample(root.copy())
+    assert len(sampler.sample(_ended(root, duration_ms=200))) == 2
+
+
+def test_pending_traces_bounded():
+    sampler = SpanSampler(sample_rate=0, max_pending_traces=2)
+    for i in range(5):
+        sampler.sample(Span(f"trace-{i}", "root", SpanType.BASE))
+    assert sampler.stats() == {"sampled_out": 3, "pending_traces": 2}
+
+
+def test_container_drops_oldest_spans():
+    storage = MemorySpanStorage()
+    container = SpanStorageContainer(batch_size=100, flush_interval=100)
+    container.max_buffer_size = 3
+    container.append_storage(storage)
+    for i in range(5):
+        container.append_span(Span("1", str(i), SpanType.BASE))
+    assert container.stats() == {"buffered": 3, "dropped": 2}
+    container.before_stop()
+    assert [s.span_id for s in storage.spans] == ["2", "3", "4"]
+
+
+def test_container_with_sampler():
+    sampler = SpanSampler(sample_rate=0, root_end_grace_ms=0)
+    container = SpanStorageContainer(sampler=sampler)
+    trace_id = _not_sampled_trace_id(sampler)
+    root = Span(trace_id, "root", SpanType.BASE)
+    container.append_span(root.copy())
+    container.append_span(_ended(root))
+    assert container.stats() == {
+        "buffered": 0,
+        "dropped": 0,
+        "sampled_out": 2,
+        "pending_traces": 0,
+    }
+    container.before_stop()
+
+
+def test_container_logs_stats(caplog):
+    container = SpanStorageContainer(flush_interval=100, stats_log_interval=0)
+    container.max_buffer_size = 1
+    container.append_span(Span("1", "1", SpanType.BASE))
+    with caplog.at_level(logging.INFO, logger="dbgpt.util.tracer.span_storage"):
+        container._log_stats()
+        assert not caplog.records
+        container.append_span(Span("1", "2", SpanType.BASE))
+        container._log_stats()
+        container._log_stats()
+    assert len(caplog.records) == 1
+    assert "'dropped': 1" in caplog.records[0].getMessage()
+    container.before_stop()
@@ -2,18 +2,21 @@ import glob
 import json
 import logging
 import os
+import sqlite3
 from datetime import datetime
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import click
 
 from dbgpt.configs.model_config import LOGDIR
 from dbgpt.util.tracer import SpanType, SpanTypeRunName
+from dbgpt.util.tracer.span_index import SpanIndex
 
 logger = logging.getLogger("dbgpt_cli")
 
 
 _DEFAULT_FILE_PATTERN = os.path.join(LOGDIR, "dbgpt*.jsonl")
+_DEFAULT_INDEX_PATH = os.path.join(LOGDIR, "dbgpt_trace_index.db")
 
 
 @click.group("trace")
@@ -154,36 +157,24 @@ def list(
     from prettytable import PrettyTable
 
     # If no files are explicitly specified, use the default pattern to get them
-    spans = read_spans_from_files(files)
-
-    if trace_id:
-        spans = filter(lambda s: s["trace_id"] == trace_id, spans)
-    if span_id:
-        spans = filter(lambda s: s["span_id"] == span_id, spans)
-    if span_type:
-        spans = filter(lambda s: s["span_type"] == span_type, spans)
-    if parent_span_id:
-        spans = filter(lambda s: s["parent_span_id"] == parent_span_id, spans)
-    # Filter spans based on the start and end times
-    if start_time:
-        start_dt = _parse_datetime(start_time)
-        spans = filter(
-            lambda span: _parse_datetime(span["start_time"]) >= start_dt, spans
-        )
-
-    if end_time:
-        end_dt = _parse_datetime(end_time)
-        spans = filter(
-            lambda span: _parse_datetime(span["start_time"]) <= end_dt, spans
+    index, file_ids = _open_span_index(files)
+    with index:
+        # The search and the JSON path are filtered after querying the index
+        spans = index.query_spans(
+            file_ids,
+            trace_id=trace_id or None,
+            span_id=span_id or None,
+            span_type=span_type or None,
+            parent_span_id=parent_span_id or None,
+            start_time=_format_span_time(start_time),
+            end_time=_format_span_time(end_time),
+            desc=desc,
+            limit=None if search or json_path else limit,
         )
 
     if search:
-        spans = filter(_new_search_span_func(search), spans)
-
-    # Sort spans based on the start time
-    spans = sorted(
-        spans, key=lambda span: _parse_datetime(span["start_time"]), reverse=desc
-    )
+        search_func = _new_search_span_func(search)
+        spans = [span for span in spans if search_func(span)]
 
     # Handle JSON path extraction if specified
     if json_path:
@@ -352,32 +343,29 @@ def chat(
     """Show conversation details"""
     from prettytable import PrettyTable
 
-    spans = read_spans_from_files(files)
-
-    # Sort by start time
-    spans = sorted(
-        spans, key=lambda span: _parse_datetime(span["start_time"]), reverse=True
-    )
-    spans = [sp for sp in spans]
-    if not spans:
-        _print_empty_message(files)
-        return
-    service_spans = {}
-    service_names = set(SpanTypeRunName.values())
-    found_trace_id = None
-    for sp in spans:
-        span_type = sp["span_type"]
-        metadata = sp.get("metadata")
-        if span_type == SpanType.RUN and metadata and "run_service" in metadata:
-            service_name = metadata["run_service"]
-            service_spans[service_name] = sp.copy()
-            if set(service_spans.keys()) == service_names and found_trace_id:
-                break
-        elif span_type == SpanType.CHAT and not found_trace_id:
-            if not trace_id:
-                found_trace_id = sp["trace_id"]
-            if trace_id and trace_id == sp["trace_id"]:
-                found_trace_id = trace_id
+    index, file_ids = _open_span_index(files)
+    with index:
+        if not index.query_spans(file_ids, limit=1):
+            _print_empty_message(files)
+            return
+        # The latest run span of every service
+        service_spans = {}
+        for sp in index.query_spans(file_ids, span_type=SpanType.RUN.value, desc=True):
+            metadata = sp.get("metadata")
+            if metadata and "run_service" in metadata:
+                service_spans.setdefault(metadata["run_service"], sp)
+        if trace_id:
+            chat_spans = index.query_spans(
+                file_ids, trace_id=trace_id, span_type=SpanType.CHAT.value, limit=1
+            )
+            found_trace_id = trace_id if chat_spans else None
+        else:
+            found_trace_id = index.latest_trace_id(file_ids, SpanType.CHAT.value)
+        trace_spans = (
+            index.query_spans(file_ids, trace_id=found_trace_id)
+            if found_trace_id
+            else []
+        )
 
     service_tables = {}
     system_infos_table = {}
@@ -430,8 +418,6 @@ def chat(
         return
     trace_id = found_trace_id
 
-    trace_spans = [span for span in spans if span["trace_id"] == trace_id]
-    trace_spans = [s for s in reversed(trace_spans)]
     hierarchy = _build_trace_hierarchy(trace_spans)
     if tree:
         print(f"\nInvoke Trace Tree(trace_id: {trace_id}):\n")
@@ -530,6 +516,81 @@ def chat(
     print(table.get_formatted_string(out_format=output, **out_kwargs))
 
 
+@trace_cli_group.command()
+@click.option(
+    "--operation_name",
+    required=False,
+    type=str,
+    default=None,
+    help="Specify the operation name to analyze, all operations by default",
+)
+@click.option(
+    "--start_time",
+    type=str,
+    help='Filter by start time. Format: "YYYY-MM-DD HH:MM:SS.mmm"',
+)
+@click.option(
+    "--end_time", type=str, help='Filter by end time. Format: "YYYY-MM-DD HH:MM:SS.mmm"'
+)
+@click.option(
+    "--sort_by",
+    required=False,
+    type=click.Choice(["p50", "p90", "p95", "p99", "max", "avg", "count"]),
+    default="p99",
+    help="The column to sort by in descending order",
+)
+@click.option(
+    "-l",
+    "--limit",
+    type=int,
+    default=50,
+    help="Limit the number of operations displayed.",
+)
+@click.option(
+    "--output",
+    required=False,
+    type=click.Choice(["text", "html", "csv", "latex", "json"]),
+    default="text",
+    help="The output format",
+)
+@click.argument("files", nargs=-1, type=click.Path(exists=True, readable=True))
+def latency(
+    operation_name: str,
+    start_time: str,
+    end_time: str,
+    sort_by: str,
+    limit: int,
+    output: str,
+    files,
+):
+    """Show the latency percentiles (ms) of the spans per operation name"""
+    from prettytable import PrettyTable
+
+    index, file_ids = _open_span_index(files)
+    with index:
+        stats = index.latency_stats(
+            file_ids,
+            operation_name=operation_name,
+            start_time=_format_span_time(start_time),
+            end_time=_format_span_time(end_time),
+        )
+    if not stats:
+        _print_empty_message(files)
+        return
+    stats = sorted(stats, key=lambda item: item[sort_by], reverse=True)[:limit]
+    columns = ["operation_name", "count", "avg", "p50", "p90", "p95", "p99", "max"]
+    table = PrettyTable(columns, title="Span Latency (ms)")
+    for item in stats:
+        table.add_row(
+            [
+                round(item[c], 2) if isinstance(item[c], float) else item[c]
+                for c in columns
+            ]
+        )
+    out_kwargs = {"ensure_ascii": False} if output == "json" else {}
+    print(table.get_formatted_string(out_format=output, **out_kwargs))
+
+
 def read_spans_from_files(files=None) -> Iterable[Dict]:
     """
     Reads spans from multiple files based on the provided file paths.
@@ -546,6 +607,37 @@ def read_spans_from_files(files=None) -> Iterable[Dict]:
                     yield json.loads(line)
 
 
+def _expand_files(files=None) -> List[str]:
+    """Return the span files matching the file patterns."""
+    if not files:
+        files = [_DEFAULT_FILE_PATTERN]
+    filenames = []
+    for filepath in files:
+        filenames.extend(sorted(glob.glob(filepath)))
+    return filenames
+
+
+def _open_span_index(files=None) -> Tuple[SpanIndex, List[int]]:
+    """Open the span index and index the new spans of the files.
+
+    The index is kept in the log directory, it falls back to an in-memory index
+    if the directory is not writable.
+    """
+    try:
+        index = SpanIndex(_DEFAULT_INDEX_PATH)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Can't open the span index {_DEFAULT_INDEX_PATH}: {e}")
+        index = SpanIndex()
+    return index, index.sync(_expand_files(files))
+
+
+def _format_span_time(dt_str: Optional[str]) -> Optional[str]:
+    """Format a datetime string the same as the span times for comparing."""
+    if not dt_str:
+        return None
+    return _parse_datetime(dt_str).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
 def _print_empty_message(files=None):
     if not files:
         files = [_DEFAULT_FILE_PATTERN]
@@ -575,59 +667,47 @@ def _parse_datetime(dt_str):
 
 
 def _build_trace_hierarchy(spans, parent_span_id=None, indent=0):
-    # Current spans
-    current_level_spans = [
-        span
-        for span in spans
-        if span["parent_span_id"] == parent_span_id and span["end_time"] is None
-    ]
-
-    hierarchy = []
-
-    for start_span in current_level_spans:
-        # Find end span
-        end_span = next(
-            (
-                span
-                for span in spans
-                if span["span_id"] == start_span["span_id"]
-                and span["end_time"] is not None
-            ),
-            None,
-        )
-        entry = {
-            "operation_name": start_span["operation_name"],
-            "parent_span_id": start_span["parent_span_id"],
-            "span_id": start_span["span_id"],
-            "start_time": start_span["start_time"],
-            "end_time": start_span["end_time"],
-            "metadata": start_span["metadata"],
-            "children": _build_trace_hierarchy(
-                spans, start_span["span_id"], indent + 1
-            ),
+    """Build the call tree of the spans of a trace.
+
+    Every started span is a node, its end span follows it as a leaf. The spans
+    are grouped by the parent span id once, so it takes linear time.
+    """
+    children: Dict[Optional[str], List[Dict]] = {}
+    end_spans: Dict[str, Dict] = {}
+    for span in spans:
+        if span["end_time"] is None:
+            children.setdefault(span["parent_span_id"], []).append(span)
+        else:
+            end_spans.setdefault(span["span_id"], span)
+
+    def _to_entry(span: Dict, children_entries: List[Dict]) -> Dict:
+        return {
+            "operation_name": span["operation_name"],
+            "parent_span_id": span["parent_span_id"],
+            "span_id": span["span_id"],
+            "start_time": span["start_time"],
+            "end_time": span["end_time"],
+            "metadata": span["metadata"],
+            "children": children_entries,
         }
-        hierarchy.append(entry)
-
-        # Append end span
-        if end_span:
-            entry_end = {
-                "operation_name": end_span["operation_name"],
-                "parent_span_id": end_span["parent_span_id"],
-                "span_id": end_span["span_id"],
-                "start_time": end_span["start_time"],
-                "end_time": end_span["end_time"],
-                "metadata": end_span["metadata"],
-                "children": [],
-            }
-            hierarchy.append(entry_end)
 
-    return hierarchy
+    def _build(span_id: Optional[str]) -> List[Dict]:
+        hierarchy = []
+        for start_span in children.get(span_id, []):
+            hierarchy.append(_to_entry(start_span, _build(start_span["span_id"])))
+            end_span = end_spans.get(start_span["span_id"])
+            if end_span:
+                hierarchy.append(_to_entry(end_span, []))
+        return hierarchy
+
+    return _build(parent_span_id)
 
 
 def _view_trace_hierarchy(trace_id, files=None):
     """Find and display the calls of the entire link based on the given trace_id"""
-    spans = read_spans_from_files(files)
-    trace_spans = [span for span in spans if span["trace_id"] == trace_id]
+    index, file_ids = _open_span_index(files)
+    with index:
+        trace_spans = index.query_spans(file_ids, trace_id=trace_id)
     if not trace_spans:
         return None
     hierarchy = _build_trace_hierarchy(trace_spans)
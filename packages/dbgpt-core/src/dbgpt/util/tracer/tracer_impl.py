@@ -382,6 +382,33 @@ class TracerParameters(BaseParameters):
             "help": _("The class of the tracer storage"),
         },
     )
+    sample_rate: float = field(
+        default=1.0,
+        metadata={
+            "help": _(
+                "The ratio of the traces to store, between 0 and 1, the traces with "
+                "an error or a slow span are always stored"
+            ),
+        },
+    )
+    slow_span_threshold_ms: Optional[float] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The spans taking longer, in milliseconds, are always stored with "
+                "their trace"
+            ),
+        },
+    )
+    max_buffered_spans: int = field(
+        default=10000,
+        metadata={
+            "help": _(
+                "The max number of the spans waiting to be written, the oldest span "
+                "is dropped when it is full"
+            ),
+        },
+    )
 
     def __post_init__(self):
         use_telemetry = os.getenv("TRACER_TO_OPEN_TELEMETRY", "false").lower() == "true"
@@ -405,6 +432,7 @@ def initialize_tracer(
     tracer_parameters: Optional[TracerParameters] = None,
 ):
     """Initialize the tracer with the given filename and system app."""
+    from dbgpt.util.tracer.span_sampler import SpanSampler
     from dbgpt.util.tracer.span_storage import FileSpanStorage, SpanStorageContainer
 
     if not system_app and create_system_app:
@@ -418,7 +446,23 @@ def initialize_tracer(
     )
     tracer = DefaultTracer(system_app)
 
-    storage_container = SpanStorageContainer(system_app)
+    if tracer_parameters:
+        sampler = None
+        if (
+            tracer_parameters.sample_rate < 1
+            or tracer_parameters.slow_span_threshold_ms is not None
+        ):
+            sampler = SpanSampler(
+                sample_rate=tracer_parameters.sample_rate,
+                slow_span_threshold_ms=tracer_parameters.slow_span_threshold_ms,
+            )
+        storage_container = SpanStorageContainer(
+            system_app,
+            max_buffer_size=tracer_parameters.max_buffered_spans,
+            sampler=sampler,
+        )
+    else:
+        storage_container = SpanStorageContainer(system_app)
     tracer_filename = resolve_root_path(tracer_filename)
     storage_container.append_storage(FileSpanStorage(tracer_filename))
     if tracer_parameters and tracer_parameters.exporter == "telemetry":
@@ -74,6 +74,7 @@ class SQLiteConnector(RDBMSConnector):
 
     db_type: str = "sqlite"
     db_dialect: str = "sqlite"
+    async_driver: str = "sqlite+aiosqlite"
 
     @classmethod
     def param_class(cls) -> Type[SQLiteConnectorParameters]:
@@ -103,6 +104,11 @@ class SQLiteConnector(RDBMSConnector):
             os.makedirs(directory)
         return cls(create_engine("sqlite:///" + file_path, **_engine_args), **kwargs)
 
+    def _get_schema_version(self) -> Optional[str]:
+        """Return the schema cookie, it is incremented by every DDL."""
+        with self._engine.connect() as conn:
+            return str(conn.execute(text("PRAGMA schema_version")).scalar())
+
     def get_indexes(self, table_name):
         """Get table indexes about specified table."""
         with self.session_scope() as session:
@@ -178,6 +184,13 @@ class SQLiteConnector(RDBMSConnector):
             self._metadata.reflect(bind=self._engine)
             return self._all_tables
 
+    def _create_async_engine(self):
+        database = self._engine.url.database
+        if not database or database == ":memory:":
+            # Every connection of an in-memory database is a different database
+            return None
+        return super()._create_async_engine()
+
     def _write(self, write_sql):
         logger.info(f"Write[{write_sql}]")
         with self.session_scope() as session:
@@ -185,7 +198,10 @@ class SQLiteConnector(RDBMSConnector):
             # TODO  Subsequent optimization of dynamically specified database submission
             #  loss target problem
             logger.info(f"SQL[{write_sql}], result:{result.rowcount}")
-            return result.rowcount
+            rowcount = result.rowcount
+        # Drop the cached results after the commit
+        self._invalidate_result_cache(write_sql)
+        return rowcount
 
     def get_table_comments(self, db_name=None):
         """Get table comments."""
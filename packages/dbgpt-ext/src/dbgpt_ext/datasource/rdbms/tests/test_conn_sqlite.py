@@ -6,6 +6,7 @@ import os
 import tempfile
 
 import pytest
+from sqlalchemy import text
 
 from dbgpt_ext.datasource.rdbms.conn_sqlite import SQLiteConnector
 
@@ -102,6 +103,266 @@ def test_query_ex(db):
     assert result == [1]
 
 
+def test_query_stream(db):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);")
+    for i in range(5):
+        db.run(f"insert into test(id, name) values ({i}, 'name{i}')")
+
+    chunks = list(db.query_stream("select * from test", batch_size=2))
+    assert [chunk.columns for chunk in chunks] == [["id", "name"]] * 3
+    assert [len(chunk.rows) for chunk in chunks] == [2, 2, 1]
+    assert [chunk.offset for chunk in chunks] == [0, 2, 4]
+    assert not any(chunk.truncated for chunk in chunks)
+
+    chunks = list(
+        db.query_stream(
+            "select * from test where id > :id", params={"id": 0}, max_rows=3
+        )
+    )
+    assert [tuple(row) for row in chunks[0].rows] == [
+        (1, "name1"),
+        (2, "name2"),
+        (3, "name3"),
+    ]
+    assert chunks[-1].truncated
+
+    # Each row is about 8 + 5 bytes
+    chunks = list(db.query_stream("select * from test", max_bytes=20))
+    assert len(chunks[0].rows) == 2
+    assert chunks[0].truncated
+
+    chunks = list(db.query_stream("select * from test where id > 10"))
+    assert len(chunks) == 1
+    assert chunks[0].columns == ["id", "name"]
+    assert chunks[0].rows == []
+
+
+def test_run_to_df(db):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);")
+    db.run("insert into test(id, name) values (1, 'a')")
+    db.run("insert into test(id, name) values (2, 'b')")
+    df = db.run_to_df("select * from test")
+    assert list(df.columns) == ["id", "name"]
+    assert df["id"].tolist() == [1, 2]
+    assert df["name"].tolist() == ["a", "b"]
+
+    df = db.run_to_df("select * from test", fetch="one")
+    assert len(df) == 1
+
+
+def test_run_to_df_with_overridden_run(db):
+    class _CustomRunConnector(SQLiteConnector):
+        def run(self, command: str, fetch: str = "all"):
+            return [["id"], (42,)]
+
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY);")
+    conn = _CustomRunConnector(db._engine)
+    # The subclass run() is used instead of streaming from the engine
+    df = conn.run_to_df("select * from test")
+    assert df["id"].tolist() == [42]
+
+
+def test_schema_cache_is_shared(db):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY);")
+    db.run("insert into test(id) values (1)")
+    db._sync_tables_from_db()
+    other = SQLiteConnector.from_file_path(db._engine.url.database)
+    assert db.schema_cache is other.schema_cache
+
+    table_info = db.get_table_info()
+    other._render_table_info = None
+    assert other.get_table_info() == table_info
+
+
+def test_schema_cache_ddl_change(db):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY);")
+    db._sync_tables_from_db()
+    db.schema_cache.version_check_interval = 0
+    assert "name" not in db.get_table_info()
+    assert [c["name"] for c in db.get_columns("test")] == ["id"]
+
+    with db.session_scope() as session:
+        session.execute(text("ALTER TABLE test ADD COLUMN name TEXT"))
+    assert "name" in db.get_table_info()
+    assert [c["name"] for c in db.get_columns("test")] == ["id", "name"]
+
+
+def test_invalidate_schema_cache(db):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY);")
+    db._sync_tables_from_db()
+    db.get_columns("test")
+    assert db.schema_cache.get("columns", "test") is not None
+    db.invalidate_schema_cache(["test"])
+    assert db.schema_cache.get("columns", "test") is None
+
+
+def test_result_cache_disabled(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.run("INSERT INTO test (id) VALUES (1)")
+    assert db.result_cache is None
+    assert not hasattr(db.run("SELECT * FROM test"), "cached_at")
+
+
+def test_result_cache(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.run("CREATE TABLE other (id INTEGER);")
+    db.run("INSERT INTO test (id) VALUES (1)")
+    db.enable_result_cache(ttl=60)
+
+    assert db.run("SELECT * FROM test") == [("id",), (1,)]
+    result = db.run("select *  from test;")
+    assert result == [("id",), (1,)]
+    assert result.cached_at > 0
+    field_names, rows = db.query_ex("SELECT * FROM test WHERE id = :id", {"id": 1})
+    assert not hasattr(rows, "cached_at")
+    field_names, rows = db.query_ex("SELECT * FROM test WHERE id = :id", {"id": 1})
+    assert field_names == ["id"]
+    assert rows == [(1,)]
+    assert rows.cached_at > 0
+    df = db.run_to_df("SELECT id FROM test")
+    assert "cached_at" not in df.attrs
+    df = db.run_to_df("SELECT id FROM test")
+    assert df["id"].tolist() == [1]
+    assert df.attrs["cached_at"] > 0
+
+    # A write to another table keeps the results
+    db.run("INSERT INTO other (id) VALUES (2)")
+    assert db.run("SELECT * FROM test").cached_at > 0
+    # A write to the table drops them
+    db.run("INSERT INTO test (id) VALUES (2)")
+    result = db.run("SELECT * FROM test")
+    assert not hasattr(result, "cached_at")
+    assert result == [("id",), (1,), (2,)]
+    _, rows = db.query_ex("SELECT * FROM test WHERE id = :id", {"id": 1})
+    assert not hasattr(rows, "cached_at")
+
+
+def test_result_cache_ddl(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.enable_result_cache(ttl=60)
+    db.run("SELECT * FROM test")
+    db.run("ALTER TABLE test ADD COLUMN name TEXT")
+    assert len(db.result_cache) == 0
+    assert db.run("SELECT * FROM test") == [("id", "name")]
+
+
+@pytest.mark.asyncio
+async def test_result_cache_query_ex_write(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.run("CREATE TABLE other (id INTEGER);")
+    db.enable_result_cache(ttl=60)
+    db.query_ex("SELECT * FROM test")
+    db.query_ex("SELECT * FROM other")
+
+    # The writes of the SQL editor go through query_ex
+    db.query_ex("INSERT INTO test (id) VALUES (:id)", {"id": 1})
+    _, rows = db.query_ex("SELECT * FROM test")
+    assert rows == [(1,)]
+    assert not hasattr(rows, "cached_at")
+    assert db.query_ex("SELECT * FROM other")[1].cached_at > 0
+
+    await db.aquery_ex("DELETE FROM test WHERE id = :id", {"id": 1})
+    _, rows = await db.aquery_ex("SELECT * FROM test")
+    assert rows == []
+    assert not hasattr(rows, "cached_at")
+
+    db.query_ex("ALTER TABLE other ADD COLUMN name TEXT")
+    assert len(db.result_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_run_in_thread(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.run("INSERT INTO test (id) VALUES (1)")
+    # Without the async driver the async calls run in threads
+    db.async_driver = None
+    assert db.async_engine is None
+    assert await db.arun("SELECT * FROM test") == [("id",), (1,)]
+    field_names, rows = await db.aquery_ex(
+        "SELECT * FROM test WHERE id = :id", {"id": 1}
+    )
+    assert field_names == ["id"]
+    assert rows == [(1,)]
+
+
+@pytest.mark.asyncio
+async def test_async_engine(db):
+    pytest.importorskip("aiosqlite")
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.run("INSERT INTO test (id) VALUES (1)")
+    assert db.async_engine is not None
+    assert await db.arun("SELECT * FROM test") == [("id",), (1,)]
+    field_names, rows = await db.aquery_ex("SELECT * FROM test", fetch="one")
+    assert rows == [(1,)]
+    assert "async" in db.pool_status()
+    await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_query_timeout_sql(db, monkeypatch):
+    executed = []
+
+    class _Cursor:
+        returns_rows = True
+
+        def fetchall(self):
+            return [(1,)]
+
+        def keys(self):
+            return ["id"]
+
+    class _Conn:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+        async def execute(self, sql, params=None):
+            executed.append(str(sql))
+            return _Cursor()
+
+    class _Engine:
+        def connect(self):
+            return _Conn()
+
+    monkeypatch.setattr(SQLiteConnector, "dialect", property(lambda self: "mysql"))
+    field_names, rows = await db._aexecute_query(
+        _Engine(), "SELECT 1 AS id", {}, "all", timeout=1.5
+    )
+    assert rows == [(1,)]
+    assert executed == [
+        "SET SESSION MAX_EXECUTION_TIME = 1500",
+        "SELECT 1 AS id",
+        "SET SESSION MAX_EXECUTION_TIME = 0",
+    ]
+
+
+def test_async_engine_args():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = SQLiteConnector.from_uri(
+            f"sqlite:///{os.path.join(temp_dir, 'sqlite.db')}",
+            engine_args={
+                "connect_args": {"check_same_thread": False},
+                "pool_pre_ping": True,
+            },
+        )
+        # The connect_args of the sync driver are not passed to the async one
+        assert db._async_engine_args == {"pool_pre_ping": True}
+
+
+def test_async_engine_in_memory():
+    db = SQLiteConnector.from_uri("sqlite://")
+    assert db.async_engine is None
+
+
+def test_pool_status(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    status = db.pool_status()
+    assert status["sync"]["pool_class"]
+    assert "async" not in status
+
+
 def test_convert_sql_write_to_select(db):
     # TODO
     pass
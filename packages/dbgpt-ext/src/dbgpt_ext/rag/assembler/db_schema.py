@@ -1,6 +1,7 @@
 """DBSchemaAssembler."""
 
-from typing import Any, List, Optional
+import logging
+from typing import Any, Dict, List, Optional, Tuple
 
 from dbgpt.core import Chunk, Embeddings
 from dbgpt.datasource.base import BaseConnector
@@ -12,6 +13,8 @@ from ..chunk_manager import ChunkParameters
 from ..knowledge.datasource import DatasourceKnowledge
 from ..retriever.db_schema import DBSchemaRetriever
 
+logger = logging.getLogger(__name__)
+
 
 class DBSchemaAssembler(BaseAssembler):
     """DBSchemaAssembler.
@@ -43,6 +46,8 @@ class DBSchemaAssembler(BaseAssembler):
         embedding_model: Optional[str] = None,
         embeddings: Optional[Embeddings] = None,
         max_seq_length: int = 512,
+        table_names: Optional[List[str]] = None,
+        table_schemas: Optional[Dict[str, Dict[str, Any]]] = None,
         **kwargs: Any,
     ) -> None:
         """Initialize with Embedding Assembler arguments.
@@ -56,6 +61,10 @@ class DBSchemaAssembler(BaseAssembler):
             chunk_manager: (Optional[ChunkManager]) ChunkManager to use for chunking.
             embedding_model: (Optional[str]) Embedding model to use.
             embeddings: (Optional[Embeddings]) Embeddings to use.
+            table_names: (Optional[List[str]]) Only assemble these tables, defaults
+                to all the tables.
+            table_schemas: (Optional[Dict[str, Dict[str, Any]]]) The introspected
+                schemas of the tables.
         """
         self._connector = connector
         self._table_vector_store_connector = table_vector_store_connector
@@ -66,7 +75,12 @@ class DBSchemaAssembler(BaseAssembler):
                 default_model_name=self._embedding_model
             ).create(self._embedding_model)
 
-        knowledge = DatasourceKnowledge(connector, model_dimension=max_seq_length)
+        knowledge = DatasourceKnowledge(
+            connector,
+            model_dimension=max_seq_length,
+            table_names=table_names,
+            table_schemas=table_schemas,
+        )
         super().__init__(
             knowledge=knowledge,
             chunk_parameters=chunk_parameters,
@@ -83,6 +97,8 @@ class DBSchemaAssembler(BaseAssembler):
         embedding_model: Optional[str] = None,
         embeddings: Optional[Embeddings] = None,
         max_seq_length: int = 512,
+        table_names: Optional[List[str]] = None,
+        table_schemas: Optional[Dict[str, Dict[str, Any]]] = None,
     ) -> "DBSchemaAssembler":
         """Load document embedding into vector store from path.
 
@@ -96,6 +112,8 @@ class DBSchemaAssembler(BaseAssembler):
             embedding_model: (Optional[str]) Embedding model to use.
             embeddings: (Optional[Embeddings]) Embeddings to use.
             max_seq_length: Embedding model max sequence length
+            table_names: Only assemble these tables, defaults to all the tables.
+            table_schemas: The introspected schemas of the tables.
         Returns:
              DBSchemaAssembler
         """
@@ -107,6 +125,8 @@ class DBSchemaAssembler(BaseAssembler):
             chunk_parameters=chunk_parameters,
             embeddings=embeddings,
             max_seq_length=max_seq_length,
+            table_names=table_names,
+            table_schemas=table_schemas,
         )
 
     def get_chunks(self) -> List[Chunk]:
@@ -119,6 +139,37 @@ class DBSchemaAssembler(BaseAssembler):
         Returns:
             List[str]: List of chunk ids.
         """
+        table_chunks, field_chunks = self._split_table_field_chunks()
+        if self._field_vector_store_connector and field_chunks:
+            self._field_vector_store_connector.load_document_with_limit(field_chunks)
+        return self._table_vector_store_connector.load_document_with_limit(table_chunks)
+
+    def persist_by_table(
+        self,
+    ) -> Optional[Dict[str, Tuple[List[str], List[str]]]]:
+        """Persist chunks into vector store, return the vector ids of every table.
+
+        Returns:
+            Optional[Dict[str, Tuple[List[str], List[str]]]]: Key is the table name,
+                value is the table vector ids and the field vector ids. None if the
+                loaded ids can't be matched to the tables.
+        """
+        table_chunks, field_chunks = self._split_table_field_chunks()
+        vector_ids: Dict[str, Tuple[List[str], List[str]]] = {
+            chunk.metadata["table_name"]: ([], [])
+            for chunk in table_chunks + field_chunks
+        }
+        matched = True
+        if self._field_vector_store_connector and field_chunks:
+            ids = self._field_vector_store_connector.load_document_with_limit(
+                field_chunks
+            )
+            matched &= _collect_table_ids(field_chunks, ids, vector_ids, 1)
+        ids = self._table_vector_store_connector.load_document_with_limit(table_chunks)
+        matched &= _collect_table_ids(table_chunks, ids, vector_ids, 0)
+        return vector_ids if matched else None
+
+    def _split_table_field_chunks(self) -> Tuple[List[Chunk], List[Chunk]]:
         table_chunks, field_chunks = [], []
         for chunk in self._chunks:
             metadata = chunk.metadata
@@ -129,10 +180,7 @@ class DBSchemaAssembler(BaseAssembler):
                     field_chunks.append(chunk)
             else:
                 table_chunks.append(chunk)
-
-        if self._field_vector_store_connector and field_chunks:
-            self._field_vector_store_connector.load_document_with_limit(field_chunks)
-        return self._table_vector_store_connector.load_document_with_limit(table_chunks)
+        return table_chunks, field_chunks
 
     def _extract_info(self, chunks) -> List[Chunk]:
         """Extract info from chunks."""
@@ -154,3 +202,28 @@ class DBSchemaAssembler(BaseAssembler):
             table_vector_store_connector=self._table_vector_store_connector,
             field_vector_store_connector=self._field_vector_store_connector,
         )
+
+
+def _collect_table_ids(
+    chunks: List[Chunk],
+    ids: List[str],
+    vector_ids: Dict[str, Tuple[List[str], List[str]]],
+    position: int,
+) -> bool:
+    """Collect the loaded ids by table, return False if they can't be matched."""
+    if len(ids) == len(chunks):
+        loaded = list(zip(chunks, ids))
+    elif set(ids) <= {chunk.chunk_id for chunk in chunks}:
+        # Some chunks failed to load, the store uses the chunk ids
+        loaded_ids = set(ids)
+        loaded = [
+            (chunk, chunk.chunk_id) for chunk in chunks if chunk.chunk_id in loaded_ids
+        ]
+    else:
+        logger.warning(
+            f"Can't match {len(ids)} loaded ids to {len(chunks)} schema chunks"
+        )
+        return False
+    for chunk, vector_id in loaded:
+        vector_ids[chunk.metadata["table_name"]][position].append(vector_id)
+    return True
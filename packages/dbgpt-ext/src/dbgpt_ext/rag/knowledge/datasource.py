@@ -30,6 +30,8 @@ class DatasourceKnowledge(Knowledge):
         knowledge_type: Optional[KnowledgeType] = KnowledgeType.DOCUMENT,
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
         model_dimension: int = 512,
+        table_names: Optional[List[str]] = None,
+        table_schemas: Optional[Dict[str, Dict[str, Any]]] = None,
         **kwargs: Any,
     ) -> None:
         """Create Datasource Knowledge with Knowledge arguments.
@@ -43,12 +45,18 @@ class DatasourceKnowledge(Knowledge):
             knowledge_type(KnowledgeType, optional): knowledge type
             metadata(Dict[str, Union[str, List[str]], optional): metadata
             model_dimension(int, optional): The threshold for splitting field string
+            table_names(List[str], optional): Only load these tables, defaults to
+                all the tables.
+            table_schemas(Dict[str, Dict[str, Any]], optional): The introspected
+                schemas of the tables, they are not introspected again.
         """
         self._separator = separator
         self._column_separator = column_separator
         self._connector = connector
         self._summary_template = summary_template
         self._model_dimension = model_dimension
+        self._table_names = table_names
+        self._table_schemas = table_schemas
         super().__init__(knowledge_type=knowledge_type, metadata=metadata, **kwargs)
 
     def _load(self) -> List[Document]:
@@ -60,6 +68,8 @@ class DatasourceKnowledge(Knowledge):
             self._separator,
             column_separator=self._column_separator,
             model_dimension=self._model_dimension,
+            table_names=self._table_names,
+            table_schemas=self._table_schemas,
         )
         for summary, table_metadata in db_summary_with_metadata:
             metadata = {"source": "database"}
@@ -1,7 +1,8 @@
 """DBSchema retriever."""
 
 import logging
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, cast
 
 from dbgpt._private.config import Config
 from dbgpt.core import Chunk
@@ -9,7 +10,11 @@ from dbgpt.datasource.base import BaseConnector
 from dbgpt.rag.retriever.base import BaseRetriever
 from dbgpt.rag.retriever.rerank import DefaultRanker, Ranker
 from dbgpt.storage.vector_store.base import VectorStoreBase
-from dbgpt.storage.vector_store.filters import MetadataFilter, MetadataFilters
+from dbgpt.storage.vector_store.filters import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
 from dbgpt.util.chat_util import run_tasks
 from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
 
@@ -23,6 +28,10 @@ logger = logging.getLogger(__name__)
 
 CFG = Config()
 
+# The field search of the separated tables fetches this times the fields kept, so
+# a table is rarely crowded out of the hits by the fields of the other tables
+_FIELD_OVERFETCH_FACTOR = 3
+
 
 class DBSchemaRetriever(BaseRetriever):
     """DBSchema retriever."""
@@ -194,12 +203,85 @@ class DBSchemaRetriever(BaseRetriever):
         field_chunks = self._field_vector_store_connector.similar_search_with_scores(
             query, self._top_k, 0, MetadataFilters(filters=filters)
         )
+        return self._join_fields(table_chunk, field_chunks)
+
+    def _join_fields(self, table_chunk: Chunk, field_chunks: List[Chunk]) -> Chunk:
         field_contents = [chunk.content.strip() for chunk in field_chunks]
         table_chunk.content += (
             "\n" + self._separator + "\n" + self._column_separator.join(field_contents)
         )
         return self._deserialize_table_chunk(table_chunk)
 
+    def _retrieve_fields(self, table_chunks: List[Chunk], query) -> List[Chunk]:
+        """Retrieve the fields of the separated tables with one filtered search.
+
+        The query is embedded and searched once with a ``table_name IN (...)``
+        filter, over-fetching the hits, which are grouped by table with at most
+        ``top_k`` fields per table. If the hits are cut off, a table left with
+        fewer than ``top_k`` fields is searched on its own.
+        """
+        table_names = [chunk.metadata.get("table_name") for chunk in table_chunks]
+        if len(table_chunks) == 1 or not all(table_names):
+            return self._retrieve_fields_one_by_one(table_chunks, query)
+
+        for chunk in table_chunks:
+            chunk.metadata["part"] = "field"
+        first, others = table_chunks[0].metadata, table_chunks[1:]
+        # The metadata all the tables share are equal filters as before
+        filters = [
+            MetadataFilter(key=k, value=v)
+            for k, v in first.items()
+            if k != "table_name"
+            and all(k in c.metadata and c.metadata[k] == v for c in others)
+        ]
+        filters.append(
+            MetadataFilter(
+                key="table_name",
+                operator=FilterOperator.IN,
+                value=list(dict.fromkeys(table_names)),
+            )
+        )
+        topk = self._top_k * len(table_chunks) * _FIELD_OVERFETCH_FACTOR
+        try:
+            field_chunks = (
+                self._field_vector_store_connector.similar_search_with_scores(
+                    query, topk, 0, MetadataFilters(filters=filters)
+                )
+            )
+        except (ValueError, NotImplementedError) as e:
+            logger.warning(f"Batched field search is not supported, fallback: {e}")
+            return self._retrieve_fields_one_by_one(table_chunks, query)
+
+        table_fields: Dict[str, List[Chunk]] = defaultdict(list)
+        for field_chunk in field_chunks:
+            fields = table_fields[field_chunk.metadata.get("table_name")]
+            if len(fields) < self._top_k:
+                fields.append(field_chunk)
+        # The hits may be cut off before the fields of some tables
+        crowded = len(field_chunks) >= topk
+        results: List[Optional[Chunk]] = []
+        crowded_chunks = []
+        for chunk, table_name in zip(table_chunks, table_names):
+            if crowded and len(table_fields[table_name]) < self._top_k:
+                crowded_chunks.append(chunk)
+                results.append(None)
+            else:
+                results.append(self._join_fields(chunk, table_fields[table_name]))
+        if crowded_chunks:
+            crowded_results = iter(
+                self._retrieve_fields_one_by_one(crowded_chunks, query)
+            )
+            results = [r if r is not None else next(crowded_results) for r in results]
+        return cast(List[Chunk], results)
+
+    def _retrieve_fields_one_by_one(
+        self, table_chunks: List[Chunk], query
+    ) -> List[Chunk]:
+        tasks = [
+            lambda c=chunk: self._retrieve_field(c, query) for chunk in table_chunks
+        ]
+        return run_tasks(tasks, concurrency_limit=3)
+
     def _similarity_search(
         self, query, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -221,14 +303,9 @@ class DBSchemaRetriever(BaseRetriever):
         if not separated_chunks:
             return not_sep_chunks
 
-        # Create tasks list
         # The fields of table is too large, and it has to be separated into chunks,
-        # so we need to retrieve fields of each table separately
-        tasks = [
-            lambda c=chunk: self._retrieve_field(c, query) for chunk in separated_chunks
-        ]
-        # Run tasks concurrently
-        separated_result = run_tasks(tasks, concurrency_limit=3)
+        # so we need to retrieve fields of the tables from the field store
+        separated_result = self._retrieve_fields(separated_chunks, query)
 
         # Combine and return results
         return not_sep_chunks + separated_result
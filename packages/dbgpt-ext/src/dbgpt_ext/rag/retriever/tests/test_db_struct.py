@@ -5,6 +5,7 @@ import pytest
 
 import dbgpt_ext
 from dbgpt.core import Chunk
+from dbgpt.storage.vector_store.filters import FilterOperator
 from dbgpt_ext.rag.retriever.db_schema import DBSchemaRetriever
 
 
@@ -129,3 +130,106 @@ def test_similarity_search_deserializes_table_chunks(
         assert orders_chunk.startswith("CREATE TABLE `orders`")
         assert "Field summary" in orders_chunk
         assert _SEPARATOR not in orders_chunk
+
+
+def _named_separated_chunk(table_name: str) -> Chunk:
+    chunk = _separated_chunk(table_name)
+    chunk.metadata["table_name"] = table_name
+    return chunk
+
+
+def _field_chunk(table_name: str, field: str) -> Chunk:
+    return Chunk(
+        content=f"{field} int",
+        metadata={"table_name": table_name, "part": "field"},
+    )
+
+
+def test_similarity_search_batches_field_search(
+    dbstruct_retriever,
+    mock_table_vector_store_connector,
+    mock_field_vector_store_connector,
+):
+    dbstruct_retriever._top_k = 2
+    mock_table_vector_store_connector.similar_search_with_scores.return_value = [
+        _named_separated_chunk("orders"),
+        _named_separated_chunk("users"),
+    ]
+    mock_field_vector_store_connector.similar_search_with_scores.return_value = [
+        _field_chunk("users", "uid"),
+        _field_chunk("orders", "oid"),
+        _field_chunk("users", "name"),
+    ]
+
+    results = dbstruct_retriever._similarity_search("query")
+
+    # One search for all the separated tables
+    search = mock_field_vector_store_connector.similar_search_with_scores
+    search.assert_called_once()
+    _, topk, _, filters = search.call_args[0]
+    assert topk == 12
+    table_filter = [f for f in filters.filters if f.key == "table_name"][0]
+    assert table_filter.operator == FilterOperator.IN
+    assert table_filter.value == ["orders", "users"]
+    assert {f.key: f.value for f in filters.filters if f.key != "table_name"} == {
+        "db_summary_version": "v1",
+        "separated": 1,
+        "part": "field",
+    }
+    assert results[0].content.startswith("CREATE TABLE `orders`")
+    assert "oid int" in results[0].content
+    assert "uid int" in results[1].content and "name int" in results[1].content
+
+
+def test_similarity_search_fields_per_table_capped(
+    dbstruct_retriever,
+    mock_table_vector_store_connector,
+    mock_field_vector_store_connector,
+):
+    dbstruct_retriever._top_k = 1
+    mock_table_vector_store_connector.similar_search_with_scores.return_value = [
+        _named_separated_chunk("orders"),
+        _named_separated_chunk("users"),
+    ]
+    search = mock_field_vector_store_connector.similar_search_with_scores
+    # The fields of users come first, the over-fetched hits still reach orders
+    search.return_value = [
+        _field_chunk("users", "uid"),
+        _field_chunk("users", "name"),
+        _field_chunk("orders", "oid"),
+    ]
+
+    results = dbstruct_retriever._similarity_search("query")
+
+    search.assert_called_once()
+    assert search.call_args[0][1] == 6
+    assert "oid int" in results[0].content
+    assert "uid int" in results[1].content and "name int" not in results[1].content
+
+
+def test_similarity_search_crowded_table_searched_alone(
+    dbstruct_retriever,
+    mock_table_vector_store_connector,
+    mock_field_vector_store_connector,
+):
+    dbstruct_retriever._top_k = 1
+    mock_table_vector_store_connector.similar_search_with_scores.return_value = [
+        _named_separated_chunk("orders"),
+        _named_separated_chunk("users"),
+    ]
+    search = mock_field_vector_store_connector.similar_search_with_scores
+    search.side_effect = [
+        # The fields of users fill all the over-fetched hits
+        [_field_chunk("users", f"u{i}") for i in range(6)],
+        [_field_chunk("orders", "oid")],
+    ]
+
+    results = dbstruct_retriever._similarity_search("query")
+
+    assert search.call_count == 2
+    filters = search.call_args[0][3]
+    assert {"key": "table_name", "value": "orders"} in [
+        {"key": f.key, "value": f.value} for f in filters.filters
+    ]
+    assert "oid int" in results[0].content
+    assert "u0 int" in results[1].content and "u1 int" not in results[1].content
@@ -1,9 +1,9 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from dbgpt.core import Chunk
-from dbgpt.rag.retriever.embedding import EmbeddingRetriever
+from dbgpt.rag.retriever.embedding import EmbeddingRetriever, merge_ranked_chunks
 
 
 @pytest.fixture
@@ -37,3 +37,43 @@ def test_retrieve(query, top_k, mock_vector_store_connector, embedding_retriever
     retrieved_chunks = embedding_retriever._retrieve(query)
 
     assert len(retrieved_chunks) == top_k
+
+
+def test_merge_ranked_chunks():
+    candidates = [
+        [Chunk(content="a", chunk_id="1", score=0.9), Chunk(content="b", score=0.5)],
+        [Chunk(content="c", score=0.8), Chunk(content="a", chunk_id="1", score=0.7)],
+        [],
+    ]
+    merged = merge_ranked_chunks(candidates)
+    assert [(c.content, c.score) for c in merged] == [
+        ("a", 0.9),
+        ("c", 0.8),
+        ("b", 0.5),
+    ]
+    assert len(merge_ranked_chunks(candidates, top_k=2)) == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_queries_retrieve_with_score():
+    rewrite = MagicMock()
+    rewrite.rewrite = AsyncMock(return_value=["rewritten query"])
+    index_store = MagicMock()
+    index_store.asimilar_search = AsyncMock(return_value=[Chunk(content="ctx")])
+    index_store.asimilar_search_batch = AsyncMock(
+        return_value=[
+            [Chunk(content="a", chunk_id="1", score=0.6)],
+            [
+                Chunk(content="b", chunk_id="2", score=0.8),
+                Chunk(content="a", chunk_id="1", score=0.6),
+            ],
+        ]
+    )
+    retriever = EmbeddingRetriever(
+        index_store=index_store, top_k=4, query_rewrite=rewrite, batch_queries=True
+    )
+    chunks = await retriever.aretrieve_with_scores("origin query", 0.3)
+    index_store.asimilar_search_batch.assert_awaited_once_with(
+        ["origin query", "rewritten query"], 4, 0.3, None
+    )
+    assert [c.content for c in chunks] == ["b", "a"]
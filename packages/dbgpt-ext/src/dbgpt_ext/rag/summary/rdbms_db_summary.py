@@ -1,6 +1,8 @@
 """Summary for rdbms database."""
 
+import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from dbgpt._private.config import Config
@@ -12,6 +14,11 @@ if TYPE_CHECKING:
 
 CFG = Config()
 
+logger = logging.getLogger(__name__)
+
+# The max threads to introspect the tables one by one
+_DEFAULT_INTROSPECTION_WORKERS = 8
+
 
 _DEFAULT_SUMMARY_TEMPLATE = """\
 table_name: {table_name}\r\n\
@@ -74,10 +81,8 @@ class RdbmsSummary(DBSummary):
             charset=self.db.get_charset(),
             collation=self.db.get_collation(),
         )
-        tables = self.db.get_table_names()
-        self.table_info_summaries = [
-            self.get_table_summary(table_name) for table_name in tables
-        ]
+        # The tables are introspected on first use
+        self._table_info_summaries: Optional[List[str]] = None
 
     def get_table_summary(self, table_name):
         """Get table summary for table.
@@ -88,6 +93,15 @@ class RdbmsSummary(DBSummary):
         """
         return _parse_table_summary(self.db, self.summary_template, table_name)
 
+    @property
+    def table_info_summaries(self) -> List[str]:
+        """Get the summaries of all the tables, introspected in bulk."""
+        if self._table_info_summaries is None:
+            self._table_info_summaries = _parse_db_summary(
+                self.db, self.summary_template
+            )
+        return self._table_info_summaries
+
     def table_summaries(self):
         """Get table summaries."""
         return self.table_info_summaries
@@ -102,9 +116,12 @@ def _parse_db_summary(
         conn (BaseConnector): database connection
         summary_template (str): summary template
     """
-    tables = conn.get_table_names()
+    tables = list(conn.get_table_names())
+    table_schemas = _introspect_tables(conn, tables)
     table_info_summaries = [
-        _parse_table_summary(conn, summary_template, table_name)
+        _parse_table_summary(
+            conn, summary_template, table_name, table_schemas[table_name]
+        )
         for table_name in tables
     ]
     return table_info_summaries
@@ -116,6 +133,8 @@ def _parse_db_summary_with_metadata(
     separator: str = "--table-field-separator--",
     column_separator: str = _DEFAULT_COLUMN_SEPARATOR,
     model_dimension: int = 512,
+    table_names: Optional[List[str]] = None,
+    table_schemas: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> List[Tuple[str, Dict[str, Any]]]:
     """Get db summary for database.
 
@@ -125,8 +144,16 @@ def _parse_db_summary_with_metadata(
         separator(str, optional): separator used to separate table's
             basic info and fields. defaults to `-- table-field-separator--`
         model_dimension(int, optional): The threshold for splitting field string
+        table_names(Optional[List[str]]): Only summarize these tables, defaults to
+            all the tables.
+        table_schemas(Optional[Dict[str, Dict[str, Any]]]): The introspected
+            schemas of the tables, see :func:`_introspect_tables`.
     """
-    tables = conn.get_table_names()
+    tables = (
+        list(table_names) if table_names is not None else list(conn.get_table_names())
+    )
+    missing = [table for table in tables if table not in (table_schemas or {})]
+    table_schemas = {**(table_schemas or {}), **_introspect_tables(conn, missing)}
     table_info_summaries = [
         _parse_table_summary_with_metadata(
             conn,
@@ -135,12 +162,93 @@ def _parse_db_summary_with_metadata(
             table_name,
             model_dimension,
             column_separator=column_separator,
+            table_schema=table_schemas[table_name],
         )
         for table_name in tables
     ]
     return table_info_summaries
 
 
+def _introspect_table(conn: BaseConnector, table_name: str) -> Dict[str, Any]:
+    """Get the columns, indexes and comment of a table."""
+    columns = [
+        {
+            "name": column["name"],
+            "type": str(column["type"]) if column.get("type") is not None else None,
+            "comment": column.get("comment"),
+        }
+        for column in conn.get_columns(table_name)
+    ]
+    indexes = conn.get_indexes(table_name)
+    try:
+        comment = conn.get_table_comment(table_name).get("text")
+    except Exception:
+        comment = None
+    return {"columns": columns, "indexes": indexes, "comment": comment}
+
+
+def _introspect_tables(
+    conn: BaseConnector,
+    table_names: List[str],
+    max_workers: int = _DEFAULT_INTROSPECTION_WORKERS,
+) -> Dict[str, Dict[str, Any]]:
+    """Get the columns, indexes and comments of the tables.
+
+    Use the bulk catalog queries of the connector if it supports them, the other
+    tables are introspected one by one in a bounded thread pool.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Key is the table name, value contains columns,
+            indexes and comment.
+    """
+    if not table_names:
+        return {}
+    schemas: Dict[str, Dict[str, Any]] = {}
+    try:
+        schemas = conn.get_table_schemas(table_names)
+    except (AttributeError, NotImplementedError):
+        pass
+    except Exception as e:
+        logger.warning(f"Bulk schema introspection failed, introspect one by one: {e}")
+    missing = [table_name for table_name in table_names if table_name not in schemas]
+    if missing:
+        logger.info(
+            f"Introspect {len(missing)} of {len(table_names)} tables one by one"
+        )
+    if len(missing) > 1 and max_workers > 1:
+        # The first table probes the schema version and reloads the stale metadata
+        # of the connector before the workers share it
+        schemas[missing[0]] = _introspect_table(conn, missing[0])
+        rest = missing[1:]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(rest))) as pool:
+            results = pool.map(
+                lambda table_name: _introspect_table(conn, table_name), rest
+            )
+            schemas.update(zip(rest, results))
+    else:
+        schemas.update(
+            {table_name: _introspect_table(conn, table_name) for table_name in missing}
+        )
+    return {table_name: schemas[table_name] for table_name in table_names}
+
+
+def _format_index_keys(raw_indexes: List[Any]) -> List[str]:
+    """Format the indexes of a table."""
+    index_keys = []
+    for index in raw_indexes:
+        if isinstance(index, tuple):  # Process tuple type index information
+            index_name, index_creation_command = index
+            # Extract column names using re
+            matched_columns = re.findall(r"\(([^)]+)\)", index_creation_command)
+            if matched_columns:
+                key_str = ", ".join(matched_columns)
+                index_keys.append(f"{index_name}(`{key_str}`) ")
+        else:
+            key_str = ", ".join(index["column_names"])
+            index_keys.append(f"{index['name']}(`{key_str}`) ")
+    return index_keys
+
+
 def _split_columns_str(
     columns: List[str], model_dimension: int, column_separator: str = ",\r\n    "
 ):
@@ -186,6 +294,7 @@ def _parse_table_summary_with_metadata(
     model_dimension=512,
     column_separator: str = _DEFAULT_COLUMN_SEPARATOR,
     db_summary_version: str = "v1.0",
+    table_schema: Optional[Dict[str, Any]] = None,
 ) -> Tuple[str, Dict[str, Any]]:
     """Get table summary for table.
 
@@ -195,6 +304,8 @@ def _parse_table_summary_with_metadata(
         separator(str, optional): separator used to separate table's
             basic info and fields. defaults to `-- table-field-separator--`
         model_dimension(int, optional): The threshold for splitting field string
+        table_schema(Optional[Dict[str, Any]]): The introspected schema of the
+            table, it is introspected if not provided.
 
     Examples:
         metadata: {'table_name': 'asd', 'separated': 0/1}
@@ -206,15 +317,17 @@ def _parse_table_summary_with_metadata(
         (column1,comment), (column2, comment), (column3, comment)
         (column4,comment), (column5, comment), (column6, comment)
     """
+    if table_schema is None:
+        table_schema = _introspect_table(conn, table_name)
     columns = []
     metadata = {
         "table_name": table_name,
         "separated": 0,
         "db_summary_version": db_summary_version,
     }
-    for column in conn.get_columns(table_name):
+    for column in table_schema["columns"]:
         col_name = column["name"]
-        col_type = str(column["type"]) if "type" in column else None
+        col_type = column.get("type") or ""
         col_comment = column.get("comment")
         column_def = f'"{col_name}" {col_type.upper()}'
         if col_comment:
@@ -228,27 +341,8 @@ def _parse_table_summary_with_metadata(
         metadata["separated"] = 1
     column_str = column_separator.join(separated_columns)
     # Obtain index information
-    index_keys = []
-    raw_indexes = conn.get_indexes(table_name)
-    for index in raw_indexes:
-        if isinstance(index, tuple):  # Process tuple type index information
-            index_name, index_creation_command = index
-            # Extract column names using re
-            matched_columns = re.findall(r"\(([^)]+)\)", index_creation_command)
-            if matched_columns:
-                key_str = ", ".join(matched_columns)
-                index_keys.append(f"{index_name}(`{key_str}`) ")
-        else:
-            key_str = ", ".join(index["column_names"])
-            index_keys.append(f"{index['name']}(`{key_str}`) ")
-
-    table_comment = ""
-
-    try:
-        comment = conn.get_table_comment(table_name)
-        table_comment = comment.get("text")
-    except Exception:
-        pass
+    index_keys = _format_index_keys(table_schema["indexes"])
+    table_comment = table_schema.get("comment")
 
     index_key_str = ", ".join(index_keys)
     table_str = summary_template.format(
@@ -259,7 +353,10 @@ def _parse_table_summary_with_metadata(
 
 
 def _parse_table_summary(
-    conn: BaseConnector, summary_template: str, table_name: str
+    conn: BaseConnector,
+    summary_template: str,
+    table_name: str,
+    table_schema: Optional[Dict[str, Any]] = None,
 ) -> str:
     """Get table summary for table.
 
@@ -267,13 +364,17 @@ def _parse_table_summary(
         conn (BaseConnector): database connection
         summary_template (str): summary template
         table_name (str): table name
+        table_schema (Optional[Dict[str, Any]]): The introspected schema of the
+            table, it is introspected if not provided.
 
     Examples:
         table_name(column1(column1 comment),column2(column2 comment),
         column3(column3 comment) and index keys, and table comment: {table_comment})
     """
+    if table_schema is None:
+        table_schema = _introspect_table(conn, table_name)
     columns = []
-    for column in conn.get_columns(table_name):
+    for column in table_schema["columns"]:
         if column.get("comment"):
             columns.append(f"{column['name']} ({column.get('comment')})")
         else:
@@ -281,27 +382,11 @@ def _parse_table_summary(
 
     column_str = ", ".join(columns)
     # Obtain index information
-    index_keys = []
-    raw_indexes = conn.get_indexes(table_name)
-    for index in raw_indexes:
-        if isinstance(index, tuple):  # Process tuple type index information
-            index_name, index_creation_command = index
-            # Extract column names using re
-            matched_columns = re.findall(r"\(([^)]+)\)", index_creation_command)
-            if matched_columns:
-                key_str = ", ".join(matched_columns)
-                index_keys.append(f"{index_name}(`{key_str}`) ")
-        else:
-            key_str = ", ".join(index["column_names"])
-            index_keys.append(f"{index['name']}(`{key_str}`) ")
+    index_keys = _format_index_keys(table_schema["indexes"])
     table_str = summary_template.format(table_name=table_name, columns=column_str)
     if len(index_keys) > 0:
         index_key_str = ", ".join(index_keys)
         table_str += f", and index keys: {index_key_str}"
-    try:
-        comment = conn.get_table_comment(table_name)
-    except Exception:
-        comment = dict(text=None)
-    if comment.get("text"):
-        table_str += f", and table comment: {comment.get('text')}"
+    if table_schema.get("comment"):
+        table_str += f", and table comment: {table_schema['comment']}"
     return table_str
@@ -0,0 +1,140 @@
+"""Schema snapshot of a database.
+
+The snapshot keeps the DDL fingerprint and the vector ids of every table of a
+database profile, so a refresh only re-summarises and re-embeds the tables whose
+fingerprint changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump it when the summary format changes, the old snapshots are discarded
+SCHEMA_SNAPSHOT_VERSION = 1
+
+
+def schema_fingerprint(table_schema: Dict[str, Any]) -> str:
+    """Return the fingerprint of the introspected schema of a table.
+
+    Args:
+        table_schema (Dict[str, Any]): The columns, indexes and comment of the
+            table, see :func:`_introspect_tables`.
+    """
+    content = json.dumps(table_schema, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class SchemaSnapshot:
+    """The versioned schema snapshot of a database profile.
+
+    Example:
+        .. code-block:: python
+
+            snapshot = SchemaSnapshot.load(path, params_key="512")
+            changed, removed = snapshot.diff(fingerprints)
+    """
+
+    def __init__(
+        self,
+        db_name: str,
+        params_key: str = "",
+        tables: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """Create a new SchemaSnapshot.
+
+        Args:
+            db_name (str): The database name.
+            params_key (str): The summary parameters of the profile, a snapshot
+                built with other parameters is not reused.
+            tables (Optional[Dict[str, Dict[str, Any]]]): The table entries, key is
+                the table name, value contains fingerprint, table_ids and
+                field_ids.
+        """
+        self.db_name = db_name
+        self.params_key = params_key
+        self.tables: Dict[str, Dict[str, Any]] = tables or {}
+
+    @classmethod
+    def load(cls, path: str, params_key: str = "") -> Optional["SchemaSnapshot"]:
+        """Load the snapshot, None if it is missing, broken or out of date."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignore the broken schema snapshot {path}: {e}")
+            return None
+        if (
+            data.get("version") != SCHEMA_SNAPSHOT_VERSION
+            or data.get("params_key") != params_key
+        ):
+            return None
+        return cls(data["db_name"], params_key, data.get("tables"))
+
+    def save(self, path: str) -> None:
+        """Save the snapshot, the old one is replaced atomically."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": SCHEMA_SNAPSHOT_VERSION,
+                    "db_name": self.db_name,
+                    "params_key": self.params_key,
+                    "tables": self.tables,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+
+    def diff(self, fingerprints: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """Compare the current fingerprints with the snapshot.
+
+        Returns:
+            Tuple[List[str], List[str]]: The new or changed tables, and the tables
+                dropped from the database.
+        """
+        changed = [
+            table_name
+            for table_name, fingerprint in fingerprints.items()
+            if self.tables.get(table_name, {}).get("fingerprint") != fingerprint
+        ]
+        removed = [
+            table_name for table_name in self.tables if table_name not in fingerprints
+        ]
+        return changed, removed
+
+    def vector_ids(self, table_names: List[str]) -> Tuple[List[str], List[str]]:
+        """Return the table and field vector ids of the tables."""
+        table_ids: List[str] = []
+        field_ids: List[str] = []
+        for table_name in table_names:
+            entry = self.tables.get(table_name)
+            if entry:
+                table_ids.extend(entry.get("table_ids", []))
+                field_ids.extend(entry.get("field_ids", []))
+        return table_ids, field_ids
+
+    def set_table(
+        self,
+        table_name: str,
+        fingerprint: str,
+        table_ids: List[str],
+        field_ids: List[str],
+    ) -> None:
+        """Record the fingerprint and vector ids of a table."""
+        self.tables[table_name] = {
+            "fingerprint": fingerprint,
+            "table_ids": table_ids,
+            "field_ids": field_ids,
+        }
+
+    def remove_table(self, table_name: str) -> None:
+        """Remove a table from the snapshot."""
+        self.tables.pop(table_name, None)
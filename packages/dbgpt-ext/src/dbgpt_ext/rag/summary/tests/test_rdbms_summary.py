@@ -1,7 +1,11 @@
 import unittest
 from unittest.mock import Mock
 
-from ...summary.rdbms_db_summary import RdbmsSummary
+from ...summary.rdbms_db_summary import (
+    RdbmsSummary,
+    _introspect_tables,
+    _parse_db_summary_with_metadata,
+)
 
 
 class MockRDBMSConnector(object):
@@ -32,6 +36,29 @@ class MockRDBMSConnector(object):
         return {"text": f"{table_name} comment"}
 
 
+class MockBulkRDBMSConnector(MockRDBMSConnector):
+    def __init__(self):
+        self.bulk_calls = []
+
+    def get_table_schemas(self, table_names):
+        self.bulk_calls.append(list(table_names))
+        # The catalog misses table2, it is introspected one by one
+        return {
+            "table1": {
+                "columns": [
+                    {"name": "column1", "type": "INT", "comment": "first column"},
+                    {"name": "column2", "type": "TEXT", "comment": None},
+                ],
+                "indexes": [{"name": "index1", "column_names": ["column1"]}],
+                "comment": "table1 comment",
+            }
+        }
+
+    def get_columns(self, table_name):
+        assert table_name != "table1"
+        return super().get_columns(table_name)
+
+
 class TestRdbmsSummary(unittest.TestCase):
     def setUp(self):
         self.mock_local_db_manage = Mock()
@@ -62,6 +89,50 @@ class TestRdbmsSummary(unittest.TestCase):
             "table2 comment" in summaries
         )
 
+    def test_table_summaries_are_lazy(self):
+        connector = MockBulkRDBMSConnector()
+        self.mock_local_db_manage.get_connector.return_value = connector
+        rdbms_summary = RdbmsSummary(
+            name="test_db", type="test_type", manager=self.mock_local_db_manage
+        )
+        self.assertEqual(connector.bulk_calls, [])
+        summaries = rdbms_summary.table_summaries()
+        self.assertEqual(connector.bulk_calls, [["table1", "table2"]])
+        self.assertEqual(
+            summaries,
+            [
+                "table1(column1 (first column), column2), and index keys: "
+                "index1(`column1`) , and table comment: table1 comment",
+                "table2(column1), and index keys: index1(`column1`) , and table "
+                "comment: table2 comment",
+            ],
+        )
+        rdbms_summary.table_summaries()
+        self.assertEqual(len(connector.bulk_calls), 1)
+
+    def test_introspect_tables_fallback(self):
+        connector = MockRDBMSConnector()
+        schemas = _introspect_tables(connector, ["table2", "table1"], max_workers=4)
+        self.assertEqual(list(schemas), ["table2", "table1"])
+        self.assertEqual(
+            schemas["table1"],
+            {
+                "columns": [
+                    {"name": "column1", "type": None, "comment": "first column"},
+                    {"name": "column2", "type": None, "comment": None},
+                ],
+                "indexes": [{"name": "index1", "column_names": ["column1"]}],
+                "comment": "table1 comment",
+            },
+        )
+
+    def test_summary_with_metadata_of_some_tables(self):
+        connector = MockBulkRDBMSConnector()
+        summaries = _parse_db_summary_with_metadata(connector, table_names=["table1"])
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(summaries[0][1]["table_name"], "table1")
+        self.assertIn('"column1" INT COMMENT "first column"', summaries[0][0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,48 @@
+from ..schema_snapshot import SchemaSnapshot, schema_fingerprint
+
+
+def _schema(column_type="INT"):
+    return {
+        "columns": [{"name": "id", "type": column_type, "comment": None}],
+        "indexes": [],
+        "comment": None,
+    }
+
+
+def test_schema_fingerprint():
+    assert schema_fingerprint(_schema()) == schema_fingerprint(_schema())
+    assert schema_fingerprint(_schema()) != schema_fingerprint(_schema("BIGINT"))
+
+
+def test_snapshot_diff():
+    snapshot = SchemaSnapshot("db")
+    snapshot.set_table("a", "fa", ["ta"], ["fa1", "fa2"])
+    snapshot.set_table("b", "fb", ["tb"], [])
+    snapshot.set_table("c", "fc", ["tc"], [])
+
+    changed, removed = snapshot.diff({"a": "fa", "b": "fb2", "d": "fd"})
+    assert changed == ["b", "d"]
+    assert removed == ["c"]
+    assert snapshot.vector_ids(["a", "c", "d"]) == (["ta", "tc"], ["fa1", "fa2"])
+
+    snapshot.remove_table("c")
+    assert list(snapshot.tables) == ["a", "b"]
+
+
+def test_snapshot_save_and_load(tmp_path):
+    path = str(tmp_path / "snapshot" / "db.json")
+    assert SchemaSnapshot.load(path) is None
+
+    snapshot = SchemaSnapshot("db", params_key="512:text2vec")
+    snapshot.set_table("a", "fa", ["ta"], ["fa1"])
+    snapshot.save(path)
+
+    loaded = SchemaSnapshot.load(path, params_key="512:text2vec")
+    assert loaded.db_name == "db"
+    assert loaded.tables == snapshot.tables
+    # Built with other summary parameters
+    assert SchemaSnapshot.load(path, params_key="1024:text2vec") is None
+
+    with open(path, "w") as f:
+        f.write("{broken")
+    assert SchemaSnapshot.load(path, params_key="512:text2vec") is None
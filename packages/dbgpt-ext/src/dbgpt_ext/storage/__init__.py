@@ -106,6 +106,15 @@ def _import_full_text() -> Tuple[Type, Type]:
     return ElasticDocumentStore, ElasticsearchStoreConfig
 
 
+def _import_local_full_text() -> Tuple[Type, Type]:
+    from dbgpt_ext.storage.full_text.local_store import (
+        LocalDocumentStore,
+        LocalFullTextConfig,
+    )
+
+    return LocalDocumentStore, LocalFullTextConfig
+
+
 def _select_rag_storage(name: str) -> Tuple[Type, Type]:
     if name == "Chroma":
         return _import_chroma()
@@ -131,6 +140,8 @@ def _select_rag_storage(name: str) -> Tuple[Type, Type]:
         return _import_openspg()
     elif name == "FullText":
         return _import_full_text()
+    elif name == "LocalFullText":
+        return _import_local_full_text()
     else:
         raise AttributeError(f"Could not find: {name}")
 
@@ -0,0 +1,567 @@
+"""Local full text store, an embedded BM25 inverted index.
+
+It needs no search service, the index of every store is kept in memory and
+persisted to a directory:
+
+- ``segment.docs``: the documents (chunk id, content, metadata and length).
+- ``segment.lexicon``: the terms with the offset, length and document frequency
+  of their posting lists.
+- ``segment.postings``: the posting lists, the delta encoded document numbers and
+  the term frequencies as varints.
+- ``wal.jsonl``: the documents added and deleted after the segment is written, it
+  is merged into the segment when it is large enough.
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+from array import array
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import msgpack
+
+from dbgpt.configs.model_config import DATA_DIR
+from dbgpt.core import Chunk
+from dbgpt.storage.base import IndexStoreConfig
+from dbgpt.storage.full_text.base import FullTextStoreBase
+from dbgpt.storage.vector_store.filters import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+from dbgpt.util import string_utils
+from dbgpt.util.executor_utils import blocking_func_to_async
+from dbgpt.util.i18n_utils import _
+
+logger = logging.getLogger(__name__)
+
+_CJK_RANGES = (
+    "぀-ヿ"  # Hiragana and Katakana
+    "㐀-䶿"  # CJK Extension A
+    "一-鿿"  # CJK Unified Ideographs
+    "豈-﫿"  # CJK Compatibility Ideographs
+    "가-힯"  # Hangul Syllables
+)
+_TOKEN_PATTERN = re.compile(
+    rf"(?P<cjk>[{_CJK_RANGES}]+)|(?P<word>[^\W{_CJK_RANGES}]+)", re.UNICODE
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split the text to terms.
+
+    The words are lowercased, the runs of CJK characters are split to the single
+    characters and the bigrams of them, so both the single character queries and
+    the phrase queries match.
+
+    Examples:
+        .. code-block:: python
+
+            tokenize("DB-GPT 数据库")
+            # ['db', 'gpt', '数', '数据', '据', '据库', '库']
+    """
+    terms = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        cjk = match.group("cjk")
+        if not cjk:
+            terms.append(match.group("word"))
+            continue
+        for i, char in enumerate(cjk):
+            terms.append(char)
+            if i + 1 < len(cjk):
+                terms.append(cjk[i : i + 2])
+    return terms
+
+
+def _encode_varints(values: Iterable[int], out: bytearray) -> None:
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def _decode_varints(data: bytes) -> List[int]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+@dataclass
+class LocalFullTextConfig(IndexStoreConfig):
+    """The config of the local full text store."""
+
+    persist_path: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The directory of the full text indexes, default is "
+                "'pilot/data/full_text'"
+            ),
+        },
+    )
+    k1: float = field(
+        default=2.0,
+        metadata={
+            "help": _("The term frequency saturation of BM25, default is 2.0"),
+        },
+    )
+    b: float = field(
+        default=0.75,
+        metadata={
+            "help": _(
+                "How much the document length normalizes the term frequency, "
+                "default is 0.75"
+            ),
+        },
+    )
+    compact_threshold: int = field(
+        default=10000,
+        metadata={
+            "help": _(
+                "Merge the write ahead log into the index segment when it has so "
+                "many operations, default is 10000"
+            ),
+        },
+    )
+
+    def create_store(self, **kwargs) -> "LocalDocumentStore":
+        """Create the local full text store."""
+        return LocalDocumentStore(self, **kwargs)
+
+
+@dataclass
+class _Doc:
+    chunk_id: str
+    content: str
+    metadata: Dict[str, Any]
+    length: int
+
+
+class LocalDocumentStore(FullTextStoreBase):
+    """Local full text store, a drop-in of ElasticDocumentStore.
+
+    The documents are scored by BM25 like Elasticsearch:
+    ``idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))``, with
+    ``idf = ln(1 + (N - df + 0.5) / (df + 0.5))``.
+
+    Examples:
+        .. code-block:: python
+
+            store = LocalDocumentStore(
+                LocalFullTextConfig(persist_path="/tmp/full_text"), name="my_space"
+            )
+            store.load_document(chunks)
+            store.similar_search_with_scores("what is AWEL", top_k=5)
+    """
+
+    def __init__(
+        self,
+        config: Optional[LocalFullTextConfig] = None,
+        name: Optional[str] = "dbgpt",
+        k1: Optional[float] = None,
+        b: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """Create a local full text store.
+
+        Args:
+            config (Optional[LocalFullTextConfig]): The config.
+            name (Optional[str]): The index name.
+            k1 (Optional[float]): The term frequency saturation, overrides the one
+                of the config.
+            b (Optional[float]): The document length normalization, overrides the
+                one of the config.
+            executor (Optional[Executor]): The executor of the async methods.
+        """
+        super().__init__(executor)
+        self._config = config or LocalFullTextConfig()
+        self._k1 = k1 or self._config.k1
+        self._b = b if b is not None else self._config.b
+        name = name or "dbgpt"
+        self._index_name = name.lower()
+        if string_utils.contains_chinese(name):
+            self._index_name = "dbgpt_" + name.encode("utf-8").hex()
+        self._index_name = re.sub(r"[^a-z0-9_\-.]", "_", self._index_name)
+        persist_path = self._config.persist_path or os.path.join(DATA_DIR, "full_text")
+        self._index_dir = os.path.join(persist_path, self._index_name)
+        self._executor = executor or ThreadPoolExecutor()
+        self._lock = threading.RLock()
+        self._reset()
+        self._load()
+
+    def get_config(self) -> LocalFullTextConfig:
+        """Get the config."""
+        return self._config
+
+    def is_support_full_text_search(self) -> bool:
+        """Support full text search."""
+        return True
+
+    def load_document(self, chunks: List[Chunk]) -> List[str]:
+        """Add the chunks to the index, the chunks with the same id are replaced."""
+        records = [
+            {
+                "op": "add",
+                "id": chunk.chunk_id,
+                "content": chunk.content,
+                "metadata": _normalize_metadata(chunk.metadata),
+            }
+            for chunk in chunks
+        ]
+        with self._lock:
+            for record in records:
+                self._add(record["id"], record["content"], record["metadata"])
+            self._append_wal(records)
+        return [chunk.chunk_id for chunk in chunks]
+
+    async def aload_document(
+        self, chunks: List[Chunk], file_id: Optional[str] = None
+    ) -> List[str]:
+        """Async add the chunks to the index."""
+        if file_id:
+            for chunk in chunks:
+                chunk.metadata["file_id"] = file_id
+        return await blocking_func_to_async(self._executor, self.load_document, chunks)
+
+    def similar_search(
+        self, text: str, topk: int, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        """Search the chunks matching the text."""
+        return self.similar_search_with_scores(text, topk, 0.0, filters)
+
+    def similar_search_with_scores(
+        self,
+        text,
+        top_k: int = 10,
+        score_threshold: float = 0.3,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search the chunks matching the text, with their BM25 scores.
+
+        Args:
+            text(str): The query text.
+            top_k(int): The number of the chunks to return.
+            score_threshold(float): The min BM25 score.
+            filters(MetadataFilters): The metadata filters.
+        """
+        terms = tokenize(text)
+        with self._lock:
+            scores = self._score(terms)
+            if filters and filters.filters:
+                scores = {
+                    doc_num: score
+                    for doc_num, score in scores.items()
+                    if _match_filters(self._docs[doc_num].metadata, filters)  # type: ignore
+                }
+            top = heapq.nlargest(top_k, scores.items(), key=lambda x: x[1])
+            chunks = []
+            for doc_num, score in top:
+                if score_threshold is not None and score < score_threshold:
+                    continue
+                doc = self._docs[doc_num]
+                chunks.append(
+                    Chunk(
+                        chunk_id=doc.chunk_id,  # type: ignore
+                        content=doc.content,  # type: ignore
+                        metadata=dict(doc.metadata),  # type: ignore
+                        score=score,
+                    )
+                )
+        if score_threshold is not None and not chunks:
+            logger.warning(
+                "No relevant docs were retrieved using the relevance score"
+                f" threshold {score_threshold}"
+            )
+        return chunks
+
+    def full_text_search(
+        self, text: str, topk: int, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        """Full text search."""
+        return self.similar_search_with_scores(text, topk, 0.0, filters)
+
+    def delete_by_ids(self, ids: str) -> List[str]:
+        """Delete the chunks by ids.
+
+        Args:
+            ids(str): The chunk ids separated by comma.
+        """
+        id_list = [i for i in ids.split(",") if i]
+        with self._lock:
+            for chunk_id in id_list:
+                self._delete(chunk_id)
+            self._append_wal([{"op": "delete", "ids": id_list}])
+        return id_list
+
+    def delete_vector_name(self, index_name: str):
+        """Delete the index."""
+        with self._lock:
+            self._reset()
+            for file_name in self._files().values():
+                if os.path.exists(file_name):
+                    os.remove(file_name)
+        return True
+
+    def truncate(self) -> List[str]:
+        """Delete all the chunks."""
+        with self._lock:
+            ids = [doc.chunk_id for doc in self._docs if doc]
+            self.delete_vector_name(self._index_name)
+        return ids
+
+    def vector_name_exists(self) -> bool:
+        """Whether the index has any chunk."""
+        return self._live_count > 0
+
+    def compact(self) -> None:
+        """Merge the write ahead log into a new segment.
+
+        The deleted documents are dropped and the documents are renumbered.
+        """
+        with self._lock:
+            live = [i for i, doc in enumerate(self._docs) if doc]
+            remap = {old: new for new, old in enumerate(live)}
+            postings: Dict[str, Tuple[array, array]] = {}
+            for term, (doc_nums, tfs) in self._postings.items():
+                new_docs, new_tfs = array("I"), array("I")
+                for doc_num, tf in zip(doc_nums, tfs):
+                    new_num = remap.get(doc_num)
+                    if new_num is not None:
+                        new_docs.append(new_num)
+                        new_tfs.append(tf)
+                if new_docs:
+                    postings[term] = (new_docs, new_tfs)
+            self._docs = [self._docs[i] for i in live]
+            self._id_to_doc = {
+                doc.chunk_id: i
+                for i, doc in enumerate(self._docs)  # type: ignore
+            }
+            self._postings = postings
+            self._write_segment()
+            self._wal_ops = 0
+
+    def _reset(self) -> None:
+        self._docs: List[Optional[_Doc]] = []
+        self._id_to_doc: Dict[str, int] = {}
+        # term -> (document numbers, term frequencies), document numbers ascending
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        # The document frequency of the live documents
+        self._df: Dict[str, int] = {}
+        self._total_length = 0
+        self._live_count = 0
+        self._wal_ops = 0
+
+    def _add(self, chunk_id: str, content: str, metadata: Dict[str, Any]) -> None:
+        if chunk_id in self._id_to_doc:
+            self._delete(chunk_id)
+        terms = tokenize(content)
+        doc_num = len(self._docs)
+        self._docs.append(_Doc(chunk_id, content, metadata, len(terms)))
+        self._id_to_doc[chunk_id] = doc_num
+        self._total_length += len(terms)
+        self._live_count += 1
+        freqs: Dict[str, int] = {}
+        for term in terms:
+            freqs[term] = freqs.get(term, 0) + 1
+        for term, tf in freqs.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = (array("I"), array("I"))
+                self._postings[term] = posting
+            posting[0].append(doc_num)
+            posting[1].append(tf)
+            self._df[term] = self._df.get(term, 0) + 1
+
+    def _delete(self, chunk_id: str) -> None:
+        doc_num = self._id_to_doc.pop(chunk_id, None)
+        if doc_num is None:
+            return
+        doc = self._docs[doc_num]
+        self._docs[doc_num] = None
+        self._total_length -= doc.length  # type: ignore
+        self._live_count -= 1
+        for term in set(tokenize(doc.content)):  # type: ignore
+            df = self._df.get(term, 0) - 1
+            if df > 0:
+                self._df[term] = df
+            else:
+                self._df.pop(term, None)
+        # The postings of the deleted documents are dropped by the compaction
+
+    def _score(self, terms: List[str]) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        if not self._live_count:
+            return scores
+        avg_length = self._total_length / self._live_count
+        k1, b = self._k1, self._b
+        for term in terms:
+            df = self._df.get(term)
+            if not df:
+                continue
+            idf = math.log(1 + (self._live_count - df + 0.5) / (df + 0.5))
+            doc_nums, tfs = self._postings[term]
+            for doc_num, tf in zip(doc_nums, tfs):
+                doc = self._docs[doc_num]
+                if doc is None:
+                    continue
+                norm = k1 * (1 - b + b * doc.length / avg_length)
+                scores[doc_num] = scores.get(doc_num, 0.0) + idf * tf * (k1 + 1) / (
+                    tf + norm
+                )
+        return scores
+
+    def _files(self) -> Dict[str, str]:
+        files = {
+            name: os.path.join(self._index_dir, name)
+            for name in ("segment.docs", "segment.lexicon", "segment.postings")
+        }
+        files["wal"] = os.path.join(self._index_dir, "wal.jsonl")
+        return files
+
+    def _write_segment(self) -> None:
+        files = self._files()
+        os.makedirs(self._index_dir, exist_ok=True)
+        postings = bytearray()
+        lexicon = {}
+        for term, (doc_nums, tfs) in self._postings.items():
+            offset = len(postings)
+            values = []
+            last = 0
+            for doc_num, tf in zip(doc_nums, tfs):
+                values.append(doc_num - last)
+                values.append(tf)
+                last = doc_num
+            _encode_varints(values, postings)
+            lexicon[term] = (offset, len(postings) - offset)
+        docs = [
+            (doc.chunk_id, doc.content, doc.metadata, doc.length)
+            for doc in self._docs  # type: ignore
+        ]
+        for name, data in (
+            ("segment.docs", msgpack.packb(docs)),
+            ("segment.lexicon", msgpack.packb(lexicon)),
+            ("segment.postings", bytes(postings)),
+        ):
+            tmp_file = files[name] + ".tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(data)
+            os.replace(tmp_file, files[name])
+        # The log is merged into the segment
+        with open(files["wal"], "w", encoding="utf-8"):
+            pass
+
+    def _append_wal(self, records: List[Dict[str, Any]]) -> None:
+        os.makedirs(self._index_dir, exist_ok=True)
+        with open(self._files()["wal"], "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._wal_ops += len(records)
+        if self._wal_ops >= self._config.compact_threshold:
+            self.compact()
+
+    def _load(self) -> None:
+        files = self._files()
+        if os.path.exists(files["segment.docs"]):
+            with open(files["segment.docs"], "rb") as f:
+                docs = msgpack.unpackb(f.read(), strict_map_key=False)
+            with open(files["segment.lexicon"], "rb") as f:
+                lexicon = msgpack.unpackb(f.read())
+            with open(files["segment.postings"], "rb") as f:
+                postings = f.read()
+            for chunk_id, content, metadata, length in docs:
+                self._id_to_doc[chunk_id] = len(self._docs)
+                self._docs.append(_Doc(chunk_id, content, metadata, length))
+                self._total_length += length
+            self._live_count = len(self._docs)
+            for term, (offset, size) in lexicon.items():
+                values = _decode_varints(postings[offset : offset + size])
+                doc_nums, tfs = array("I"), array("I")
+                last = 0
+                for i in range(0, len(values), 2):
+                    last += values[i]
+                    doc_nums.append(last)
+                    tfs.append(values[i + 1])
+                self._postings[term] = (doc_nums, tfs)
+                self._df[term] = len(doc_nums)
+        if os.path.exists(files["wal"]):
+            with open(files["wal"], encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # The last record may be written partially
+                        logger.warning(f"Skip a broken record in {files['wal']}")
+                        continue
+                    if record["op"] == "add":
+                        self._add(record["id"], record["content"], record["metadata"])
+                    else:
+                        for chunk_id in record["ids"]:
+                            self._delete(chunk_id)
+                    self._wal_ops += 1
+
+
+def _normalize_metadata(metadata: Any) -> Dict[str, Any]:
+    if metadata is None:
+        return {}
+    if isinstance(metadata, dict):
+        return metadata
+    if isinstance(metadata, str):
+        try:
+            return json.loads(metadata)
+        except Exception:
+            return {"value": metadata}
+    try:
+        return dict(metadata)
+    except Exception:
+        return {"value": metadata}
+
+
+def _match_filter(metadata: Dict[str, Any], f: MetadataFilter) -> bool:
+    if f.operator == FilterOperator.EXISTS:
+        return f.key in metadata
+    if f.key not in metadata:
+        return f.operator in (FilterOperator.NE, FilterOperator.NIN)
+    value = metadata[f.key]
+    try:
+        if f.operator == FilterOperator.EQ:
+            return value == f.value
+        if f.operator == FilterOperator.NE:
+            return value != f.value
+        if f.operator == FilterOperator.GT:
+            return value > f.value
+        if f.operator == FilterOperator.GTE:
+            return value >= f.value
+        if f.operator == FilterOperator.LT:
+            return value < f.value
+        if f.operator == FilterOperator.LTE:
+            return value <= f.value
+        if f.operator == FilterOperator.IN:
+            return value in (f.value if isinstance(f.value, list) else [f.value])
+        if f.operator == FilterOperator.NIN:
+            return value not in (f.value if isinstance(f.value, list) else [f.value])
+    except TypeError:
+        # Not comparable
+        return False
+    return False
+
+
+def _match_filters(metadata: Dict[str, Any], filters: MetadataFilters) -> bool:
+    matches = (_match_filter(metadata, f) for f in filters.filters)
+    if filters.condition == FilterCondition.OR:
+        return any(matches)
+    return all(matches)
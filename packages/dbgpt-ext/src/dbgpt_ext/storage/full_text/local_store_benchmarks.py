@@ -0,0 +1,153 @@
+"""Benchmark the local full text store against Elasticsearch.
+
+It indexes a synthetic corpus (the words follow a Zipf distribution, some chunks
+are Chinese) and runs the same queries against :class:`LocalDocumentStore` and,
+when ``--es_host`` is provided, :class:`ElasticDocumentStore`, then reports the
+index throughput, the query latency and the overlap of the top results.
+
+Usage:
+
+.. code-block:: shell
+
+    python -m dbgpt_ext.storage.full_text.local_store_benchmarks \\
+        --num_chunks 20000 --num_queries 500 --es_host 127.0.0.1
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from dbgpt.core import Chunk
+from dbgpt.storage.full_text.base import FullTextStoreBase
+
+_CJK_WORDS = ["数据", "知识库", "模型", "检索", "向量", "工作流", "智能体", "查询"]
+
+
+def _corpus(num_chunks: int, vocab_size: int, chunk_words: int) -> List[Chunk]:
+    rnd = random.Random(42)
+    vocab = [f"w{i}" for i in range(vocab_size)]
+    weights = [1.0 / (i + 1) for i in range(vocab_size)]
+    chunks = []
+    for i in range(num_chunks):
+        if i % 10 == 0:
+            words = rnd.choices(_CJK_WORDS, k=chunk_words // 2)
+            content = "".join(words)
+        else:
+            content = " ".join(rnd.choices(vocab, weights=weights, k=chunk_words))
+        chunks.append(Chunk(chunk_id=str(i), content=content, metadata={"n": i % 100}))
+    return chunks
+
+
+def _queries(num_queries: int, vocab_size: int) -> List[str]:
+    rnd = random.Random(7)
+    queries = []
+    for i in range(num_queries):
+        if i % 10 == 0:
+            queries.append(rnd.choice(_CJK_WORDS))
+        else:
+            words = [f"w{rnd.randint(0, vocab_size // 10)}" for _ in range(3)]
+            queries.append(" ".join(words))
+    return queries
+
+
+def _run(
+    store: FullTextStoreBase, chunks: List[Chunk], queries: List[str], top_k: int
+) -> Dict:
+    start = time.perf_counter()
+    for i in range(0, len(chunks), 1000):
+        store.load_document(chunks[i : i + 1000])
+    index_time = time.perf_counter() - start
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        found = store.similar_search_with_scores(query, top_k, 0.0)
+        latencies.append(time.perf_counter() - start)
+        results.append([c.chunk_id for c in found])
+    latencies.sort()
+    return {
+        "index_docs_per_s": len(chunks) / index_time,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "results": results,
+    }
+
+
+def run_benchmarks(
+    num_chunks: int,
+    num_queries: int,
+    top_k: int = 10,
+    vocab_size: int = 50000,
+    chunk_words: int = 100,
+    es_host: Optional[str] = None,
+    es_port: int = 9200,
+) -> Dict[str, Dict]:
+    """Run the benchmarks.
+
+    Returns:
+        Dict[str, Dict]: The report of every store.
+    """
+    from dbgpt_ext.storage.full_text.local_store import (
+        LocalDocumentStore,
+        LocalFullTextConfig,
+    )
+
+    chunks = _corpus(num_chunks, vocab_size, chunk_words)
+    queries = _queries(num_queries, vocab_size)
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalDocumentStore(
+            LocalFullTextConfig(persist_path=tmp_dir), name="bm25_benchmark"
+        )
+        report["local"] = _run(store, chunks, queries, top_k)
+    if es_host:
+        from dbgpt_ext.storage.full_text.elasticsearch import ElasticDocumentStore
+        from dbgpt_ext.storage.vector_store.elastic_store import (
+            ElasticsearchStoreConfig,
+        )
+
+        es_store = ElasticDocumentStore(
+            ElasticsearchStoreConfig(uri=es_host, port=str(es_port)),
+            name="bm25_benchmark",
+        )
+        try:
+            report["elasticsearch"] = _run(es_store, chunks, queries, top_k)
+        finally:
+            es_store.delete_vector_name("bm25_benchmark")
+        overlaps = [
+            len(set(a) & set(b)) / max(1, len(b))
+            for a, b in zip(
+                report["local"]["results"], report["elasticsearch"]["results"]
+            )
+        ]
+        report["elasticsearch"]["top_k_overlap"] = statistics.mean(overlaps)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_chunks", type=int, default=20000)
+    parser.add_argument("--num_queries", type=int, default=500)
+    parser.add_argument("--top_k", type=int, default=10)
+    parser.add_argument("--es_host", type=str, default=None)
+    parser.add_argument("--es_port", type=int, default=9200)
+    args = parser.parse_args()
+
+    result = run_benchmarks(
+        args.num_chunks,
+        args.num_queries,
+        top_k=args.top_k,
+        es_host=args.es_host,
+        es_port=args.es_port,
+    )
+    print(f"{'store':<16}{'docs/s':>12}{'p50(ms)':>10}{'p99(ms)':>10}{'overlap':>10}")
+    for store_name, metrics in result.items():
+        overlap = metrics.get("top_k_overlap")
+        print(
+            f"{store_name:<16}{metrics['index_docs_per_s']:>12.0f}"
+            f"{metrics['p50_ms']:>10.2f}{metrics['p99_ms']:>10.2f}"
+            f"{'' if overlap is None else f'{overlap:.3f}':>10}"
+        )
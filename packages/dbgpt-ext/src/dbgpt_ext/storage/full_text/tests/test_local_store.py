@@ -0,0 +1,114 @@
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt.storage.vector_store.filters import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+
+from ..local_store import LocalDocumentStore, LocalFullTextConfig, tokenize
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalDocumentStore(
+        LocalFullTextConfig(persist_path=str(tmp_path)), name="test"
+    )
+
+
+def _chunks():
+    return [
+        Chunk(
+            chunk_id="1",
+            content="AWEL is the agentic workflow expression language",
+            metadata={"source": "awel.md", "page": 1},
+        ),
+        Chunk(
+            chunk_id="2",
+            content="DB-GPT builds data apps with AWEL and agents",
+            metadata={"source": "intro.md", "page": 2},
+        ),
+        Chunk(
+            chunk_id="3",
+            content="数据库是存储数据的仓库",
+            metadata={"source": "db.md", "page": 3},
+        ),
+    ]
+
+
+def test_tokenize():
+    assert tokenize("DB-GPT 数据库") == ["db", "gpt", "数", "数据", "据", "据库", "库"]
+
+
+def test_bm25_ranking(store):
+    store.load_document(_chunks())
+    results = store.similar_search_with_scores("workflow expression language", 10, 0)
+    assert [c.chunk_id for c in results] == ["1"]
+    results = store.similar_search_with_scores("awel agents", 10, 0)
+    assert [c.chunk_id for c in results] == ["2", "1"]
+    assert results[0].score > results[1].score > 0
+
+
+def test_cjk_search(store):
+    store.load_document(_chunks())
+    results = store.similar_search("数据库", 10)
+    assert results[0].chunk_id == "3"
+    assert results[0].metadata["source"] == "db.md"
+
+
+def test_score_threshold(store):
+    store.load_document(_chunks())
+    assert store.similar_search_with_scores("awel", 10, 100.0) == []
+    assert store.similar_search_with_scores("nothing matches", 10, 0) == []
+
+
+def test_upsert_and_delete(store):
+    store.load_document(_chunks())
+    store.load_document([Chunk(chunk_id="1", content="replaced content")])
+    assert store.similar_search("workflow", 10) == []
+    assert [c.chunk_id for c in store.similar_search("replaced", 10)] == ["1"]
+    store.delete_by_ids("1,2")
+    assert store.similar_search("awel replaced", 10) == []
+    assert store.truncate() == ["3"]
+    assert not store.vector_name_exists()
+
+
+def test_metadata_filters(store):
+    store.load_document(_chunks())
+    filters = MetadataFilters(filters=[MetadataFilter(key="source", value="intro.md")])
+    assert [c.chunk_id for c in store.similar_search("awel", 10, filters)] == ["2"]
+    filters = MetadataFilters(
+        condition=FilterCondition.OR,
+        filters=[
+            MetadataFilter(key="page", operator=FilterOperator.LT, value=2),
+            MetadataFilter(key="source", operator=FilterOperator.IN, value=["x"]),
+        ],
+    )
+    assert [c.chunk_id for c in store.similar_search("awel", 10, filters)] == ["1"]
+
+
+def test_persist_and_compact(tmp_path):
+    config = LocalFullTextConfig(persist_path=str(tmp_path), compact_threshold=3)
+    store = LocalDocumentStore(config, name="知识库")
+    store.load_document(_chunks())
+    store.delete_by_ids("2")
+    # The log is merged into the segment
+    store.compact()
+    store.load_document([Chunk(chunk_id="4", content="AWEL operators")])
+    expected = [(c.chunk_id, c.score) for c in store.similar_search("awel 数据", 10)]
+
+    reloaded = LocalDocumentStore(config, name="知识库")
+    assert [
+        (c.chunk_id, c.score) for c in reloaded.similar_search("awel 数据", 10)
+    ] == expected
+    assert {c.chunk_id for c in reloaded.similar_search("awel", 10)} == {"1", "4"}
+
+
+@pytest.mark.asyncio
+async def test_aload_document(store):
+    ids = await store.aload_document(_chunks(), file_id="f1")
+    assert ids == ["1", "2", "3"]
+    filters = MetadataFilters(filters=[MetadataFilter(key="file_id", value="f1")])
+    assert len(store.similar_search("awel 数据", 10, filters)) == 3
@@ -18,6 +18,7 @@ from dbgpt.storage.vector_store.base import (
 )
 from dbgpt.storage.vector_store.filters import FilterOperator, MetadataFilters
 from dbgpt.util import string_utils
+from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt.util.i18n_utils import _
 
 logger = logging.getLogger(__name__)
@@ -218,6 +219,65 @@ class ChromaStore(VectorStoreBase):
         ]
         return self.filter_by_score_threshold(chunks, score_threshold)
 
+    async def asimilar_search_batch(
+        self,
+        queries: List[str],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Search similar documents of multiple queries.
+
+        The queries are embedded in one call and searched in one Chroma query.
+        """
+        return await blocking_func_to_async(
+            self._executor,
+            self._similar_search_batch,
+            queries,
+            topk,
+            score_threshold,
+            filters,
+        )
+
+    def _similar_search_batch(
+        self,
+        queries: List[str],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        if not queries:
+            return []
+        if self.embeddings is None:
+            raise ValueError("Chroma Embeddings is None")
+        logger.info(f"ChromaStore similar search of {len(queries)} queries")
+        where_filters = self.convert_metadata_filters(filters) if filters else None
+        chroma_results = self._collection.query(
+            query_embeddings=self.embeddings.embed_queries(queries),
+            n_results=topk,
+            where=where_filters,
+        )
+        results = []
+        for i in range(len(queries)):
+            chunks = [
+                Chunk(
+                    content=content,
+                    metadata=metadata or {},
+                    score=0.0 if score_threshold is None else (1 - distance),
+                    chunk_id=chunk_id,
+                )
+                for content, metadata, distance, chunk_id in zip(
+                    chroma_results["documents"][i],
+                    chroma_results["metadatas"][i],
+                    chroma_results["distances"][i],
+                    chroma_results["ids"][i],
+                )
+            ]
+            if score_threshold is not None:
+                chunks = self.filter_by_score_threshold(chunks, score_threshold)
+            results.append(chunks)
+        return results
+
     async def afull_text_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -462,6 +522,10 @@ def _convert_chroma_filter_operator(operator: str) -> str:
         return "$gte"
     elif operator == FilterOperator.LTE:
         return "$lte"
+    elif operator == FilterOperator.IN:
+        return "$in"
+    elif operator == FilterOperator.NIN:
+        return "$nin"
     else:
         raise ValueError(f"Chroma Where operator {operator} not supported")
 
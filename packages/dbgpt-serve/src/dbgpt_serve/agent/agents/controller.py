@@ -37,6 +37,7 @@ from dbgpt.util.executor_utils import ExecutorFactory
 from dbgpt.util.json_utils import serialize
 from dbgpt.util.tracer import TracerManager
 from dbgpt_app.dbgpt_server import system_app
+from dbgpt_app.openapi.api_view_model import Result
 from dbgpt_app.scene.base import ChatScene
 from dbgpt_serve.conversation.serve import Serve as ConversationServe
 from dbgpt_serve.core import blocking_func_to_async
@@ -315,6 +316,9 @@ class MultiAgents(BaseComponent, ABC):
             enable_vis_message=enable_verbose,
             history_messages=history_messages,
             start_round=history_message_count,
+            # The deltas are opt-in by "vis_delta", the "incremental" flag keeps
+            # its meaning. The simple message mode returns the last message.
+            incremental=enable_verbose and bool(ext_info.get("vis_delta")),
         )
         # init agent memory
         agent_memory = self.get_or_build_agent_memory(conv_id, gpts_name)
@@ -843,3 +847,17 @@ def _format_vis_msg(msg: str):
 
 
 multi_agents = MultiAgents(system_app)
+
+
+@router.get("/v1/agent/chat/snapshot")
+async def agent_chat_snapshot(conv_id: str):
+    """Return the full message view of an agent chat and its sequence number.
+
+    A client streaming the message deltas (``ext_info["vis_delta"]``) calls it after
+    reconnecting.
+    """
+    try:
+        return Result.succ(await multi_agents.memory.snapshot(conv_id))
+    except Exception as ex:
+        logger.exception("query agent chat snapshot error!")
+        return Result.failed(code="E000X", msg=f"query agent chat snapshot error: {ex}")
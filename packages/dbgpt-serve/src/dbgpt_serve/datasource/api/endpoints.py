@@ -1,5 +1,5 @@
 from functools import cache
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.security.http import HTTPAuthorizationCredentials, HTTPBearer
@@ -216,6 +216,18 @@ async def get_datasource_types(
     return Result.succ(res)
 
 
+@router.get(
+    "/datasource-pool-status",
+    dependencies=[Depends(check_api_key)],
+    response_model=Result[Dict[str, Dict[str, Any]]],
+)
+async def get_pool_status(
+    service: Service = Depends(get_service),
+) -> Result[Dict[str, Dict[str, Any]]]:
+    """Get the connection pool usage of the connected datasources."""
+    return Result.succ(service.pool_status())
+
+
 @router.post(
     "/datasources/test-connection",
     dependencies=[Depends(check_api_key)],
@@ -4,7 +4,7 @@ import json
 import logging
 import threading
 import time
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from dbgpt.core.awel.flow import ResourceMetadata
@@ -227,6 +227,7 @@ class ConnectorManager(BaseComponent):
                     return cached[1]
 
             connector = self._build_connector(db_name)
+            self._configure_result_cache(db_name, connector)
             with self._connector_cache_lock:
                 self._connector_cache[db_name] = (time.time(), connector)
             return connector
@@ -236,16 +237,54 @@ class ConnectorManager(BaseComponent):
 
         Call this after editing the datasource config, refreshing the
         schema, or deleting the datasource. The next ``get_connector``
-        will rebuild from scratch. Best-effort disposal of the underlying
-        SQLAlchemy engine is attempted so connections are released
-        promptly rather than waiting for GC.
+        will rebuild from scratch and the cached schema metadata is
+        dropped. Best-effort disposal of the underlying SQLAlchemy engine
+        is attempted so connections are released promptly rather than
+        waiting for GC.
         """
         with self._connector_cache_lock:
             cached = self._connector_cache.pop(db_name, None)
         if cached is not None:
             _, connector = cached
+            # The schema cache is shared with the connector built next
+            if hasattr(connector, "invalidate_schema_cache"):
+                connector.invalidate_schema_cache()
+            if getattr(connector, "result_cache", None) is not None:
+                connector.result_cache.invalidate_tables()
             self._dispose_connector(connector)
 
+    def _configure_result_cache(self, db_name: str, connector: BaseConnector):
+        """Enable the query result cache if the datasource opts in.
+
+        It is enabled by a positive ``result_cache_ttl`` (seconds) in the
+        ``ext_config`` of the datasource, ``result_cache_max_entries`` bounds the
+        number of the cached results.
+        """
+        if not hasattr(connector, "enable_result_cache"):
+            return
+        db_config = self.storage.get_db_config(db_name)
+        try:
+            ext_config = db_config.get("ext_config") if db_config else None
+            db_json = json.loads(ext_config) if ext_config else {}
+            ttl = float(db_json.get("result_cache_ttl") or 0)
+            max_entries = int(db_json.get("result_cache_max_entries") or 256)
+        except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+            return
+        if ttl > 0:
+            connector.enable_result_cache(ttl=ttl, max_entries=max_entries)
+
+    def pool_status(self) -> Dict[str, Dict[str, Any]]:
+        """Return the connection pool usage of the cached connectors."""
+        with self._connector_cache_lock:
+            connectors = {
+                db_name: connector
+                for db_name, (_, connector) in self._connector_cache.items()
+            }
+        return {
+            db_name: connector.pool_status()
+            for db_name, connector in connectors.items()
+        }
+
     def clear_connector_cache(self) -> None:
         """Drop all cached connectors. Useful for tests / shutdown hooks."""
         with self._connector_cache_lock:
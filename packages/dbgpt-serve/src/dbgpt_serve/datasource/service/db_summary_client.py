@@ -1,18 +1,22 @@
 """DBSummaryClient class."""
 
 import logging
+import os
 import threading
 import traceback
-from typing import Dict, Tuple
+from collections import Counter
+from typing import Dict, List, Tuple
 
 from dbgpt.component import SystemApp
+from dbgpt.configs.model_config import DATA_DIR
 from dbgpt.core import Embeddings
 from dbgpt.rag.embedding.embedding_factory import EmbeddingFactory
 from dbgpt.rag.text_splitter.text_splitter import RDBTextSplitter
 from dbgpt.storage.vector_store.base import VectorStoreBase
 from dbgpt_ext.rag import ChunkParameters
 from dbgpt_ext.rag.summary.gdbms_db_summary import GdbmsSummary
-from dbgpt_ext.rag.summary.rdbms_db_summary import RdbmsSummary
+from dbgpt_ext.rag.summary.rdbms_db_summary import RdbmsSummary, _introspect_tables
+from dbgpt_ext.rag.summary.schema_snapshot import SchemaSnapshot, schema_fingerprint
 from dbgpt_serve.datasource.manages import ConnectorManager
 from dbgpt_serve.rag.storage_manager import StorageManager
 
@@ -66,12 +70,18 @@ class DBSummaryClient:
         )
         return embedding_factory.create()
 
-    def db_summary_embedding(self, dbname, db_type):
+    def db_summary_embedding(self, dbname, db_type, incremental: bool = False):
         """Put db profile and table profile summary into vector store.
 
         Serializes per-db so that concurrent triggers (startup auto-summary,
         ``/refresh`` API, retries on failure) cannot race and delete each
         other's in-flight chroma collections.
+
+        Args:
+            dbname(str): dbname
+            db_type(str): db type
+            incremental(bool): Update the existing profile with the tables changed
+                since the last embedding, see :meth:`init_db_profile`.
         """
         lock = _get_db_index_lock(dbname)
         if not lock.acquire(blocking=False):
@@ -83,7 +93,7 @@ class DBSummaryClient:
         try:
             db_summary_client = self.create_summary_client(dbname, db_type)
 
-            self.init_db_profile(db_summary_client, dbname)
+            self.init_db_profile(db_summary_client, dbname, incremental=incremental)
 
             logger.info("db summary embedding success")
         except Exception as e:
@@ -128,22 +138,119 @@ class DBSummaryClient:
                     f"detail: {message}"
                 )
 
-    def init_db_profile(self, db_summary_client, dbname):
+    def init_db_profile(self, db_summary_client, dbname, incremental: bool = False):
         """Initialize db summary profile.
 
+        The schema snapshot of the profile records the DDL fingerprint and the
+        vector ids of every table, an incremental update only re-embeds the
+        changed tables and deletes the dropped ones. The profile is rebuilt if it
+        has no snapshot.
+
         Args:
         db_summary_client(DBSummaryClient): DB Summary Client
         dbname(str): dbname
+        incremental(bool): Update the profile if it exists
         """
         vector_store_name = dbname + "_profile"
 
         table_vector_connector, field_vector_connector = (
             self._get_vector_connector_by_db(dbname)
         )
+        connector = db_summary_client.db
         if not table_vector_connector.vector_name_exists():
-            from dbgpt_ext.rag.assembler.db_schema import DBSchemaAssembler
-            from dbgpt_ext.rag.summary.rdbms_db_summary import _DEFAULT_COLUMN_SEPARATOR
+            self._build_db_profile(
+                connector, dbname, table_vector_connector, field_vector_connector
+            )
+        elif incremental:
+            snapshot = SchemaSnapshot.load(
+                self._snapshot_path(dbname), self._snapshot_params_key()
+            )
+            if snapshot is None:
+                logger.info(f"No schema snapshot of {dbname}, rebuild the profile")
+                self._delete_profile_stores(dbname)
+                table_vector_connector, field_vector_connector = (
+                    self._get_vector_connector_by_db(dbname)
+                )
+                self._build_db_profile(
+                    connector, dbname, table_vector_connector, field_vector_connector
+                )
+            else:
+                self._update_db_profile(
+                    connector,
+                    snapshot,
+                    table_vector_connector,
+                    field_vector_connector,
+                )
+        else:
+            logger.info(f"Vector store name {vector_store_name} exist")
+        logger.info("initialize db summary profile success...")
+
+    def _build_db_profile(
+        self, connector, dbname, table_vector_connector, field_vector_connector
+    ):
+        tables = list(connector.get_table_names())
+        table_schemas = _introspect_tables(connector, tables)
+        snapshot = SchemaSnapshot(dbname, self._snapshot_params_key())
+        self._embed_tables(
+            connector,
+            snapshot,
+            tables,
+            table_schemas,
+            table_vector_connector,
+            field_vector_connector,
+        )
+
+    def _update_db_profile(
+        self,
+        connector,
+        snapshot: SchemaSnapshot,
+        table_vector_connector,
+        field_vector_connector,
+    ):
+        tables = list(connector.get_table_names())
+        table_schemas = _introspect_tables(connector, tables)
+        changed, removed = snapshot.diff(
+            {name: schema_fingerprint(schema) for name, schema in table_schemas.items()}
+        )
+        logger.info(
+            f"{snapshot.db_name} has {len(tables)} tables, {len(changed)} new or "
+            f"changed, {len(removed)} dropped"
+        )
+        if not changed and not removed:
+            return
+        table_ids, field_ids = snapshot.vector_ids(changed + removed)
+        if table_ids:
+            table_vector_connector.delete_by_ids(",".join(table_ids))
+        if field_ids:
+            field_vector_connector.delete_by_ids(",".join(field_ids))
+        for table_name in changed + removed:
+            snapshot.remove_table(table_name)
+        self._embed_tables(
+            connector,
+            snapshot,
+            changed,
+            table_schemas,
+            table_vector_connector,
+            field_vector_connector,
+        )
 
+    def _embed_tables(
+        self,
+        connector,
+        snapshot: SchemaSnapshot,
+        tables: List[str],
+        table_schemas: Dict[str, Dict],
+        table_vector_connector,
+        field_vector_connector,
+    ):
+        """Embed the tables and save their vector ids in the snapshot."""
+        from dbgpt_ext.rag.assembler.db_schema import DBSchemaAssembler
+        from dbgpt_ext.rag.summary.rdbms_db_summary import _DEFAULT_COLUMN_SEPARATOR
+
+        snapshot_path = self._snapshot_path(snapshot.db_name)
+        vector_ids: Dict[str, Tuple[List[str], List[str]]] = {}
+        expected: Counter = Counter()
+        if tables:
             chunk_parameters = ChunkParameters(
                 text_splitter=RDBTextSplitter(
                     column_separator=_DEFAULT_COLUMN_SEPARATOR,
@@ -151,18 +258,33 @@ class DBSummaryClient:
                 )
             )
             db_assembler = DBSchemaAssembler.load_from_connection(
-                connector=db_summary_client.db,
+                connector=connector,
                 table_vector_store_connector=table_vector_connector,
                 field_vector_store_connector=field_vector_connector,
                 chunk_parameters=chunk_parameters,
                 max_seq_length=self.app_config.service.web.embedding_model_max_seq_len,
+                table_names=tables,
+                table_schemas=table_schemas,
             )
-
-            if len(db_assembler.get_chunks()) > 0:
-                db_assembler.persist()
-        else:
-            logger.info(f"Vector store name {vector_store_name} exist")
-        logger.info("initialize db summary profile success...")
+            chunks = db_assembler.get_chunks()
+            if len(chunks) > 0:
+                vector_ids = db_assembler.persist_by_table()
+                if vector_ids is None:
+                    # The loaded chunks are not tracked, rebuild next time
+                    if os.path.exists(snapshot_path):
+                        os.remove(snapshot_path)
+                    return
+            expected = Counter(chunk.metadata.get("table_name") for chunk in chunks)
+        for table_name, (table_ids, field_ids) in vector_ids.items():
+            # A table with failed chunks is embedded again in the next update
+            complete = len(table_ids) + len(field_ids) == expected[table_name]
+            snapshot.set_table(
+                table_name,
+                schema_fingerprint(table_schemas[table_name]) if complete else "",
+                table_ids,
+                field_ids,
+            )
+        snapshot.save(snapshot_path)
 
     def delete_db_profile(self, dbname):
         """Delete db profile.
@@ -174,16 +296,34 @@ class DBSummaryClient:
         """
         lock = _get_db_index_lock(dbname)
         with lock:
-            table_vector_store_name = dbname + "_profile"
-            field_vector_store_name = dbname + "_profile_field"
+            self._delete_profile_stores(dbname)
+            logger.info(f"delete db profile {dbname} success")
 
-            table_vector_connector, field_vector_connector = (
-                self._get_vector_connector_by_db(dbname)
-            )
+    def _delete_profile_stores(self, dbname):
+        table_vector_store_name = dbname + "_profile"
+        field_vector_store_name = dbname + "_profile_field"
 
-            table_vector_connector.delete_vector_name(table_vector_store_name)
-            field_vector_connector.delete_vector_name(field_vector_store_name)
-            logger.info(f"delete db profile {dbname} success")
+        table_vector_connector, field_vector_connector = (
+            self._get_vector_connector_by_db(dbname)
+        )
+
+        table_vector_connector.delete_vector_name(table_vector_store_name)
+        field_vector_connector.delete_vector_name(field_vector_store_name)
+        snapshot_path = self._snapshot_path(dbname)
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+
+    @staticmethod
+    def _snapshot_path(dbname: str) -> str:
+        return os.path.join(DATA_DIR, "schema_snapshot", f"{dbname}.json")
+
+    def _snapshot_params_key(self) -> str:
+        """The parameters of the profile, the snapshot is dropped if they change."""
+        max_seq_length = self.app_config.service.web.embedding_model_max_seq_len
+        embedding_model = getattr(
+            getattr(self.app_config, "models", None), "default_embedding", None
+        )
+        return f"{max_seq_length}:{embedding_model}"
 
     @staticmethod
     def create_summary_client(dbname: str, db_type: str):
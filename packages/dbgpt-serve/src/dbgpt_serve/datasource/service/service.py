@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from fastapi import HTTPException
 
@@ -285,6 +285,14 @@ class Service(
         """
         return self.datasource_manager.get_supported_types()
 
+    def pool_status(self) -> Dict[str, Dict[str, Any]]:
+        """Return the connection pool usage of the cached connectors.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Key is the datasource name
+        """
+        return self.datasource_manager.pool_status()
+
     def test_connection(self, request: DatasourceCreateRequest) -> bool:
         """Test the connection of the datasource.
 
@@ -309,12 +317,12 @@ class Service(
         if not db_config:
             raise HTTPException(status_code=404, detail="datasource not found")
 
-        self._db_summary_client.delete_db_profile(db_config.db_name)
         # The cached connector's reflected MetaData may be stale relative
         # to whatever caused the refresh; force a rebuild on next access.
         self.datasource_manager.invalidate_connector(db_config.db_name)
 
-        # async embedding
+        # async embedding, only the tables changed since the last embedding are
+        # embedded again
         executor = self._system_app.get_component(
             ComponentType.EXECUTOR_DEFAULT, ExecutorFactory
         ).create()  # type: ignore
@@ -322,5 +330,6 @@ class Service(
             self._db_summary_client.db_summary_embedding,
             db_config.db_name,
             db_config.db_type,
+            True,
         )
         return True
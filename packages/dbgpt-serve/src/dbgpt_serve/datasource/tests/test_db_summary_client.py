@@ -0,0 +1,102 @@
+import json
+import sqlite3
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from dbgpt_ext.datasource.rdbms.conn_sqlite import SQLiteConnector
+
+from ..service.db_summary_client import DBSummaryClient
+
+
+class _VectorStore:
+    def __init__(self):
+        self.loaded = []
+        self.deleted = []
+        self.exists = False
+
+    def vector_name_exists(self):
+        return self.exists
+
+    def load_document_with_limit(self, chunks, *args, **kwargs):
+        self.exists = True
+        self.loaded.extend(chunk.metadata["table_name"] for chunk in chunks)
+        return [chunk.chunk_id for chunk in chunks]
+
+    def delete_by_ids(self, ids):
+        self.deleted.extend(ids.split(","))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test.sqlite")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE user (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER)")
+        conn.execute("CREATE TABLE item (id INTEGER PRIMARY KEY)")
+    return path
+
+
+@pytest.fixture
+def summary_client(tmp_path, monkeypatch):
+    system_app = MagicMock()
+    client = DBSummaryClient(system_app)
+    client.app_config.service.web.embedding_model_max_seq_len = 512
+    client.app_config.models.default_embedding = "text2vec"
+    monkeypatch.setattr(
+        DBSummaryClient,
+        "_snapshot_path",
+        staticmethod(lambda dbname: str(tmp_path / "snapshot" / f"{dbname}.json")),
+    )
+    stores = (_VectorStore(), _VectorStore())
+    client._get_vector_connector_by_db = Mock(return_value=stores)
+    return client, stores[0]
+
+
+def _init_profile(client, db_path):
+    # The connector is created again after a refresh
+    db_summary_client = Mock(db=SQLiteConnector.from_file_path(db_path))
+    client.init_db_profile(db_summary_client, "test", incremental=True)
+
+
+def _snapshot_tables(client):
+    with open(client._snapshot_path("test")) as f:
+        return json.load(f)["tables"]
+
+
+def test_incremental_update(summary_client, db_path):
+    client, table_store = summary_client
+    _init_profile(client, db_path)
+    assert sorted(table_store.loaded) == ["item", "orders", "user"]
+    tables = _snapshot_tables(client)
+    assert sorted(tables) == ["item", "orders", "user"]
+
+    # Nothing changed
+    table_store.loaded.clear()
+    _init_profile(client, db_path)
+    assert table_store.loaded == []
+    assert table_store.deleted == []
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("ALTER TABLE orders ADD COLUMN amount REAL")
+        conn.execute("DROP TABLE item")
+    _init_profile(client, db_path)
+    assert table_store.loaded == ["orders"]
+    assert sorted(table_store.deleted) == sorted(
+        tables["orders"]["table_ids"] + tables["item"]["table_ids"]
+    )
+    new_tables = _snapshot_tables(client)
+    assert sorted(new_tables) == ["orders", "user"]
+    assert new_tables["user"] == tables["user"]
+    assert new_tables["orders"]["fingerprint"] != tables["orders"]["fingerprint"]
+
+
+def test_rebuild_without_snapshot(summary_client, db_path):
+    client, table_store = summary_client
+    # Embedded before the schema snapshot
+    table_store.exists = True
+    client._delete_profile_stores = Mock()
+    _init_profile(client, db_path)
+    client._delete_profile_stores.assert_called_once_with("test")
+    assert sorted(table_store.loaded) == ["item", "orders", "user"]
+    assert sorted(_snapshot_tables(client)) == ["item", "orders", "user"]
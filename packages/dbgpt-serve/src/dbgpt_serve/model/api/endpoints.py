@@ -5,7 +5,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security.http import HTTPAuthorizationCredentials, HTTPBearer
 
-from dbgpt.component import SystemApp
+from dbgpt.component import ComponentType, SystemApp
 from dbgpt.model.cluster import (
     WorkerManager,
     WorkerManagerFactory,
@@ -113,8 +113,16 @@ async def check_api_key(
 
 @router.get("/health")
 async def health():
-    """Health check endpoint"""
-    return {"status": "ok"}
+    """Health check endpoint, with the metrics of the worker manager"""
+    health_info = {"status": "ok"}
+    factory = global_system_app.get_component(
+        ComponentType.WORKER_MANAGER_FACTORY,
+        WorkerManagerFactory,
+        default_component=None,
+    )
+    if factory:
+        health_info["worker_manager"] = factory.create().metrics()
+    return health_info
 
 
 @router.get("/test_auth", dependencies=[Depends(check_api_key)])
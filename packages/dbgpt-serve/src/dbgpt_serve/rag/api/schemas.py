@@ -1,5 +1,5 @@
 import re
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 from fastapi import File, UploadFile
@@ -125,6 +125,12 @@ class DocumentServeResponse(BaseModel):
     chunk_size: Optional[int] = Field(None, description="chunk size")
     """questions: questions"""
     questions: Optional[str] = Field(None, description="questions")
+    """progress: sync progress"""
+    progress: Optional[Dict[str, Any]] = Field(
+        None,
+        description="sync progress, the stage, the embedded chunks, chunks per "
+        "second and the ETA in seconds",
+    )
 
 
 class ChunkServeRequest(BaseModel):
@@ -74,6 +74,19 @@ class ServeConfig(BaseServeConfig):
         default=3,
         metadata={"help": _("knowledge rerank top k")},
     )
+    max_concurrent_ingestions: Optional[int] = field(
+        default=4,
+        metadata={"help": _("The max number of documents synced at the same time")},
+    )
+    max_concurrent_ingestions_per_space: Optional[int] = field(
+        default=2,
+        metadata={
+            "help": _(
+                "The max number of documents of one knowledge space synced at the "
+                "same time"
+            )
+        },
+    )
 
 
 @dataclass
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from sqlalchemy import Column, DateTime, Integer, String, Text, func, not_
 
@@ -276,3 +276,92 @@ class DocumentChunkDao(BaseDao):
         )
         entity = DocumentChunkEntity(**response_dict)
         return entity
+
+
+class DocumentChunkVectorEntity(Model):
+    """The vector store id of a document chunk.
+
+    The chunks are identified by the hash of their content, a re-sync only embeds
+    the chunks whose hash is not in the table.
+    """
+
+    __tablename__ = "document_chunk_vector"
+    id = Column(Integer, primary_key=True)
+    document_id = Column(Integer, nullable=False, index=True)
+    chunk_index = Column(Integer, nullable=False)
+    chunk_hash = Column(String(64), nullable=False)
+    vector_id = Column(String(255))
+    gmt_created = Column(DateTime, default=datetime.now)
+    gmt_modified = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return (
+            f"DocumentChunkVectorEntity(id={self.id}, "
+            f"document_id={self.document_id}, chunk_index={self.chunk_index}, "
+            f"chunk_hash='{self.chunk_hash}', vector_id='{self.vector_id}')"
+        )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "document_id": self.document_id,
+            "chunk_index": self.chunk_index,
+            "chunk_hash": self.chunk_hash,
+            "vector_id": self.vector_id,
+        }
+
+
+class DocumentChunkVectorDao(BaseDao):
+    """DAO for document_chunk_vector table."""
+
+    def get_chunk_vectors(self, document_id: int) -> List[Dict[str, Any]]:
+        """Get the chunk vectors of a document, in the order of the chunks."""
+        with self.session(commit=False) as session:
+            entities = (
+                session.query(DocumentChunkVectorEntity)
+                .filter(DocumentChunkVectorEntity.document_id == document_id)
+                .order_by(DocumentChunkVectorEntity.chunk_index.asc())
+                .all()
+            )
+            return [entity.to_dict() for entity in entities]
+
+    def get_vector_ids(self, document_id: int) -> List[str]:
+        """Get the vector store ids of a document."""
+        return [
+            chunk_vector["vector_id"]
+            for chunk_vector in self.get_chunk_vectors(document_id)
+            if chunk_vector["vector_id"]
+        ]
+
+    def replace_chunk_vectors(
+        self, document_id: int, chunk_vectors: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        """Replace the chunk vectors of a document in one transaction.
+
+        Args:
+            document_id (int): The document id.
+            chunk_vectors (List[Tuple[str, Optional[str]]]): The (chunk hash,
+                vector id) of the chunks, in the order of the chunks.
+        """
+        with self.session() as session:
+            session.query(DocumentChunkVectorEntity).filter(
+                DocumentChunkVectorEntity.document_id == document_id
+            ).delete()
+            session.add_all(
+                [
+                    DocumentChunkVectorEntity(
+                        document_id=document_id,
+                        chunk_index=index,
+                        chunk_hash=chunk_hash,
+                        vector_id=vector_id,
+                    )
+                    for index, (chunk_hash, vector_id) in enumerate(chunk_vectors)
+                ]
+            )
+
+    def delete_by_document(self, document_id: int) -> None:
+        """Delete the chunk vectors of a document."""
+        with self.session() as session:
+            session.query(DocumentChunkVectorEntity).filter(
+                DocumentChunkVectorEntity.document_id == document_id
+            ).delete()
@@ -0,0 +1,166 @@
+"""Knowledge ingestion job persistence model.
+
+Every document sync is a job, the job records the last completed stage of the
+ingestion pipeline, so an interrupted sync is resumed from its checkpoint:
+
+  download -> parse -> split -> embed (batch by batch) -> persist
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from dbgpt.storage.metadata import BaseDao, Model
+
+
+class IngestionStatus:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    FAILED = "FAILED"
+    FINISHED = "FINISHED"
+
+
+class IngestionStage:
+    """The completed stages, in the order of the pipeline."""
+
+    CREATED = "created"
+    DOWNLOAD = "download"
+    PARSE = "parse"
+    SPLIT = "split"
+    EMBED = "embed"
+    PERSIST = "persist"
+
+
+class KnowledgeIngestionJobEntity(Model):
+    """Knowledge document ingestion job entity."""
+
+    __tablename__ = "knowledge_ingestion_job"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(Integer, nullable=False, unique=True)
+    space_id = Column(String(50), nullable=False)
+    status = Column(String(50), nullable=False, index=True)
+    stage = Column(String(50), nullable=False)
+    chunk_parameters = Column(Text)
+    local_path = Column(String(512))
+    checkpoint_path = Column(String(512))
+    total_chunks = Column(Integer, nullable=False, default=0)
+    embedded_chunks = Column(Integer, nullable=False, default=0)
+    embedded_batches = Column(Integer, nullable=False, default=0)
+    vector_ids = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    gmt_created = Column(DateTime, default=datetime.now)
+    gmt_modified = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return (
+            f"KnowledgeIngestionJobEntity(id={self.id}, "
+            f"document_id={self.document_id}, status='{self.status}', "
+            f"stage='{self.stage}', embedded_batches={self.embedded_batches})"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "document_id": self.document_id,
+            "space_id": self.space_id,
+            "status": self.status,
+            "stage": self.stage,
+            "chunk_parameters": self.chunk_parameters,
+            "local_path": self.local_path,
+            "checkpoint_path": self.checkpoint_path,
+            "total_chunks": self.total_chunks,
+            "embedded_chunks": self.embedded_chunks,
+            "embedded_batches": self.embedded_batches,
+            "vector_ids": self.vector_ids,
+            "attempts": self.attempts,
+            "error": self.error,
+            "gmt_created": self.gmt_created,
+            "gmt_modified": self.gmt_modified,
+        }
+
+
+class KnowledgeIngestionJobDao(BaseDao):
+    """DAO for knowledge_ingestion_job table.
+
+    The jobs are returned as dicts, the entities are not used out of the session.
+    """
+
+    def create_job(
+        self, document_id: int, space_id: str, chunk_parameters: str
+    ) -> Dict[str, Any]:
+        """Create the job of a document, an existing job is reset."""
+        with self.session() as session:
+            job = (
+                session.query(KnowledgeIngestionJobEntity)
+                .filter(KnowledgeIngestionJobEntity.document_id == document_id)
+                .first()
+            )
+            if job is None:
+                job = KnowledgeIngestionJobEntity(document_id=document_id)
+                session.add(job)
+            job.space_id = str(space_id)
+            job.status = IngestionStatus.PENDING
+            job.stage = IngestionStage.CREATED
+            job.chunk_parameters = chunk_parameters
+            job.local_path = None
+            job.checkpoint_path = None
+            job.total_chunks = 0
+            job.embedded_chunks = 0
+            job.embedded_batches = 0
+            job.vector_ids = None
+            job.attempts = 0
+            job.error = None
+            session.flush()
+            return job.to_dict()
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a job by id."""
+        with self.session(commit=False) as session:
+            job = session.get(KnowledgeIngestionJobEntity, job_id)
+            return job.to_dict() if job else None
+
+    def get_jobs_by_documents(
+        self, document_ids: List[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Get the jobs of the documents, key is the document id."""
+        if not document_ids:
+            return {}
+        with self.session(commit=False) as session:
+            jobs = (
+                session.query(KnowledgeIngestionJobEntity)
+                .filter(KnowledgeIngestionJobEntity.document_id.in_(document_ids))
+                .all()
+            )
+            return {job.document_id: job.to_dict() for job in jobs}
+
+    def list_unfinished_jobs(self) -> List[Dict[str, Any]]:
+        """List the pending and running jobs, oldest first."""
+        with self.session(commit=False) as session:
+            jobs = (
+                session.query(KnowledgeIngestionJobEntity)
+                .filter(
+                    KnowledgeIngestionJobEntity.status.in_(
+                        [IngestionStatus.PENDING, IngestionStatus.RUNNING]
+                    )
+                )
+                .order_by(KnowledgeIngestionJobEntity.id.asc())
+                .all()
+            )
+            return [job.to_dict() for job in jobs]
+
+    def update_job(self, job_id: int, **fields: Any) -> None:
+        """Update the fields of a job, it is a checkpoint of the pipeline."""
+        with self.session() as session:
+            session.query(KnowledgeIngestionJobEntity).filter(
+                KnowledgeIngestionJobEntity.id == job_id
+            ).update({**fields, "gmt_modified": datetime.now()})
+
+    def delete_job_by_document(self, document_id: int) -> None:
+        """Delete the job of a document."""
+        with self.session() as session:
+            session.query(KnowledgeIngestionJobEntity).filter(
+                KnowledgeIngestionJobEntity.document_id == document_id
+            ).delete()
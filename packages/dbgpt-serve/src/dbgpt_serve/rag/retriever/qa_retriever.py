@@ -191,14 +191,14 @@ class QARetriever(BaseRetriever):
     ) -> List[Chunk]:
         """Rerank candidates using cosine similarity."""
         if len(candidates_with_scores) > self._top_k:
-            for candidate in candidates_with_scores:
-                similarity = calculate_cosine_similarity(
-                    embeddings=self._embedding_fn,
-                    prediction=query,
-                    contexts=[candidate.content],
-                )
-                score = float(similarity.mean())
-                candidate.score = score
+            # Embed the query once and the candidates in one batch
+            similarities = calculate_cosine_similarity(
+                embeddings=self._embedding_fn,
+                prediction=query,
+                contexts=[candidate.content for candidate in candidates_with_scores],
+            )
+            for candidate, similarity in zip(candidates_with_scores, similarities):
+                candidate.score = float(similarity)
             candidates_with_scores.sort(key=lambda x: x.score, reverse=True)
             candidates_with_scores = candidates_with_scores[: self._top_k]
             candidates_with_scores = [
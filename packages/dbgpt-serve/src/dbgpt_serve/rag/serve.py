@@ -74,11 +74,13 @@ class Serve(BaseServe):
         """
         # import your own module here to ensure the module is loaded before the
         # application starts
+        from .models.chunk_db import DocumentChunkVectorEntity  # noqa: F401
         from .models.code_graph_db import (  # noqa: F401
             CodeGraphEdgeEntity,
             CodeGraphMetaEntity,
             CodeGraphVertexEntity,
         )
+        from .models.ingestion_db import KnowledgeIngestionJobEntity  # noqa: F401
         from .models.models import KnowledgeSpaceEntity as _  # noqa: F401
 
     def before_start(self):
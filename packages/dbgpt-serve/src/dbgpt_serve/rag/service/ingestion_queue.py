@@ -0,0 +1,210 @@
+"""The queue of the knowledge ingestion jobs.
+
+The jobs are stored in the metadata DB (``knowledge_ingestion_job``), so the jobs
+interrupted by a restart are resumed from their last checkpoint by
+:meth:`IngestionQueue.recover`. The queue limits the number of the running jobs,
+globally and per knowledge space.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from ..models.ingestion_db import (
+    IngestionStatus,
+    KnowledgeIngestionJobDao,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionProgress:
+    """The progress of a running job, the rate is measured in the current run."""
+
+    def __init__(self, total_chunks: int = 0, embedded_chunks: int = 0):
+        self.total_chunks = total_chunks
+        self.embedded_chunks = embedded_chunks
+        self._start_chunks = embedded_chunks
+        self._start_time: Optional[float] = None
+
+    def start_embedding(self, total_chunks: int, embedded_chunks: int) -> None:
+        """Start to measure the embedding rate."""
+        self.total_chunks = total_chunks
+        self.embedded_chunks = embedded_chunks
+        self._start_chunks = embedded_chunks
+        self._start_time = time.monotonic()
+
+    def on_embedded(self, num_chunks: int) -> None:
+        """Record the chunks of a finished batch."""
+        self.embedded_chunks += num_chunks
+
+    @property
+    def chunks_per_second(self) -> Optional[float]:
+        """The embedding rate of the current run."""
+        if self._start_time is None:
+            return None
+        elapsed = time.monotonic() - self._start_time
+        embedded = self.embedded_chunks - self._start_chunks
+        if elapsed <= 0 or embedded <= 0:
+            return None
+        return embedded / elapsed
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """The estimated seconds to embed the remaining chunks."""
+        rate = self.chunks_per_second
+        if not rate:
+            return None
+        return max(0, self.total_chunks - self.embedded_chunks) / rate
+
+
+def progress_to_dict(
+    job: Dict[str, Any], progress: Optional[IngestionProgress] = None
+) -> Dict[str, Any]:
+    """Return the progress of a job for the document API."""
+    total_chunks = job["total_chunks"]
+    embedded_chunks = job["embedded_chunks"]
+    chunks_per_second = eta_seconds = None
+    if progress is not None:
+        total_chunks = progress.total_chunks
+        embedded_chunks = progress.embedded_chunks
+        chunks_per_second = progress.chunks_per_second
+        eta_seconds = progress.eta_seconds
+    return {
+        "status": job["status"],
+        "stage": job["stage"],
+        "total_chunks": total_chunks,
+        "embedded_chunks": embedded_chunks,
+        "embedded_batches": job["embedded_batches"],
+        "percent": (
+            round(embedded_chunks * 100 / total_chunks, 2) if total_chunks else None
+        ),
+        "chunks_per_second": (
+            round(chunks_per_second, 2) if chunks_per_second is not None else None
+        ),
+        "eta_seconds": round(eta_seconds, 1) if eta_seconds is not None else None,
+        "attempts": job["attempts"],
+        "error": job["error"],
+    }
+
+
+JobRunner = Callable[[Dict[str, Any], IngestionProgress], Awaitable[None]]
+
+
+class IngestionQueue:
+    """Run the ingestion jobs with bounded concurrency.
+
+    A job waits in PENDING status until it gets a global slot and a slot of its
+    knowledge space, the runner checkpoints the job after every stage.
+
+    Note:
+        The jobs are recovered by the process which starts, run one webserver
+        process per metadata DB, otherwise the unfinished jobs are resumed by
+        every process.
+    """
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        job_dao: KnowledgeIngestionJobDao,
+        max_concurrency: int = 4,
+        max_concurrency_per_space: int = 2,
+    ):
+        """Create a new IngestionQueue.
+
+        Args:
+            runner (JobRunner): Run a job, it raises if the job failed.
+            job_dao (KnowledgeIngestionJobDao): The DAO of the jobs.
+            max_concurrency (int): The max number of the running jobs.
+            max_concurrency_per_space (int): The max number of the running jobs of
+                one knowledge space.
+        """
+        self._runner = runner
+        self._job_dao = job_dao
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_concurrency_per_space = max(1, max_concurrency_per_space)
+        # Created in the event loop of the first job
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._space_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._running: Dict[int, IngestionProgress] = {}
+        self._queued: Set[int] = set()
+
+    def submit(self, job: Dict[str, Any]) -> bool:
+        """Schedule a job, return False if the job is already queued."""
+        if job["id"] in self._queued:
+            return False
+        self._queued.add(job["id"])
+        task = asyncio.create_task(self._run(job))
+        # Keep a reference, the event loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def recover(self) -> int:
+        """Resume the pending and running jobs in the metadata DB."""
+        loop = asyncio.get_running_loop()
+        jobs = await loop.run_in_executor(None, self._job_dao.list_unfinished_jobs)
+        for job in jobs:
+            logger.info(
+                f"Resume the ingestion job {job['id']} of document "
+                f"{job['document_id']} from stage {job['stage']}"
+            )
+            self.submit(job)
+        return len(jobs)
+
+    def progress(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the progress of a job, with the rate if it runs here."""
+        return progress_to_dict(job, self._running.get(job["id"]))
+
+    def is_queued(self, job_id: int) -> bool:
+        """Whether the job is waiting or running in this queue."""
+        return job_id in self._queued
+
+    async def close(self) -> None:
+        """Cancel the jobs, they are resumed from the checkpoints next time."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        space_semaphore = self._space_semaphores.setdefault(
+            job["space_id"], asyncio.Semaphore(self._max_concurrency_per_space)
+        )
+        try:
+            async with space_semaphore, self._semaphore:
+                attempts = job["attempts"] + 1
+                await loop.run_in_executor(
+                    None,
+                    lambda: self._job_dao.update_job(
+                        job_id, status=IngestionStatus.RUNNING, attempts=attempts
+                    ),
+                )
+                job = {**job, "status": IngestionStatus.RUNNING, "attempts": attempts}
+                progress = IngestionProgress(
+                    job["total_chunks"], job["embedded_chunks"]
+                )
+                self._running[job_id] = progress
+                try:
+                    await self._runner(job, progress)
+                except asyncio.CancelledError:
+                    # Leave the job RUNNING, it is resumed by the next recover
+                    raise
+                except Exception as e:
+                    logger.exception(f"Ingestion job {job_id} failed")
+                    error = str(e)
+                    await loop.run_in_executor(
+                        None,
+                        lambda: self._job_dao.update_job(
+                            job_id, status=IngestionStatus.FAILED, error=error
+                        ),
+                    )
+        finally:
+            self._running.pop(job_id, None)
+            self._queued.discard(job_id)
@@ -1,13 +1,15 @@
-import asyncio
+import hashlib
 import json
 import logging
 import os
+from collections import defaultdict, deque
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, cast
+from typing import Any, Deque, Dict, List, Optional, Tuple, cast
 
 from fastapi import HTTPException
 
+from dbgpt._private.pydantic import model_to_dict
 from dbgpt.component import ComponentType, SystemApp
 from dbgpt.configs import TAG_KEY_KNOWLEDGE_FACTORY_DOMAIN_TYPE
 from dbgpt.configs.model_config import (
@@ -27,7 +29,7 @@ from dbgpt.util.string_utils import remove_trailing_punctuation
 from dbgpt.util.tracer import root_tracer, trace
 from dbgpt_app.knowledge.request.request import BusinessFieldType
 from dbgpt_ext.rag.assembler import EmbeddingAssembler
-from dbgpt_ext.rag.chunk_manager import ChunkParameters
+from dbgpt_ext.rag.chunk_manager import ChunkManager, ChunkParameters
 from dbgpt_ext.rag.knowledge import KnowledgeFactory
 from dbgpt_serve.core import BaseService, blocking_func_to_async
 
@@ -41,14 +43,24 @@ from ..api.schemas import (
     SpaceServeResponse,
 )
 from ..config import SERVE_SERVICE_COMPONENT_NAME, ServeConfig
-from ..models.chunk_db import DocumentChunkDao, DocumentChunkEntity
+from ..models.chunk_db import (
+    DocumentChunkDao,
+    DocumentChunkEntity,
+    DocumentChunkVectorDao,
+)
 from ..models.document_db import (
     KnowledgeDocumentDao,
     KnowledgeDocumentEntity,
 )
+from ..models.ingestion_db import (
+    IngestionStage,
+    IngestionStatus,
+    KnowledgeIngestionJobDao,
+)
 from ..models.models import KnowledgeSpaceDao, KnowledgeSpaceEntity
 from ..retriever.knowledge_space import KnowledgeSpaceRetriever
 from ..storage_manager import StorageManager
+from .ingestion_queue import IngestionProgress, IngestionQueue
 
 logger = logging.getLogger(__name__)
 
@@ -72,12 +84,17 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         dao: Optional[KnowledgeSpaceDao] = None,
         document_dao: Optional[KnowledgeDocumentDao] = None,
         chunk_dao: Optional[DocumentChunkDao] = None,
+        job_dao: Optional[KnowledgeIngestionJobDao] = None,
+        chunk_vector_dao: Optional[DocumentChunkVectorDao] = None,
     ):
         self._system_app = system_app
         self._dao: KnowledgeSpaceDao = dao
         self._document_dao: KnowledgeDocumentDao = document_dao
         self._chunk_dao: DocumentChunkDao = chunk_dao
+        self._job_dao: KnowledgeIngestionJobDao = job_dao
+        self._chunk_vector_dao: DocumentChunkVectorDao = chunk_vector_dao
         self._serve_config = config
+        self._ingestion_queue: Optional[IngestionQueue] = None
 
         super().__init__(system_app)
 
@@ -91,6 +108,8 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         self._dao = self._dao or KnowledgeSpaceDao()
         self._document_dao = self._document_dao or KnowledgeDocumentDao()
         self._chunk_dao = self._chunk_dao or DocumentChunkDao()
+        self._job_dao = self._job_dao or KnowledgeIngestionJobDao()
+        self._chunk_vector_dao = self._chunk_vector_dao or DocumentChunkVectorDao()
         self._system_app = system_app
 
     @property
@@ -223,10 +242,8 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                     f"there are document called, doc_id: {sync_request.doc_id}"
                 )
             doc = docs[0]
-            if (
-                doc.status == SyncStatus.RUNNING.name
-                or doc.status == SyncStatus.FINISHED.name
-            ):
+            # A finished document is synced incrementally
+            if doc.status == SyncStatus.RUNNING.name:
                 raise Exception(
                     f" doc:{doc.doc_name} status is {doc.status}, can not sync"
                 )
@@ -273,7 +290,10 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         # TODO: implement your own logic here
         # Build the query request from the request
         query_request = request
-        return self._document_dao.get_one(query_request)
+        document = self._document_dao.get_one(query_request)
+        if document is not None:
+            self._with_progress([document])
+        return document
 
     def delete(self, space_id: str) -> Optional[SpaceServeResponse]:
         """Delete a Flow entity
@@ -299,6 +319,7 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         documents = self._document_dao.get_documents(document_query)
         for document in documents:
             self._chunk_dao.raw_delete(document.id)
+            self._chunk_vector_dao.delete_by_document(document.id)
         # delete documents
         self._document_dao.raw_delete(document_query)
         # delete space
@@ -356,13 +377,17 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             raise Exception(f"invalid space name: {docuemnt.space}")
         space = spaces[0]
 
-        vector_ids = docuemnt.vector_ids
-        if vector_ids is not None:
+        vector_ids = self._chunk_vector_dao.get_vector_ids(docuemnt.id)
+        if docuemnt.vector_ids:
+            vector_ids.extend(docuemnt.vector_ids.split(","))
+        if vector_ids:
             vector_store_connector = self.create_vector_store(space.name)
             # delete vector by ids
-            vector_store_connector.delete_by_ids(vector_ids)
+            vector_store_connector.delete_by_ids(",".join(vector_ids))
         # delete chunks
         self._chunk_dao.raw_delete(docuemnt.id)
+        self._chunk_vector_dao.delete_by_document(docuemnt.id)
+        self._job_dao.delete_job_by_document(docuemnt.id)
         # delete document
         self._document_dao.raw_delete(docuemnt)
         return docuemnt
@@ -424,7 +449,9 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         Returns:
             List[SpaceServeResponse]: The response
         """
-        return self._document_dao.get_list_page(request, page, page_size)
+        result = self._document_dao.get_list_page(request, page, page_size)
+        self._with_progress(result.items)
+        return result
 
     def get_chunk_list_page(self, request: QUERY_SPEC, page: int, page_size: int):
         """get document chunks with page
@@ -473,10 +500,8 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                     f"there are document called, doc_id: {sync_request.doc_id}"
                 )
             doc = docs[0]
-            if (
-                doc.status == SyncStatus.RUNNING.name
-                or doc.status == SyncStatus.FINISHED.name
-            ):
+            # A finished document is synced incrementally
+            if doc.status == SyncStatus.RUNNING.name:
                 raise Exception(
                     f" doc:{doc.doc_name} status is {doc.status}, can not sync"
                 )
@@ -503,11 +528,274 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         doc: KnowledgeDocumentEntity,
         chunk_parameters: ChunkParameters,
     ) -> None:
-        """sync knowledge document chunk into vector store"""
+        """sync knowledge document chunk into vector store
+
+        The sync is an ingestion job in the metadata DB, it is run by the ingestion
+        queue and resumed from its checkpoint if the process restarts. A failed job
+        with the same chunk parameters is resumed too.
+        """
         space = self.get({"id": space_id})
+        if space is None:
+            raise Exception(f"there is no space called, space_id: {space_id}")
+        # Fail fast if the storage of the space is not available
+        self.storage_manager.get_storage_connector(space.name, space.vector_type)
+        chunk_parameters_json = json.dumps(
+            model_to_dict(
+                chunk_parameters, exclude={"text_splitter"}, exclude_none=True
+            )
+        )
+        job = await blocking_func_to_async(
+            self.system_app, self._job_dao.get_jobs_by_documents, [doc.id]
+        )
+        job = job.get(doc.id)
+        if (
+            job
+            and job["status"] == IngestionStatus.FAILED
+            and job["chunk_parameters"] == chunk_parameters_json
+            and str(job["space_id"]) == str(space_id)
+        ):
+            await blocking_func_to_async(
+                self.system_app,
+                self._job_dao.update_job,
+                job["id"],
+                status=IngestionStatus.PENDING,
+                error=None,
+            )
+            job = {**job, "status": IngestionStatus.PENDING, "error": None}
+        else:
+            job = await blocking_func_to_async(
+                self.system_app,
+                self._job_dao.create_job,
+                doc.id,
+                space_id,
+                chunk_parameters_json,
+            )
+        doc.status = SyncStatus.RUNNING.name
+
+        doc.gmt_modified = datetime.now()
+        await blocking_func_to_async(
+            self.system_app, self._document_dao.update_knowledge_document, doc
+        )
+        self.ingestion_queue.submit(job)
+        logger.info(f"begin save document chunks, doc:{doc.doc_name}")
+
+    async def _run_ingestion_job(
+        self, job: Dict[str, Any], progress: IngestionProgress
+    ) -> None:
+        """Run the ingestion pipeline of a job from its last checkpoint.
+
+        The stages are download, parse, split, embed (batch by batch) and persist,
+        the split chunks are saved to a checkpoint file, so a resumed job embeds
+        the same chunks from the first unfinished batch.
+
+        The sync is incremental, the chunks are compared with the chunk hashes of
+        the last sync, only the new and changed chunks are embedded and the
+        vanished chunks are deleted from the index store.
+        """
+        job_id = job["id"]
+
+        async def _checkpoint(**fields):
+            job.update(fields)
+            await blocking_func_to_async(
+                self.system_app, self._job_dao.update_job, job_id, **fields
+            )
+
+        docs = await blocking_func_to_async(
+            self.system_app, self._document_dao.documents_by_ids, [job["document_id"]]
+        )
+        if not docs:
+            logger.warning(f"The document of ingestion job {job_id} is deleted")
+            await _checkpoint(
+                status=IngestionStatus.FAILED, error="The document is deleted"
+            )
+            return
+        doc = docs[0]
+        space = self.get({"id": job["space_id"]})
+        chunk_parameters = ChunkParameters(**json.loads(job["chunk_parameters"]))
         storage_connector = self.storage_manager.get_storage_connector(
             space.name, space.vector_type
         )
+        domain_type = (space.domain_type or "normal").lower()
+        if space.domain_type and domain_type != BusinessFieldType.NORMAL.value.lower():
+            # The custom pipelines of the domain types have no batch checkpoints,
+            # they are restarted from the beginning.
+            knowledge_content = await self._download_document(doc)
+            await self.async_doc_process(
+                None, chunk_parameters, storage_connector, doc, space, knowledge_content
+            )
+            await self._finish_ingestion_job(job_id, doc)
+            return
+
+        try:
+            chunks = None
+            if job["stage"] in (IngestionStage.SPLIT, IngestionStage.EMBED):
+                chunks = self._load_chunks_checkpoint(job["checkpoint_path"])
+                if chunks is None and job["vector_ids"]:
+                    # The chunks are split again with new ids, drop the old ones
+                    _delete_quietly(
+                        storage_connector,
+                        [i for i in json.loads(job["vector_ids"]) if i],
+                    )
+                    await _checkpoint(
+                        embedded_batches=0, embedded_chunks=0, vector_ids=None
+                    )
+            resumed = chunks is not None
+            checkpoint_path = job["checkpoint_path"]
+            if chunks is None:
+                local_path = job["local_path"]
+                if not local_path or not os.path.exists(local_path):
+                    local_path = await self._download_document(doc)
+                    await _checkpoint(
+                        stage=IngestionStage.DOWNLOAD, local_path=local_path
+                    )
+                knowledge = KnowledgeFactory.create(
+                    datasource=local_path,
+                    knowledge_type=KnowledgeType.get_by_value(doc.doc_type),
+                )
+                documents = await blocking_func_to_async(
+                    self.system_app, knowledge.load
+                )
+                await _checkpoint(stage=IngestionStage.PARSE)
+                chunk_manager = ChunkManager(
+                    knowledge=knowledge, chunk_parameter=chunk_parameters
+                )
+                chunks = await blocking_func_to_async(
+                    self.system_app, chunk_manager.split, documents
+                )
+                checkpoint_path = await blocking_func_to_async(
+                    self.system_app, self._save_chunks_checkpoint, job_id, chunks
+                )
+
+            # Only the new and changed chunks are embedded, the chunk vectors are
+            # replaced in the persist stage, so a resumed job gets the same diff.
+            chunk_hashes = [_chunk_hash(chunk) for chunk in chunks]
+            chunk_vectors = await blocking_func_to_async(
+                self.system_app, self._chunk_vector_dao.get_chunk_vectors, doc.id
+            )
+            vector_ids, pending, vanished_ids = _diff_chunk_vectors(
+                chunk_hashes, chunk_vectors
+            )
+            if not chunk_vectors and doc.vector_ids:
+                # Synced before the chunk vectors table, all the chunks are new
+                vanished_ids = doc.vector_ids.split(",")
+            to_embed = [chunks[i] for i in pending]
+            logger.info(
+                f"Document {doc.doc_name} has {len(chunks)} chunks, "
+                f"{len(to_embed)} to embed, {len(vanished_ids)} to delete"
+            )
+            if not resumed:
+                await _checkpoint(
+                    stage=IngestionStage.SPLIT,
+                    checkpoint_path=checkpoint_path,
+                    total_chunks=len(to_embed),
+                    embedded_batches=0,
+                    embedded_chunks=0,
+                    vector_ids=None,
+                )
+
+            max_chunks_once_load = self.config.max_chunks_once_load
+            max_threads = self.config.max_threads
+            # One batch keeps all the load threads busy
+            batch_size = max(1, max_chunks_once_load * max_threads)
+            # The chunk offset is the checkpoint, the batch size may change
+            # between the runs
+            start = job["embedded_chunks"]
+            # The vector ids of the embedded chunks, None if a chunk failed
+            embedded_ids = json.loads(job["vector_ids"]) if job["vector_ids"] else []
+            embedded_ids = embedded_ids[:start]
+            embedded_batches = job["embedded_batches"]
+            progress.start_embedding(len(to_embed), start)
+            if resumed and start < len(to_embed):
+                # The next chunks may be loaded partially before the interruption
+                _delete_quietly(
+                    storage_connector, [chunk.chunk_id for chunk in to_embed[start:]]
+                )
+            for offset in range(start, len(to_embed), batch_size):
+                batch = to_embed[offset : offset + batch_size]
+                ids = await storage_connector.aload_document_with_limit(
+                    batch, max_chunks_once_load, max_threads, file_id=doc.id
+                )
+                embedded_ids.extend(_match_vector_ids(storage_connector, batch, ids))
+                progress.on_embedded(len(batch))
+                embedded_batches += 1
+                await _checkpoint(
+                    stage=IngestionStage.EMBED,
+                    embedded_batches=embedded_batches,
+                    embedded_chunks=offset + len(batch),
+                    vector_ids=json.dumps(embedded_ids),
+                )
+            for index, vector_id in zip(pending, embedded_ids):
+                vector_ids[index] = vector_id
+            failed = sum(1 for vector_id in vector_ids if vector_id is None)
+            if failed:
+                logger.warning(
+                    f"{failed} chunks of document {doc.doc_name} failed to load, "
+                    "they are embedded again in the next sync"
+                )
+
+            # Delete the vanished chunks after the new ones are loaded
+            _delete_quietly(storage_connector, vanished_ids)
+            await blocking_func_to_async(
+                self.system_app,
+                self._chunk_vector_dao.replace_chunk_vectors,
+                doc.id,
+                list(zip(chunk_hashes, vector_ids)),
+            )
+            doc.chunk_size = len(chunks)
+            # The vector ids are in the chunk vectors table
+            doc.vector_ids = None
+            doc.status = SyncStatus.FINISHED.name
+            doc.result = "document persist into index store success"
+            chunk_entities = [
+                DocumentChunkEntity(
+                    doc_name=doc.doc_name,
+                    doc_type=doc.doc_type,
+                    document_id=doc.id,
+                    content=chunk.content,
+                    meta_info=str(chunk.metadata),
+                    gmt_created=datetime.now(),
+                    gmt_modified=datetime.now(),
+                )
+                for chunk in chunks
+            ]
+            # The chunks of an interrupted persist stage are replaced
+            await blocking_func_to_async(
+                self.system_app, self._chunk_dao.raw_delete, doc.id
+            )
+            await blocking_func_to_async(
+                self.system_app, self._chunk_dao.create_documents_chunks, chunk_entities
+            )
+            logger.info(f"async document persist index store success:{doc.doc_name}")
+            await self._maybe_build_heading_graph(space, doc)
+        except Exception as e:
+            doc.status = SyncStatus.FAILED.name
+            doc.result = "document embedding failed" + str(e)
+            await blocking_func_to_async(
+                self.system_app, self._document_dao.update_knowledge_document, doc
+            )
+            raise
+        await blocking_func_to_async(
+            self.system_app, self._document_dao.update_knowledge_document, doc
+        )
+        await _checkpoint(
+            stage=IngestionStage.PERSIST, status=IngestionStatus.FINISHED, error=None
+        )
+        _remove_quietly(job["checkpoint_path"])
+
+    async def _finish_ingestion_job(self, job_id: int, doc) -> None:
+        if doc.status == SyncStatus.FINISHED.name:
+            fields = {
+                "stage": IngestionStage.PERSIST,
+                "status": IngestionStatus.FINISHED,
+            }
+        else:
+            fields = {"status": IngestionStatus.FAILED, "error": doc.result}
+        await blocking_func_to_async(
+            self.system_app, self._job_dao.update_job, job_id, **fields
+        )
+
+    async def _download_document(self, doc: KnowledgeDocumentEntity) -> str:
+        """Download the document file from the file storage if needed."""
         knowledge_content = doc.content
         if (
             doc.doc_type == KnowledgeType.DOCUMENT.value
@@ -525,32 +813,63 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             )
             logger.info(f"Downloaded file to {local_file_path}")
             knowledge_content = local_file_path
-        knowledge = None
-        domain_type = (space.domain_type or "normal").lower()
-        if not space.domain_type or (
-            domain_type == BusinessFieldType.NORMAL.value.lower()
-        ):
-            knowledge = KnowledgeFactory.create(
-                datasource=knowledge_content,
-                knowledge_type=KnowledgeType.get_by_value(doc.doc_type),
-            )
-        doc.status = SyncStatus.RUNNING.name
+        return knowledge_content
+
+    def _save_chunks_checkpoint(self, job_id: int, chunks: List[Chunk]) -> str:
+        checkpoint_dir = os.path.join(KNOWLEDGE_CACHE_ROOT_PATH, "ingestion")
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        checkpoint_path = os.path.join(checkpoint_dir, f"job_{job_id}.jsonl")
+        tmp_path = checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(json.dumps(model_to_dict(chunk), ensure_ascii=False) + "\n")
+        os.replace(tmp_path, checkpoint_path)
+        return checkpoint_path
+
+    def _load_chunks_checkpoint(
+        self, checkpoint_path: Optional[str]
+    ) -> Optional[List[Chunk]]:
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return None
+        with open(checkpoint_path, encoding="utf-8") as f:
+            return [Chunk(**json.loads(line)) for line in f if line.strip()]
 
-        doc.gmt_modified = datetime.now()
-        await blocking_func_to_async(
-            self.system_app, self._document_dao.update_knowledge_document, doc
-        )
-        asyncio.create_task(
-            self.async_doc_process(
-                knowledge,
-                chunk_parameters,
-                storage_connector,
-                doc,
-                space,
-                knowledge_content,
+    @property
+    def ingestion_queue(self) -> IngestionQueue:
+        """The queue of the ingestion jobs."""
+        if self._ingestion_queue is None:
+            self._ingestion_queue = IngestionQueue(
+                self._run_ingestion_job,
+                self._job_dao,
+                max_concurrency=self.config.max_concurrent_ingestions or 4,
+                max_concurrency_per_space=(
+                    self.config.max_concurrent_ingestions_per_space or 2
+                ),
             )
+        return self._ingestion_queue
+
+    async def async_after_start(self):
+        """Resume the ingestion jobs interrupted by the last shutdown."""
+        try:
+            count = await self.ingestion_queue.recover()
+            if count:
+                logger.info(f"Resumed {count} knowledge ingestion jobs")
+        except Exception as e:
+            logger.warning(f"Failed to resume the knowledge ingestion jobs: {e}")
+
+    async def async_before_stop(self):
+        """Stop the running ingestion jobs, they are resumed on next start."""
+        if self._ingestion_queue is not None:
+            await self._ingestion_queue.close()
+
+    def _with_progress(self, documents: List[DocumentServeResponse]) -> None:
+        jobs = self._job_dao.get_jobs_by_documents(
+            [document.id for document in documents if document.id is not None]
         )
-        logger.info(f"begin save document chunks, doc:{doc.doc_name}")
+        for document in documents:
+            job = jobs.get(document.id)
+            if job:
+                document.progress = self.ingestion_queue.progress(job)
 
     @trace("async_doc_process")
     async def async_doc_process(
@@ -784,3 +1103,71 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         return await space_retriever.aretrieve_with_scores(
             request.query, request.score_threshold
         )
+
+
+def _delete_quietly(storage_connector, chunk_ids: List[str]) -> None:
+    if not chunk_ids:
+        return
+    try:
+        storage_connector.delete_by_ids(",".join(chunk_ids))
+    except Exception as e:
+        logger.warning(f"Failed to delete the chunks from the index store: {e}")
+
+
+def _remove_quietly(path: Optional[str]) -> None:
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Failed to remove the checkpoint {path}: {e}")
+
+
+def _chunk_hash(chunk: Chunk) -> str:
+    """The hash of the chunk content and metadata, the chunk id is random."""
+    metadata = json.dumps(chunk.metadata, sort_keys=True, default=str)
+    return hashlib.sha256(f"{chunk.content}\n{metadata}".encode("utf-8")).hexdigest()
+
+
+def _diff_chunk_vectors(
+    chunk_hashes: List[str], chunk_vectors: List[Dict[str, Any]]
+) -> Tuple[List[Optional[str]], List[int], List[str]]:
+    """Compare the chunks with the chunk vectors of the last sync.
+
+    Returns:
+        Tuple[List[Optional[str]], List[int], List[str]]: The reused vector id of
+            every chunk (None if it is embedded), the indexes of the chunks to
+            embed and the vector ids of the vanished chunks.
+    """
+    reusable: Dict[str, Deque[str]] = defaultdict(deque)
+    for chunk_vector in chunk_vectors:
+        # A chunk failed to load last time has no vector id, it is embedded again
+        if chunk_vector["vector_id"]:
+            reusable[chunk_vector["chunk_hash"]].append(chunk_vector["vector_id"])
+    vector_ids: List[Optional[str]] = []
+    pending = []
+    for index, chunk_hash in enumerate(chunk_hashes):
+        # The same content may appear more than once, each has its own vector
+        if reusable[chunk_hash]:
+            vector_ids.append(reusable[chunk_hash].popleft())
+        else:
+            vector_ids.append(None)
+            pending.append(index)
+    vanished_ids = [i for ids in reusable.values() for i in ids]
+    return vector_ids, pending, vanished_ids
+
+
+def _match_vector_ids(
+    storage_connector, chunks: List[Chunk], ids: List[str]
+) -> List[Optional[str]]:
+    """Match the loaded ids to the chunks, the failed chunks are skipped."""
+    if len(ids) == len(chunks):
+        return list(ids)
+    loaded = set(ids)
+    if loaded <= {chunk.chunk_id for chunk in chunks}:
+        return [
+            chunk.chunk_id if chunk.chunk_id in loaded else None for chunk in chunks
+        ]
+    # The store generates its own ids, the failed chunks are unknown, so the batch
+    # is dropped and embedded again in the next sync
+    _delete_quietly(storage_connector, ids)
+    return [None] * len(chunks)
@@ -12,6 +12,7 @@ from dbgpt.storage.base import IndexStoreBase
 from dbgpt.storage.full_text.base import FullTextStoreBase
 from dbgpt.storage.vector_store.base import VectorStoreBase, VectorStoreConfig
 from dbgpt_ext.storage.full_text.elasticsearch import ElasticDocumentStore
+from dbgpt_ext.storage.full_text.local_store import LocalDocumentStore
 from dbgpt_ext.storage.knowledge_graph.knowledge_graph import BuiltinKnowledgeGraph
 
 
@@ -66,22 +67,6 @@ class StorageManager(BaseComponent):
                 )
             return self.create_kg_store(index_name, llm_model)
         elif storage_type == "FullText":
-            if not storage_config.full_text:
-                raise ValueError(
-                    "FullText storage is not configured. To use Full-Text "
-                    "Search (BM25):\n"
-                    "1. Make sure Elasticsearch is running (docker run -d -p "
-                    '9200:9200 -e "discovery.type=single-node" elasticsearch:8.7.0)\n'
-                    "2. Start the webserver with full-text config:\n"
-                    "   python dbgpt_server.py --config configs/dbgpt-bm25-rag.toml\n"
-                    "3. Or add [rag.storage.full_text] section to your current "
-                    "config file:\n"
-                    "   [rag.storage.full_text]\n"
-                    '   type = "elasticsearch"\n'
-                    '   host = "127.0.0.1"\n'
-                    "   port = 9200\n"
-                    "See documentation for details."
-                )
             return self.create_full_text_store(index_name)
         else:
             raise ValueError(f"Does not support storage type {storage_type}")
@@ -174,6 +159,15 @@ class StorageManager(BaseComponent):
         if index_name in self._store_cache:
             return self._store_cache[index_name]
         with self._cache_lock:
+            if not storage_config.full_text:
+                # No Elasticsearch configured, use the embedded BM25 index
+                new_store = LocalDocumentStore(
+                    name=index_name,
+                    k1=rag_config.bm25_k1,
+                    b=rag_config.bm25_b,
+                )
+                self._store_cache[index_name] = new_store
+                return new_store
             return ElasticDocumentStore(
                 es_config=storage_config.full_text,
                 name=index_name,
@@ -0,0 +1,272 @@
+import asyncio
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+
+from dbgpt.component import SystemApp
+from dbgpt.core import Chunk
+from dbgpt.storage.metadata import db
+from dbgpt.util.executor_utils import DefaultExecutorFactory
+from dbgpt_serve.core.tests.conftest import system_app  # noqa: F401
+
+from ..api.schemas import SpaceServeResponse
+from ..models.chunk_db import DocumentChunkVectorDao
+from ..models.document_db import KnowledgeDocumentEntity
+from ..models.ingestion_db import (
+    IngestionStage,
+    IngestionStatus,
+    KnowledgeIngestionJobDao,
+)
+from ..service.ingestion_queue import IngestionProgress, IngestionQueue
+from ..service.service import Service, SyncStatus
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown(tmp_path):
+    # A file DB, the jobs are updated in the executor threads
+    db.init_db(f"sqlite:///{tmp_path / 'dbgpt.db'}")
+    db.create_all()
+    yield
+
+
+@pytest.fixture
+def job_dao():
+    return KnowledgeIngestionJobDao()
+
+
+def test_create_job_resets_checkpoint(job_dao):
+    job = job_dao.create_job(1, "1", "{}")
+    job_dao.update_job(
+        job["id"], stage=IngestionStage.EMBED, embedded_batches=3, vector_ids="a,b"
+    )
+    assert [j["id"] for j in job_dao.list_unfinished_jobs()] == [job["id"]]
+
+    new_job = job_dao.create_job(1, "1", "{}")
+    assert new_job["id"] == job["id"]
+    assert new_job["stage"] == IngestionStage.CREATED
+    assert new_job["embedded_batches"] == 0
+    assert new_job["vector_ids"] is None
+
+    job_dao.update_job(job["id"], status=IngestionStatus.FINISHED)
+    assert job_dao.list_unfinished_jobs() == []
+    assert job_dao.get_jobs_by_documents([1, 2])[1]["status"] == "FINISHED"
+
+
+@pytest.mark.asyncio
+async def test_queue_concurrency(job_dao):
+    running = {"total": 0, "max": 0, "space": {}, "space_max": {}}
+
+    async def _runner(job, progress):
+        space_id = job["space_id"]
+        running["total"] += 1
+        running["space"][space_id] = running["space"].get(space_id, 0) + 1
+        running["max"] = max(running["max"], running["total"])
+        running["space_max"][space_id] = max(
+            running["space_max"].get(space_id, 0), running["space"][space_id]
+        )
+        await asyncio.sleep(0.01)
+        running["total"] -= 1
+        running["space"][space_id] -= 1
+        job_dao.update_job(job["id"], status=IngestionStatus.FINISHED)
+
+    queue = IngestionQueue(
+        _runner, job_dao, max_concurrency=3, max_concurrency_per_space=1
+    )
+    for doc_id, space_id in enumerate(["a", "a", "a", "b", "b", "c", "d"]):
+        queue.submit(job_dao.create_job(doc_id, space_id, "{}"))
+    while queue._tasks:
+        await asyncio.sleep(0.01)
+
+    assert running["max"] == 3
+    assert set(running["space_max"].values()) == {1}
+    assert job_dao.list_unfinished_jobs() == []
+
+
+@pytest.mark.asyncio
+async def test_queue_failed_and_recover(job_dao):
+    async def _runner(job, progress):
+        raise ValueError("embedding model is down")
+
+    job = job_dao.create_job(1, "1", "{}")
+    queue = IngestionQueue(_runner, job_dao)
+    assert await queue.recover() == 1
+    assert not queue.submit(job)
+    while queue._tasks:
+        await asyncio.sleep(0.01)
+
+    job = job_dao.get_job(job["id"])
+    assert job["status"] == IngestionStatus.FAILED
+    assert job["attempts"] == 1
+    assert job["error"] == "embedding model is down"
+    assert queue.progress(job)["error"] == "embedding model is down"
+
+
+def test_progress():
+    progress = IngestionProgress()
+    progress.start_embedding(100, 40)
+    assert progress.chunks_per_second is None
+    progress._start_time -= 2
+    progress.on_embedded(20)
+    assert progress.chunks_per_second == pytest.approx(10, rel=0.1)
+    assert progress.eta_seconds == pytest.approx(4, rel=0.1)
+
+
+@pytest.fixture
+def ingestion_service(
+    system_app: SystemApp,  # noqa: F811
+    job_dao,
+    tmp_path,
+    monkeypatch,
+):
+    monkeypatch.setattr(
+        "dbgpt_serve.rag.service.service.KNOWLEDGE_CACHE_ROOT_PATH", str(tmp_path)
+    )
+    system_app.register(DefaultExecutorFactory)
+    config = MagicMock()
+    config.max_chunks_once_load = 2
+    config.max_threads = 1
+    document_dao = Mock()
+    doc = KnowledgeDocumentEntity(
+        id=1, doc_name="a.txt", doc_type="TEXT", content="text", space="s"
+    )
+    document_dao.documents_by_ids = Mock(return_value=[doc])
+    service = Service(
+        system_app,
+        config,
+        dao=Mock(),
+        document_dao=document_dao,
+        chunk_dao=Mock(),
+        job_dao=job_dao,
+        chunk_vector_dao=DocumentChunkVectorDao(),
+    )
+    service.get = Mock(return_value=SpaceServeResponse(id=1, name="s"))
+    service._maybe_build_heading_graph = AsyncMock()
+
+    connector = Mock()
+    connector.loaded = []
+
+    async def _aload(chunks, *args, **kwargs):
+        connector.loaded.append([chunk.content for chunk in chunks])
+        return [chunk.chunk_id for chunk in chunks]
+
+    connector.aload_document_with_limit = _aload
+    storage_manager = Mock()
+    storage_manager.get_storage_connector = Mock(return_value=connector)
+    monkeypatch.setattr(Service, "storage_manager", storage_manager)
+    return service, doc, connector
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "embedded_chunks, loaded",
+    [
+        (2, [["chunk 2", "chunk 3"], ["chunk 4"]]),
+        # The first batch of 3 chunks was embedded with another batch size
+        (3, [["chunk 3", "chunk 4"]]),
+    ],
+)
+async def test_resume_from_embedded_chunks(
+    ingestion_service, job_dao, embedded_chunks, loaded
+):
+    service, doc, connector = ingestion_service
+
+    # The job was interrupted after the first batch
+    chunks = [Chunk(chunk_id=str(i), content=f"chunk {i}") for i in range(5)]
+    checkpoint_path = service._save_chunks_checkpoint(1, chunks)
+    job = job_dao.create_job(1, "1", json.dumps({"chunk_strategy": "CHUNK_BY_SIZE"}))
+    job_dao.update_job(
+        job["id"],
+        stage=IngestionStage.EMBED,
+        status=IngestionStatus.RUNNING,
+        checkpoint_path=checkpoint_path,
+        total_chunks=5,
+        embedded_chunks=embedded_chunks,
+        embedded_batches=1,
+        vector_ids=json.dumps([str(i) for i in range(embedded_chunks)]),
+    )
+    job = job_dao.get_job(job["id"])
+
+    await service._run_ingestion_job(job, IngestionProgress())
+
+    assert connector.loaded == loaded
+    # The partially loaded chunks are deleted before they are loaded again
+    connector.delete_by_ids.assert_called_once_with(
+        ",".join(str(i) for i in range(embedded_chunks, 5))
+    )
+    assert doc.status == SyncStatus.FINISHED.name
+    assert doc.vector_ids is None
+    assert service._chunk_vector_dao.get_vector_ids(1) == ["0", "1", "2", "3", "4"]
+    job = job_dao.get_job(job["id"])
+    assert job["status"] == IngestionStatus.FINISHED
+    assert job["stage"] == IngestionStage.PERSIST
+    assert job["embedded_chunks"] == 5
+    assert not os.path.exists(checkpoint_path)
+
+
+async def _sync(service, job_dao, content):
+    service._document_dao.documents_by_ids.return_value[0].content = content
+    chunk_parameters = {
+        "chunk_strategy": "CHUNK_BY_SIZE",
+        "chunk_size": 12,
+        "chunk_overlap": 0,
+    }
+    job = job_dao.create_job(1, "1", json.dumps(chunk_parameters))
+    await service._run_ingestion_job(job, IngestionProgress())
+    return job_dao.get_job(job["id"])
+
+
+@pytest.mark.asyncio
+async def test_incremental_resync(ingestion_service, job_dao):
+    service, doc, connector = ingestion_service
+    # Synced before the chunk vectors table
+    doc.vector_ids = "old1,old2"
+
+    await _sync(service, job_dao, "para one.\n\npara two.\n\npara three.")
+    assert connector.loaded == [["para one.", "para two."], ["para three."]]
+    connector.delete_by_ids.assert_called_once_with("old1,old2")
+    assert doc.vector_ids is None
+    first = service._chunk_vector_dao.get_chunk_vectors(1)
+    assert len(first) == 3
+
+    # Edit one paragraph, remove one and add one
+    connector.loaded.clear()
+    connector.delete_by_ids.reset_mock()
+    job = await _sync(service, job_dao, "para one.\n\npara 2.\n\npara four.")
+    assert connector.loaded == [["para 2.", "para four."]]
+    assert job["total_chunks"] == 2
+    deleted = set(connector.delete_by_ids.call_args[0][0].split(","))
+    assert deleted == {first[1]["vector_id"], first[2]["vector_id"]}
+    second = service._chunk_vector_dao.get_chunk_vectors(1)
+    assert [v["chunk_index"] for v in second] == [0, 1, 2]
+    assert second[0]["vector_id"] == first[0]["vector_id"]
+    assert doc.chunk_size == 3
+
+    # Nothing changed, nothing is embedded
+    connector.loaded.clear()
+    connector.delete_by_ids.reset_mock()
+    await _sync(service, job_dao, "para one.\n\npara 2.\n\npara four.")
+    assert connector.loaded == []
+    connector.delete_by_ids.assert_not_called()
+    assert service._chunk_vector_dao.get_chunk_vectors(1) == second
+
+
+@pytest.mark.asyncio
+async def test_failed_chunks_are_embedded_again(ingestion_service, job_dao):
+    service, doc, connector = ingestion_service
+
+    async def _aload(chunks, *args, **kwargs):
+        connector.loaded.append([chunk.content for chunk in chunks])
+        # The store skips the chunks it failed to load
+        return [chunk.chunk_id for chunk in chunks if chunk.content != "para two."]
+
+    connector.aload_document_with_limit = _aload
+    await _sync(service, job_dao, "para one.\n\npara two.")
+    vectors = service._chunk_vector_dao.get_chunk_vectors(1)
+    assert vectors[0]["vector_id"] is not None
+    assert vectors[1]["vector_id"] is None
+
+    connector.loaded.clear()
+    await _sync(service, job_dao, "para one.\n\npara two.")
+    assert connector.loaded == [["para two."]]
@@ -16,8 +16,9 @@ from ..api.schemas import (
     DocumentServeResponse,
     SpaceServeResponse,
 )
-from ..models.chunk_db import DocumentChunkDao
+from ..models.chunk_db import DocumentChunkDao, DocumentChunkVectorDao
 from ..models.document_db import KnowledgeDocumentDao
+from ..models.ingestion_db import KnowledgeIngestionJobDao
 from ..models.models import KnowledgeSpaceDao, SpaceServeRequest
 from ..service.service import Service
 
@@ -43,13 +44,33 @@ def mock_chunk_dao():
 
 
 @pytest.fixture
-def service(system_app: SystemApp, mock_dao, mock_document_dao, mock_chunk_dao, config):
+def mock_job_dao():
+    return Mock(KnowledgeIngestionJobDao)
+
+
+@pytest.fixture
+def mock_chunk_vector_dao():
+    return Mock(DocumentChunkVectorDao)
+
+
+@pytest.fixture
+def service(
+    system_app: SystemApp,
+    mock_dao,
+    mock_document_dao,
+    mock_chunk_dao,
+    mock_job_dao,
+    mock_chunk_vector_dao,
+    config,
+):
     return Service(
         system_app=system_app,
         config=config,
         dao=mock_dao,
         document_dao=mock_document_dao,
         chunk_dao=mock_chunk_dao,
+        job_dao=mock_job_dao,
+        chunk_vector_dao=mock_chunk_vector_dao,
     )
 
 
@@ -131,6 +152,9 @@ async def test_delete_document(service):
         return_value=[SpaceServeRequest(id="1", name="TestSpace")]
     )
     service._chunk_dao.raw_delete = Mock()
+    service._chunk_vector_dao.get_vector_ids = Mock(return_value=["v1", "v2"])
+    vector_store = Mock()
+    service.create_vector_store = Mock(return_value=vector_store)
     service._document_dao.raw_delete = Mock(return_value=existing_document)
 
     response = service.delete_document(document_id)
@@ -138,6 +162,9 @@ async def test_delete_document(service):
     assert response.id == document_id
     service._chunk_dao.raw_delete.assert_called_once_with(document_id)
     service._document_dao.raw_delete.assert_called_once_with(existing_document)
+    service._job_dao.delete_job_by_document.assert_called_once_with(document_id)
+    vector_store.delete_by_ids.assert_called_once_with("v1,v2")
+    service._chunk_vector_dao.delete_by_document.assert_called_once_with(document_id)
 
 
 # @pytest.mark.asyncio